@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, render_template, request
+import json
+from typing import Any
+
+from flask import Blueprint, Response, jsonify, render_template, request, stream_with_context
 
 from ..db.models import Audit, Document
 from ..db.session import get_session
+from ..services.progress_bus import (
+    TERMINAL_STATUSES,
+    audit_status_payload,
+    get_progress_bus,
+    publish_audit_status,
+)
 
 audits_blueprint = Blueprint("audits", __name__, url_prefix="/api")
 audits_pages_blueprint = Blueprint("audits_pages", __name__)
@@ -13,46 +22,20 @@ audits_pages_blueprint = Blueprint("audits_pages", __name__)
 
 @audits_blueprint.get("/audits")
 def list_audits() -> tuple[dict[str, object], int]:
-    """List all audits with optional filtering."""
+    """List audits, newest first, with optional filtering.
+
+    Pages are keyset-based: pass the returned ``next_cursor`` (the last audit's id) as
+    ``cursor`` to get the next page.
+    """
     session = get_session()
-    from sqlalchemy import select, desc
-    
-    # Get query parameters
-    status_filter = request.args.get("status")
-    is_draft = request.args.get("is_draft")
-    limit = request.args.get("limit", type=int, default=50)
-    
-    # Build query
-    query = select(Audit)
-    
-    if status_filter:
-        query = query.where(Audit.status == status_filter)
-    
-    if is_draft is not None:
-        is_draft_bool = str(is_draft).lower() in ("true", "1", "yes")
-        query = query.where(Audit.is_draft == is_draft_bool)
-    
-    # Order by created_at descending
-    query = query.order_by(desc(Audit.created_at)).limit(limit)
-    
-    audits = session.execute(query).scalars().all()
-    
-    # Get documents and scores for each audit
-    from ..services.compliance_score import get_flag_summary
-    from ..db.models import Flag
-    
+    cursor = request.args.get("cursor")
+    if cursor is not None and not cursor.isdigit():
+        return jsonify({"error": "cursor must be an audit id"}), 400
+    items, next_cursor = _audit_listing(session)
+
     result = []
-    for audit in audits:
-        document = session.get(Document, audit.document_id) if audit.document_id else None
-        
-        # Get flag summary if audit is completed
-        flag_summary = None
-        if audit.status == "completed":
-            flags = session.execute(
-                select(Flag).where(Flag.audit_id == audit.id)
-            ).scalars().all()
-            flag_summary = get_flag_summary(list(flags))
-        
+    for item in items:
+        audit, document, flag_summary = item["audit"], item["document"], item["flag_summary"]
         result.append({
             "id": audit.id,
             "external_id": audit.external_id,
@@ -77,8 +60,8 @@ def list_audits() -> tuple[dict[str, object], int]:
                 "green_count": flag_summary.get("green_count", 0) if flag_summary else 0,
             } if flag_summary else None,
         })
-    
-    return jsonify({"audits": result, "count": len(result)})
+
+    return jsonify({"audits": result, "count": len(result), "next_cursor": next_cursor})
 
 
 @audits_blueprint.post("/audits")
@@ -107,11 +90,29 @@ def create_audit() -> tuple[dict[str, object], int]:
     if not isinstance(is_draft, bool):
         is_draft = str(is_draft).lower() in ("true", "1", "yes")
 
+    # Delta audit: reuse results from a baseline audit for unchanged chunks
+    baseline = None
+    baseline_id = data.get("baseline_audit_id")
+    if baseline_id:
+        baseline = _resolve_audit(session, str(baseline_id))
+        if baseline is None:
+            return jsonify({"error": f"Baseline audit '{baseline_id}' not found"}), 404
+        from ..services.delta_audit import baseline_rejection
+
+        reason = baseline_rejection(baseline, document)
+        if reason:
+            return jsonify({"error": f"Baseline audit '{baseline_id}' {reason}"}), 400
+    elif str(data.get("delta", False)).lower() in ("true", "1", "yes"):
+        from ..services.delta_audit import find_baseline_audit
+
+        baseline = find_baseline_audit(session, document)
+
     # Create audit
     audit = Audit(
         document_id=document.id,
         is_draft=is_draft,
         status="queued",
+        baseline_audit_id=baseline.id if baseline else None,
     )
     session.add(audit)
     session.commit()
@@ -126,6 +127,7 @@ def create_audit() -> tuple[dict[str, object], int]:
                     "document_id": audit.document_id,
                     "status": audit.status,
                     "is_draft": audit.is_draft,
+                    "baseline_audit_id": baseline.external_id if baseline else None,
                     "created_at": audit.created_at.isoformat(),
                 }
             }
@@ -154,6 +156,7 @@ def get_audit(audit_id: str) -> tuple[dict[str, object], int]:
                 "is_draft": audit.is_draft,
                 "chunk_total": audit.chunk_total,
                 "chunk_completed": audit.chunk_completed,
+                "chunks_carried_over": _carried_over_count(session, audit),
                 "document": {
                     "id": document.id if document else None,
                     "external_id": document.external_id if document else None,
@@ -177,87 +180,72 @@ def get_audit_status(audit_id: str) -> tuple[dict[str, object], int]:
     audit = _resolve_audit(session, audit_id)
     if audit is None:
         return jsonify({"error": "Audit not found"}), 404
+    return jsonify(_stored_progress(session, audit))
 
-    # Calculate progress percentage
-    progress_percent = 0.0
-    if audit.chunk_total > 0:
-        progress_percent = (audit.chunk_completed / audit.chunk_total) * 100
-
-    # Determine current activity message
-    current_activity = None
-    if audit.status == "queued":
-        current_activity = "Waiting in queue..."
-    elif audit.status == "running":
-        if audit.chunk_total == 0:
-            current_activity = "Initializing audit process..."
-        elif audit.chunk_completed == 0:
-            current_activity = f"Starting analysis of {audit.chunk_total} chunks..."
-        elif audit.last_chunk_id:
-            # Show more detailed progress
-            progress_pct = (audit.chunk_completed / audit.chunk_total * 100) if audit.chunk_total > 0 else 0
-            current_activity = (
-                f"Analyzing chunk {audit.chunk_completed + 1} of {audit.chunk_total} "
-                f"({progress_pct:.1f}% complete)"
-            )
-        else:
-            current_activity = f"Analyzing chunk {audit.chunk_completed + 1} of {audit.chunk_total}"
-    elif audit.status == "completed":
-        current_activity = f"Audit completed successfully - {audit.chunk_completed} chunks analyzed"
-    elif audit.status == "failed":
-        # Truncate failure reason for display if too long
-        failure_msg = audit.failure_reason or "Unknown error"
-        if len(failure_msg) > 200:
-            failure_msg = failure_msg[:197] + "..."
-        current_activity = f"Audit failed: {failure_msg}"
-    else:
-        current_activity = f"Status: {audit.status}"
-
-    # Calculate ETA if running
-    eta_seconds = None
-    eta_formatted = None
-    if audit.status == "running" and audit.started_at and audit.chunk_completed > 0 and audit.chunk_total > 0:
-        from datetime import datetime, timezone
-        # Handle both timezone-aware and naive datetimes
-        if audit.started_at.tzinfo is None:
-            # Naive datetime - assume UTC
-            started_at_aware = audit.started_at.replace(tzinfo=timezone.utc)
-        else:
-            started_at_aware = audit.started_at
-        elapsed = (datetime.now(timezone.utc) - started_at_aware).total_seconds()
-        if elapsed > 0 and audit.chunk_completed > 0:
-            rate = audit.chunk_completed / elapsed  # chunks per second
-            remaining_chunks = audit.chunk_total - audit.chunk_completed
-            if rate > 0:
-                eta_seconds = remaining_chunks / rate
-                # Format ETA
-                if eta_seconds < 60:
-                    eta_formatted = f"{int(eta_seconds)}s"
-                elif eta_seconds < 3600:
-                    eta_formatted = f"{int(eta_seconds / 60)}m {int(eta_seconds % 60)}s"
-                else:
-                    hours = int(eta_seconds / 3600)
-                    minutes = int((eta_seconds % 3600) / 60)
-                    eta_formatted = f"{hours}h {minutes}m"
 
-    return jsonify(
-        {
-            "status": audit.status,
-            "chunk_total": audit.chunk_total,
-            "chunk_completed": audit.chunk_completed,
-            "progress_percent": round(progress_percent, 1),
-            "current_activity": current_activity,
-            "last_chunk_id": audit.last_chunk_id,
-            "eta_seconds": eta_seconds,
-            "eta_formatted": eta_formatted,
-            "started_at": audit.started_at.isoformat() if audit.started_at else None,
-            "completed_at": audit.completed_at.isoformat() if audit.completed_at else None,
-            "failed_at": audit.failed_at.isoformat() if audit.failed_at else None,
-            "failure_reason": audit.failure_reason,
-            "is_draft": audit.is_draft,
-        }
+@audits_blueprint.get("/audits/<audit_id>/events")
+def stream_audit_progress(audit_id: str):
+    """Server-Sent Events stream of an audit's progress, ending once it completes or fails.
+
+    Updates come from the in-process progress bus the runner publishes to after every
+    chunk commit, so connected clients cost no queries while an audit makes progress.
+    Bus entries are only hints: the stream starts from the stored status and re-reads it
+    whenever a heartbeat passes without a publication, which catches audits run by
+    another process or changed without a publish.
+    """
+    session = get_session()
+    audit = _resolve_audit(session, audit_id)
+    if audit is None:
+        return jsonify({"error": "Audit not found"}), 404
+    key = audit.external_id
+    initial = _stored_progress(session, audit)
+    # Never hold a read transaction while waiting: under SQLite it would block the runner's commits
+    session.rollback()
+    bus = get_progress_bus()
+    heartbeat = min(60.0, max(1.0, request.args.get("heartbeat", type=float, default=15.0)))
+
+    def events():
+        payload = initial
+        yield _sse_event(payload)
+        while payload["status"] not in TERMINAL_STATUSES:
+            update = bus.wait(key, after=payload["version"], timeout=heartbeat)
+            if update is None:
+                update = _refresh_stored_progress(key, payload)
+            if update is None:
+                yield ": keep-alive\n\n"
+                continue
+            payload = update
+            yield _sse_event(payload)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@audits_blueprint.get("/audits/<audit_id>/progress")
+def wait_audit_progress(audit_id: str) -> tuple[dict[str, object], int]:
+    """Long-poll for progress: returns once the version is above ``after`` or ``timeout`` passes.
+
+    On timeout the stored status is returned, so changes that were never published still show.
+    """
+    after = request.args.get("after", type=int, default=0)
+    timeout = min(30.0, max(0.0, request.args.get("timeout", type=float, default=25.0)))
+    session = get_session()
+    audit = _resolve_audit(session, audit_id)
+    if audit is None:
+        return jsonify({"error": "Audit not found"}), 404
+    key = audit.external_id
+    # End the read transaction so a long wait does not pin a database snapshot
+    session.rollback()
+    payload = get_progress_bus().wait(key, after=after, timeout=timeout)
+    if payload is None:
+        session.refresh(audit)
+        payload = _stored_progress(session, audit)
+    return jsonify(payload)
+
+
 @audits_blueprint.post("/audits/<audit_id>/resume")
 def resume_audit(audit_id: str) -> tuple[dict[str, object], int]:
     """Resume/restart processing of a stuck or failed audit."""
@@ -279,6 +267,7 @@ def resume_audit(audit_id: str) -> tuple[dict[str, object], int]:
         audit.status = "running"
         audit.failure_reason = None
         session.commit()
+        publish_audit_status(session, audit)
     
     # Import here to avoid circular imports
     from ..config.settings import AppConfig
@@ -327,6 +316,7 @@ def resume_audit(audit_id: str) -> tuple[dict[str, object], int]:
                     audit.status = "failed"
                     audit.failure_reason = f"Resume failed: {str(exc)}"
                     session.commit()
+                    publish_audit_status(session, audit)
     
     # Start background thread to resume audit
     resume_thread = threading.Thread(
@@ -347,51 +337,136 @@ def resume_audit(audit_id: str) -> tuple[dict[str, object], int]:
 def list_audits_page():
     """Render the audit dashboard page."""
     session = get_session()
-    from sqlalchemy import select, desc
-    
-    # Get query parameters
     status_filter = request.args.get("status")
     is_draft = request.args.get("is_draft")
-    limit = request.args.get("limit", type=int, default=50)
-    
-    # Build query
-    query = select(Audit)
-    
+    audit_list, next_cursor = _audit_listing(session)
+
+    return render_template(
+        "dashboard.html",
+        audits=audit_list,
+        status_filter=status_filter,
+        is_draft=is_draft,
+        next_cursor=next_cursor,
+    )
+
+
+def _audit_listing(session) -> tuple[list[dict[str, Any]], str | None]:
+    """Audits for the list endpoints, with documents and flag summaries, in one query.
+
+    Reads ``status``, ``is_draft``, ``limit`` and ``cursor`` from the request. Flag counts
+    and scores come from the materialized ``AuditFlagSummary`` row, or from the persisted
+    ``ComplianceScore`` for audits that predate it; flags are only loaded for completed
+    audits that have neither.
+    """
+    from sqlalchemy import and_, desc, or_, select
+
+    from ..db.models import AuditFlagSummary, ComplianceScore, Flag
+    from ..services.compliance_score import get_flag_summary, summary_state
+
+    status_filter = request.args.get("status")
+    is_draft = request.args.get("is_draft")
+    limit = max(1, min(500, request.args.get("limit", type=int, default=50)))
+    cursor = request.args.get("cursor", type=int)
+
+    query = (
+        select(Audit, Document, AuditFlagSummary, ComplianceScore)
+        .outerjoin(Document, Document.id == Audit.document_id)
+        .outerjoin(AuditFlagSummary, AuditFlagSummary.audit_id == Audit.id)
+        .outerjoin(ComplianceScore, ComplianceScore.audit_id == Audit.id)
+    )
     if status_filter:
         query = query.where(Audit.status == status_filter)
-    
     if is_draft is not None:
         is_draft_bool = str(is_draft).lower() in ("true", "1", "yes")
         query = query.where(Audit.is_draft == is_draft_bool)
-    
-    # Order by created_at descending
-    query = query.order_by(desc(Audit.created_at)).limit(limit)
-    
-    audits = session.execute(query).scalars().all()
-    
-    # Get documents and scores for each audit
-    from ..services.compliance_score import get_flag_summary
-    from ..db.models import Flag
-    
-    audit_list = []
-    for audit in audits:
-        document = session.get(Document, audit.document_id) if audit.document_id else None
-        
-        # Get flag summary if audit is completed
+    if cursor is not None:
+        # Compared against the stored value, so the cursor never depends on timestamp formatting
+        cursor_created = select(Audit.created_at).where(Audit.id == cursor).scalar_subquery()
+        query = query.where(
+            or_(Audit.created_at < cursor_created, and_(Audit.created_at == cursor_created, Audit.id < cursor))
+        )
+    # One extra row tells whether there is a next page
+    query = query.order_by(desc(Audit.created_at), desc(Audit.id)).limit(limit + 1)
+    rows = session.execute(query).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Audits completed before either summary was stored fall back to their flags
+    unsummarized = [
+        row.Audit.id
+        for row in rows
+        if row.Audit.status == "completed" and row.AuditFlagSummary is None and row.ComplianceScore is None
+    ]
+    fallback: dict[int, dict[str, Any]] = {}
+    if unsummarized:
+        flags_by_audit: dict[int, list[Flag]] = {audit_id: [] for audit_id in unsummarized}
+        for flag in session.execute(select(Flag).where(Flag.audit_id.in_(unsummarized))).scalars():
+            flags_by_audit[flag.audit_id].append(flag)
+        fallback = {audit_id: get_flag_summary(flags) for audit_id, flags in flags_by_audit.items()}
+
+    items = []
+    for row in rows:
+        audit = row.Audit
         flag_summary = None
         if audit.status == "completed":
-            flags = session.execute(
-                select(Flag).where(Flag.audit_id == audit.id)
-            ).scalars().all()
-            flag_summary = get_flag_summary(list(flags))
-        
-        audit_list.append({
-            "audit": audit,
-            "document": document,
-            "flag_summary": flag_summary,
-        })
-    
-    return render_template("dashboard.html", audits=audit_list, status_filter=status_filter, is_draft=is_draft)
+            if row.AuditFlagSummary is not None:
+                flag_summary = summary_state(row.AuditFlagSummary).summary()
+            elif row.ComplianceScore is not None:
+                score = row.ComplianceScore
+                flag_summary = {
+                    "total_flags": score.total_flags,
+                    "red_count": score.red_count,
+                    "yellow_count": score.yellow_count,
+                    "green_count": score.green_count,
+                    "compliance_score": round(score.overall_score, 2),
+                }
+            else:
+                flag_summary = fallback[audit.id]
+        items.append({"audit": audit, "document": row.Document, "flag_summary": flag_summary})
+
+    next_cursor = str(rows[-1].Audit.id) if has_more else None
+    return items, next_cursor
+
+
+def _carried_over_count(session, audit: Audit) -> int:
+    """Chunk results copied from the baseline of a delta audit."""
+    if audit.baseline_audit_id is None:
+        return 0
+    from sqlalchemy import func, select
+
+    from ..db.models import AuditChunkResult
+
+    stmt = select(func.count()).where(
+        AuditChunkResult.audit_id == audit.id, AuditChunkResult.carried_from_audit_id.is_not(None)
+    )
+    return int(session.execute(stmt).scalar_one())
+
+
+def _stored_progress(session, audit: Audit) -> dict[str, Any]:
+    """The stored status, carrying the latest published version for waiting on the bus."""
+    from ..services.compliance_score import audit_flag_summary
+
+    # Version 0 when nothing has been published for the audit in this process
+    published = get_progress_bus().latest(audit.external_id)
+    version = published["version"] if published is not None else 0
+    return {**audit_status_payload(audit, audit_flag_summary(session, audit.id)), "version": version}
+
+
+def _refresh_stored_progress(external_id: str, previous: dict[str, Any]) -> dict[str, Any] | None:
+    """Stored progress if it differs from ``previous``, e.g. for audits run by another process."""
+    session = get_session()
+    session.expire_all()
+    audit = _resolve_audit(session, external_id)
+    payload = _stored_progress(session, audit) if audit is not None else None
+    session.rollback()
+    if payload is None:
+        return None
+    changed = any(payload[key] != previous.get(key) for key in ("status", "chunk_completed", "chunk_total"))
+    return payload if changed else None
+
+
+def _sse_event(payload: dict[str, Any]) -> str:
+    return f"id: {payload['version']}\ndata: {json.dumps(payload)}\n\n"
 
 
 def _resolve_audit(session, identifier: str):
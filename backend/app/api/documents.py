@@ -11,6 +11,7 @@ from ..db.session import get_session
 from ..logging_config import get_logger
 from ..services.documents import DocumentService, DocumentUploadError
 from ..services.document_processor import DocumentProcessor, DocumentProcessingError
+from ..services.progress_bus import publish_audit_status
 
 documents_blueprint = Blueprint("documents", __name__, url_prefix="/api")
 documents_pages_blueprint = Blueprint("documents_pages", __name__)
@@ -55,6 +56,7 @@ def _process_document_background(document_id: int, is_draft: bool, data_root: Pa
                     from datetime import timezone
                     audit.started_at = datetime.now(timezone.utc)
                 session.commit()
+                publish_audit_status(session, audit)
                 logger.info(f"Started processing document {document_id}, audit {audit.id}")
             
             processor = DocumentProcessor(data_root, session, config)
@@ -81,6 +83,7 @@ def _process_document_background(document_id: int, is_draft: bool, data_root: Pa
                     audit.failed_at = datetime.now(timezone.utc)
                     audit.failure_reason = str(exc)
                     session.commit()
+                    publish_audit_status(session, audit)
                     logger.error(f"Marked audit {audit.id} as failed due to error: {exc}")
             except Exception as update_exc:
                 logger.exception(f"Failed to update audit status: {update_exc}")
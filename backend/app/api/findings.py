@@ -60,6 +60,8 @@ def list_flags(audit_id: str):
                     for citation in flag.citations
                 ],
                 "analysis_metadata": flag.analysis_metadata,
+                # Copied from the baseline audit rather than analyzed in this one
+                "carried_over": bool((flag.analysis_metadata or {}).get("carried_over_from")),
                 "updated_at": flag.updated_at.isoformat(),
             }
             for flag in rows
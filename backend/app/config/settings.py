@@ -15,6 +15,15 @@ class ChunkingConfig:
     max_section_tokens: int
 
 
+@dataclass(frozen=True)
+class IngestionConfig:
+    """Configuration payload for the streaming extract → chunk → embed pipeline."""
+
+    queue_size: int
+    batch_size: int
+    max_in_flight: int
+
+
 @dataclass(frozen=True)
 class ContextBuilderConfig:
     """Configuration payload controlling contextual retrieval budgets."""
@@ -62,6 +71,22 @@ class AppConfig:
     embedding_api_base_url: str = field(
         default_factory=lambda: os.getenv("EMBEDDING_API_BASE_URL") or os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1")
     )
+    # Worker processes for page-parallel PDF extraction (0 = one per CPU core, 1 = in-process)
+    pdf_extraction_workers: int = field(
+        default_factory=lambda: int(os.getenv("PDF_EXTRACTION_WORKERS", "0"))
+    )
+    # Streaming ingestion: queue depth between stages, chunks per insert/embedding batch,
+    # and embedding batches awaiting storage before the pipeline applies backpressure
+    ingest_queue_size: int = field(default_factory=lambda: int(os.getenv("INGEST_QUEUE_SIZE", "64")))
+    ingest_batch_size: int = field(default_factory=lambda: int(os.getenv("INGEST_BATCH_SIZE", "100")))
+    ingest_max_in_flight: int = field(default_factory=lambda: int(os.getenv("INGEST_MAX_IN_FLIGHT", "2")))
+    # Embedding requests kept in flight over the pooled HTTP client, and attempts per batch
+    embedding_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+    )
+    embedding_max_retries: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+    )
     chunk_size: int = field(default_factory=lambda: int(os.getenv("CHUNK_SIZE", "800")))
     chunk_overlap: int = field(default_factory=lambda: int(os.getenv("CHUNK_OVERLAP", "80")))
     chunk_tokenizer: str = field(
@@ -113,8 +138,20 @@ class AppConfig:
         default_factory=lambda: os.getenv("REFINEMENT_INCLUDE_EVIDENCE", "1") == "1"
     )
     # Rate limiting configuration
+    # Fixed pause between chunks; outbound pacing is handled by the shared rate limiter
     chunk_processing_delay: float = field(
-        default_factory=lambda: float(os.getenv("CHUNK_PROCESSING_DELAY", "5.0"))
+        default_factory=lambda: float(os.getenv("CHUNK_PROCESSING_DELAY", "0"))
+    )
+    # Process-wide budgets for LLM and embedding calls (0 disables that budget)
+    rate_limit_requests_per_minute: float = field(
+        default_factory=lambda: float(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "60"))
+    )
+    rate_limit_tokens_per_minute: float = field(
+        default_factory=lambda: float(os.getenv("RATE_LIMIT_TOKENS_PER_MINUTE", "0"))
+    )
+    # Completion tokens charged for chat requests that do not set max_tokens
+    rate_limit_completion_tokens: int = field(
+        default_factory=lambda: int(os.getenv("RATE_LIMIT_COMPLETION_TOKENS", "1000"))
     )
     rate_limit_backoff_base: float = field(
         default_factory=lambda: float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "10.0"))
@@ -122,6 +159,51 @@ class AppConfig:
     rate_limit_max_wait: float = field(
         default_factory=lambda: float(os.getenv("RATE_LIMIT_MAX_WAIT", "120.0"))
     )
+    # Number of chunks analyzed in parallel by the compliance runner (1 = sequential)
+    runner_concurrency: int = field(
+        default_factory=lambda: int(os.getenv("RUNNER_CONCURRENCY", "1"))
+    )
+    # Vector searches run concurrently per depth level during recursive RAG expansion
+    recursive_rag_workers: int = field(
+        default_factory=lambda: int(os.getenv("RECURSIVE_RAG_WORKERS", "1"))
+    )
+    # Use the asyncio LLM client so one thread keeps RUNNER_CONCURRENCY analyses in flight
+    runner_async: bool = field(
+        default_factory=lambda: os.getenv("RUNNER_ASYNC", "0") == "1"
+    )
+    # Upper bound on pooled keep-alive connections held by the async LLM client
+    llm_max_connections: int = field(
+        default_factory=lambda: int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+    )
+    # Persistent cache of validated chunk analyses keyed by the full request payload
+    llm_cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+    )
+    llm_cache_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+    )
+    llm_cache_max_mb: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+    )
+    # Entries older than this are discarded (0 keeps them until evicted by size)
+    llm_cache_ttl_hours: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_TTL_HOURS", "720"))
+    )
+    # In-memory LRU of query embeddings shared by all context builders in the process
+    query_embedding_cache_size: int = field(
+        default_factory=lambda: int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+    )
+    # Process-wide cache of vector search results (0 entries disables it)
+    retrieval_cache_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "10000"))
+    )
+    retrieval_cache_max_mb: float = field(
+        default_factory=lambda: float(os.getenv("RETRIEVAL_CACHE_MAX_MB", "64"))
+    )
+    # Upper bound on how long a result survives writes made without invalidating the cache
+    retrieval_cache_ttl_seconds: float = field(
+        default_factory=lambda: float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "300"))
+    )
     log_level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
     secret_key: str = field(
         default_factory=lambda: os.getenv("FLASK_SECRET_KEY", "hackathon-secret")
@@ -156,6 +238,16 @@ class AppConfig:
             max_section_tokens=self.chunk_max_section_tokens,
         )
 
+    @property
+    def ingestion(self) -> IngestionConfig:
+        """Return the streaming ingestion configuration block."""
+
+        return IngestionConfig(
+            queue_size=self.ingest_queue_size,
+            batch_size=self.ingest_batch_size,
+            max_in_flight=self.ingest_max_in_flight,
+        )
+
     @property
     def context_builder(self) -> ContextBuilderConfig:
         """Return the context builder configuration block."""
@@ -0,0 +1,33 @@
+"""Add section_index table for exact section-number lookups."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251117_section_index"
+down_revision = "20251116_legislation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "section_index",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("document_id", sa.Integer(), sa.ForeignKey("documents.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("chunk_id", sa.String(length=128), sa.ForeignKey("chunks.chunk_id", ondelete="CASCADE"), nullable=False),
+        sa.Column("section_key", sa.String(length=128), nullable=False),
+        sa.Column("source_type", sa.String(length=20), nullable=False),
+        sa.Column("level", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+    )
+    op.create_index("idx_section_index_doc_key", "section_index", ["document_id", "section_key"])
+    op.create_index("idx_section_index_source_key", "section_index", ["source_type", "section_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_section_index_source_key", table_name="section_index")
+    op.drop_index("idx_section_index_doc_key", table_name="section_index")
+    op.drop_table("section_index")
@@ -0,0 +1,40 @@
+"""Record chunk fingerprints on audit results and link delta audits to their baseline."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251118_delta_audits"
+down_revision = "20251117_section_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("audits") as batch:
+        batch.add_column(sa.Column("baseline_audit_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_audits_baseline_audit", "audits", ["baseline_audit_id"], ["id"], ondelete="SET NULL"
+        )
+    with op.batch_alter_table("audit_chunk_results") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(length=16), nullable=True))
+        batch.add_column(sa.Column("section_path", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("context_hash", sa.String(length=16), nullable=True))
+        batch.add_column(sa.Column("carried_from_audit_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_audit_chunk_results_carried_from", "audits", ["carried_from_audit_id"], ["id"], ondelete="SET NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("audit_chunk_results") as batch:
+        batch.drop_constraint("fk_audit_chunk_results_carried_from", type_="foreignkey")
+        batch.drop_column("carried_from_audit_id")
+        batch.drop_column("context_hash")
+        batch.drop_column("section_path")
+        batch.drop_column("content_hash")
+    with op.batch_alter_table("audits") as batch:
+        batch.drop_constraint("fk_audits_baseline_audit", type_="foreignkey")
+        batch.drop_column("baseline_audit_id")
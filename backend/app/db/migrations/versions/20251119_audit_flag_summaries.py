@@ -0,0 +1,35 @@
+"""Add audit_flag_summaries, the per-audit flag counts and running score state."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20251119_audit_flag_summaries"
+down_revision = "20251118_delta_audits"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_flag_summaries",
+        sa.Column("audit_id", sa.Integer(), sa.ForeignKey("audits.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("red_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("yellow_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("green_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_flags", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("severity_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("red_penalty", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("yellow_penalty", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("consecutive_red", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("consecutive_yellow", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_flag_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_flag_summaries")
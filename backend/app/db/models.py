@@ -105,6 +105,29 @@ class Chunk(Base, TimestampMixin):
     document: Mapped[Document] = relationship(back_populates="chunks")
 
 
+class SectionIndexEntry(Base):
+    """Normalized section number → chunk mapping written at chunking time."""
+
+    __tablename__ = "section_index"
+    __table_args__ = (
+        Index("idx_section_index_doc_key", "document_id", "section_key"),
+        Index("idx_section_index_source_key", "source_type", "section_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    document_id: Mapped[int] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
+    chunk_id: Mapped[str] = mapped_column(
+        ForeignKey("chunks.chunk_id", ondelete="CASCADE"), nullable=False
+    )
+    section_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    source_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # 0 when the key is the chunk's own heading, 1 for its parent, and so on
+    level: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class EmbeddingJob(Base, TimestampMixin):
     __tablename__ = "embedding_jobs"
     __table_args__ = (
@@ -150,10 +173,12 @@ class Audit(Base, TimestampMixin):
     failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     failure_reason: Mapped[str | None] = mapped_column(Text)
     details: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    # Earlier audit whose results are copied forward for unchanged chunks (delta audit)
+    baseline_audit_id: Mapped[int | None] = mapped_column(ForeignKey("audits.id", ondelete="SET NULL"))
 
     document: Mapped[Document] = relationship(back_populates="audits")
     chunk_results: Mapped[list["AuditChunkResult"]] = relationship(
-        back_populates="audit", cascade="all,delete-orphan"
+        back_populates="audit", cascade="all,delete-orphan", foreign_keys="AuditChunkResult.audit_id"
     )
 
 
@@ -170,8 +195,13 @@ class AuditChunkResult(Base, TimestampMixin):
     status: Mapped[str] = mapped_column(String(30), default="pending", nullable=False)
     analysis: Mapped[dict[str, Any] | None] = mapped_column(JSON)
     context_token_count: Mapped[int | None] = mapped_column(Integer)
+    # What the analysis saw, so a later delta audit can tell whether it still applies
+    content_hash: Mapped[str | None] = mapped_column(String(16))
+    section_path: Mapped[str | None] = mapped_column(Text)
+    context_hash: Mapped[str | None] = mapped_column(String(16))
+    carried_from_audit_id: Mapped[int | None] = mapped_column(ForeignKey("audits.id", ondelete="SET NULL"))
 
-    audit: Mapped[Audit] = relationship(back_populates="chunk_results")
+    audit: Mapped[Audit] = relationship(back_populates="chunk_results", foreign_keys=[audit_id])
 
 
 class Flag(Base, TimestampMixin):
@@ -248,6 +278,24 @@ class ComplianceScore(Base, TimestampMixin):
     audit: Mapped[Audit] = relationship()
 
 
+class AuditFlagSummary(Base, TimestampMixin):
+    """Flag counts and running compliance score state of an audit, updated as each flag is written."""
+
+    __tablename__ = "audit_flag_summaries"
+
+    audit_id: Mapped[int] = mapped_column(ForeignKey("audits.id", ondelete="CASCADE"), primary_key=True)
+    red_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    yellow_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    green_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_flags: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    severity_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    red_penalty: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    yellow_penalty: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    consecutive_red: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    consecutive_yellow: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_flag_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
 class Legislation(Base, TimestampMixin):
     """Legislation documents uploaded for compliance checking."""
     __tablename__ = "legislations"
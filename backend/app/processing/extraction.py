@@ -3,11 +3,15 @@ from __future__ import annotations
 import json
 import logging
 import mimetypes
+import multiprocessing
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Iterable
+from typing import Any, Callable, Iterable, Iterator
 
 from bs4 import BeautifulSoup
 
@@ -73,6 +77,9 @@ class DocumentExtractor:
         ".xml",
     }
     OCR_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tiff", ".tif"}
+    # PDFs shorter than this are extracted in-process; a worker pool would cost more than it saves
+    PDF_PARALLEL_MIN_PAGES = 32
+    PDF_PAGES_PER_TASK = 8
 
     def __init__(
         self,
@@ -80,35 +87,55 @@ class DocumentExtractor:
         use_ocr: bool = False,
         ocr_lang: str = "eng",
         min_section_length: int = 20,
+        pdf_workers: int = 1,
     ):
         self.use_ocr = use_ocr
         self.ocr_lang = ocr_lang
         self.min_section_length = min_section_length
+        # Worker processes for PDF page extraction (0 = one per CPU core)
+        self.pdf_workers = pdf_workers if pdf_workers > 0 else min(8, os.cpu_count() or 1)
 
     def extract(self, path: str | Path) -> ExtractedDocument:
-        document_path = Path(path)
-        if not document_path.exists():
-            raise ExtractionError(f"Document not found: {document_path}")
-        if not document_path.is_file():
-            raise ExtractionError(f"Path must be a file: {document_path}")
+        document_path, extension = self._validate_path(path)
+        sections = list(self.iter_sections(document_path))
 
-        extension = document_path.suffix.lower()
-        if extension not in self.SUPPORTED_EXTENSIONS and (
-            extension not in self.OCR_EXTENSIONS
-        ):
-            allowed = ", ".join(sorted(self.SUPPORTED_EXTENSIONS | self.OCR_EXTENSIONS))
+        if not sections:
             raise ExtractionError(
-                f"Unsupported extension '{extension}'. Allowed: {allowed}"
+                f"No textual content could be extracted from {document_path.name}."
             )
-
-        extractor = self._resolve_extractor(extension)
-        sections = extractor(document_path)
-
-        if not sections:
+        return self._build_document(document_path, extension, sections)
+
+    def iter_sections_to_json(
+        self, path: str | Path, destination: str | Path
+    ) -> Iterator[ExtractedSection]:
+        """Yield sections like :meth:`iter_sections`, writing ``extract(path).to_json()`` as they pass.
+
+        The file is written one section at a time, so it never needs the whole document in memory.
+        """
+        document_path, extension = self._validate_path(path)
+        header = self._build_document(document_path, extension, []).to_dict()
+        del header["sections"], header["section_count"]
+
+        count = 0
+        with Path(destination).open("w", encoding="utf-8") as handle:
+            handle.write("{\n")
+            for key, value in header.items():
+                handle.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            handle.write('  "sections": [')
+            for section in self.iter_sections(document_path):
+                handle.write(("," if count else "") + "\n    " + json.dumps(section.to_dict(), ensure_ascii=False))
+                count += 1
+                yield section
+            handle.write(f'\n  ],\n  "section_count": {count}\n}}\n')
+
+        if not count:
             raise ExtractionError(
                 f"No textual content could be extracted from {document_path.name}."
             )
 
+    def _build_document(
+        self, document_path: Path, extension: str, sections: list[ExtractedSection]
+    ) -> ExtractedDocument:
         content_type = (
             mimetypes.guess_type(document_path.name)[0] or "application/octet-stream"
         )
@@ -126,6 +153,36 @@ class DocumentExtractor:
             metadata=metadata,
         )
 
+    def iter_sections(self, path: str | Path) -> Iterator[ExtractedSection]:
+        """Yield sections in document order as they are extracted.
+
+        PDFs are streamed page by page, so callers can start chunking before the rest
+        of the document has been read. Other formats are parsed whole, then yielded.
+        """
+        document_path, extension = self._validate_path(path)
+        if extension == ".pdf":
+            yield from self._iter_pdf_sections(document_path)
+            return
+        yield from self._resolve_extractor(extension)(document_path)
+
+    def _validate_path(self, path: str | Path) -> tuple[Path, str]:
+        document_path = Path(path)
+        if not document_path.exists():
+            raise ExtractionError(f"Document not found: {document_path}")
+        if not document_path.is_file():
+            raise ExtractionError(f"Path must be a file: {document_path}")
+
+        extension = document_path.suffix.lower()
+        if extension not in self.SUPPORTED_EXTENSIONS and (
+            extension not in self.OCR_EXTENSIONS
+        ):
+            allowed = ", ".join(sorted(self.SUPPORTED_EXTENSIONS | self.OCR_EXTENSIONS))
+            raise ExtractionError(
+                f"Unsupported extension '{extension}'. Allowed: {allowed}"
+            )
+
+        return document_path, extension
+
     # --------------------------------------------------------------------- #
     # Individual format extractors
     # --------------------------------------------------------------------- #
@@ -153,27 +210,70 @@ class DocumentExtractor:
         raise ExtractionError(f"No extractor available for extension {extension}")
 
     def _extract_pdf(self, path: Path) -> list[ExtractedSection]:
-        from PyPDF2 import PdfReader  # local import to reduce startup time
+        return list(self._iter_pdf_sections(path))
+
+    def _iter_pdf_sections(self, path: Path) -> Iterator[ExtractedSection]:
+        with _PdfPageReader(path, use_ocr=self.use_ocr, ocr_lang=self.ocr_lang) as reader:
+            page_count = reader.page_count
+            if self.pdf_workers <= 1 or page_count < self.PDF_PARALLEL_MIN_PAGES:
+                for index in range(page_count):
+                    text = reader.page_text(index)
+                    if text:
+                        yield self._pdf_section(index, text)
+                return
+
+        for index, text in self._iter_pdf_pages_parallel(path, page_count):
+            if text:
+                yield self._pdf_section(index, text)
+
+    def _iter_pdf_pages_parallel(self, path: Path, page_count: int) -> Iterator[tuple[int, str]]:
+        """Extract page ranges in worker processes, yielding pages in document order.
+
+        Each worker opens the PDF once. At most two ranges per worker are in flight, so a
+        slow consumer holds back extraction instead of buffering the whole document.
+        """
+        ranges = iter(
+            [(start, min(start + self.PDF_PAGES_PER_TASK, page_count))
+             for start in range(0, page_count, self.PDF_PAGES_PER_TASK)]
+        )
+        workers = min(self.pdf_workers, -(-page_count // self.PDF_PAGES_PER_TASK))
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            # Never fork: the web app extracts on request threads, and a forked child can
+            # inherit locks (SQLite, ChromaDB, logging) held by other threads and deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_pdf_worker,
+            initargs=(str(path), self.use_ocr, self.ocr_lang),
+        )
+        try:
+            pending: deque[Future[list[str]]] = deque()
+            starts: deque[int] = deque()
+
+            def submit_next() -> None:
+                bounds = next(ranges, None)
+                if bounds is not None:
+                    starts.append(bounds[0])
+                    pending.append(pool.submit(_extract_pdf_pages, *bounds))
+
+            for _ in range(workers * 2):
+                submit_next()
+            while pending:
+                texts = pending.popleft().result()
+                start = starts.popleft()
+                submit_next()
+                for offset, text in enumerate(texts):
+                    yield start + offset, text
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
-        sections: list[ExtractedSection] = []
-        reader = PdfReader(str(path))
-        for index, page in enumerate(reader.pages):
-            text = page.extract_text() or ""
-            text = self._normalize_whitespace(text)
-            if not text and self.use_ocr:
-                logger.debug("PDF page %s empty, attempting OCR fallback.", index + 1)
-                text = self._extract_pdf_page_with_ocr(path, index)
-            if not text:
-                continue
-            sections.append(
-                ExtractedSection(
-                    index=index,
-                    title=f"Page {index + 1}",
-                    content=text,
-                    metadata={"source": "pdf", "page_number": index + 1},
-                )
-            )
-        return sections
+    @staticmethod
+    def _pdf_section(index: int, text: str) -> ExtractedSection:
+        return ExtractedSection(
+            index=index,
+            title=f"Page {index + 1}",
+            content=text,
+            metadata={"source": "pdf", "page_number": index + 1},
+        )
 
     def _extract_docx(self, path: Path) -> list[ExtractedSection]:
         from docx import Document as DocxDocument
@@ -561,33 +661,6 @@ class DocumentExtractor:
             )
         ]
 
-    def _extract_pdf_page_with_ocr(self, path: Path, page_index: int) -> str:
-        try:
-            import fitz  # type: ignore
-        except ImportError:  # pragma: no cover - optional dependency
-            logger.warning(
-                "PyMuPDF (fitz) not installed; skipping OCR fallback for %s page %s",
-                path.name,
-                page_index + 1,
-            )
-            return ""
-
-        try:
-            import pytesseract
-        except ImportError:  # pragma: no cover - optional dependency
-            logger.warning("pytesseract not installed; skipping OCR fallback.")
-            return ""
-
-        doc = fitz.open(path)  # pragma: no cover - requires optional dependency
-        page = doc.load_page(page_index)
-        pix = page.get_pixmap()
-        from PIL import Image  # pragma: no cover
-        from io import BytesIO  # pragma: no cover
-
-        image = Image.open(BytesIO(pix.tobytes()))
-        text = pytesseract.image_to_string(image, lang=self.ocr_lang)
-        return self._normalize_whitespace(text)
-
     # ------------------------------------------------------------------ #
     # Helpers
     # ------------------------------------------------------------------ #
@@ -625,3 +698,71 @@ class DocumentExtractor:
         return normalized.strip()
 
 
+class _PdfPageReader:
+    """Opens a PDF once and returns normalized page text, with optional OCR fallback."""
+
+    def __init__(self, path: Path | str, *, use_ocr: bool = False, ocr_lang: str = "eng"):
+        from PyPDF2 import PdfReader  # local import to reduce startup time
+
+        self.path = Path(path)
+        self.use_ocr = use_ocr
+        self.ocr_lang = ocr_lang
+        self._reader = PdfReader(str(self.path))
+        self._ocr_document: Any | None = None
+        self._ocr_unavailable = False
+
+    @property
+    def page_count(self) -> int:
+        return len(self._reader.pages)
+
+    def page_text(self, index: int) -> str:
+        text = DocumentExtractor._normalize_whitespace(self._reader.pages[index].extract_text() or "")
+        if not text and self.use_ocr:
+            logger.debug("PDF page %s empty, attempting OCR fallback.", index + 1)
+            text = self._ocr_page(index)
+        return text
+
+    def _ocr_page(self, index: int) -> str:
+        if self._ocr_unavailable:
+            return ""
+        try:
+            import fitz  # type: ignore
+            import pytesseract
+        except ImportError:  # pragma: no cover - optional dependency
+            logger.warning("PyMuPDF (fitz) or pytesseract not installed; skipping OCR fallback for %s", self.path.name)
+            self._ocr_unavailable = True
+            return ""
+
+        from io import BytesIO  # pragma: no cover - requires optional dependency
+        from PIL import Image  # pragma: no cover
+
+        if self._ocr_document is None:  # pragma: no cover
+            self._ocr_document = fitz.open(self.path)
+        pix = self._ocr_document.load_page(index).get_pixmap()  # pragma: no cover
+        image = Image.open(BytesIO(pix.tobytes()))  # pragma: no cover
+        return DocumentExtractor._normalize_whitespace(pytesseract.image_to_string(image, lang=self.ocr_lang))
+
+    def close(self) -> None:
+        if self._ocr_document is not None:
+            self._ocr_document.close()
+            self._ocr_document = None
+
+    def __enter__(self) -> "_PdfPageReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# Reader opened once per worker process by _init_pdf_worker
+_worker_reader: _PdfPageReader | None = None
+
+
+def _init_pdf_worker(path: str, use_ocr: bool, ocr_lang: str) -> None:
+    global _worker_reader
+    _worker_reader = _PdfPageReader(path, use_ocr=use_ocr, ocr_lang=ocr_lang)
+
+
+def _extract_pdf_pages(start: int, stop: int) -> list[str]:
+    assert _worker_reader is not None, "PDF worker was not initialized"
+    return [_worker_reader.page_text(index) for index in range(start, stop)]
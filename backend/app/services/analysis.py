@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import sqlite3
 from dataclasses import dataclass
 from typing import Any
 
@@ -10,8 +12,10 @@ from pydantic import BaseModel, Field, ValidationError, conint, field_validator
 
 from ..config.settings import AppConfig
 from ..prompts.compliance import SYSTEM_PROMPT, build_user_prompt
-from .analysis_base import AnalysisClient
+from .analysis_base import AnalysisClient, AsyncAnalysisClient
 from .context_builder import ContextBundle
+from .llm_cache import LLMResponseCache, get_llm_response_cache
+from .rate_limiter import AdaptiveRateLimiter, estimate_chat_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +110,9 @@ class LLMConfig:
     api_base_url: str
     max_retries: int = 2
     timeout: float = 60.0
+    # Connection pool bounds and protocol for the async client
+    max_connections: int = 32
+    http2: bool = True
     
     @property
     def api_url(self) -> str:
@@ -115,17 +122,8 @@ class LLMConfig:
             return f"{base}/chat/completions"
         return base
 
-
-class ComplianceLLMClient(AnalysisClient):
-    """Analysis client that calls LLM APIs (OpenRouter, Featherless, or other OpenAI-compatible) for structured JSON responses."""
-
-    def __init__(
-        self,
-        app_config: AppConfig,
-        *,
-        http_client: httpx.Client | None = None,
-        llm_config: LLMConfig | None = None,
-    ):
+    @classmethod
+    def from_app_config(cls, app_config: AppConfig) -> "LLMConfig":
         # Determine API key and base URL
         api_key = app_config.llm_api_key or app_config.openrouter_api_key
         api_base_url = app_config.llm_api_base_url
@@ -138,16 +136,56 @@ class ComplianceLLMClient(AnalysisClient):
             # Default to OpenRouter
             api_base_url = "https://openrouter.ai/api/v1"
         
-        self.config = llm_config or LLMConfig(
+        return cls(
             api_key=api_key,
             model=app_config.llm_model_compliance or app_config.openrouter_model_compliance,
             api_base_url=api_base_url,
+            max_connections=app_config.llm_max_connections,
         )
+
+
+class _ComplianceLLMBase:
+    """Request construction and response validation shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        app_config: AppConfig,
+        *,
+        llm_config: LLMConfig | None,
+        rate_limiter: AdaptiveRateLimiter | None,
+        response_cache: LLMResponseCache | None,
+    ):
+        self.config = llm_config or LLMConfig.from_app_config(app_config)
         if not self.config.api_key:
-            raise ValueError("LLM API key is required for ComplianceLLMClient.")
-        self._client = http_client or httpx.Client(timeout=self.config.timeout)
+            raise ValueError(f"LLM API key is required for {type(self).__name__}.")
+        self._rate_limiter = rate_limiter or get_rate_limiter(app_config)
+        self._completion_tokens = app_config.rate_limit_completion_tokens
+        self._response_cache = response_cache or get_llm_response_cache(app_config)
 
-    def analyze(self, chunk, context: ContextBundle) -> dict[str, Any]:
+    def _cached_analysis(self, payload: dict[str, Any]) -> tuple[str | None, dict[str, Any] | None]:
+        """Return the cache key for ``payload`` and any analysis already stored under it."""
+        if self._response_cache is None:
+            return None, None
+        key = self._response_cache.make_key(payload)
+        try:
+            cached = self._response_cache.get(key)
+        except sqlite3.Error as exc:
+            logger.warning("LLM response cache lookup failed: %s", exc)
+            return key, None
+        if cached is not None:
+            logger.debug("LLM response cache hit %s", key[:12])
+        return key, cached
+
+    def _remember(self, key: str | None, analysis: dict[str, Any]) -> None:
+        if key is None or self._response_cache is None:
+            return
+        try:
+            self._response_cache.put(key, analysis)
+        except sqlite3.Error as exc:
+            logger.warning("LLM response cache store failed: %s", exc)
+
+    def _build_request(self, context: ContextBundle) -> tuple[dict[str, Any], dict[str, str], int]:
+        """Return the JSON payload, headers and estimated prompt tokens for one analysis."""
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": build_user_prompt(context)},
@@ -162,96 +200,58 @@ class ComplianceLLMClient(AnalysisClient):
             "Authorization": f"Bearer {self.config.api_key}",
             "Content-Type": "application/json",
         }
+        request_tokens = estimate_chat_tokens(payload, self._completion_tokens)
+        return payload, headers, request_tokens
 
-        import time
-        last_error: Exception | None = None
-        for attempt in range(1, self.config.max_retries + 1):
+    def _parse_response(self, response: httpx.Response, attempt: int) -> dict[str, Any]:
+        """Validate one chat completion response, raising on HTTP or schema errors."""
+        if response.status_code == 429:
+            logger.warning(
+                "Rate limit hit (429) on attempt %s/%s",
+                attempt,
+                self.config.max_retries,
+            )
+            response.raise_for_status()
+        
+        # Check for 404 errors which often indicate model not found
+        if response.status_code == 404:
+            error_body = response.text
             try:
-                api_url = self.config.api_url
-                logger.debug(f"Calling LLM API: {api_url} with model: {self.config.model}")
-                response = self._client.post(api_url, headers=headers, json=payload)
-                
-                # Handle rate limits (429) with exponential backoff
-                if response.status_code == 429:
-                    # Try to get Retry-After header, otherwise use exponential backoff
-                    retry_after_header = response.headers.get("Retry-After")
-                    if retry_after_header:
-                        try:
-                            retry_after = int(retry_after_header)
-                        except ValueError:
-                            retry_after = None
-                    else:
-                        retry_after = None
-                    
-                    # Calculate wait time: use Retry-After if available, otherwise exponential backoff
-                    if retry_after:
-                        wait_time = min(retry_after, 120)  # Respect Retry-After, max 120s
-                    else:
-                        # Exponential backoff: 10s, 20s, 40s, etc., capped at 120s
-                        backoff_base = 10.0
-                        wait_time = min(backoff_base * (2 ** (attempt - 1)), 120)
-                    
-                    logger.warning(
-                        "Rate limit hit (429), waiting %s seconds before retry %s/%s",
-                        wait_time,
-                        attempt,
-                        self.config.max_retries,
-                    )
-                    if attempt < self.config.max_retries:
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        response.raise_for_status()
-                
-                # Check for 404 errors which often indicate model not found
-                if response.status_code == 404:
-                    error_body = response.text
-                    try:
-                        error_json = response.json()
-                        error_message = error_json.get("error", {}).get("message", error_body)
-                    except Exception:
-                        error_message = error_body
-                    logger.error(
-                        f"404 Not Found from OpenRouter API. This usually means the model '{self.config.model}' "
-                        f"does not exist or is not available. Error: {error_message}. "
-                        f"Please check: 1) Model name is correct, 2) Model is available on OpenRouter, "
-                        f"3) Your API key has access to this model."
-                    )
-                    response.raise_for_status()
-                
-                response.raise_for_status()
-                content = self._extract_content(response.json())
-                # Log the raw content for debugging
-                logger.debug(f"LLM raw response (first 500 chars): {content[:500]}")
-                try:
-                    analysis = ChunkAnalysis.model_validate_json(content)
-                    return analysis.normalize()
-                except ValidationError as ve:
-                    # Log the full content when validation fails - this is critical for debugging
-                    logger.error(
-                        "Validation failed. LLM returned invalid JSON structure.\n"
-                        f"Full response: {content}\n"
-                        f"Validation error: {ve}"
-                    )
-                    raise
-            except (httpx.HTTPError, ValidationError, ValueError) as exc:
-                last_error = exc
-                # For rate limits, add exponential backoff before retry
-                if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
-                    if attempt < self.config.max_retries:
-                        # Exponential backoff: 10s, 20s, 40s, etc., capped at 120s
-                        backoff_base = 10.0
-                        wait_time = min(backoff_base * (2 ** (attempt - 1)), 120)
-                        logger.warning("Rate limit error, waiting %s seconds before retry %s/%s", 
-                                     wait_time, attempt + 1, self.config.max_retries)
-                        time.sleep(wait_time)
-                logger.warning(
-                    "Compliance LLM attempt %s/%s failed: %s",
-                    attempt,
-                    self.config.max_retries,
-                    exc,
-                )
-        raise OpenRouterError(f"Unable to obtain valid analysis: {last_error}") from last_error
+                error_json = response.json()
+                error_message = error_json.get("error", {}).get("message", error_body)
+            except Exception:
+                error_message = error_body
+            logger.error(
+                f"404 Not Found from OpenRouter API. This usually means the model '{self.config.model}' "
+                f"does not exist or is not available. Error: {error_message}. "
+                f"Please check: 1) Model name is correct, 2) Model is available on OpenRouter, "
+                f"3) Your API key has access to this model."
+            )
+            response.raise_for_status()
+        
+        response.raise_for_status()
+        content = self._extract_content(response.json())
+        # Log the raw content for debugging
+        logger.debug(f"LLM raw response (first 500 chars): {content[:500]}")
+        try:
+            analysis = ChunkAnalysis.model_validate_json(content)
+            return analysis.normalize()
+        except ValidationError as ve:
+            # Log the full content when validation fails - this is critical for debugging
+            logger.error(
+                "Validation failed. LLM returned invalid JSON structure.\n"
+                f"Full response: {content}\n"
+                f"Validation error: {ve}"
+            )
+            raise
+
+    def _log_failed_attempt(self, attempt: int, exc: Exception) -> None:
+        logger.warning(
+            "Compliance LLM attempt %s/%s failed: %s",
+            attempt,
+            self.config.max_retries,
+            exc,
+        )
 
     @staticmethod
     def _extract_content(payload: dict[str, Any]) -> str:
@@ -277,6 +277,155 @@ class ComplianceLLMClient(AnalysisClient):
         
         return content
 
+
+class ComplianceLLMClient(_ComplianceLLMBase, AnalysisClient):
+    """Analysis client that calls LLM APIs (OpenRouter, Featherless, or other OpenAI-compatible) for structured JSON responses."""
+
+    def __init__(
+        self,
+        app_config: AppConfig,
+        *,
+        http_client: httpx.Client | None = None,
+        llm_config: LLMConfig | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        response_cache: LLMResponseCache | None = None,
+    ):
+        super().__init__(
+            app_config,
+            llm_config=llm_config,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
+        self._client = http_client or httpx.Client(timeout=self.config.timeout)
+
+    def analyze(self, chunk, context: ContextBundle) -> dict[str, Any]:
+        payload, headers, request_tokens = self._build_request(context)
+        cache_key, cached = self._cached_analysis(payload)
+        if cached is not None:
+            return cached
+        last_error: Exception | None = None
+        for attempt in range(1, self.config.max_retries + 1):
+            try:
+                api_url = self.config.api_url
+                logger.debug(f"Calling LLM API: {api_url} with model: {self.config.model}")
+                # The shared limiter paces requests and honours Retry-After from earlier 429s
+                self._rate_limiter.acquire(tokens=request_tokens)
+                response = self._client.post(api_url, headers=headers, json=payload)
+                self._rate_limiter.observe_response(response)
+                analysis = self._parse_response(response, attempt)
+                self._remember(cache_key, analysis)
+                return analysis
+            except (httpx.HTTPError, ValidationError, ValueError) as exc:
+                last_error = exc
+                self._log_failed_attempt(attempt, exc)
+        raise OpenRouterError(f"Unable to obtain valid analysis: {last_error}") from last_error
+
     def close(self) -> None:
         self._client.close()
 
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncComplianceLLMClient(_ComplianceLLMBase, AsyncAnalysisClient):
+    """Asyncio counterpart of :class:`ComplianceLLMClient` built on ``httpx.AsyncClient``.
+
+    A single client multiplexes many in-flight analyses over a bounded pool of
+    keep-alive connections, negotiating HTTP/2 when the ``h2`` package is installed.
+    The underlying ``AsyncClient`` is bound to the event loop it was created on, so
+    a fresh one is opened transparently if the client is reused from another loop.
+    Callers that reuse the client across ``asyncio.run`` calls should await
+    :meth:`close_loop_client` before each loop ends; a pool left open on a finished
+    loop can no longer be closed cleanly.
+    """
+
+    def __init__(
+        self,
+        app_config: AppConfig,
+        *,
+        http_client: httpx.AsyncClient | None = None,
+        llm_config: LLMConfig | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        response_cache: LLMResponseCache | None = None,
+    ):
+        super().__init__(
+            app_config,
+            llm_config=llm_config,
+            rate_limiter=rate_limiter,
+            response_cache=response_cache,
+        )
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if not self._owns_client:
+            return self._client  # type: ignore[return-value]
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._client is not None:
+                self._discard_client(self._client, self._client_loop)
+            use_http2 = self.config.http2 and _http2_available()
+            if self.config.http2 and not use_http2:
+                logger.debug("h2 package not installed; async LLM client falling back to HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                http2=use_http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_connections,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def analyze(self, chunk, context: ContextBundle) -> dict[str, Any]:
+        payload, headers, request_tokens = self._build_request(context)
+        cache_key, cached = self._cached_analysis(payload)
+        if cached is not None:
+            return cached
+        client = self._get_client()
+        last_error: Exception | None = None
+        for attempt in range(1, self.config.max_retries + 1):
+            try:
+                await self._rate_limiter.acquire_async(tokens=request_tokens)
+                response = await client.post(self.config.api_url, headers=headers, json=payload)
+                self._rate_limiter.observe_response(response)
+                analysis = self._parse_response(response, attempt)
+                self._remember(cache_key, analysis)
+                return analysis
+            except (httpx.HTTPError, ValidationError, ValueError) as exc:
+                last_error = exc
+                self._log_failed_attempt(attempt, exc)
+        raise OpenRouterError(f"Unable to obtain valid analysis: {last_error}") from last_error
+
+    @staticmethod
+    def _discard_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+        """Close a client opened on another event loop, on that loop while it still runs."""
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            logger.warning(
+                "Async LLM client pool outlived its event loop; await close_loop_client() before the loop ends"
+            )
+
+    async def close_loop_client(self) -> None:
+        """Close the connection pool this client opened on the running loop.
+
+        Unlike :meth:`aclose`, an ``http_client`` passed in by the caller is left open.
+        """
+        if self._owns_client and self._client is not None and self._client_loop is asyncio.get_running_loop():
+            client, self._client, self._client_loop = self._client, None, None
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            if self._owns_client:
+                self._client = None
+                self._client_loop = None
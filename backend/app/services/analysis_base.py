@@ -9,3 +9,10 @@ class AnalysisClient(Protocol):
     def analyze(self, chunk, context) -> dict[str, Any]:  # pragma: no cover - typing aid
         ...
 
+
+
+class AsyncAnalysisClient(Protocol):
+    """Asyncio variant of :class:`AnalysisClient` whose ``analyze`` is a coroutine."""
+
+    async def analyze(self, chunk, context) -> dict[str, Any]:  # pragma: no cover - typing aid
+        ...
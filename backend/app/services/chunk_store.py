@@ -0,0 +1,199 @@
+"""Bulk persistence for chunk rows.
+
+Chunks are written with multi-row ``INSERT ... RETURNING`` statements instead of the ORM
+unit of work, and a document's chunks are removed with a single ``DELETE``. :class:`ChunkDiff`
+matches a re-chunked document against its stored chunks so unchanged ones can be kept.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..db.models import Chunk, Document, SectionIndexEntry
+from .chunking import ChunkPayload
+from .vector_metadata import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkWriteReport:
+    """Rows written by the bulk helpers and the time spent in the database."""
+
+    inserted: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.inserted + self.deleted) / self.seconds if self.seconds > 0 else 0.0
+
+
+def chunk_values(
+    document_id: int,
+    payload: ChunkPayload,
+    chunk_index: int,
+    *,
+    embedding_status: str = "pending",
+    with_path_metadata: bool = False,
+) -> dict[str, Any]:
+    """Column values for one chunk row.
+
+    With ``with_path_metadata`` the chunk id, section path and parent heading are also
+    copied into ``chunk_metadata``, as the chunk CLI and legislation uploads store them.
+    """
+    metadata = payload.metadata
+    if with_path_metadata:
+        metadata = {
+            **payload.metadata,
+            "chunk_id": payload.chunk_id,
+            "section_path": payload.section_path,
+            "parent_heading": payload.parent_heading,
+        }
+    return {
+        "document_id": document_id,
+        "chunk_id": payload.chunk_id,
+        "chunk_index": chunk_index,
+        "section_path": " > ".join(payload.section_path).strip() or None,
+        "parent_heading": payload.parent_heading,
+        "content": payload.text,
+        "token_count": payload.token_count,
+        "chunk_metadata": metadata,
+        "embedding_status": embedding_status,
+    }
+
+
+def insert_chunks(
+    session: Session, values: Sequence[dict[str, Any]], *, report: ChunkWriteReport | None = None
+) -> list[Chunk]:
+    """Insert chunk rows in bulk and return them as persistent ``Chunk`` objects; the caller commits."""
+    if not values:
+        return []
+    started = time.perf_counter()
+    chunks = list(session.scalars(insert(Chunk).returning(Chunk, sort_by_parameter_order=True), list(values)))
+    elapsed = time.perf_counter() - started
+    if report is not None:
+        report.inserted += len(chunks)
+        report.seconds += elapsed
+    logger.debug("Inserted %s chunks in %.3fs", len(chunks), elapsed)
+    return chunks
+
+
+def delete_document_chunks(
+    session: Session, document: Document, *, report: ChunkWriteReport | None = None
+) -> int:
+    """Delete all of a document's chunks and section index entries; the caller commits."""
+    started = time.perf_counter()
+    session.execute(delete(SectionIndexEntry).where(SectionIndexEntry.document_id == document.id))
+    deleted = session.execute(
+        delete(Chunk).where(Chunk.document_id == document.id).execution_options(synchronize_session=False)
+    ).rowcount
+    # A loaded ``document.chunks`` collection would still list the deleted rows
+    session.expire(document, ["chunks"])
+    if report is not None:
+        report.deleted += deleted
+        report.seconds += time.perf_counter() - started
+    return deleted
+
+
+def delete_chunks(
+    session: Session, chunk_pks: Sequence[int], *, report: ChunkWriteReport | None = None, batch_size: int = 500
+) -> int:
+    """Delete chunks by primary key, ``batch_size`` ids per statement; the caller commits."""
+    started = time.perf_counter()
+    deleted = 0
+    for start in range(0, len(chunk_pks), batch_size):
+        ids = list(chunk_pks[start:start + batch_size])
+        stale_keys = select(Chunk.chunk_id).where(Chunk.id.in_(ids))
+        session.execute(delete(SectionIndexEntry).where(SectionIndexEntry.chunk_id.in_(stale_keys)))
+        deleted += session.execute(
+            delete(Chunk).where(Chunk.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+    if report is not None:
+        report.deleted += deleted
+        report.seconds += time.perf_counter() - started
+    return deleted
+
+
+@dataclass
+class StoredChunk:
+    id: int
+    chunk_id: str
+
+
+class ChunkDiff:
+    """Matches freshly chunked payloads against a document's stored chunks by content hash.
+
+    A payload whose text equals a stored chunk's keeps that chunk's ``chunk_id`` (and so its
+    vector). New text gets the id the chunker assigned, or a hash-suffixed one while a stored
+    chunk still holds that id. Stored chunks left unmatched are the ones to delete.
+    """
+
+    def __init__(self, stored: Iterable[tuple[int, str, str]] = ()):
+        self._by_hash: dict[str, deque[StoredChunk]] = defaultdict(deque)
+        self._stored_ids: set[str] = set()
+        self._assigned: set[str] = set()
+        self._unmatched: dict[int, StoredChunk] = {}
+        for pk, chunk_id, content in stored:
+            chunk = StoredChunk(pk, chunk_id)
+            self._by_hash[content_hash(content)].append(chunk)
+            self._stored_ids.add(chunk_id)
+            self._unmatched[pk] = chunk
+
+    @classmethod
+    def load(cls, session: Session, document: Document) -> "ChunkDiff":
+        stmt = (
+            select(Chunk.id, Chunk.chunk_id, Chunk.content)
+            .where(Chunk.document_id == document.id)
+            .order_by(Chunk.chunk_index)
+        )
+        return cls(session.execute(stmt))
+
+    def resolve(self, payloads: Iterable[ChunkPayload]) -> Iterator[tuple[ChunkPayload, StoredChunk | None]]:
+        """Yield each payload with its stored match, after renaming it to its final ``chunk_id``.
+
+        ``prev_chunk_id``/``next_chunk_id`` links are rewritten to the final ids, so each
+        payload is held back until the next one is resolved.
+        """
+        previous: tuple[ChunkPayload, StoredChunk | None] | None = None
+        for payload in payloads:
+            match = self._claim(payload)
+            payload.chunk_id = match.chunk_id if match is not None else self._new_id(payload)
+            if previous is not None:
+                previous[0].metadata["next_chunk_id"] = payload.chunk_id
+                payload.metadata["prev_chunk_id"] = previous[0].chunk_id
+                yield previous
+            previous = (payload, match)
+        if previous is not None:
+            yield previous
+
+    def unmatched(self) -> list[StoredChunk]:
+        """Stored chunks that no payload matched; call once every payload is resolved."""
+        return list(self._unmatched.values())
+
+    def _claim(self, payload: ChunkPayload) -> StoredChunk | None:
+        candidates = self._by_hash.get(content_hash(payload.text))
+        if not candidates:
+            return None
+        match = candidates.popleft()
+        del self._unmatched[match.id]
+        self._assigned.add(match.chunk_id)
+        return match
+
+    def _new_id(self, payload: ChunkPayload) -> str:
+        chunk_id = payload.chunk_id
+        if chunk_id in self._stored_ids or chunk_id in self._assigned:
+            base = f"{payload.chunk_id}_{content_hash(payload.text)[:8]}"
+            chunk_id, suffix = base, 1
+            while chunk_id in self._stored_ids or chunk_id in self._assigned:
+                suffix += 1
+                chunk_id = f"{base}_{suffix}"
+        self._assigned.add(chunk_id)
+        return chunk_id
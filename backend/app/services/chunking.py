@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import math
 from dataclasses import dataclass, field
-from typing import Any, Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
 from ..config.settings import ChunkingConfig
 
@@ -57,8 +57,22 @@ class SemanticChunker:
                           If False, uses fixed-size token-based chunking with overlap.
         """
 
-        payloads: list[ChunkPayload] = []
-        previous_chunk_id: str | None = None
+        return list(self.iter_chunks(doc_id, sections, section_aware=section_aware))
+
+    def iter_chunks(
+        self,
+        doc_id: str,
+        sections: Iterable[SectionText],
+        *,
+        section_aware: bool = False,
+    ) -> Iterator[ChunkPayload]:
+        """Yield the payloads of :meth:`chunk_sections` as sections arrive.
+
+        Each payload is held back until the following chunk exists, so its
+        ``next_chunk_id`` link is set before the caller sees it.
+        """
+
+        previous: ChunkPayload | None = None
 
         for section in sections:
             normalized_content = self._prepare_section_content(section.content)
@@ -96,10 +110,10 @@ class SemanticChunker:
                         "chunking_mode": "section_aware",
                     }
 
-                    if previous_chunk_id:
-                        metadata["prev_chunk_id"] = previous_chunk_id
-                        if payloads:
-                            payloads[-1].metadata["next_chunk_id"] = chunk_id
+                    if previous is not None:
+                        metadata["prev_chunk_id"] = previous.chunk_id
+                        previous.metadata["next_chunk_id"] = chunk_id
+                        yield previous
 
                     payload = ChunkPayload(
                         chunk_id=chunk_id,
@@ -110,8 +124,7 @@ class SemanticChunker:
                         parent_heading=section.title,
                         metadata=metadata,
                     )
-                    payloads.append(payload)
-                    previous_chunk_id = chunk_id
+                    previous = payload
             else:
                 # Original token-based chunking with overlap
                 section_text = self._truncate_section(normalized_content)
@@ -137,9 +150,10 @@ class SemanticChunker:
                         "chunking_mode": "token_based",
                     }
 
-                    if previous_chunk_id:
-                        metadata["prev_chunk_id"] = previous_chunk_id
-                        payloads[-1].metadata["next_chunk_id"] = chunk_id
+                    if previous is not None:
+                        metadata["prev_chunk_id"] = previous.chunk_id
+                        previous.metadata["next_chunk_id"] = chunk_id
+                        yield previous
 
                     payload = ChunkPayload(
                         chunk_id=chunk_id,
@@ -150,14 +164,13 @@ class SemanticChunker:
                         parent_heading=section.title,
                         metadata=metadata,
                     )
-                    payloads.append(payload)
-
-                    previous_chunk_id = chunk_id
+                    previous = payload
                     token_cursor = max(
                         0, token_cursor + max(token_length - self.config.overlap, 0)
                     )
 
-        return payloads
+        if previous is not None:
+            yield previous
 
     # ------------------------------------------------------------------ #
     # Helpers
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Iterable, Sequence
@@ -11,16 +16,24 @@ from sqlalchemy.orm import Session
 from ..config.settings import AppConfig
 from ..db.models import Audit, AuditChunkResult, Chunk
 from ..logging_config import get_logger, set_audit_id, set_chunk_id
-from .analysis import ComplianceLLMClient
-from .analysis_base import AnalysisClient
+from .analysis import AsyncComplianceLLMClient, ComplianceLLMClient
+from .analysis_base import AnalysisClient, AsyncAnalysisClient
+from .compliance_score import rebuild_flag_summary
 from .context_builder import ContextBuilder, ContextBundle, ContextSlice
+from .delta_audit import DeltaAudit, context_fingerprint
 from .recursive_context_builder import RecursiveContextBuilder
 from .flagging import FlagSynthesizer
 from .metrics import get_metrics
+from .progress_bus import publish_audit_status
 from .score_tracker import ScoreTracker
+from .vector_metadata import content_hash
 
 logger = get_logger(__name__)
 
+# Context building hits SQLite and the vector store, so the async path caps its
+# thread pool below the number of in-flight LLM calls.
+MAX_ASYNC_CONTEXT_WORKERS = 8
+
 
 class EchoAnalysisClient(AnalysisClient):
     """Fallback analysis client that emits placeholder findings."""
@@ -50,7 +63,14 @@ class RunnerResult:
 
 
 class ComplianceRunner:
-    """Sequential runner responsible for executing queued audits chunk-by-chunk."""
+    """Runner responsible for executing queued audits chunk-by-chunk.
+
+    With ``concurrency`` (or ``RUNNER_CONCURRENCY``) above 1, context building and
+    LLM calls run on a worker pool while all database writes stay on the calling
+    thread and are committed in chunk order, so results match the sequential path.
+    With an async analysis client (or ``RUNNER_ASYNC=1``) up to ``concurrency``
+    analyses are kept in flight on a single event loop instead.
+    """
 
     def __init__(
         self,
@@ -58,12 +78,20 @@ class ComplianceRunner:
         config: AppConfig,
         *,
         context_builder: ContextBuilder | None = None,
-        analysis_client: AnalysisClient | None = None,
+        analysis_client: AnalysisClient | AsyncAnalysisClient | None = None,
         flag_synthesizer: FlagSynthesizer | None = None,
         use_recursive_rag: bool = True,
+        concurrency: int | None = None,
     ):
         self.session = session
         self.config = config
+        self.concurrency = max(1, concurrency if concurrency is not None else config.runner_concurrency)
+        # Injected builders are shared by workers unless bound to this session; see _worker_context_builder
+        self._shared_base_builder = context_builder
+        self._use_recursive_rag = use_recursive_rag
+        self._worker_state = threading.local()
+        self._worker_sessions: list[Session] = []
+        self._worker_lock = threading.Lock()
         base_builder = context_builder or ContextBuilder(session, config)
         # Use recursive RAG by default for comprehensive context
         if use_recursive_rag:
@@ -72,16 +100,22 @@ class ComplianceRunner:
             self.context_builder = base_builder
         self.flag_synthesizer = flag_synthesizer or FlagSynthesizer(session)
         self.score_tracker = ScoreTracker(session)
+        self._owns_analysis_client = False
         if analysis_client is not None:
             self.analysis_client = analysis_client
         elif config.llm_api_key or config.openrouter_api_key:
             try:
-                self.analysis_client = ComplianceLLMClient(config)
+                if config.runner_async:
+                    self.analysis_client = AsyncComplianceLLMClient(config)
+                    self._owns_analysis_client = True
+                else:
+                    self.analysis_client = ComplianceLLMClient(config)
             except ValueError as exc:
                 logger.warning("ComplianceLLMClient unavailable; falling back to echo client", error=str(exc))
                 self.analysis_client = EchoAnalysisClient()
         else:
             self.analysis_client = EchoAnalysisClient()
+        self._async_analysis = inspect.iscoroutinefunction(self.analysis_client.analyze)
 
     def run(
         self,
@@ -110,124 +144,141 @@ class ComplianceRunner:
         
         # Ensure chunk_total is set and committed so frontend can see progress
         self._ensure_chunk_counts(audit)
+        # record_flag adds to the materialized summary; start from the flags that exist now,
+        # since a re-queued audit may have had its flags deleted behind the summary's back
+        rebuild_flag_summary(self.session, audit.id)
         self.session.commit()  # Commit so frontend can see chunk_total immediately
+        self._publish_progress(audit)
 
+        evidence_enabled = include_evidence if include_evidence is not None else (not audit.is_draft)
         processed = 0
         metrics = get_metrics()
-        # For draft mode, limit to first 5 chunks for faster processing
-        effective_limit = max_chunks
-        if audit.is_draft and effective_limit is None:
-            effective_limit = 5
-        
-        # Get pending chunks and log for debugging
-        pending_chunks = list(self._pending_chunks(audit, limit=effective_limit))
-        pending_count = self._pending_chunk_count(audit)
+
+        import time
+        from ..services.analysis import OpenRouterError
+
+        try:
+            # Inside the try so a failed carry-forward marks the audit failed like any other step
+            if audit.baseline_audit_id is not None:
+                self._carry_forward(audit, include_evidence=evidence_enabled)
+
+            # For draft mode, limit to first 5 chunks for faster processing
+            effective_limit = max_chunks
+            if audit.is_draft and effective_limit is None:
+                effective_limit = 5
         
-        logger.info(
-            "Retrieved pending chunks",
-            audit_id=audit.external_id,
-            chunks_found=len(pending_chunks),
-            total_pending=pending_count,
-            limit=effective_limit,
-            chunk_total=audit.chunk_total,
-            chunk_completed=audit.chunk_completed,
-        )
+            # Get pending chunks and log for debugging
+            pending_chunks = list(self._pending_chunks(audit, limit=effective_limit))
+            pending_count = self._pending_chunk_count(audit)
         
-        if not pending_chunks:
-            logger.warning(
-                "No pending chunks found to process",
+            logger.info(
+                "Retrieved pending chunks",
                 audit_id=audit.external_id,
+                chunks_found=len(pending_chunks),
                 total_pending=pending_count,
+                limit=effective_limit,
                 chunk_total=audit.chunk_total,
                 chunk_completed=audit.chunk_completed,
             )
-            # If no chunks but we have a total, something might be wrong
-            if audit.chunk_total > 0 and audit.chunk_completed == 0:
-                logger.error(
-                    "Audit has chunks but none are pending - possible query issue",
-                    audit_id=audit.external_id,
-                    document_id=audit.document_id,
-                )
-
-        import time
-        from ..services.analysis import OpenRouterError
         
-        try:
-            for chunk_idx, chunk in enumerate(pending_chunks, 1):
-                logger.info(
-                    "Processing chunk",
+            if not pending_chunks:
+                logger.warning(
+                    "No pending chunks found to process",
                     audit_id=audit.external_id,
-                    chunk_id=chunk.chunk_id,
-                    chunk_index=chunk.chunk_index,
-                    progress=f"{chunk_idx}/{len(pending_chunks)}",
+                    total_pending=pending_count,
+                    chunk_total=audit.chunk_total,
+                    chunk_completed=audit.chunk_completed,
                 )
-                set_chunk_id(chunk.chunk_id)
-                try:
-                    self._process_chunk(
+                # If no chunks but we have a total, something might be wrong
+                if audit.chunk_total > 0 and audit.chunk_completed == 0:
+                    logger.error(
+                        "Audit has chunks but none are pending - possible query issue",
+                        audit_id=audit.external_id,
+                        document_id=audit.document_id,
+                    )
+
+            if self._async_analysis or (self.concurrency > 1 and len(pending_chunks) > 1):
+                if self._async_analysis:
+                    logger.info(
+                        "Processing chunks with async analysis client",
+                        audit_id=audit.external_id,
+                        concurrency=self.concurrency,
+                    )
+                    processed, worker_error = asyncio.run(
+                        self._run_async(audit, pending_chunks, include_evidence=evidence_enabled)
+                    )
+                else:
+                    logger.info(
+                        "Processing chunks on worker pool",
+                        audit_id=audit.external_id,
+                        concurrency=self.concurrency,
+                    )
+                    processed, worker_error = self._run_concurrent(
                         audit,
-                        chunk,
-                        include_evidence=include_evidence
-                        if include_evidence is not None
-                        else (not audit.is_draft),
+                        pending_chunks,
+                        include_evidence=evidence_enabled,
                     )
-                    processed += 1
-                    # Record metrics (estimate token usage from context)
-                    metrics.record_chunk_processed(tokens_used=0)  # TODO: track actual token usage
-                    
-                    # Commit progress after each chunk so frontend can see updates
-                    self.session.commit()
-                    logger.debug(
-                        "Chunk processed and committed",
+                if worker_error is not None:
+                    if isinstance(worker_error, OpenRouterError) and self._is_rate_limit_error(worker_error):
+                        return self._fail_on_rate_limit(
+                            audit, pending_chunks[processed], processed, worker_error
+                        )
+                    raise worker_error
+            else:
+                for chunk_idx, chunk in enumerate(pending_chunks, 1):
+                    logger.info(
+                        "Processing chunk",
                         audit_id=audit.external_id,
                         chunk_id=chunk.chunk_id,
-                        processed_count=processed,
+                        chunk_index=chunk.chunk_index,
+                        progress=f"{chunk_idx}/{len(pending_chunks)}",
                     )
+                    set_chunk_id(chunk.chunk_id)
+                    try:
+                        self._process_chunk(
+                            audit,
+                            chunk,
+                            include_evidence=evidence_enabled,
+                        )
+                        processed += 1
+                        # Record metrics (estimate token usage from context)
+                        metrics.record_chunk_processed(tokens_used=0)  # TODO: track actual token usage
                     
-                except OpenRouterError as rate_limit_error:
-                    # Handle rate limit errors gracefully
-                    error_msg = str(rate_limit_error)
-                    if "429" in error_msg or "rate limit" in error_msg.lower() or "Too Many Requests" in error_msg:
-                        logger.error(
-                            "Rate limit exceeded during audit processing",
+                        # Commit progress after each chunk so frontend can see updates
+                        self.session.commit()
+                        self._publish_progress(audit)
+                        logger.debug(
+                            "Chunk processed and committed",
                             audit_id=audit.external_id,
                             chunk_id=chunk.chunk_id,
-                            error=error_msg,
-                        )
-                        # Mark audit as failed with a user-friendly message
-                        audit.status = "failed"
-                        from datetime import timezone
-                        audit.failed_at = datetime.now(timezone.utc)
-                        audit.failure_reason = (
-                            f"Rate limit exceeded while processing chunk {processed + 1} of {audit.chunk_total}. "
-                            f"Please wait a few minutes and retry the audit. "
-                            f"Progress: {audit.chunk_completed}/{audit.chunk_total} chunks completed."
+                            processed_count=processed,
                         )
-                        self.session.commit()
-                        return RunnerResult(
-                            processed=processed,
-                            remaining=self._pending_chunk_count(audit),
-                            status="failed",
+                    
+                    except OpenRouterError as rate_limit_error:
+                        # Handle rate limit errors gracefully
+                        if self._is_rate_limit_error(rate_limit_error):
+                            return self._fail_on_rate_limit(audit, chunk, processed, rate_limit_error)
+                        else:
+                            # Re-raise non-rate-limit errors
+                            raise
+                    except Exception as chunk_exc:
+                        # Log any other exceptions during chunk processing
+                        logger.exception(
+                            "Error processing chunk",
+                            audit_id=audit.external_id,
+                            chunk_id=chunk.chunk_id,
+                            error=str(chunk_exc),
+                            error_type=type(chunk_exc).__name__,
                         )
-                    else:
-                        # Re-raise non-rate-limit errors
+                        # Re-raise to be caught by outer exception handler
                         raise
-                except Exception as chunk_exc:
-                    # Log any other exceptions during chunk processing
-                    logger.exception(
-                        "Error processing chunk",
-                        audit_id=audit.external_id,
-                        chunk_id=chunk.chunk_id,
-                        error=str(chunk_exc),
-                        error_type=type(chunk_exc).__name__,
-                    )
-                    # Re-raise to be caught by outer exception handler
-                    raise
                 
-                # Add configurable delay between chunks to avoid rate limits
-                if processed < len(pending_chunks):  # Don't delay after last chunk
+                    # Outbound calls are paced by the shared rate limiter; the fixed
+                    # delay is only applied when explicitly configured.
                     delay = self.config.chunk_processing_delay
-                    logger.debug(f"Waiting {delay}s before next chunk to avoid rate limits")
-                    time.sleep(delay)
+                    if delay > 0 and processed < len(pending_chunks):
+                        logger.debug(f"Waiting {delay}s before next chunk")
+                        time.sleep(delay)
 
             remaining = self._pending_chunk_count(audit)
             if remaining == 0:
@@ -250,6 +301,7 @@ class ComplianceRunner:
                     chunks_processed=processed,
                 )
             self.session.commit()
+            self._publish_progress(audit)
             return RunnerResult(processed=processed, remaining=remaining, status=audit.status)
         except Exception as exc:  # pragma: no cover - catastrophic failure
             logger.exception("Audit failed", audit_id=audit.external_id, error=str(exc))
@@ -262,6 +314,7 @@ class ComplianceRunner:
                 failure_reason = failure_reason[:497] + "..."
             audit.failure_reason = failure_reason
             self.session.commit()
+            self._publish_progress(audit)
             # Don't raise - return failed result instead so caller can handle gracefully
             return RunnerResult(
                 processed=processed,
@@ -273,27 +326,338 @@ class ComplianceRunner:
             set_audit_id(None)
             set_chunk_id(None)
 
+    # ------------------------------------------------------------------ #
+    # Worker pool
+    # ------------------------------------------------------------------ #
+    def _run_concurrent(
+        self,
+        audit: Audit,
+        pending_chunks: Sequence[Chunk],
+        *,
+        include_evidence: bool,
+    ) -> tuple[int, Exception | None]:
+        """Analyze chunks on a worker pool and commit results in chunk order.
+
+        Workers only build context and call the LLM. The calling thread is the single
+        writer: it persists each result once every earlier chunk has been written, so
+        a failure leaves a contiguous prefix of results and resume picks up from there.
+        Returns the number of committed chunks and the first worker error, if any.
+        """
+        metrics = get_metrics()
+        processed = 0
+        next_position = 0
+        failed_position: int | None = None
+        first_error: Exception | None = None
+        completed: dict[int, tuple[dict[str, Any], ContextBundle]] = {}
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="compliance-worker"
+            ) as executor:
+                futures: dict[Future, int] = {
+                    executor.submit(
+                        self._analyze_in_worker,
+                        audit.external_id,
+                        chunk,
+                        include_evidence=include_evidence,
+                        is_draft=audit.is_draft,
+                    ): position
+                    for position, chunk in enumerate(pending_chunks)
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    position = futures[future]
+                    try:
+                        completed[position] = future.result()
+                    except Exception as exc:
+                        if failed_position is None or position < failed_position:
+                            failed_position, first_error = position, exc
+                        # Stop handing out new chunks; in-flight ones finish on their own
+                        for pending in futures:
+                            pending.cancel()
+                        continue
+
+                    while next_position in completed and (
+                        failed_position is None or next_position < failed_position
+                    ):
+                        analysis, bundle = completed.pop(next_position)
+                        chunk = pending_chunks[next_position]
+                        set_chunk_id(chunk.chunk_id)
+                        self._record_chunk_result(audit, chunk, analysis, bundle)
+                        self.session.commit()
+                        self._publish_progress(audit)
+                        processed += 1
+                        next_position += 1
+                        metrics.record_chunk_processed(tokens_used=0)
+                        logger.debug(
+                            "Chunk processed and committed",
+                            audit_id=audit.external_id,
+                            chunk_id=chunk.chunk_id,
+                            processed_count=processed,
+                        )
+        finally:
+            self._close_worker_sessions()
+
+        return processed, first_error
+
+    def _analyze_in_worker(
+        self,
+        audit_external_id: str,
+        chunk: Chunk,
+        *,
+        include_evidence: bool,
+        is_draft: bool,
+    ) -> tuple[dict[str, Any], ContextBundle]:
+        # Context variables do not propagate into pool threads
+        set_audit_id(audit_external_id)
+        set_chunk_id(chunk.chunk_id)
+        try:
+            return self._analyze_chunk(
+                chunk,
+                audit_external_id=audit_external_id,
+                include_evidence=include_evidence,
+                is_draft=is_draft,
+                context_builder=self._worker_context_builder(),
+            )
+        finally:
+            set_chunk_id(None)
+
+    async def _run_async(
+        self,
+        audit: Audit,
+        pending_chunks: Sequence[Chunk],
+        *,
+        include_evidence: bool,
+    ) -> tuple[int, Exception | None]:
+        """Keep up to ``concurrency`` analyses in flight on one event loop.
+
+        Context is built on a small thread pool (one session per thread) and the LLM
+        calls are awaited concurrently. Results are awaited and committed in chunk
+        order on the loop thread, with the same prefix guarantee as the worker pool.
+        """
+        metrics = get_metrics()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.concurrency, MAX_ASYNC_CONTEXT_WORKERS),
+            thread_name_prefix="compliance-context",
+        )
+
+        async def analyze(chunk: Chunk) -> tuple[dict[str, Any], ContextBundle]:
+            async with semaphore:
+                set_chunk_id(chunk.chunk_id)
+                return await self._analyze_chunk_async(
+                    chunk,
+                    audit_external_id=audit.external_id,
+                    include_evidence=include_evidence,
+                    is_draft=audit.is_draft,
+                    executor=executor,
+                )
+
+        tasks = [asyncio.create_task(analyze(chunk)) for chunk in pending_chunks]
+        processed = 0
+        try:
+            for chunk, task in zip(pending_chunks, tasks):
+                try:
+                    analysis, bundle = await task
+                except Exception as exc:
+                    return processed, exc
+                set_chunk_id(chunk.chunk_id)
+                self._record_chunk_result(audit, chunk, analysis, bundle)
+                self.session.commit()
+                self._publish_progress(audit)
+                processed += 1
+                metrics.record_chunk_processed(tokens_used=0)
+                logger.debug(
+                    "Chunk processed and committed",
+                    audit_id=audit.external_id,
+                    chunk_id=chunk.chunk_id,
+                    processed_count=processed,
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            executor.shutdown(wait=True)
+            self._close_worker_sessions()
+            if self._owns_analysis_client:
+                await self.analysis_client.aclose()
+            elif hasattr(self.analysis_client, "close_loop_client"):
+                # The pool is bound to this run's event loop, which ends with the run
+                await self.analysis_client.close_loop_client()
+        return processed, None
+
+    async def _analyze_chunk_async(
+        self,
+        chunk: Chunk,
+        *,
+        audit_external_id: str,
+        include_evidence: bool,
+        is_draft: bool,
+        executor: ThreadPoolExecutor,
+    ) -> tuple[dict[str, Any], ContextBundle]:
+        loop = asyncio.get_running_loop()
+
+        async def build(**bundle_kwargs: Any) -> ContextBundle:
+            return await loop.run_in_executor(
+                executor,
+                partial(self._build_bundle_in_worker, audit_external_id, chunk.chunk_id, **bundle_kwargs),
+            )
+
+        try:
+            bundle = await build(**self._initial_bundle_kwargs(include_evidence, is_draft))
+            fingerprint = context_fingerprint(bundle)
+            analysis = await self.analysis_client.analyze(chunk, bundle)
+            attempts = 0
+            max_attempts = self._max_refinement_attempts(self._use_recursive_rag, is_draft)
+            while analysis.get("needs_additional_context") and attempts < max_attempts:
+                attempts += 1
+                context_query = analysis.get("context_query")
+                if not context_query:
+                    logger.warning(
+                        f"Refinement attempt {attempts} requested but no context_query provided - skipping"
+                    )
+                    break
+                bundle = await build(**self._refinement_bundle_kwargs(include_evidence, context_query))
+                analysis = await self.analysis_client.analyze(chunk, bundle)
+                if self._refinement_stalled(analysis, attempts, context_query):
+                    break
+        except Exception as analysis_exc:
+            logger.exception(
+                "Error during chunk analysis",
+                chunk_id=chunk.chunk_id,
+                audit_id=audit_external_id,
+                error=str(analysis_exc),
+                error_type=type(analysis_exc).__name__,
+            )
+            raise
+
+        if attempts:
+            analysis["refined"] = True
+            analysis["refinement_attempts"] = attempts
+        analysis["context_fingerprint"] = fingerprint
+        return analysis, bundle
+
+    def _build_bundle_in_worker(self, audit_external_id: str, chunk_id: str, **bundle_kwargs: Any) -> ContextBundle:
+        set_audit_id(audit_external_id)
+        set_chunk_id(chunk_id)
+        try:
+            return self._build_bundle(self._worker_context_builder(), chunk_id, **bundle_kwargs)
+        finally:
+            set_chunk_id(None)
+
+    def _worker_context_builder(self) -> ContextBuilder | RecursiveContextBuilder:
+        """Return the calling worker's context builder, creating it on first use.
+
+        SQLAlchemy sessions and the recursive builder's traversal state are not
+        thread-safe, so every worker thread gets its own session and builder. An
+        injected builder is shared only when it holds no session or there is a single
+        worker; a session-bound one is replaced per worker by a ``ContextBuilder`` on the
+        worker's session that keeps the injected vector client.
+        """
+        builder = getattr(self._worker_state, "context_builder", None)
+        if builder is not None:
+            return builder
+
+        worker_session = Session(bind=self.session.get_bind(), autoflush=False, expire_on_commit=False)
+        with self._worker_lock:
+            self._worker_sessions.append(worker_session)
+
+        shared = self._shared_base_builder
+        if shared is not None and self.concurrency > 1 and getattr(shared, "session", None) is not None:
+            base_builder = ContextBuilder(worker_session, self.config, vector_client=getattr(shared, "vector", None))
+        else:
+            base_builder = shared or ContextBuilder(worker_session, self.config)
+        if self._use_recursive_rag:
+            builder = RecursiveContextBuilder(worker_session, self.config, base_context_builder=base_builder)
+        else:
+            builder = base_builder
+        self._worker_state.context_builder = builder
+        return builder
+
+    def _close_worker_sessions(self) -> None:
+        with self._worker_lock:
+            sessions, self._worker_sessions = self._worker_sessions, []
+        for worker_session in sessions:
+            worker_session.close()
+        # Pool threads are discarded after each run; drop the stale thread-local
+        self._worker_state = threading.local()
+
     # ------------------------------------------------------------------ #
     # Helpers
     # ------------------------------------------------------------------ #
+    @staticmethod
+    def _is_rate_limit_error(error: Exception) -> bool:
+        error_msg = str(error)
+        return "429" in error_msg or "rate limit" in error_msg.lower() or "Too Many Requests" in error_msg
+
+    def _publish_progress(self, audit: Audit) -> None:
+        """Push the audit's committed progress to streaming subscribers."""
+        publish_audit_status(self.session, audit)
+
+    def _fail_on_rate_limit(
+        self, audit: Audit, chunk: Chunk, processed: int, error: Exception
+    ) -> RunnerResult:
+        logger.error(
+            "Rate limit exceeded during audit processing",
+            audit_id=audit.external_id,
+            chunk_id=chunk.chunk_id,
+            error=str(error),
+        )
+        # Mark audit as failed with a user-friendly message
+        audit.status = "failed"
+        from datetime import timezone
+        audit.failed_at = datetime.now(timezone.utc)
+        audit.failure_reason = (
+            f"Rate limit exceeded while processing chunk {processed + 1} of {audit.chunk_total}. "
+            f"Please wait a few minutes and retry the audit. "
+            f"Progress: {audit.chunk_completed}/{audit.chunk_total} chunks completed."
+        )
+        self.session.commit()
+        self._publish_progress(audit)
+        return RunnerResult(
+            processed=processed,
+            remaining=self._pending_chunk_count(audit),
+            status="failed",
+        )
+
     def _process_chunk(self, audit: Audit, chunk: Chunk, *, include_evidence: bool) -> None:
+        analysis, bundle = self._analyze_chunk(
+            chunk,
+            audit_external_id=audit.external_id,
+            include_evidence=include_evidence,
+            is_draft=audit.is_draft,
+            context_builder=self.context_builder,
+        )
+        self._record_chunk_result(audit, chunk, analysis, bundle)
+
+    def _analyze_chunk(
+        self,
+        chunk: Chunk,
+        *,
+        audit_external_id: str,
+        include_evidence: bool,
+        is_draft: bool,
+        context_builder: ContextBuilder | RecursiveContextBuilder,
+    ) -> tuple[dict[str, Any], ContextBundle]:
         logger.info(
             "Starting chunk processing",
             chunk_id=chunk.chunk_id,
-            audit_id=audit.external_id,
-            draft=audit.is_draft,
+            audit_id=audit_external_id,
+            draft=is_draft,
             include_evidence=include_evidence,
         )
         try:
             analysis, bundle = self._analyze_with_optional_refinement(
                 chunk,
                 include_evidence=include_evidence,
-                is_draft=audit.is_draft,
+                is_draft=is_draft,
+                context_builder=context_builder,
             )
             logger.debug(
                 "Analysis completed",
                 chunk_id=chunk.chunk_id,
-                audit_id=audit.external_id,
+                audit_id=audit_external_id,
                 flag=analysis.get("flag"),
                 needs_context=analysis.get("needs_additional_context"),
             )
@@ -301,12 +665,21 @@ class ComplianceRunner:
             logger.exception(
                 "Error during chunk analysis",
                 chunk_id=chunk.chunk_id,
-                audit_id=audit.external_id,
+                audit_id=audit_external_id,
                 error=str(analysis_exc),
                 error_type=type(analysis_exc).__name__,
             )
             raise
+        return analysis, bundle
 
+    def _record_chunk_result(
+        self,
+        audit: Audit,
+        chunk: Chunk,
+        analysis: dict[str, Any],
+        bundle: ContextBundle,
+    ) -> None:
+        """Persist one analyzed chunk. Must only be called from the runner's thread."""
         # Store context summary for UI display
         context_summary = {
             "total_tokens": bundle.total_tokens,
@@ -369,6 +742,9 @@ class ComplianceRunner:
             status="completed",
             analysis=analysis_with_context,
             context_token_count=bundle.total_tokens,
+            content_hash=content_hash(chunk.content),
+            section_path=chunk.section_path,
+            context_hash=analysis.get("context_fingerprint"),
         )
         self.session.add(result)
         self.flag_synthesizer.upsert_flag(audit.id, chunk.chunk_id, analysis)
@@ -377,113 +753,157 @@ class ComplianceRunner:
         audit.last_chunk_id = chunk.chunk_id
         self.session.flush()
 
+    def _carry_forward(self, audit: Audit, *, include_evidence: bool) -> None:
+        """Copy the baseline audit's results for pending chunks that are unchanged."""
+        baseline = self.session.get(Audit, audit.baseline_audit_id)
+        if baseline is None:
+            return
+        bundle_kwargs = self._initial_bundle_kwargs(include_evidence, audit.is_draft)
+
+        def fingerprint(chunk: Chunk) -> str:
+            return context_fingerprint(self._build_bundle(self.context_builder, chunk.chunk_id, **bundle_kwargs))
+
+        DeltaAudit(self.session, audit, baseline).carry_forward(self._pending_chunks(audit), fingerprint)
+        self.session.commit()
+        self._publish_progress(audit)
+
     def _analyze_with_optional_refinement(
         self,
         chunk: Chunk,
         *,
         include_evidence: bool,
         is_draft: bool = False,
+        context_builder: ContextBuilder | RecursiveContextBuilder | None = None,
     ) -> tuple[dict[str, Any], ContextBundle]:
-        # For draft mode, use reduced context budgets
-        neighbor_window = 0 if is_draft else None  # No neighbors for draft
-        budget_multiplier = 0.5 if is_draft else 1.0  # Half budget for draft
+        context_builder = context_builder or self.context_builder
+        recursive = isinstance(context_builder, RecursiveContextBuilder)
 
         logger.info(
             "Building RAG context for chunk %s (draft=%s, evidence=%s, recursive=%s)",
             chunk.chunk_id[:16],
             is_draft,
             include_evidence,
-            isinstance(self.context_builder, RecursiveContextBuilder),
+            recursive,
+        )
+        bundle = self._build_bundle(
+            context_builder, chunk.chunk_id, **self._initial_bundle_kwargs(include_evidence, is_draft)
         )
-        
-        # Use recursive context builder if available
-        if isinstance(self.context_builder, RecursiveContextBuilder):
-            bundle = self.context_builder.build_recursive_context(
-                chunk.chunk_id,
-                include_evidence=include_evidence,
-                include_litigation=True,
-                neighbor_window=neighbor_window,
-                budget_multiplier=budget_multiplier,
-            )
-        else:
-            bundle = self.context_builder.build_context(
-                chunk.chunk_id,
-                include_evidence=include_evidence,
-                neighbor_window=neighbor_window,
-                budget_multiplier=budget_multiplier,
-            )
         logger.info(
             "RAG context ready: %d regulations, %d guidance, %d manual neighbors",
             len(bundle.regulation_slices),
             len(bundle.guidance_slices),
             len(bundle.manual_neighbors),
         )
+        fingerprint = context_fingerprint(bundle)
         analysis = self.analysis_client.analyze(chunk, bundle)
         attempts = 0
 
-        # Skip refinement for draft mode
-        # Allow multiple refinement attempts for comprehensive searching
-        max_refinement_attempts = max(0, self.config.refinement_max_attempts) if not is_draft else 0
-        # Increase limit for recursive RAG to allow more thorough searching
-        if isinstance(self.context_builder, RecursiveContextBuilder):
-            max_refinement_attempts = max(max_refinement_attempts, 5)  # Allow up to 5 searches with recursive RAG
-        
-        if not is_draft:
-            while (
-                analysis.get("needs_additional_context")
-                and attempts < max_refinement_attempts
-            ):
-                attempts += 1
-                # Use context_query from previous analysis for targeted RAG search
-                context_query = analysis.get("context_query")
-                if context_query:
-                    logger.info(
-                        f"Refinement attempt {attempts}/{max_refinement_attempts}: Searching for: {context_query[:100]}..."
-                    )
-                else:
-                    logger.warning(
-                        f"Refinement attempt {attempts} requested but no context_query provided - skipping"
-                    )
-                    break
-                
-                # Build context with targeted query
-                if isinstance(self.context_builder, RecursiveContextBuilder):
-                    bundle = self.context_builder.build_recursive_context(
-                        chunk.chunk_id,
-                        include_evidence=self.config.refinement_include_evidence or include_evidence,
-                        include_litigation=True,
-                        neighbor_window=self.config.refinement_manual_window,
-                        budget_multiplier=max(1.0, self.config.refinement_token_multiplier),
-                        context_query=context_query,  # Pass the search query
-                    )
-                else:
-                    bundle = self.context_builder.build_context(
-                        chunk.chunk_id,
-                        include_evidence=self.config.refinement_include_evidence or include_evidence,
-                        neighbor_window=self.config.refinement_manual_window,
-                        budget_multiplier=max(1.0, self.config.refinement_token_multiplier),
-                        context_query=context_query,  # Pass query for targeted RAG
-                    )
-                
-                # Re-analyze with expanded context
-                analysis = self.analysis_client.analyze(chunk, bundle)
-                
-                # If still needs context but we've made progress, continue
-                # Otherwise, break to avoid infinite loops
-                if analysis.get("needs_additional_context") and attempts >= 3:
-                    # After 3 attempts, check if we're making progress
-                    # If context_query changed, continue; otherwise break
-                    new_query = analysis.get("context_query")
-                    if new_query == context_query:
-                        logger.info(f"Context query unchanged after {attempts} attempts - stopping refinement")
-                        break
+        max_refinement_attempts = self._max_refinement_attempts(recursive, is_draft)
+        while (
+            analysis.get("needs_additional_context")
+            and attempts < max_refinement_attempts
+        ):
+            attempts += 1
+            # Use context_query from previous analysis for targeted RAG search
+            context_query = analysis.get("context_query")
+            if context_query:
+                logger.info(
+                    f"Refinement attempt {attempts}/{max_refinement_attempts}: Searching for: {context_query[:100]}..."
+                )
+            else:
+                logger.warning(
+                    f"Refinement attempt {attempts} requested but no context_query provided - skipping"
+                )
+                break
+            
+            # Build context with targeted query
+            bundle = self._build_bundle(
+                context_builder,
+                chunk.chunk_id,
+                **self._refinement_bundle_kwargs(include_evidence, context_query),
+            )
+            
+            # Re-analyze with expanded context
+            analysis = self.analysis_client.analyze(chunk, bundle)
+            if self._refinement_stalled(analysis, attempts, context_query):
+                break
 
         if attempts:
             analysis["refined"] = True
             analysis["refinement_attempts"] = attempts
+        # Recorded on the chunk result so a later delta audit can check the context still matches
+        analysis["context_fingerprint"] = fingerprint
 
         return analysis, bundle
 
+    @staticmethod
+    def _initial_bundle_kwargs(include_evidence: bool, is_draft: bool) -> dict[str, Any]:
+        # For draft mode, use reduced context budgets
+        return {
+            "include_evidence": include_evidence,
+            "neighbor_window": 0 if is_draft else None,  # No neighbors for draft
+            "budget_multiplier": 0.5 if is_draft else 1.0,  # Half budget for draft
+        }
+
+    def _refinement_bundle_kwargs(self, include_evidence: bool, context_query: str) -> dict[str, Any]:
+        return {
+            "include_evidence": self.config.refinement_include_evidence or include_evidence,
+            "neighbor_window": self.config.refinement_manual_window,
+            "budget_multiplier": max(1.0, self.config.refinement_token_multiplier),
+            "context_query": context_query,  # Pass the search query for targeted RAG
+        }
+
+    @staticmethod
+    def _build_bundle(
+        context_builder: ContextBuilder | RecursiveContextBuilder,
+        chunk_id: str,
+        *,
+        include_evidence: bool,
+        neighbor_window: int | None,
+        budget_multiplier: float,
+        context_query: str | None = None,
+    ) -> ContextBundle:
+        # Use recursive context builder if available
+        if isinstance(context_builder, RecursiveContextBuilder):
+            return context_builder.build_recursive_context(
+                chunk_id,
+                include_evidence=include_evidence,
+                include_litigation=True,
+                neighbor_window=neighbor_window,
+                budget_multiplier=budget_multiplier,
+                context_query=context_query,
+            )
+        kwargs: dict[str, Any] = {}
+        if context_query is not None:
+            kwargs["context_query"] = context_query
+        return context_builder.build_context(
+            chunk_id,
+            include_evidence=include_evidence,
+            neighbor_window=neighbor_window,
+            budget_multiplier=budget_multiplier,
+            **kwargs,
+        )
+
+    def _max_refinement_attempts(self, recursive: bool, is_draft: bool) -> int:
+        # Skip refinement for draft mode
+        if is_draft:
+            return 0
+        # Allow multiple refinement attempts for comprehensive searching
+        max_attempts = max(0, self.config.refinement_max_attempts)
+        # Increase limit for recursive RAG to allow more thorough searching
+        if recursive:
+            max_attempts = max(max_attempts, 5)  # Allow up to 5 searches with recursive RAG
+        return max_attempts
+
+    @staticmethod
+    def _refinement_stalled(analysis: dict[str, Any], attempts: int, context_query: str) -> bool:
+        # After 3 attempts, keep going only while the model asks for something new
+        if analysis.get("needs_additional_context") and attempts >= 3:
+            if analysis.get("context_query") == context_query:
+                logger.info(f"Context query unchanged after {attempts} attempts - stopping refinement")
+                return True
+        return False
+
     def _resolve_audit(self, audit_identifier: int | str) -> Audit | None:
         stmt: Select[Audit]
         if isinstance(audit_identifier, int):
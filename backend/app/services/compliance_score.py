@@ -3,9 +3,17 @@
 from __future__ import annotations
 
 from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any
 
-from ..db.models import Flag
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db.models import AuditFlagSummary, Flag
+
+# Penalty multiplier applied to each further consecutive flag of the same type
+DECAY_FACTOR = 0.9
 
 
 def calculate_compliance_score(flags: list[Flag]) -> float:
@@ -25,70 +33,75 @@ def calculate_compliance_score(flags: list[Flag]) -> float:
       * Third consecutive: 0.81x penalty, etc.
     - If 100% red or 100% green: score = 0 (unbalanced compliance)
     """
-    if not flags:
-        return 100.0  # No flags = fully compliant
-
-    # Count flags by type
-    severity_counts = Counter(flag.flag_type for flag in flags)
-    red_count = severity_counts.get("RED", 0)
-    yellow_count = severity_counts.get("YELLOW", 0)
-    green_count = severity_counts.get("GREEN", 0)
-    total_flags = len(flags)
-
-    # If all flags are one type, return 0 (unbalanced)
-    if total_flags > 0:
-        if red_count == total_flags or green_count == total_flags:
-            return 0.0
-
     # Sort flags by creation time to ensure consistent consecutive detection
     # Use created_at if available, otherwise fall back to id
     sorted_flags = sorted(
         flags, 
         key=lambda f: (f.created_at.timestamp() if f.created_at else float('inf'), f.id)
     )
-    
-    # Calculate penalties with exponential decay for consecutive flags
-    # Process flags in order to detect consecutive sequences
-    red_penalty = 0.0
-    yellow_penalty = 0.0
-    
-    # Track consecutive counts
-    consecutive_red = 0
-    consecutive_yellow = 0
-    consecutive_green = 0
-    
-    # Decay factor for consecutive flags
-    decay_factor = 0.9
-    
+    state = ScoreState()
     for flag in sorted_flags:
-        if flag.flag_type == "RED":
-            consecutive_red += 1
-            consecutive_yellow = 0
-            consecutive_green = 0
-            # Apply exponential decay: first flag = full penalty, second = 0.9x, third = 0.81x, etc.
-            penalty_multiplier = decay_factor ** (consecutive_red - 1)
-            red_penalty += 20 * penalty_multiplier
-        elif flag.flag_type == "YELLOW":
-            consecutive_yellow += 1
-            consecutive_red = 0
-            consecutive_green = 0
-            # Apply exponential decay
-            penalty_multiplier = decay_factor ** (consecutive_yellow - 1)
-            yellow_penalty += 10 * penalty_multiplier
-        else:  # GREEN
-            consecutive_green += 1
-            consecutive_red = 0
-            consecutive_yellow = 0
-            # Green flags don't add penalty, but reset consecutive counts for others
+        state.add(flag.flag_type, flag.severity_score)
+    return state.score
 
-    # Base score starts at 100
-    base_score = 100.0
 
-    # Apply penalties
-    score = base_score - red_penalty - yellow_penalty
+@dataclass
+class ScoreState:
+    """Running state of :func:`calculate_compliance_score`, fed one flag at a time in creation order."""
 
-    # Clamp to 0-100 range
-    return max(0.0, min(100.0, score))
+    red_count: int = 0
+    yellow_count: int = 0
+    green_count: int = 0
+    total_flags: int = 0
+    severity_total: int = 0
+    red_penalty: float = 0.0
+    yellow_penalty: float = 0.0
+    # Track consecutive counts
+    consecutive_red: int = 0
+    consecutive_yellow: int = 0
+
+    def add(self, flag_type: str, severity_score: int | None) -> None:
+        self.total_flags += 1
+        self.severity_total += severity_score or 0
+        if flag_type == "RED":
+            self.red_count += 1
+            self.consecutive_red += 1
+            self.consecutive_yellow = 0
+            # Apply exponential decay: first flag = full penalty, second = 0.9x, third = 0.81x, etc.
+            self.red_penalty += 20 * DECAY_FACTOR ** (self.consecutive_red - 1)
+        elif flag_type == "YELLOW":
+            self.yellow_count += 1
+            self.consecutive_yellow += 1
+            self.consecutive_red = 0
+            self.yellow_penalty += 10 * DECAY_FACTOR ** (self.consecutive_yellow - 1)
+        else:
+            # Green flags don't add penalty, but reset consecutive counts for others
+            if flag_type == "GREEN":
+                self.green_count += 1
+            self.consecutive_red = 0
+            self.consecutive_yellow = 0
+
+    @property
+    def score(self) -> float:
+        if not self.total_flags:
+            return 100.0  # No flags = fully compliant
+        # If all flags are one type, return 0 (unbalanced)
+        if self.red_count == self.total_flags or self.green_count == self.total_flags:
+            return 0.0
+        # Base score of 100 minus penalties, clamped to 0-100
+        return max(0.0, min(100.0, 100.0 - self.red_penalty - self.yellow_penalty))
+
+    def summary(self) -> dict[str, Any]:
+        """The same dictionary :func:`get_flag_summary` returns."""
+        avg_severity = self.severity_total / self.total_flags if self.total_flags else 0
+        return {
+            "total_flags": self.total_flags,
+            "red_count": self.red_count,
+            "yellow_count": self.yellow_count,
+            "green_count": self.green_count,
+            "avg_severity_score": round(avg_severity, 2),
+            "compliance_score": round(self.score, 2),
+        }
 
 
 def get_flag_summary(flags: list[Flag]) -> dict[str, Any]:
@@ -108,3 +121,61 @@ def get_flag_summary(flags: list[Flag]) -> dict[str, Any]:
         "compliance_score": round(calculate_compliance_score(flags), 2),
     }
 
+
+
+_STATE_FIELDS = tuple(ScoreState.__dataclass_fields__)
+
+
+def summary_state(summary: AuditFlagSummary) -> ScoreState:
+    return ScoreState(**{name: getattr(summary, name) for name in _STATE_FIELDS})
+
+
+def record_flag(session: Session, audit_id: int, flag_type: str, severity_score: int | None) -> AuditFlagSummary:
+    """Fold one new flag into the audit's materialized summary; the caller commits."""
+    summary = session.get(AuditFlagSummary, audit_id)
+    if summary is None:
+        return rebuild_flag_summary(session, audit_id)
+    state = summary_state(summary)
+    state.add(flag_type, severity_score)
+    _store_state(summary, state, datetime.now(timezone.utc))
+    return summary
+
+
+def rebuild_flag_summary(session: Session, audit_id: int) -> AuditFlagSummary:
+    """Recompute the audit's summary from all of its flags; the caller commits.
+
+    Used when a flag changes type or severity, since the running state cannot be rewound,
+    and for audits whose flags predate the summary table.
+    """
+    # The session does not autoflush; pending flags must be visible to the query
+    session.flush()
+    flags = session.execute(
+        select(Flag.flag_type, Flag.severity_score, Flag.created_at)
+        .where(Flag.audit_id == audit_id)
+        .order_by(Flag.created_at, Flag.id)
+    ).all()
+    state = ScoreState()
+    for flag_type, severity_score, _ in flags:
+        state.add(flag_type, severity_score)
+    summary = session.get(AuditFlagSummary, audit_id)
+    if summary is None:
+        summary = AuditFlagSummary(audit_id=audit_id)
+        session.add(summary)
+    _store_state(summary, state, flags[-1].created_at if flags else None)
+    # Flushed so the next ``session.get`` finds the row instead of creating another
+    session.flush()
+    return summary
+
+
+def audit_flag_summary(session: Session, audit_id: int) -> dict[str, Any]:
+    """The :func:`get_flag_summary` dictionary for an audit, read from its materialized row."""
+    summary = session.get(AuditFlagSummary, audit_id)
+    if summary is None:
+        summary = rebuild_flag_summary(session, audit_id)
+    return summary_state(summary).summary()
+
+
+def _store_state(summary: AuditFlagSummary, state: ScoreState, last_flag_at: datetime | None) -> None:
+    for name in _STATE_FIELDS:
+        setattr(summary, name, getattr(state, name))
+    summary.last_flag_at = last_flag_at
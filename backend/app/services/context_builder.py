@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence
@@ -12,6 +14,9 @@ from sqlalchemy.orm import Session
 
 from ..config.settings import AppConfig, ContextBuilderConfig
 from ..db.models import Chunk
+from .query_embedding_cache import QueryEmbeddingCache, get_query_embedding_cache
+from .retrieval_cache import RetrievalCache, embedding_digest, get_retrieval_cache, text_digest
+from .vector_registry import VectorStoreRegistry, get_vector_registry
 
 logger = logging.getLogger(__name__)
 
@@ -77,40 +82,74 @@ class VectorMatch:
     score: float | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class VectorQuery:
+    """One retrieval request inside a batched ``query_many`` call."""
+
+    collection: str
+    query_text: str
+    n_results: int
+    document_id: int | None = None
+
+
 class VectorClient:
     """Interface for vector retrieval backends."""
 
     def query(self, collection: str, query_text: str, n_results: int) -> list[VectorMatch]:
         raise NotImplementedError
 
+    def query_many(self, queries: Sequence[VectorQuery]) -> list[list[VectorMatch]]:
+        """Run several queries, returning matches in the same order.
+
+        Backends that can embed or search in bulk override this; the default
+        simply issues one ``query`` per request.
+        """
+        return [
+            self.query(q.collection, q.query_text, q.n_results, document_id=q.document_id)
+            for q in queries
+        ]
+
 
 class NullVectorClient(VectorClient):
     """Fallback client used when ChromaDB (or other backend) is unavailable."""
 
-    def query(self, collection: str, query_text: str, n_results: int) -> list[VectorMatch]:
+    def query(
+        self, collection: str, query_text: str, n_results: int, document_id: int | None = None
+    ) -> list[VectorMatch]:
         return []
 
 
 class ChromaVectorClient(VectorClient):
     """Thin wrapper around ChromaDB queries to simplify testing."""
 
-    def __init__(self, chroma_path: Path, app_config=None):
+    def __init__(
+        self,
+        chroma_path: Path,
+        app_config=None,
+        registry: VectorStoreRegistry | None = None,
+        retrieval_cache: RetrievalCache | None = None,
+    ):
+        self._chroma_path = chroma_path
+        self._registry = registry or get_vector_registry()
+        # Search results are shared across builders and invalidated by collection writes
+        self._retrieval_cache = retrieval_cache or get_retrieval_cache(app_config)
         try:
-            import chromadb  # type: ignore
+            # Clients are shared per process; builders no longer open their own
+            self._client = self._registry.client(chroma_path)
         except ImportError:  # pragma: no cover - optional dependency
             logger.warning("chromadb is not installed; vector retrieval will be disabled.")
             self._client = None
             self._embedding_client = None
+            self._query_embeddings = None
             return
-
-        self._client = chromadb.PersistentClient(path=str(chroma_path))
         
         # Initialize embedding client to generate query embeddings with the same model as storage
         self._embedding_client = None
+        self._query_embeddings: QueryEmbeddingCache | None = None
         if app_config:
             try:
                 from .embeddings import EmbeddingClient, EmbeddingConfig
-                cache_dir = Path(app_config.data_root) / "cache" / "embeddings"
+                cache_dir = Path(app_config.data_root) / "cache" / "embedding_store"
                 cache_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Use OpenRouter for embeddings
@@ -126,100 +165,142 @@ class ChromaVectorClient(VectorClient):
                         cache_dir=cache_dir,
                     )
                     self._embedding_client = EmbeddingClient(embedding_config)
+                    # Repeated query strings are embedded once per process and persisted
+                    self._query_embeddings = get_query_embedding_cache(app_config)
             except Exception as exc:
                 logger.warning("Failed to initialize embedding client for queries: %s", exc)
 
     def query(self, collection: str, query_text: str, n_results: int, document_id: int | None = None) -> list[VectorMatch]:
-        if self._client is None or not query_text or n_results <= 0:
+        return self.query_many([VectorQuery(collection, query_text, n_results, document_id)])[0]
+
+    def query_many(self, queries: Sequence[VectorQuery]) -> list[list[VectorMatch]]:
+        """Embed each distinct query text once and search each collection once.
+
+        Queries are grouped by (collection, document filter); every group becomes a
+        single ``collection.query`` call carrying all of its query embeddings, and
+        results are fanned back out to the original positions.
+        """
+        results: list[list[VectorMatch]] = [[] for _ in queries]
+        if self._client is None:
+            return results
+        active = [(idx, q) for idx, q in enumerate(queries) if q.query_text and q.n_results > 0]
+        if not active:
+            return results
+
+        # Generate query embeddings using the same model as storage
+        # This ensures dimension compatibility
+        embeddings: dict[str, list[float]] = {}
+        if self._embedding_client:
+            texts = list(dict.fromkeys(q.query_text for _, q in active))
+            try:
+                vectors = self.embed_queries(texts)
+            except Exception as exc:  # pragma: no cover - embedding failure
+                logger.warning("Query embedding failed for %d texts: %s", len(texts), exc)
+                return results
+            embeddings = dict(zip(texts, vectors))
+        else:
+            # Fallback: use text query (may fail if dimension mismatch)
+            logger.warning(
+                "Embedding client not available, using text query (may cause dimension mismatch)"
+            )
+
+        groups: dict[tuple[str, int | None], list[tuple[int, VectorQuery]]] = defaultdict(list)
+        for idx, q in active:
+            groups[(q.collection, q.document_id)].append((idx, q))
+        for (collection, document_id), members in groups.items():
+            for idx, matches in self._query_collection(collection, document_id, members, embeddings):
+                results[idx] = matches
+        return results
+
+    def embed_queries(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed query texts with the storage model, reusing cached query embeddings.
+
+        Returns an empty list when no embedding client is configured.
+        """
+        if not self._embedding_client or not texts:
             return []
+        if self._query_embeddings is not None:
+            vectors = self._query_embeddings.embed(list(texts), self._embedding_client.embed_texts)
+        else:
+            vectors = self._embedding_client.embed_texts(list(texts))
+        return [vector.tolist() if hasattr(vector, "tolist") else vector for vector in vectors]
+
+    def _query_collection(
+        self,
+        collection: str,
+        document_id: int | None,
+        members: list[tuple[int, VectorQuery]],
+        embeddings: dict[str, list[float]],
+    ) -> list[tuple[int, list[VectorMatch]]]:
+        where = {"document_id": document_id} if document_id is not None else None
+        resolved: list[tuple[int, list[VectorMatch]]] = []
+        pending: list[tuple[int, VectorQuery, tuple]] = []
+        for idx, q in members:
+            digest = embedding_digest(embeddings[q.query_text]) if embeddings else text_digest(q.query_text)
+            key = self._retrieval_cache.make_key(self._chroma_path, collection, digest, q.n_results, where)
+            cached = self._retrieval_cache.get(key)
+            if cached is not None:
+                resolved.append((idx, cached))
+            else:
+                pending.append((idx, q, key))
+        if not pending:
+            return resolved
 
         try:
-            collection_obj = self._client.get_collection(name=collection)
-        except Exception as exc:  # pragma: no cover - collection missing
+            collection_obj = self._registry.get_collection(self._chroma_path, collection)
+        except Exception as exc:  # pragma: no cover - collection unavailable
             logger.debug("Vector collection '%s' not available: %s", collection, exc)
-            return []
-
+            return resolved
+        if collection_obj is None:
+            logger.debug("Vector collection '%s' does not exist", collection)
+            return resolved
+
+        texts = list(dict.fromkeys(q.query_text for _, q, _ in pending))
+        # Results are distance-ordered, so the largest request serves the smaller ones
+        n_results = max(q.n_results for _, q, _ in pending)
         try:
-            # Build where clause to filter by document_id if provided
-            where_clause = None
-            if document_id is not None:
-                where_clause = {"document_id": document_id}
-            
-            # Generate query embedding using the same model as storage
-            # This ensures dimension compatibility
-            if self._embedding_client:
-                query_embeddings = self._embedding_client.embed_texts([query_text])
-                if query_embeddings:
-                    # Validate query embedding dimension matches collection dimension
-                    import numpy as np
-                    # Convert to list if it's a numpy array
-                    query_emb = query_embeddings[0]
-                    if isinstance(query_emb, np.ndarray):
-                        query_emb = query_emb.tolist()
-                    query_dim = len(query_emb)
-                    collection_count = collection_obj.count()
-                    if collection_count > 0:
-                        # Check collection dimension by peeking at existing embeddings
-                        sample_result = collection_obj.peek(limit=1)
-                        if sample_result.get("embeddings") and len(sample_result["embeddings"]) > 0:
-                            # Convert to list if it's a numpy array
-                            sample_emb = sample_result["embeddings"][0]
-                            if isinstance(sample_emb, np.ndarray):
-                                sample_emb = sample_emb.tolist()
-                            collection_dim = len(sample_emb)
-                            if query_dim != collection_dim:
-                                logger.error(
-                                    f"Dimension mismatch in query for collection '{collection}': "
-                                    f"collection has {collection_dim} dimensions, "
-                                    f"but query embedding has {query_dim} dimensions. "
-                                    f"This will cause query failures. "
-                                    f"Please ensure EMBEDDING_MODEL matches the model used to create the collection."
-                                )
-                                return []  # Return empty results rather than failing
-                    
-                    # Ensure query embeddings are lists (not numpy arrays) for ChromaDB compatibility
-                    query_emb_list = []
-                    for emb in query_embeddings:
-                        if isinstance(emb, np.ndarray):
-                            query_emb_list.append(emb.tolist())
-                        else:
-                            query_emb_list.append(emb)
-                    
-                    query_kwargs = {
-                        "query_embeddings": query_emb_list,
-                        "n_results": n_results
-                    }
-                    if where_clause:
-                        query_kwargs["where"] = where_clause
-                    results = collection_obj.query(**query_kwargs)
-                else:
-                    # Fallback to text query if embedding generation fails
-                    query_kwargs = {"query_texts": [query_text], "n_results": n_results}
-                    if where_clause:
-                        query_kwargs["where"] = where_clause
-                    results = collection_obj.query(**query_kwargs)
+            if embeddings:
+                query_vectors = [embeddings[text] for text in texts]
+                # Validate query embedding dimension matches collection dimension
+                query_dim = len(query_vectors[0])
+                collection_dim = self._registry.collection_dimension(self._chroma_path, collection)
+                if collection_dim is not None and query_dim != collection_dim:
+                    logger.error(
+                        f"Dimension mismatch in query for collection '{collection}': "
+                        f"collection has {collection_dim} dimensions, "
+                        f"but query embedding has {query_dim} dimensions. "
+                        f"This will cause query failures. "
+                        f"Please ensure EMBEDDING_MODEL matches the model used to create the collection."
+                    )
+                    return resolved  # Return empty results rather than failing
+                query_kwargs: dict[str, Any] = {"query_embeddings": query_vectors, "n_results": n_results}
             else:
-                # Fallback: use text query (may fail if dimension mismatch)
-                logger.warning(
-                    "Embedding client not available, using text query (may cause dimension mismatch)"
-                )
-                query_kwargs = {"query_texts": [query_text], "n_results": n_results}
-                if where_clause:
-                    query_kwargs["where"] = where_clause
-                results = collection_obj.query(**query_kwargs)
+                query_kwargs = {"query_texts": texts, "n_results": n_results}
+            if where is not None:
+                # Filter by document_id if provided
+                query_kwargs["where"] = where
+            raw = collection_obj.query(**query_kwargs)
         except Exception as exc:  # pragma: no cover - query failure
             logger.warning("Vector query failed for %s: %s", collection, exc)
-            return []
+            return resolved
 
-        matches: list[VectorMatch] = []
-        ids = results.get("ids", [[]])[0]
-        documents = results.get("documents", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0]
+        by_text = {text: self._parse_matches(raw, position) for position, text in enumerate(texts)}
+        for idx, q, key in pending:
+            matches = by_text[q.query_text][: q.n_results]
+            self._retrieval_cache.put(key, matches)
+            resolved.append((idx, matches))
+        return resolved
 
-        for doc, meta, score in zip(documents, metadatas, distances):
-            matches.append(VectorMatch(content=doc, metadata=meta or {}, score=score))
-        return matches
+    @staticmethod
+    def _parse_matches(raw: dict[str, Any], position: int) -> list[VectorMatch]:
+        def column(name: str) -> list[Any]:
+            values = raw.get(name) or []
+            return values[position] if position < len(values) and values[position] is not None else []
+
+        return [
+            VectorMatch(content=doc, metadata=meta or {}, score=score)
+            for doc, meta, score in zip(column("documents"), column("metadatas"), column("distances"))
+        ]
     
     def close(self):
         """Close the embedding client if it exists."""
@@ -227,19 +308,100 @@ class ChromaVectorClient(VectorClient):
             self._embedding_client.close()
 
 
+def stored_token_count(metadata: dict[str, Any] | None) -> int | None:
+    """``token_count`` recorded in chunk or vector metadata, if it is usable."""
+    value = (metadata or {}).get("token_count")
+    return value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else None
+
+
+def is_usable_match(match: VectorMatch, max_distance: float = 1.5) -> bool:
+    """Drop poor matches (ChromaDB distances, lower is better) and corrupted content."""
+    if match.score is not None and match.score > max_distance:
+        return False
+    content = match.content.strip() if match.content else None
+    if content is not None and (
+        len(content) < 10
+        or re.match(r'^[\d\s\.\-]+$', content)
+        or '-1097280' in match.content
+        or '-448310' in match.content
+    ):
+        return False
+    return True
+
+
 class TokenEstimator:
-    """Helper for estimating token counts."""
+    """Helper for estimating token counts.
+
+    Counts are memoized process-wide by content hash, so text that reappears across
+    builders, questions and recursive depths is tokenized once. Cache misses from
+    :meth:`count_many` are encoded together with tiktoken's ``encode_batch``.
+    """
+
+    CACHE_SIZE = 65_536
+    # Threads tiktoken may use for one encode_batch call
+    BATCH_THREADS = 4
+
+    _cache: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+    _cache_lock = threading.Lock()
 
     def __init__(self, tokenizer_name: str):
         self.tokenizer_name = tokenizer_name
         self._encoding = self._load_encoding(tokenizer_name)
 
     def count(self, text: str) -> int:
-        if not text:
-            return 0
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: Sequence[str]) -> list[int]:
+        """Token counts for ``texts``, encoding only those not seen before."""
         if self._encoding is None:
-            return max(1, len(text) // 4)
-        return len(self._encoding.encode(text))
+            return [max(1, len(text) // 4) if text else 0 for text in texts]
+
+        encoding_name = getattr(self._encoding, "name", self.tokenizer_name)
+        keys = [
+            (encoding_name, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+            if text
+            else None
+            for text in texts
+        ]
+        counts: list[int | None] = [0 if key is None else None for key in keys]
+        cache = TokenEstimator._cache
+        with self._cache_lock:
+            for position, key in enumerate(keys):
+                if key is not None and key in cache:
+                    cache.move_to_end(key)
+                    counts[position] = cache[key]
+
+        missing = list(dict.fromkeys(keys[i] for i, count in enumerate(counts) if count is None))
+        if missing:
+            first_text = {key: text for key, text in zip(keys, texts) if key is not None}
+            missing_texts = [first_text[key] for key in missing]
+            if len(missing_texts) == 1:
+                encoded = [self._encoding.encode(missing_texts[0])]
+            else:
+                encoded = self._encoding.encode_batch(missing_texts, num_threads=self.BATCH_THREADS)
+            fresh = {key: len(tokens) for key, tokens in zip(missing, encoded)}
+            with self._cache_lock:
+                for key, count in fresh.items():
+                    cache[key] = count
+                    cache.move_to_end(key)
+                while len(cache) > self.CACHE_SIZE:
+                    cache.popitem(last=False)
+            counts = [fresh[key] if count is None else count for key, count in zip(keys, counts)]
+        return counts  # type: ignore[return-value]
+
+    def count_matches(self, matches: Sequence[VectorMatch]) -> list[int]:
+        """Token counts for vector matches, preferring ``token_count`` stored at ingestion."""
+        counts = [stored_token_count(match.metadata) for match in matches]
+        missing = [position for position, count in enumerate(counts) if count is None]
+        if missing:
+            for position, count in zip(missing, self.count_many([matches[i].content for i in missing])):
+                counts[position] = count
+        return counts  # type: ignore[return-value]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            TokenEstimator._cache.clear()
 
     @staticmethod
     def _load_encoding(name: str):
@@ -301,7 +463,7 @@ class ContextBuilder:
         self.token_estimator = TokenEstimator(self.config.tokenizer)
         chroma_path = Path(app_config.data_root) / "chroma"
         self.vector = vector_client or ChromaVectorClient(chroma_path, app_config=app_config)
-        self._query_cache: dict[tuple[str, str], list[VectorMatch]] = {}
+        self._query_cache: dict[tuple[str, str, int | None, str, int], list[VectorMatch]] = {}
 
     def build_context(
         self,
@@ -327,6 +489,21 @@ class ContextBuilder:
         guidance_limit = int(self.config.guidance_token_budget * budget_multiplier)
         evidence_limit = int(self.config.evidence_token_budget * budget_multiplier)
 
+        # Embed the query once and search every collection in a single batch;
+        # the _collect_vector_context calls below are then served from the cache.
+        vector_query_text = context_query if context_query else chunk.content
+        planned_queries = [
+            VectorQuery("manual_chunks", vector_query_text, 5, chunk.document_id),
+            VectorQuery("regulation_chunks", vector_query_text, self.config.regulation_top_k),
+            VectorQuery("amc_chunks", vector_query_text, self.config.guidance_top_k),
+            VectorQuery("gm_chunks", vector_query_text, self.config.guidance_top_k),
+        ]
+        if include_evidence:
+            planned_queries.append(
+                VectorQuery("evidence_chunks", vector_query_text, self.config.evidence_top_k)
+            )
+        self.prefetch_vector_queries(planned_queries, cache_key=chunk.chunk_id)
+
         # Collect manual neighbors (sequential chunks)
         manual_neighbors = self._collect_manual_neighbors(chunk, manual_window)
         
@@ -528,26 +705,15 @@ class ContextBuilder:
                 chunk.chunk_id[:16],
             )
         
+        kept = [(idx, match) for idx, match in enumerate(matches) if is_usable_match(match)]
+        token_counts = self.token_estimator.count_matches([match for _, match in kept])
         slices: list[ContextSlice] = []
-        for idx, match in enumerate(matches):
-            # Filter out low-quality matches (ChromaDB returns distances, lower is better)
-            if match.score is not None and match.score > 1.5:  # Filter out poor matches
-                continue
-            
-            # Filter out corrupted content
-            if match.content and (len(match.content.strip()) < 10 or 
-                                 re.match(r'^[\d\s\.\-]+$', match.content.strip()) or
-                                 '-1097280' in match.content or '-448310' in match.content):
-                continue
-            
+        for (idx, match), tokens in zip(kept, token_counts):
             label = f"{label_prefix} ref #{idx + 1}"
             metadata = dict(match.metadata or {})
             metadata.setdefault("chunk_id", metadata.get("chunk_id"))
             metadata.setdefault("source", source)
             metadata.setdefault("heading", metadata.get("parent_heading"))
-            tokens = metadata.get("token_count")
-            if not isinstance(tokens, int):
-                tokens = self.token_estimator.count(match.content)
             
             # Convert distance to similarity score for display (1 / (1 + distance))
             # This gives a score between 0 and 1, where 1 is perfect match
@@ -571,12 +737,47 @@ class ContextBuilder:
         """Public method for vector queries (used by recursive context builder)."""
         return self._vector_query(collection, query_text, cache_key, top_k, document_id)
     
+    def prefetch_vector_queries(self, queries: Sequence[VectorQuery], *, cache_key: str) -> None:
+        """Resolve several vector queries with one ``query_many`` call and cache the results.
+
+        Subsequent ``vector_query`` calls with the same collection, text, top_k and
+        document filter under ``cache_key`` are answered without another round-trip.
+        """
+        pending: list[VectorQuery] = []
+        for query in queries:
+            if not query.query_text or query.n_results <= 0:
+                continue
+            key = self._query_key(query.collection, cache_key, query.document_id, query.query_text, query.n_results)
+            if key not in self._query_cache and query not in pending:
+                pending.append(query)
+        if not pending:
+            return
+
+        logger.info(
+            "RAG query: Batched %d searches across %d collections for %s",
+            len(pending),
+            len({query.collection for query in pending}),
+            cache_key[:16],
+        )
+        results = self.vector.query_many(pending)
+        for query, matches in zip(pending, results):
+            key = self._query_key(query.collection, cache_key, query.document_id, query.query_text, query.n_results)
+            self._query_cache[key] = matches
+
+    @staticmethod
+    def _query_key(
+        collection: str, cache_key: str, document_id: int | None, query_text: str, top_k: int
+    ) -> tuple[str, str, int | None, str, int]:
+        # The query text is part of the key so refinement passes with a new
+        # context_query do not reuse results retrieved for the chunk content.
+        return (collection, cache_key, document_id, query_text, top_k)
+
     def _vector_query(
         self, collection: str, query_text: str, cache_key: str, top_k: int, document_id: int | None = None
     ) -> list[VectorMatch]:
         if not query_text or top_k <= 0:
             return []
-        key = (collection, cache_key, document_id)
+        key = self._query_key(collection, cache_key, document_id, query_text, top_k)
         if key in self._query_cache:
             return self._query_cache[key]
         
@@ -620,7 +821,11 @@ class ContextBuilder:
         }
         if chunk.chunk_metadata:
             metadata.update(chunk.chunk_metadata)
-        token_count = chunk.token_count or self.token_estimator.count(chunk.content)
+        token_count = (
+            chunk.token_count
+            or stored_token_count(chunk.chunk_metadata)
+            or self.token_estimator.count(chunk.content)
+        )
         return ContextSlice(
             label=label,
             source=source,
@@ -0,0 +1,178 @@
+"""Delta audits: copy forward a baseline audit's results for chunks that did not change.
+
+A baseline result is reused when the new chunk has the same text and section path and
+its initial regulation and guidance context is the same as when the baseline analyzed it.
+Everything else goes through the normal analysis.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from sqlalchemy import desc, select
+from sqlalchemy.orm import Session, selectinload
+
+from ..db.models import Audit, AuditChunkResult, Chunk, Citation, Document, Flag
+from ..logging_config import get_logger
+from .compliance_score import record_flag
+from .context_builder import ContextBundle
+from .vector_metadata import content_hash
+
+logger = get_logger(__name__)
+
+
+def context_fingerprint(bundle: ContextBundle) -> str:
+    """Hash of the regulation and guidance slices in a bundle, independent of their order."""
+    keys = sorted(
+        f"{slice_.source}:{slice_.metadata.get('chunk_id') or slice_.label}:{content_hash(slice_.content)}"
+        for slice_ in (*bundle.regulation_slices, *bundle.guidance_slices)
+    )
+    return hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+
+
+def find_baseline_audit(session: Session, document: Document, *, exclude_audit_id: int | None = None) -> Audit | None:
+    """Latest completed full audit of this document, or of a manual from the same organization."""
+    stmt = (
+        select(Audit)
+        .join(Document, Document.id == Audit.document_id)
+        .where(Audit.status == "completed", Audit.is_draft.is_(False))
+        .order_by(desc(Audit.completed_at), desc(Audit.id))
+        .limit(1)
+    )
+    if document.organization:
+        stmt = stmt.where(
+            (Audit.document_id == document.id)
+            | ((Document.organization == document.organization) & (Document.source_type == document.source_type))
+        )
+    else:
+        stmt = stmt.where(Audit.document_id == document.id)
+    if exclude_audit_id is not None:
+        stmt = stmt.where(Audit.id != exclude_audit_id)
+    return session.execute(stmt).scalar_one_or_none()
+
+
+def baseline_rejection(baseline: Audit, document: Document) -> str | None:
+    """Why ``baseline`` cannot seed a delta audit of ``document``, or None if it can.
+
+    Applies the same rules as :func:`find_baseline_audit` to an explicitly chosen baseline.
+    """
+    if baseline.status != "completed":
+        return f"is {baseline.status}, not completed"
+    if baseline.is_draft:
+        return "is a draft audit"
+    if baseline.document_id == document.id:
+        return None
+    source = baseline.document
+    if (
+        document.organization
+        and source.organization == document.organization
+        and source.source_type == document.source_type
+    ):
+        return None
+    return "belongs to a document from a different organization"
+
+
+@dataclass
+class CarryForwardResult:
+    carried: int = 0
+    # Chunks with a text match whose regulation context has since changed
+    context_changed: int = 0
+
+
+class DeltaAudit:
+    """Copies a baseline audit's chunk results and flags onto a new audit."""
+
+    def __init__(self, session: Session, audit: Audit, baseline: Audit):
+        self.session = session
+        self.audit = audit
+        self.baseline = baseline
+        self._candidates: dict[tuple[str, str | None], deque[AuditChunkResult]] = defaultdict(deque)
+        stmt = (
+            select(AuditChunkResult)
+            .where(
+                AuditChunkResult.audit_id == baseline.id,
+                AuditChunkResult.status == "completed",
+                # Results recorded before fingerprints existed cannot be verified
+                AuditChunkResult.context_hash.is_not(None),
+            )
+            .order_by(AuditChunkResult.chunk_index)
+        )
+        for result in session.scalars(stmt):
+            self._candidates[(result.content_hash, result.section_path)].append(result)
+
+    def carry_forward(
+        self, chunks: Iterable[Chunk], fingerprint: Callable[[Chunk], str]
+    ) -> CarryForwardResult:
+        """Copy results for every chunk that matches the baseline; the caller commits.
+
+        ``fingerprint`` builds the chunk's initial context and returns its
+        :func:`context_fingerprint`. It is only called for chunks with a text match.
+        """
+        outcome = CarryForwardResult()
+        for chunk in chunks:
+            candidates = self._candidates.get((content_hash(chunk.content), chunk.section_path))
+            if not candidates:
+                continue
+            baseline_result = candidates[0]
+            if fingerprint(chunk) != baseline_result.context_hash:
+                outcome.context_changed += 1
+                continue
+            candidates.popleft()
+            self._copy(chunk, baseline_result)
+            outcome.carried += 1
+        self.session.flush()
+        logger.info(
+            "Carried forward baseline results",
+            audit_id=self.audit.external_id,
+            baseline_audit_id=self.baseline.external_id,
+            carried=outcome.carried,
+            context_changed=outcome.context_changed,
+        )
+        return outcome
+
+    def _copy(self, chunk: Chunk, baseline_result: AuditChunkResult) -> None:
+        self.session.add(
+            AuditChunkResult(
+                audit_id=self.audit.id,
+                chunk_id=chunk.chunk_id,
+                chunk_index=chunk.chunk_index,
+                status="completed",
+                analysis=baseline_result.analysis,
+                context_token_count=baseline_result.context_token_count,
+                content_hash=baseline_result.content_hash,
+                section_path=baseline_result.section_path,
+                context_hash=baseline_result.context_hash,
+                carried_from_audit_id=self.baseline.id,
+            )
+        )
+        flag = self.session.execute(
+            select(Flag)
+            .options(selectinload(Flag.citations))
+            .where(Flag.audit_id == self.baseline.id, Flag.chunk_id == baseline_result.chunk_id)
+        ).scalar_one_or_none()
+        if flag is not None:
+            self.session.add(
+                Flag(
+                    audit_id=self.audit.id,
+                    chunk_id=chunk.chunk_id,
+                    flag_type=flag.flag_type,
+                    severity_score=flag.severity_score,
+                    findings=flag.findings,
+                    gaps=flag.gaps,
+                    recommendations=flag.recommendations,
+                    analysis_metadata={
+                        **(flag.analysis_metadata or {}),
+                        "carried_over_from": self.baseline.external_id,
+                    },
+                    citations=[
+                        Citation(citation_type=citation.citation_type, reference=citation.reference)
+                        for citation in flag.citations
+                    ],
+                )
+            )
+            record_flag(self.session, self.audit.id, flag.flag_type, flag.severity_score)
+        self.audit.chunk_completed += 1
+        self.audit.last_chunk_id = chunk.chunk_id
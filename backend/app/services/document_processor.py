@@ -15,6 +15,7 @@ from ..processing.extraction import DocumentExtractor
 from .chunking import SemanticChunker
 from .embeddings import EmbeddingService
 from .compliance_runner import ComplianceRunner
+from .ingestion_pipeline import StreamingIngestionPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class DocumentProcessor:
         self.data_root = Path(data_root)
         self.session = session
         self.config = config or AppConfig()
-        self.extractor = DocumentExtractor()
+        self.extractor = DocumentExtractor(pdf_workers=self.config.pdf_extraction_workers)
         self.chunker = SemanticChunker(self.config.chunking)
         self.embedding_service = EmbeddingService(session, self.config)
 
@@ -40,6 +41,7 @@ class DocumentProcessor:
         *,
         run_audit: bool = True,
         is_draft: bool = False,
+        incremental: bool = True,
     ) -> dict[str, Any]:
         """
         Process a document through the full pipeline.
@@ -48,115 +50,49 @@ class DocumentProcessor:
             document: The document to process
             run_audit: Whether to automatically run the audit after processing
             is_draft: Whether this is a draft audit (affects processing depth)
+            incremental: Keep unchanged chunks and their embeddings instead of rebuilding all of them
             
         Returns:
             Dictionary with processing results and status
         """
         try:
-            # Step 1: Extract text
-            logger.info(f"Extracting text from document {document.id}")
+            # Steps 1-3: Extract, chunk, persist and embed as one streaming pipeline
+            logger.info(f"Ingesting document {document.id}")
             document_path = self.data_root / document.storage_path
             if not document_path.exists():
                 raise DocumentProcessingError(f"Document file not found: {document_path}")
-            
-            extracted = self.extractor.extract(document_path)
-            
+
             # Save extracted JSON to processed directory
             processed_dir = self.data_root / "processed" / document.external_id
             processed_dir.mkdir(parents=True, exist_ok=True)
-            extracted_json_path = processed_dir / "extracted.json"
-            extracted_json_path.write_text(extracted.to_json(indent=2), encoding="utf-8")
-            
-            # Step 2: Chunk the document
-            logger.info(f"Chunking document {document.id}")
-            from .chunking import SectionText
-            
-            # Convert extracted sections to SectionText objects
-            sections = [
-                SectionText(
-                    index=section.index,
-                    title=section.title,
-                    content=section.content,
-                    section_path=None,  # Will be resolved by chunker
-                    metadata=section.metadata,
-                )
-                for section in extracted.sections
-            ]
-            
-            # Generate chunks
+
             # Use section-aware chunking for all document types (regulations, AMC, GM, and manuals)
             # This provides better RAG context - each section/subsection becomes one chunk
             # (unless it exceeds max_section_tokens, in which case it's split)
-            doc_id = str(document.external_id)
-            chunk_payloads = self.chunker.chunk_sections(
-                doc_id, 
-                sections,
-                section_aware=True,  # Use section-aware for all documents
+            pipeline = StreamingIngestionPipeline(
+                self.session,
+                extractor=self.extractor,
+                chunker=self.chunker,
+                embedding_service=self.embedding_service,
+                config=self.config.ingestion,
             )
-            
-            if not chunk_payloads:
-                raise DocumentProcessingError("No chunks generated from document")
-            
-            # Persist chunks to database
-            from ..db.models import Chunk
-            
-            existing_chunks = (
-                self.session.query(Chunk)
-                .filter(Chunk.document_id == document.id)
-                .all()
+            ingestion = pipeline.run(
+                document,
+                document_path,
+                collection_name=self._get_collection_name(document.source_type),
+                extracted_json_path=processed_dir / "extracted.json",
+                incremental=incremental,
             )
-            if existing_chunks:
-                # Delete existing chunks
-                for chunk in existing_chunks:
-                    self.session.delete(chunk)
-                self.session.flush()
-            
-            chunk_count = 0
-            for idx, chunk_payload in enumerate(chunk_payloads):
-                # Convert section_path list to string
-                section_path_str = " > ".join(chunk_payload.section_path) if chunk_payload.section_path else None
-                
-                chunk = Chunk(
-                    document_id=document.id,
-                    chunk_id=chunk_payload.chunk_id,
-                    chunk_index=idx,  # Use sequential index
-                    section_path=section_path_str,
-                    parent_heading=chunk_payload.parent_heading,
-                    content=chunk_payload.text,
-                    token_count=chunk_payload.token_count,
-                    chunk_metadata=chunk_payload.metadata,
-                    embedding_status="pending",
-                )
-                self.session.add(chunk)
-                chunk_count += 1
-            
-            self.session.commit()
-            logger.info(f"Created {chunk_count} chunks for document {document.id}")
-            
-            # Step 3: Generate embeddings
-            logger.info(f"Generating embeddings for document {document.id}")
-            collection_name = self._get_collection_name(document.source_type)
-            
-            # Fetch chunks for this document
-            from ..db.models import Chunk
-            chunks = (
-                self.session.query(Chunk)
-                .filter(Chunk.document_id == document.id)
-                .filter(Chunk.embedding_status == "pending")
-                .all()
+            if not ingestion.chunk_count:
+                raise DocumentProcessingError("No chunks generated from document")
+
+            chunk_count = ingestion.chunks_created
+            processed_count = ingestion.embeddings_generated
+            logger.info(
+                f"Created {chunk_count} chunks ({ingestion.chunks_reused} unchanged, "
+                f"{ingestion.chunks_removed} removed) and {processed_count} embeddings for document {document.id}"
             )
-            
-            if chunks:
-                result = self.embedding_service.process_chunks(
-                    chunks,
-                    collection_name=collection_name,
-                )
-                processed_count = result.get("processed", 0)
-                logger.info(f"Generated {processed_count} embeddings for document {document.id}")
-            else:
-                processed_count = 0
-                logger.warning(f"No pending chunks found for document {document.id}")
-            
+
             # Step 4: Optionally run audit
             audit_id = None
             if run_audit:
@@ -204,7 +140,10 @@ class DocumentProcessor:
                 return {
                     "document_id": document.id,
                     "chunks_created": chunk_count,
+                    "chunks_reused": ingestion.chunks_reused,
+                    "chunks_removed": ingestion.chunks_removed,
                     "embeddings_generated": processed_count,
+                    "timings": ingestion.timings(),
                     "audit_id": audit.external_id if audit else None,
                     "status": "processed",  # Document processed successfully
                     "audit_status": "failed",  # But audit failed
@@ -214,7 +153,10 @@ class DocumentProcessor:
             return {
                 "document_id": document.id,
                 "chunks_created": chunk_count,
+                "chunks_reused": ingestion.chunks_reused,
+                "chunks_removed": ingestion.chunks_removed,
                 "embeddings_generated": processed_count,
+                "timings": ingestion.timings(),
                 "audit_id": audit.external_id if audit else None,
                 "status": "completed",
             }
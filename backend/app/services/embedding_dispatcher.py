@@ -0,0 +1,123 @@
+"""Concurrent embedding requests with per-batch retries and in-order results."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_EXHAUSTED = object()
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """Whether a failed embedding request may succeed if sent again.
+
+    Timeouts, connection errors, 408, 429 and 5xx responses are; authentication,
+    validation and malformed-response errors fail the same way on every attempt.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status in (408, 429) or status >= 500
+    return isinstance(exc, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+@dataclass
+class EmbeddedBatch(Generic[T]):
+    """Outcome of one batch: its embeddings, or the error from its last attempt."""
+
+    item: T
+    embeddings: list[list[float]] | None = None
+    error: Exception | None = None
+    attempts: int = 0
+    # Time spent in embedding calls (including retries) and time the consumer blocked on the batch
+    seconds: float = 0.0
+    waited: float = 0.0
+
+
+class EmbeddingDispatcher:
+    """Keeps up to ``concurrency`` embedding requests in flight and yields batches in input order.
+
+    Each batch is retried on its own, so one failing request costs only its own chunks.
+    Only errors ``retry_on`` accepts are retried; the rest fail the batch at once.
+    Input batches are pulled lazily on the calling thread, at most ``max_pending`` ahead
+    of the batch being yielded. Callers can build batches from a database session, and
+    a slow consumer holds back new requests.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[list[str]], list[list[float]]],
+        *,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_pending: int | None = None,
+        retry_on: Callable[[Exception], bool] = is_transient_error,
+    ):
+        self.embed = embed
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.retry_on = retry_on
+        self.max_pending = max(self.concurrency, max_pending or 2 * self.concurrency)
+
+    def dispatch(self, batches: Iterable[T], texts: Callable[[T], list[str]]) -> Iterator[EmbeddedBatch[T]]:
+        """Embed ``texts(batch)`` for every batch, yielding results in the order of ``batches``."""
+        source = iter(batches)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embedding-dispatch")
+        pending: deque[tuple[T, Future[EmbeddedBatch[T]]]] = deque()
+        try:
+            while True:
+                while len(pending) < self.max_pending:
+                    item = next(source, _EXHAUSTED)
+                    if item is _EXHAUSTED:
+                        break
+                    pending.append((item, executor.submit(self._embed_batch, item, texts(item))))
+                if not pending:
+                    return
+                item, future = pending.popleft()
+                started = time.perf_counter()
+                embedded = future.result()
+                embedded.waited = time.perf_counter() - started
+                yield embedded
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _embed_batch(self, item: T, texts: list[str]) -> EmbeddedBatch[T]:
+        embedded = EmbeddedBatch(item)
+        started = time.perf_counter()
+        for attempt in range(1, self.max_retries + 1):
+            embedded.attempts = attempt
+            try:
+                embeddings = self.embed(texts)
+                if len(embeddings) != len(texts):
+                    # A short response cannot be merged back onto the batch's chunks
+                    raise ValueError(f"Received {len(embeddings)} embeddings for {len(texts)} texts")
+                embedded.embeddings, embedded.error = embeddings, None
+                break
+            except Exception as exc:
+                embedded.error = exc
+                retry = attempt < self.max_retries and self.retry_on(exc)
+                logger.warning(
+                    "Embedding batch of %s texts failed (attempt %s/%s%s): %s",
+                    len(texts),
+                    attempt,
+                    self.max_retries,
+                    "" if retry or attempt == self.max_retries else ", not retryable",
+                    exc,
+                )
+                if not retry:
+                    break
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+        embedded.seconds = time.perf_counter() - started
+        return embedded
+
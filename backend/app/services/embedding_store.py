@@ -0,0 +1,363 @@
+"""Append-only, memory-mapped embedding store with a SQLite hash index."""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DTYPE = np.float32
+_ROW_ITEMSIZE = np.dtype(_DTYPE).itemsize
+# Reads that race a compaction in another process retry this many times, then count as misses
+_READ_ATTEMPTS = 5
+
+
+def model_namespace(model: str) -> str:
+    """Filesystem-safe directory name for an embedding model."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model).strip("_") or "default"
+
+
+@dataclass
+class MigrationReport:
+    migrated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    removed: int = 0
+
+
+class EmbeddingStore:
+    """Content-addressed embeddings for one model, stored as float32 matrices.
+
+    Each dimension gets a single append-only ``vectors-<dim>.f32`` file holding
+    row-major float32 vectors; ``index.sqlite3`` maps cache keys to row numbers.
+    Reads go through a read-only ``np.memmap`` so ``get_many`` returns row views
+    without copying or per-key file I/O. Deleted rows are reclaimed by ``compact``.
+
+    The web app, the runner and the ingestion CLIs share one store directory, so
+    appends and compaction run inside a ``BEGIN IMMEDIATE`` transaction: SQLite's
+    write lock serializes row allocation across processes. Compaction replaces a
+    vector file and renumbers its rows, so the index also records the inode its rows
+    refer to, and readers only use a file whose inode matches their snapshot.
+    """
+
+    def __init__(self, root: Path, model: str):
+        self.model = model
+        self.path = Path(root) / model_namespace(model)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._maps: dict[int, tuple[int, np.memmap]] = {}
+        self._conn = sqlite3.connect(
+            str(self.path / "index.sqlite3"), timeout=60.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                row INTEGER NOT NULL,
+                PRIMARY KEY (key, dim)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_dim_row ON embeddings (dim, row)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vector_files (dim INTEGER PRIMARY KEY, inode INTEGER NOT NULL)"
+        )
+        # Stores written before vector_files existed: adopt the files as they are now
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO vector_files (dim, inode) VALUES (?, ?)",
+            [(int(path.stem.split("-", 1)[1]), path.stat().st_ino) for path in self.path.glob("vectors-*.f32")],
+        )
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+    def get_many(self, keys: Sequence[str], *, dimensions: int | None = None) -> dict[str, np.ndarray]:
+        """Return ``{key: vector}`` for stored keys; vectors are read-only memmap views."""
+        if not keys:
+            return {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for attempt in range(1, _READ_ATTEMPTS + 1):
+                rows, inodes = self._read_snapshot(unique, dimensions)
+                found: dict[str, np.ndarray] = {}
+                replaced: set[int] = set()
+                for key, dim, row in rows:
+                    if key in found or dim in replaced:
+                        continue
+                    matrix = self._matrix(dim, min_rows=row + 1)
+                    if matrix is None:
+                        # Index entry written ahead of a truncated vector file; treat as a miss
+                        continue
+                    if self._maps[dim][0] != inodes.get(dim):
+                        # Another process is compacting: these row numbers belong to another file
+                        replaced.add(dim)
+                        continue
+                    found[key] = matrix[row]
+                if not replaced:
+                    break
+                if attempt < _READ_ATTEMPTS:
+                    time.sleep(0.01 * attempt)
+            else:
+                logger.debug("Vector files for dimensions %s changed during every read; treating as misses", replaced)
+        return found
+
+    def _read_snapshot(
+        self, keys: list[str], dimensions: int | None
+    ) -> tuple[list[tuple[str, int, int]], dict[int, int]]:
+        """Rows for ``keys`` and the inode of each vector file they index, read atomically."""
+        self._conn.execute("BEGIN")
+        try:
+            rows = self._lookup_rows(keys, dimensions)
+            dims = sorted({dim for _, dim, _ in rows})
+            inodes = dict(
+                self._conn.execute(
+                    f"SELECT dim, inode FROM vector_files WHERE dim IN ({','.join('?' * len(dims))})", dims
+                ).fetchall()
+            ) if dims else {}
+        finally:
+            self._conn.execute("COMMIT")
+        return rows, inodes
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return bool(self._lookup_rows([key], None))
+
+    def _lookup_rows(self, keys: list[str], dimensions: int | None) -> list[tuple[str, int, int]]:
+        rows: list[tuple[str, int, int]] = []
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            sql = f"SELECT key, dim, row FROM embeddings WHERE key IN ({placeholders})"
+            params: list[object] = list(batch)
+            if dimensions is not None:
+                sql += " AND dim = ?"
+                params.append(dimensions)
+            rows.extend(self._conn.execute(sql, params).fetchall())
+        return rows
+
+    def _vector_file(self, dim: int) -> Path:
+        return self.path / f"vectors-{dim}.f32"
+
+    def _file_rows(self, dim: int) -> int:
+        vector_file = self._vector_file(dim)
+        if not vector_file.exists():
+            return 0
+        return vector_file.stat().st_size // (dim * _ROW_ITEMSIZE)
+
+    def _matrix(self, dim: int, *, min_rows: int = 0) -> np.memmap | None:
+        """Return a memmap covering at least ``min_rows`` rows, remapping after appends.
+
+        A map is also dropped once the file has been replaced, which happens when another
+        process compacts the store and renumbers its rows.
+        """
+        try:
+            stat = self._vector_file(dim).stat()
+        except FileNotFoundError:
+            self._maps.pop(dim, None)
+            return None
+        cached = self._maps.get(dim)
+        if cached is not None and cached[0] == stat.st_ino and cached[1].shape[0] >= min_rows:
+            return cached[1]
+        rows = stat.st_size // (dim * _ROW_ITEMSIZE)
+        if rows == 0 or rows < min_rows:
+            return None
+        matrix = np.memmap(self._vector_file(dim), dtype=_DTYPE, mode="r", shape=(rows, dim))
+        self._maps[dim] = (stat.st_ino, matrix)
+        return matrix
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+    def put_many(self, items: Iterable[tuple[str, Sequence[float] | np.ndarray]]) -> int:
+        """Append vectors for keys not already stored; returns the number written."""
+        by_dim: dict[int, dict[str, np.ndarray]] = {}
+        for key, vector in items:
+            array = np.asarray(vector, dtype=_DTYPE).reshape(-1)
+            by_dim.setdefault(array.shape[0], {}).setdefault(key, array)
+
+        written = 0
+        with self._lock:
+            for dim, vectors in by_dim.items():
+                # Hold the index's write lock from reading the file length until the rows are
+                # indexed, so no other process can allocate the same rows
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    existing = {key for key, _, _ in self._lookup_rows(list(vectors), dim)}
+                    new_items = [(key, vec) for key, vec in vectors.items() if key not in existing]
+                    if not new_items:
+                        self._conn.execute("COMMIT")
+                        continue
+                    start_row = self._file_rows(dim)
+                    vector_file = self._vector_file(dim)
+                    with open(vector_file, "ab") as handle:
+                        # Drop any partial row left by an interrupted write before appending
+                        handle.truncate(start_row * dim * _ROW_ITEMSIZE)
+                        handle.write(np.stack([vec for _, vec in new_items]).astype(_DTYPE).tobytes())
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                        inode = os.fstat(handle.fileno()).st_ino
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO vector_files (dim, inode) VALUES (?, ?)", (dim, inode)
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO embeddings (key, dim, row) VALUES (?, ?, ?)",
+                        [(key, dim, start_row + offset) for offset, (key, _) in enumerate(new_items)],
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                written += len(new_items)
+        return written
+
+    def delete_many(self, keys: Sequence[str]) -> int:
+        """Remove keys from the index; their rows are reclaimed by :meth:`compact`."""
+        with self._lock:
+            cursor = self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(k,) for k in keys])
+            return max(cursor.rowcount, 0)
+
+    def clear(self) -> int:
+        """Remove every entry and its vector file; returns the number of entries removed.
+
+        Unlike deleting the directory, this is safe while other processes have the store
+        open: the entries go under the write lock, and a process still mapping a removed
+        file keeps reading its own copy until it finds no rows for the key.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = max(self._conn.execute("DELETE FROM embeddings").rowcount, 0)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.compact()
+        return removed
+
+    def compact(self) -> int:
+        """Rewrite vector files without unreferenced rows; returns bytes reclaimed."""
+        reclaimed = 0
+        with self._lock:
+            dims = [dim for (dim,) in self._conn.execute("SELECT DISTINCT dim FROM embeddings")]
+            orphaned = {
+                int(path.stem.split("-", 1)[1])
+                for path in self.path.glob("vectors-*.f32")
+            } - set(dims)
+            for dim in orphaned:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Another process may have started this dimension since the listing
+                    if self._conn.execute("SELECT 1 FROM embeddings WHERE dim = ? LIMIT 1", (dim,)).fetchone():
+                        continue
+                    reclaimed += self._vector_file(dim).stat().st_size
+                    self._conn.execute("DELETE FROM vector_files WHERE dim = ?", (dim,))
+                    self._vector_file(dim).unlink()
+                    self._maps.pop(dim, None)
+                finally:
+                    self._conn.execute("COMMIT")
+
+            for dim in dims:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    reclaimed += self._compact_dimension(dim)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        if reclaimed:
+            logger.info("Compacted embedding store %s, reclaimed %s bytes", self.path, reclaimed)
+        return reclaimed
+
+    def _compact_dimension(self, dim: int) -> int:
+        """Rewrite one vector file; runs inside the caller's ``BEGIN IMMEDIATE``."""
+        entries = self._conn.execute(
+            "SELECT key, row FROM embeddings WHERE dim = ? ORDER BY row", (dim,)
+        ).fetchall()
+        total_rows = self._file_rows(dim)
+        if len(entries) == total_rows and all(row == idx for idx, (_, row) in enumerate(entries)):
+            return 0
+        # Map the file afresh: a cached map predates later appends and would drop their rows
+        self._maps.pop(dim, None)
+        matrix = self._matrix(dim)
+        live = [(key, row) for key, row in entries if matrix is not None and row < matrix.shape[0]]
+        tmp_file = self._vector_file(dim).with_suffix(".f32.tmp")
+        with open(tmp_file, "wb") as handle:
+            if live:
+                handle.write(np.ascontiguousarray(matrix[[row for _, row in live]]).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+            # The rename keeps the inode; readers pair the new rows with this file only
+            inode = os.fstat(handle.fileno()).st_ino
+        self._conn.execute("INSERT OR REPLACE INTO vector_files (dim, inode) VALUES (?, ?)", (dim, inode))
+        self._conn.execute("DELETE FROM embeddings WHERE dim = ?", (dim,))
+        self._conn.executemany(
+            "INSERT INTO embeddings (key, dim, row) VALUES (?, ?, ?)",
+            [(key, dim, new_row) for new_row, (key, _) in enumerate(live)],
+        )
+        os.replace(tmp_file, self._vector_file(dim))
+        self._maps.pop(dim, None)
+        return (total_rows - len(live)) * dim * _ROW_ITEMSIZE
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            file_rows = sum(
+                path.stat().st_size // (int(path.stem.split("-", 1)[1]) * _ROW_ITEMSIZE)
+                for path in self.path.glob("vectors-*.f32")
+            )
+        return {"entries": entries, "file_rows": file_rows, "dead_rows": max(0, file_rows - entries)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._maps.clear()
+            self._conn.close()
+
+    # ------------------------------------------------------------------ #
+    # Migration
+    # ------------------------------------------------------------------ #
+    def import_npy_directory(
+        self, cache_dir: Path, *, remove: bool = False, batch_size: int = 1000
+    ) -> MigrationReport:
+        """Import a legacy ``<key>.npy``-per-text cache directory into this store."""
+        report = MigrationReport()
+        batch: list[tuple[str, np.ndarray]] = []
+        imported_files: list[Path] = []
+
+        def flush() -> None:
+            written = self.put_many(batch)
+            report.migrated += written
+            report.skipped += len(batch) - written
+            batch.clear()
+
+        for npy_file in sorted(Path(cache_dir).glob("*.npy")):
+            try:
+                vector = np.load(npy_file)
+            except Exception as exc:  # corrupt or partially written legacy file
+                logger.warning("Skipping unreadable cached embedding %s: %s", npy_file.name, exc)
+                report.failed += 1
+                continue
+            batch.append((npy_file.stem, vector))
+            imported_files.append(npy_file)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+        if remove:
+            for npy_file in imported_files:
+                npy_file.unlink(missing_ok=True)
+                report.removed += 1
+        return report
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import hashlib
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -8,11 +7,19 @@ from pathlib import Path
 from typing import Any
 
 import httpx
+import numpy as np
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..config.settings import AppConfig
 from ..db.models import Chunk, EmbeddingJob, Legislation, LegislationChunk
+from .embedding_dispatcher import EmbeddedBatch, EmbeddingDispatcher
+from .embedding_store import EmbeddingStore
+from .rate_limiter import AdaptiveRateLimiter, estimate_request_tokens, get_rate_limiter
+from .context_builder import TokenEstimator
+from .retrieval_cache import get_retrieval_cache
+from .vector_metadata import chunk_vector_metadata, content_hash, resolve_token_counts
+from .vector_registry import get_vector_registry
 
 logger = logging.getLogger(__name__)
 
@@ -49,14 +56,22 @@ class EmbeddingConfig:
     api_base_url: str
     batch_size: int
     cache_dir: Path | None = None
+    concurrency: int = 1
+    max_retries: int = 1
 
 
 class EmbeddingClient:
     """Client for generating embeddings via OpenRouter API."""
 
-    def __init__(self, config: EmbeddingConfig):
+    def __init__(self, config: EmbeddingConfig, rate_limiter: AdaptiveRateLimiter | None = None):
         self.config = config
-        self.client = httpx.Client(timeout=60.0)
+        # One connection per concurrent request; httpx clients are safe to share across threads
+        connections = max(1, config.concurrency)
+        self.client = httpx.Client(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        )
+        self.rate_limiter = rate_limiter or get_rate_limiter()
 
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for a batch of texts using OpenRouter."""
@@ -76,7 +91,9 @@ class EmbeddingClient:
         payload = {"input": texts, "model": self.config.model}
 
         try:
+            self.rate_limiter.acquire(tokens=estimate_request_tokens(*texts))
             response = self.client.post(url, json=payload, headers=headers, timeout=300.0)  # 5 minute timeout
+            self.rate_limiter.observe_response(response)
             response.raise_for_status()
             
             # Check content type
@@ -138,10 +155,21 @@ class EmbeddingService:
         self.config = config
         self.embedding_config = self._build_embedding_config()
         self.client = EmbeddingClient(self.embedding_config)
+        self.embedding_store = (
+            EmbeddingStore(self.embedding_config.cache_dir, self.embedding_config.model)
+            if self.embedding_config.cache_dir
+            else None
+        )
+        self._tokens: TokenEstimator | None = None
+
+    def _token_estimator(self) -> TokenEstimator:
+        if self._tokens is None:
+            self._tokens = TokenEstimator(self.config.context_builder.tokenizer)
+        return self._tokens
 
     def _build_embedding_config(self) -> EmbeddingConfig:
         """Build embedding configuration from app config."""
-        cache_dir = Path(self.config.data_root) / "cache" / "embeddings"
+        cache_dir = Path(self.config.data_root) / "cache" / "embedding_store"
         cache_dir.mkdir(parents=True, exist_ok=True)
 
         # Use OpenRouter for embeddings
@@ -157,6 +185,8 @@ class EmbeddingService:
             api_base_url=self.config.embedding_api_base_url,
             batch_size=100,  # Smaller batches to avoid large responses
             cache_dir=cache_dir,
+            concurrency=self.config.embedding_concurrency,
+            max_retries=self.config.embedding_max_retries,
         )
 
     def get_pending_chunks(self, doc_id: str | None = None, limit: int = 100) -> list[Chunk]:
@@ -178,7 +208,10 @@ class EmbeddingService:
     def process_chunks(
         self, chunks: list[Chunk], collection_name: str = "manual_chunks"
     ) -> dict[str, Any]:
-        """Process a batch of chunks and generate embeddings."""
+        """Embed chunks in concurrent batches, storing each batch as its result arrives.
+
+        A batch that still fails after retries marks only its own chunks as failed.
+        """
         if not chunks:
             return {"processed": 0, "failed": 0}
 
@@ -187,63 +220,82 @@ class EmbeddingService:
             chunk.embedding_status = "in_progress"
         self.session.flush()
 
-        try:
-            # Extract texts
-            texts = [chunk.content for chunk in chunks]
+        size = self.embedding_config.batch_size
+        batches = [chunks[i:i + size] for i in range(0, len(chunks), size)]
+        processed = failed = 0
+        errors: list[str] = []
+        for embedded in self.dispatcher().dispatch(batches, lambda batch: [chunk.content for chunk in batch]):
+            result = self.store_embedded_batch(embedded, collection_name)
+            processed += result["processed"]
+            failed += result["failed"]
+            if result.get("error"):
+                errors.append(result["error"])
+
+        summary: dict[str, Any] = {"processed": processed, "failed": failed}
+        if errors:
+            summary["error"] = errors[0] if len(errors) == 1 else f"{len(errors)} batches failed; first: {errors[0]}"
+        return summary
+
+    def dispatcher(self, *, max_pending: int | None = None) -> EmbeddingDispatcher:
+        """Dispatcher that runs :meth:`embed_texts` for several batches at once."""
+        return EmbeddingDispatcher(
+            self.embed_texts,
+            concurrency=self.embedding_config.concurrency,
+            max_retries=self.embedding_config.max_retries,
+            max_pending=max_pending,
+        )
+
+    def store_embedded_batch(self, embedded: EmbeddedBatch[list[Chunk]], collection_name: str) -> dict[str, Any]:
+        """Store a dispatched batch, or mark its chunks failed if it could not be embedded."""
+        chunks = embedded.item
+        if embedded.error is not None:
+            logger.error(
+                f"Failed to generate embeddings for {len(chunks)} chunks after "
+                f"{embedded.attempts} attempt(s): {embedded.error}"
+            )
+            for chunk in chunks:
+                chunk.embedding_status = "failed"
+            self.session.commit()
+            return {"processed": 0, "failed": len(chunks), "error": str(embedded.error)}
+        return self.store_chunk_embeddings(chunks, embedded.embeddings or [], collection_name)
 
-            # Check cache
-            cached_embeddings = self._load_cached_embeddings(texts)
-            texts_to_embed = [
-                text for i, text in enumerate(texts) if cached_embeddings.get(i) is None
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embeddings for ``texts`` in order, calling the API only for uncached texts.
+
+        Does not touch the database session, so it can run on a worker thread.
+        """
+        cached_embeddings = self._load_cached_embeddings(texts)
+        texts_to_embed = [
+            text for i, text in enumerate(texts) if cached_embeddings.get(i) is None
+        ]
+
+        # Generate new embeddings
+        if texts_to_embed:
+            logger.info(f"Generating {len(texts_to_embed)} new embeddings...")
+            new_embeddings = self.client.embed_texts(texts_to_embed)
+
+            # Cache new embeddings
+            self._cache_embeddings(texts_to_embed, new_embeddings)
+
+            # Merge cached and new
+            new_iter = iter(new_embeddings)
+            all_embeddings = [
+                cached_embeddings[i] if i in cached_embeddings else next(new_iter)
+                for i in range(len(texts))
             ]
+        else:
+            logger.info("All embeddings loaded from cache.")
+            all_embeddings = [cached_embeddings[i] for i in range(len(texts))]
 
-            # Generate new embeddings
-            if texts_to_embed:
-                logger.info(f"Generating {len(texts_to_embed)} new embeddings...")
-                try:
-                    new_embeddings = self.client.embed_texts(texts_to_embed)
-                except Exception as embed_err:
-                    logger.exception(f"Failed to generate embeddings: {embed_err}")
-                    # Mark chunks as failed
-                    for chunk in chunks:
-                        chunk.embedding_status = "failed"
-                    self.session.commit()
-                    return {"processed": 0, "failed": len(chunks), "error": str(embed_err)}
-
-                # Cache new embeddings
-                for text, embedding in zip(texts_to_embed, new_embeddings):
-                    self._cache_embedding(text, embedding)
-
-                # Merge cached and new
-                import numpy as np
-                new_idx = 0
-                all_embeddings = []
-                for i, text in enumerate(texts):
-                    if cached_embeddings.get(i) is not None:
-                        # Ensure cached embedding is a list
-                        emb = cached_embeddings[i]
-                        if isinstance(emb, np.ndarray):
-                            emb = emb.tolist()
-                        all_embeddings.append(emb)
-                    else:
-                        # Ensure new embedding is a list
-                        emb = new_embeddings[new_idx]
-                        if isinstance(emb, np.ndarray):
-                            emb = emb.tolist()
-                        all_embeddings.append(emb)
-                        new_idx += 1
-            else:
-                logger.info("All embeddings loaded from cache.")
-                import numpy as np
-                all_embeddings = []
-                for i in range(len(texts)):
-                    emb = cached_embeddings[i]
-                    if isinstance(emb, np.ndarray):
-                        emb = emb.tolist()
-                    all_embeddings.append(emb)
-
-            # Store in ChromaDB
-            self._store_in_chroma(chunks, all_embeddings, collection_name)
+        # Chroma expects plain lists
+        return [emb.tolist() if isinstance(emb, np.ndarray) else emb for emb in all_embeddings]
+
+    def store_chunk_embeddings(
+        self, chunks: list[Chunk], embeddings: list[list[float]], collection_name: str
+    ) -> dict[str, Any]:
+        """Store embeddings for ``chunks`` in ChromaDB and mark the chunks completed."""
+        try:
+            self._store_in_chroma(chunks, embeddings, collection_name)
 
             # Mark as completed
             for chunk in chunks:
@@ -263,162 +315,112 @@ class EmbeddingService:
             self.session.commit()
             return {"processed": 0, "failed": len(chunks), "error": str(e)}
 
-    def _load_cached_embeddings(self, texts: list[str]) -> dict[int, list[float]]:
-        """Load cached embeddings for texts."""
-        if not self.embedding_config.cache_dir:
+    def _load_cached_embeddings(self, texts: list[str]) -> dict[int, np.ndarray]:
+        """Load cached embeddings for texts in one batched store lookup."""
+        if self.embedding_store is None:
             return {}
 
-        cached = {}
-        for i, text in enumerate(texts):
-            cache_key = self._compute_cache_key(text)
-            cache_file = self.embedding_config.cache_dir / f"{cache_key}.npy"
-
-            if cache_file.exists():
-                try:
-                    import numpy as np
-
-                    embedding = np.load(cache_file).tolist()
-                    cached[i] = embedding
-                except Exception as e:
-                    logger.warning(f"Failed to load cached embedding: {e}")
-
-        return cached
+        keys = [self._compute_cache_key(text) for text in texts]
+        try:
+            found = self.embedding_store.get_many(
+                keys, dimensions=get_expected_dimensions(self.embedding_config.model)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load cached embeddings: {e}")
+            return {}
+        return {i: found[key] for i, key in enumerate(keys) if key in found}
 
-    def _cache_embedding(self, text: str, embedding: list[float]) -> None:
-        """Cache an embedding to disk."""
-        if not self.embedding_config.cache_dir:
+    def _cache_embeddings(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        """Append newly generated embeddings to the store."""
+        if self.embedding_store is None:
             return
 
         try:
-            import numpy as np
-
-            cache_key = self._compute_cache_key(text)
-            cache_file = self.embedding_config.cache_dir / f"{cache_key}.npy"
-            np.save(cache_file, np.array(embedding))
+            self.embedding_store.put_many(
+                (self._compute_cache_key(text), embedding)
+                for text, embedding in zip(texts, embeddings)
+            )
         except Exception as e:
-            logger.warning(f"Failed to cache embedding: {e}")
+            logger.warning(f"Failed to cache embeddings: {e}")
 
     def _compute_cache_key(self, text: str) -> str:
         """Compute SHA256 hash of text for cache key."""
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return content_hash(text)
 
     def _store_in_chroma(
         self, chunks: list[Chunk], embeddings: list[list[float]], collection_name: str
     ) -> None:
         """Store embeddings in ChromaDB with dimension validation."""
+        chroma_path = Path(self.config.data_root) / "chroma"
+        registry = get_vector_registry()
         try:
-            import chromadb
+            registry.client(chroma_path)
         except ImportError:
             raise RuntimeError("chromadb not installed. Install with: pip install chromadb")
-
-        chroma_path = Path(self.config.data_root) / "chroma"
-        chroma_path.mkdir(parents=True, exist_ok=True)
-
-        client = chromadb.PersistentClient(path=str(chroma_path))
         
         # Validate embedding dimensions before storing
         expected_dim = get_expected_dimensions(self.embedding_config.model)
+        first_dim: int | None = None
         if embeddings:
-            import numpy as np
-            # Convert first embedding to list if it's a numpy array
             first_emb = embeddings[0]
-            if isinstance(first_emb, np.ndarray):
-                first_emb = first_emb.tolist()
             first_dim = len(first_emb)
             validate_embedding_dimension(first_emb, expected_dim, self.embedding_config.model)
             
             # Validate all embeddings have the same dimension
             for i, emb in enumerate(embeddings):
-                # Convert to list if it's a numpy array
-                if isinstance(emb, np.ndarray):
-                    emb = emb.tolist()
                 if len(emb) != first_dim:
                     raise ValueError(
                         f"Embedding dimension inconsistency: first embedding has {first_dim} dimensions, "
                         f"but embedding {i} has {len(emb)} dimensions"
                     )
         
-        # Check if collection exists and validate dimension compatibility
-        try:
-            existing_collection = client.get_collection(name=collection_name)
-            collection_count = existing_collection.count()
-            
-            if collection_count > 0:
-                # Collection exists and has data - check dimension compatibility
-                # Get a sample embedding from the collection to check dimension
-                sample_result = existing_collection.peek(limit=1)
-                import numpy as np
-                sample_embeddings = sample_result.get("embeddings")
-                # Check if embeddings exist and convert to list if needed
-                if sample_embeddings is not None:
-                    # Convert to list if it's a numpy array
-                    if isinstance(sample_embeddings, np.ndarray):
-                        sample_embeddings = sample_embeddings.tolist()
-                    if len(sample_embeddings) > 0:
-                        sample_emb = sample_embeddings[0]
-                        if isinstance(sample_emb, np.ndarray):
-                            sample_emb = sample_emb.tolist()
-                        existing_dim = len(sample_emb)
-                        if embeddings:
-                            # Ensure embeddings[0] is a list for comparison
-                            first_emb = embeddings[0]
-                            if isinstance(first_emb, np.ndarray):
-                                first_emb = first_emb.tolist()
-                            if len(first_emb) != existing_dim:
-                                raise ValueError(
-                                    f"Dimension mismatch in collection '{collection_name}': "
-                                    f"existing embeddings have {existing_dim} dimensions, "
-                                    f"but new embeddings have {len(first_emb)} dimensions. "
-                                    f"This usually means the embedding model was changed. "
-                                    f"To fix this, either:\n"
-                                    f"  1. Delete the ChromaDB collection using: "
-                                    f"     python -c \"import chromadb; c = chromadb.PersistentClient(path='{chroma_path}'); c.delete_collection('{collection_name}')\"\n"
-                                    f"  2. Or use the same embedding model ({self.embedding_config.model} -> {existing_dim} dims) "
-                                    f"that was used to create the collection"
-                                )
-                            else:
-                                logger.debug(
-                                    f"Collection '{collection_name}' dimension validated: {existing_dim} dimensions"
-                                )
-        except Exception as e:
-            # Collection doesn't exist yet or other error - will be created or re-raised
-            if "does not exist" not in str(e).lower() and "not found" not in str(e).lower():
-                # Re-raise if it's not a "collection doesn't exist" error
-                raise
+        # Check dimension compatibility against the collection (memoized per process)
+        existing_dim = registry.collection_dimension(chroma_path, collection_name)
+        if existing_dim is not None and first_dim is not None:
+            if first_dim != existing_dim:
+                raise ValueError(
+                    f"Dimension mismatch in collection '{collection_name}': "
+                    f"existing embeddings have {existing_dim} dimensions, "
+                    f"but new embeddings have {first_dim} dimensions. "
+                    f"This usually means the embedding model was changed. "
+                    f"To fix this, either:\n"
+                    f"  1. Delete the ChromaDB collection using: "
+                    f"     python -c \"import chromadb; c = chromadb.PersistentClient(path='{chroma_path}'); c.delete_collection('{collection_name}')\"\n"
+                    f"  2. Or use the same embedding model ({self.embedding_config.model} -> {existing_dim} dims) "
+                    f"that was used to create the collection"
+                )
+            logger.debug(
+                f"Collection '{collection_name}' dimension validated: {existing_dim} dimensions"
+            )
         
-        collection = client.get_or_create_collection(name=collection_name)
+        collection = registry.get_collection(chroma_path, collection_name, create=True)
 
         # Prepare data
         ids = [chunk.chunk_id for chunk in chunks]
         documents = [chunk.content for chunk in chunks]
+        # Every vector carries its token count and content hash so retrieval never re-tokenizes
+        token_counts = resolve_token_counts(chunks, self._token_estimator)
         metadatas = []
-        for chunk in chunks:
-            # ChromaDB only accepts primitive types in metadata (str, int, float, bool, None)
-            # Flatten nested dicts and convert complex types to strings
-            metadata = {
-                "chunk_pk": chunk.id,
-                "chunk_id": chunk.chunk_id,
-                "document_id": chunk.document_id,
-                "chunk_index": chunk.chunk_index,
-                "section_path": chunk.section_path or "",
-                "parent_heading": chunk.parent_heading or "",
-                "token_count": chunk.token_count or 0,
-            }
-            # Flatten chunk_metadata, converting dicts to JSON strings
-            if chunk.chunk_metadata:
-                import json
-                for key, value in chunk.chunk_metadata.items():
-                    if isinstance(value, (dict, list)):
-                        metadata[key] = json.dumps(value)
-                    elif isinstance(value, (str, int, float, bool)) or value is None:
-                        metadata[key] = value
-                    else:
-                        metadata[key] = str(value)
-            metadatas.append(metadata)
+        for chunk, token_count in zip(chunks, token_counts):
+            if not chunk.token_count:
+                chunk.token_count = token_count
+            metadatas.append(chunk_vector_metadata(chunk, token_count))
 
         # Add to collection with error handling for dimension mismatches
         try:
-            collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+            try:
+                collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+            except Exception as e:
+                # The cached handle is stale if the collection was deleted elsewhere
+                if "does not exist" not in str(e).lower():
+                    raise
+                registry.forget_collection(chroma_path, collection_name)
+                collection = registry.get_collection(chroma_path, collection_name, create=True)
+                collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+            if first_dim is not None:
+                registry.record_dimension(chroma_path, collection_name, first_dim)
+            # Cached search results for this collection predate the write
+            get_retrieval_cache().invalidate(chroma_path, collection_name)
             if embeddings:
                 logger.info(
                     f"Stored {len(chunks)} embeddings ({len(embeddings[0])} dimensions) "
@@ -435,6 +437,39 @@ class EmbeddingService:
                 ) from e
             raise
 
+    def update_vector_metadata(self, chunks: list[Chunk], collection_name: str) -> int:
+        """Rewrite the stored metadata of already-embedded chunks without re-embedding them."""
+        collection = self._existing_collection(collection_name)
+        if collection is None or not chunks:
+            return 0
+        token_counts = resolve_token_counts(chunks, self._token_estimator)
+        collection.update(
+            ids=[chunk.chunk_id for chunk in chunks],
+            metadatas=[chunk_vector_metadata(chunk, count) for chunk, count in zip(chunks, token_counts)],
+        )
+        get_retrieval_cache().invalidate(Path(self.config.data_root) / "chroma", collection_name)
+        return len(chunks)
+
+    def delete_vectors(self, chunk_ids: list[str], collection_name: str) -> int:
+        """Remove the vectors of deleted chunks from the collection."""
+        collection = self._existing_collection(collection_name)
+        if collection is None or not chunk_ids:
+            return 0
+        collection.delete(ids=chunk_ids)
+        get_retrieval_cache().invalidate(Path(self.config.data_root) / "chroma", collection_name)
+        logger.info(f"Deleted {len(chunk_ids)} vectors from ChromaDB collection '{collection_name}'.")
+        return len(chunk_ids)
+
+    def _existing_collection(self, collection_name: str) -> Any | None:
+        """The collection if ChromaDB is installed and the collection exists; no vectors to touch otherwise."""
+        chroma_path = Path(self.config.data_root) / "chroma"
+        registry = get_vector_registry()
+        try:
+            registry.client(chroma_path)
+        except ImportError:
+            return None
+        return registry.get_collection(chroma_path, collection_name)
+
     def create_embedding_job(self, doc_id: int, job_type: str = "manual") -> EmbeddingJob:
         """Create a new embedding job record."""
         job = EmbeddingJob(
@@ -462,6 +497,8 @@ class EmbeddingService:
     def close(self):
         """Close resources."""
         self.client.close()
+        if self.embedding_store is not None:
+            self.embedding_store.close()
 
 
 def process_legislation_file(file, filename: str, db_session: Session, config: AppConfig | None = None) -> dict[str, Any]:
@@ -491,7 +528,9 @@ def process_legislation_file(file, filename: str, db_session: Session, config: A
     from ..config.settings import AppConfig
     from ..db.models import Document, Chunk, Legislation
     from .documents import DocumentService, DocumentUploadError
+    from .chunk_store import ChunkWriteReport, chunk_values, insert_chunks
     from .chunking import SemanticChunker, SectionText
+    from .section_index import index_document_sections
     from ..processing.extraction import DocumentExtractor, ExtractionError
     
     if config is None:
@@ -599,7 +638,7 @@ def process_legislation_file(file, filename: str, db_session: Session, config: A
                 )
         
         logger.info(f"Extracting from storage path: {storage_path}")
-        extractor = DocumentExtractor()
+        extractor = DocumentExtractor(pdf_workers=config.pdf_extraction_workers)
         
         try:
             extracted_doc = extractor.extract(storage_path)
@@ -684,37 +723,26 @@ def process_legislation_file(file, filename: str, db_session: Session, config: A
         # Step 4: Create Chunk objects in database
         chunk_objects = []
         try:
-            for idx, payload in enumerate(payloads):
-                metadata = {
-                    **payload.metadata,
-                    "chunk_id": payload.chunk_id,
-                    "section_path": payload.section_path,
-                    "parent_heading": payload.parent_heading,
-                }
-                section_path = " > ".join(payload.section_path).strip() if payload.section_path else None
-                chunk_row = Chunk(
-                    document_id=document.id,
-                    chunk_id=payload.chunk_id,
-                    chunk_index=idx,
-                    section_path=section_path,
-                    parent_heading=payload.parent_heading,
-                    content=payload.text,
-                    token_count=payload.token_count,
-                    chunk_metadata=metadata,
-                    embedding_status="pending",  # Mark as pending for embedding
-                )
-                chunk_objects.append(chunk_row)
-                db_session.add(chunk_row)
-            
+            values = [
+                chunk_values(document.id, payload, idx, with_path_metadata=True)
+                for idx, payload in enumerate(payloads)
+            ]
+
             # Retry commit on database lock errors
             import time
             max_retries = 5
             retry_delay = 0.1
             
             for attempt in range(max_retries):
+                writes = ChunkWriteReport()
                 try:
+                    chunk_objects = insert_chunks(db_session, values, report=writes)
+                    index_document_sections(db_session, document, chunk_objects)
                     db_session.commit()
-                    logger.info(f"Saved {len(chunk_objects)} chunks to database")
+                    logger.info(
+                        f"Saved {len(chunk_objects)} chunks to database "
+                        f"({writes.rows_per_second:.0f} rows/s)"
+                    )
                     break
                 except Exception as e:
                     if "database is locked" in str(e).lower() and attempt < max_retries - 1:
@@ -722,9 +750,6 @@ def process_legislation_file(file, filename: str, db_session: Session, config: A
                         wait_time = retry_delay * (2 ** attempt)
                         logger.warning(f"Database locked, retrying in {wait_time}s (attempt {attempt + 1}/{max_retries})")
                         time.sleep(wait_time)
-                        # Re-add chunks for retry
-                        for chunk_row in chunk_objects:
-                            db_session.add(chunk_row)
                         continue
                     # Re-raise if not a lock error or last attempt
                     raise
@@ -738,36 +763,14 @@ def process_legislation_file(file, filename: str, db_session: Session, config: A
         embedding_service = None
         try:
             embedding_service = EmbeddingService(db_session, config)
-            # Process in smaller batches to avoid large API responses
-            # OpenRouter may have limits on response size, so use smaller batches
-            batch_size = 100  # Reduced from 1024 to avoid large JSON responses
-            total_processed = 0
-            total_failed = 0
-            
-            for i in range(0, len(chunk_objects), batch_size):
-                batch = chunk_objects[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (len(chunk_objects) + batch_size - 1) // batch_size
-                
-                logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} chunks)...")
-                
-                try:
-                    # Use the same collection name as regulations
-                    result = embedding_service.process_chunks(batch, collection_name="regulation_chunks")
-                    
-                    total_processed += result["processed"]
-                    total_failed += result["failed"]
-                    
-                    logger.info(f"  Processed: {result['processed']}, Failed: {result['failed']}")
-                    
-                    if result.get("error"):
-                        logger.warning(f"Batch {batch_num} had errors: {result['error']}")
-                except Exception as e:
-                    logger.exception(f"Failed to process batch {batch_num}: {e}")
-                    total_failed += len(batch)
-                    # Continue with next batch instead of failing completely
-                    continue
-            
+            # process_chunks sends batches of 100 concurrently and retries each batch on its own;
+            # use the same collection name as regulations
+            result = embedding_service.process_chunks(chunk_objects, collection_name="regulation_chunks")
+            total_processed = result["processed"]
+            total_failed = result["failed"]
+            if result.get("error"):
+                logger.warning(f"Embedding batches had errors: {result['error']}")
+
             if total_failed > 0:
                 logger.warning(f"Embedding generation completed with {total_failed} failures out of {len(chunk_objects)} chunks")
             else:
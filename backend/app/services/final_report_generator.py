@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from ..config.settings import AppConfig
 from ..db.models import Audit, AuditChunkResult, Citation, Flag
 from .analysis import ComplianceLLMClient
+from .rate_limiter import estimate_chat_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -254,8 +255,11 @@ Return ONLY valid JSON, no markdown, no code blocks.
                 "max_tokens": 4000,  # Allow for comprehensive reports
             }
             
+            rate_limiter = get_rate_limiter(self.config)
+            rate_limiter.acquire(tokens=estimate_chat_tokens(payload, self.config.rate_limit_completion_tokens))
             with httpx.Client(timeout=self.llm_client.config.timeout) as client:
                 response = client.post(api_url, headers=headers, json=payload)
+                rate_limiter.observe_response(response)
                 response.raise_for_status()
                 result = response.json()
                 
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..db.models import Audit, Citation, Flag
+from .compliance_score import rebuild_flag_summary, record_flag
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +34,12 @@ class FlagSynthesizer:
             .where(Flag.chunk_id == chunk_id)
         )
         flag = self.session.execute(stmt).scalar_one_or_none()
+        previous = None
         if flag is None:
             flag = Flag(audit_id=audit_id, chunk_id=chunk_id)
             self.session.add(flag)
+        else:
+            previous = (flag.flag_type, flag.severity_score)
 
         flag.flag_type = flag_type
         flag.severity_score = severity_score
@@ -63,6 +67,13 @@ class FlagSynthesizer:
                     Citation(citation_type="regulation", reference=str(ref).strip())
                 )
 
+        # Keep the audit's materialized summary current; a re-scored flag changes
+        # history the running state has already folded in, so that case rebuilds it
+        if previous is None:
+            record_flag(self.session, audit_id, flag_type, severity_score)
+        elif previous != (flag_type, severity_score):
+            rebuild_flag_summary(self.session, audit_id)
+
         return flag
 
     @staticmethod
@@ -0,0 +1,462 @@
+"""Streaming extract → chunk → persist → embed pipeline for a single document.
+
+Extraction and chunking run on their own threads and hand items over bounded queues,
+so a slow downstream stage holds the upstream ones back instead of letting the whole
+document pile up in memory. The database session is only used on the calling thread;
+embedding requests run concurrently through :class:`EmbeddingDispatcher` while the next
+batches are chunked and inserted.
+
+Re-ingestion is incremental by default: chunks whose text is unchanged keep their row,
+``chunk_id`` and vector, and only new or modified chunks are embedded.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..config.settings import IngestionConfig
+from ..db.models import Chunk, Document
+from ..processing.extraction import DocumentExtractor, ExtractedSection
+from .chunk_store import (
+    ChunkDiff,
+    ChunkWriteReport,
+    StoredChunk,
+    chunk_values,
+    delete_chunks,
+    delete_document_chunks,
+    insert_chunks,
+)
+from .chunking import ChunkPayload, SectionText, SemanticChunker
+from .embedding_dispatcher import EmbeddedBatch
+from .embeddings import EmbeddingService
+from .section_index import delete_document_sections, index_document_sections
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("extract", "chunk", "persist", "embed", "store")
+
+
+@dataclass
+class StageTiming:
+    """Work done by one pipeline stage.
+
+    ``seconds`` is time spent working; ``waited`` is time spent blocked on the stage
+    before it, so a stage with a large ``waited`` was starved rather than slow.
+    """
+
+    name: str
+    items: int = 0
+    seconds: float = 0.0
+    waited: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "items": self.items,
+            "seconds": round(self.seconds, 3),
+            "waited": round(self.waited, 3),
+            "items_per_second": round(self.items / self.seconds, 1) if self.seconds > 0 else None,
+        }
+
+
+@dataclass
+class IngestionResult:
+    chunks_created: int = 0
+    # Unchanged chunks kept from the previous ingestion, and stored chunks no longer present
+    chunks_reused: int = 0
+    chunks_removed: int = 0
+    embeddings_generated: int = 0
+    embeddings_failed: int = 0
+    elapsed_seconds: float = 0.0
+    # Seconds from the start of the run until the first embeddings were stored
+    first_embedding_seconds: float | None = None
+    stages: dict[str, StageTiming] = field(
+        default_factory=lambda: {name: StageTiming(name) for name in STAGES}
+    )
+    writes: ChunkWriteReport = field(default_factory=ChunkWriteReport)
+
+    @property
+    def chunk_count(self) -> int:
+        return self.chunks_created + self.chunks_reused
+
+    def timings(self) -> dict[str, Any]:
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "first_embedding_seconds": (
+                round(self.first_embedding_seconds, 3) if self.first_embedding_seconds is not None else None
+            ),
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "chunk_rows_per_second": round(self.writes.rows_per_second),
+        }
+
+
+@dataclass
+class _RunLog:
+    """What a run changed, so a failed run can be undone."""
+
+    inserted: list[tuple[int, str]] = field(default_factory=list)
+    # Retained chunks' values before this run rewrote them, by primary key
+    originals: dict[int, dict[str, Any]] = field(default_factory=dict)
+    # Every column of the stored chunks this run deleted, and the ids whose vectors it deleted
+    deleted: list[dict[str, Any]] = field(default_factory=list)
+    removed_vectors: list[str] = field(default_factory=list)
+
+
+_RETAINED_FIELDS = ("chunk_index", "section_path", "parent_heading", "token_count", "chunk_metadata")
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+class _QueueStage:
+    """Runs an iterator on a daemon thread, handing its items over a bounded queue."""
+
+    def __init__(self, name: str, source: Iterable[Any], timing: StageTiming, *, maxsize: int, stop: threading.Event):
+        self.name = name
+        self.timing = timing
+        self._source = source
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = stop
+        self._thread = threading.Thread(target=self._run, name=f"ingest-{name}", daemon=True)
+
+    def start(self) -> "_QueueStage":
+        self._thread.start()
+        return self
+
+    def drain(self, consumer: StageTiming) -> Iterator[Any]:
+        """Yield the stage's items, charging time blocked on the queue to ``consumer``."""
+        while True:
+            started = time.perf_counter()
+            item = self._queue.get()
+            consumer.waited += time.perf_counter() - started
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def _run(self) -> None:
+        try:
+            iterator = iter(self._source)
+            while True:
+                started, waited = time.perf_counter(), self.timing.waited
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    # Time the source spent blocked on an upstream stage is already in ``waited``
+                    self.timing.seconds += time.perf_counter() - started - (self.timing.waited - waited)
+                self.timing.items += 1
+                if not self._put(item):
+                    return
+        except BaseException as exc:  # handed to the consumer, which re-raises it
+            self._put(_Failure(exc))
+            return
+        self._put(_DONE)
+
+    def _put(self, item: Any) -> bool:
+        # Poll so a consumer that gave up (stop set) never leaves this thread blocked
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class StreamingIngestionPipeline:
+    """Extracts, chunks, persists and embeds one document with bounded memory."""
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        extractor: DocumentExtractor,
+        chunker: SemanticChunker,
+        embedding_service: EmbeddingService,
+        config: IngestionConfig,
+    ):
+        self.session = session
+        self.extractor = extractor
+        self.chunker = chunker
+        self.embedding_service = embedding_service
+        self.config = config
+
+    def run(
+        self,
+        document: Document,
+        document_path: Path,
+        *,
+        collection_name: str,
+        extracted_json_path: Path | None = None,
+        incremental: bool = True,
+    ) -> IngestionResult:
+        """Replace the document's chunks and vectors with freshly extracted ones.
+
+        With ``incremental`` stored chunks are matched by content hash: matches keep their
+        ``chunk_id`` and vector, and only stored chunks left unmatched are deleted, after the
+        new ones are in place. Otherwise the whole document is chunked first, and only then
+        are every stored chunk and its vector replaced, so an extraction error leaves them
+        untouched; this holds the document's chunk payloads in memory.
+        ``extracted_json_path`` receives the same JSON as :meth:`ExtractedDocument.to_json`,
+        written as sections are extracted. Vectors of stored chunks that are gone are
+        deleted last, once every new chunk is stored.
+
+        If any stage fails, the chunks inserted by this run and their vectors are deleted,
+        deleted chunks are inserted again, retained chunks get their previous values back
+        and the section entries of the remaining chunks are rebuilt before the error is
+        re-raised. Restored chunks whose vector this run overwrote or deleted are marked
+        ``pending`` so they are embedded again.
+        """
+        result = IngestionResult()
+        stages = result.stages
+        started = time.perf_counter()
+        stop = threading.Event()
+        log = _RunLog()
+
+        if incremental:
+            diff = ChunkDiff.load(self.session, document)
+            # Section entries are rebuilt for retained chunks too, as their paths may have moved
+            delete_document_sections(self.session, document)
+        else:
+            diff = ChunkDiff()
+
+        sections: Iterable[ExtractedSection] = (
+            self.extractor.iter_sections_to_json(document_path, extracted_json_path)
+            if extracted_json_path is not None
+            else self.extractor.iter_sections(document_path)
+        )
+        extract = _QueueStage(
+            "extract", sections, stages["extract"], maxsize=self.config.queue_size, stop=stop
+        ).start()
+        chunk = _QueueStage(
+            "chunk",
+            self.chunker.iter_chunks(
+                str(document.external_id),
+                (self._section_text(section) for section in extract.drain(stages["chunk"])),
+                section_aware=True,
+            ),
+            stages["chunk"],
+            maxsize=self.config.queue_size,
+            stop=stop,
+        ).start()
+
+        # Batches are inserted on this thread as the dispatcher asks for more work, so
+        # inserts stop once max_in_flight batches are waiting on the embedding API
+        payloads = chunk.drain(stages["persist"])
+        if not incremental:
+            payloads = self._replace_after_chunking(document, payloads, result, log)
+        resolved = self._batches(diff.resolve(payloads))
+        persisted = (
+            rows
+            for rows in (self._persist(document, batch, collection_name, result, log) for batch in resolved)
+            if rows
+        )
+        dispatcher = self.embedding_service.dispatcher(max_pending=self.config.max_in_flight)
+        try:
+            try:
+                for embedded in dispatcher.dispatch(persisted, lambda rows: [row.content for row in rows]):
+                    self._store(embedded, collection_name, result, started)
+            finally:
+                stop.set()
+            if incremental:
+                self._remove(diff.unmatched(), collection_name, result, log)
+            else:
+                current = {chunk_id for _, chunk_id in log.inserted}
+                stale = [row["chunk_id"] for row in log.deleted if row["chunk_id"] not in current]
+                self._delete_vectors(stale, collection_name, log)
+        except BaseException:
+            self._undo(document, log, collection_name)
+            raise
+
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            "Ingested document %s: %s new, %s unchanged, %s removed chunks, %s embeddings; timings: %s",
+            document.id,
+            result.chunks_created,
+            result.chunks_reused,
+            result.chunks_removed,
+            result.embeddings_generated,
+            result.timings(),
+        )
+        return result
+
+    # ------------------------------------------------------------------ #
+    # Stages
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _section_text(section: ExtractedSection) -> SectionText:
+        return SectionText(
+            index=section.index,
+            title=section.title,
+            content=section.content,
+            section_path=None,  # Will be resolved by chunker
+            metadata=section.metadata,
+        )
+
+    def _replace_after_chunking(
+        self, document: Document, payloads: Iterator[ChunkPayload], result: IngestionResult, log: _RunLog
+    ) -> Iterator[ChunkPayload]:
+        """Delete the stored chunks once every payload is chunked, then yield them.
+
+        Their vectors stay until the run succeeds: new chunks with the same ``chunk_id``
+        overwrite them, and :meth:`run` deletes the rest at the end.
+        """
+        chunked = list(payloads)
+        log.deleted.extend(self._snapshot(Chunk.document_id == document.id))
+        delete_document_chunks(self.session, document, report=result.writes)
+        self.session.commit()
+        yield from chunked
+
+    def _snapshot(self, condition: Any) -> list[dict[str, Any]]:
+        return [dict(row) for row in self.session.execute(select(Chunk.__table__).where(condition)).mappings()]
+
+    def _batches(self, payloads: Iterator[Any]) -> Iterator[list[Any]]:
+        batch: list[Any] = []
+        for payload in payloads:
+            batch.append(payload)
+            if len(batch) >= self.config.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _persist(
+        self,
+        document: Document,
+        batch: list[tuple[ChunkPayload, StoredChunk | None]],
+        collection_name: str,
+        result: IngestionResult,
+        log: _RunLog,
+    ) -> list[Chunk]:
+        """Write one batch and return the chunks that still need embeddings."""
+        started = time.perf_counter()
+        values, retained = [], {}
+        for offset, (payload, match) in enumerate(batch):
+            row = chunk_values(document.id, payload, result.chunk_count + offset)  # Use sequential index
+            if match is None:
+                values.append(row)
+            else:
+                retained[match.id] = row
+        rows = insert_chunks(self.session, values, report=result.writes)
+        log.inserted.extend((row.id, row.chunk_id) for row in rows)
+        kept = self._refresh_retained(retained, log)
+        index_document_sections(self.session, document, rows + kept, replace=False)
+        self.session.commit()
+        result.chunks_created += len(rows)
+        result.chunks_reused += len(kept)
+
+        # Retained vectors keep their embedding; only their metadata (index, links) can move
+        embedded = [chunk for chunk in kept if chunk.embedding_status == "completed"]
+        self.embedding_service.update_vector_metadata(embedded, collection_name)
+        timing = result.stages["persist"]
+        timing.seconds += time.perf_counter() - started
+        timing.items += len(batch)
+        return rows + [chunk for chunk in kept if chunk.embedding_status != "completed"]
+
+    def _refresh_retained(self, retained: dict[int, dict[str, Any]], log: _RunLog) -> list[Chunk]:
+        if not retained:
+            return []
+        chunks = list(self.session.scalars(select(Chunk).where(Chunk.id.in_(list(retained)))))
+        for chunk in chunks:
+            log.originals.setdefault(chunk.id, {key: getattr(chunk, key) for key in _RETAINED_FIELDS})
+            for key in _RETAINED_FIELDS:
+                value = retained[chunk.id][key]
+                if getattr(chunk, key) != value:
+                    setattr(chunk, key, value)
+        self.session.flush()
+        return sorted(chunks, key=lambda chunk: chunk.chunk_index)
+
+    def _remove(
+        self, stale: list[StoredChunk], collection_name: str, result: IngestionResult, log: _RunLog
+    ) -> None:
+        if not stale:
+            return
+        pks = [chunk.id for chunk in stale]
+        log.deleted.extend(self._snapshot(Chunk.id.in_(pks)))
+        result.chunks_removed = delete_chunks(self.session, pks, report=result.writes)
+        self.session.commit()
+        self._delete_vectors([chunk.chunk_id for chunk in stale], collection_name, log)
+
+    def _delete_vectors(self, chunk_ids: list[str], collection_name: str, log: _RunLog) -> None:
+        if not chunk_ids:
+            return
+        # Recorded first: a failed delete may still have removed some of them
+        log.removed_vectors.extend(chunk_ids)
+        self.embedding_service.delete_vectors(chunk_ids, collection_name)
+
+    def _undo(self, document: Document, log: _RunLog, collection_name: str) -> None:
+        """Return the document to its state before a failed run; errors are logged, not raised."""
+        try:
+            self.session.rollback()
+            delete_chunks(self.session, [pk for pk, _ in log.inserted])
+            if log.deleted:
+                touched = {chunk_id for _, chunk_id in log.inserted} | set(log.removed_vectors)
+                self.session.execute(
+                    insert(Chunk.__table__),
+                    [
+                        {**row, "embedding_status": "pending"} if row["chunk_id"] in touched else row
+                        for row in log.deleted
+                    ],
+                )
+            for pk, values in log.originals.items():
+                self.session.execute(update(Chunk).where(Chunk.id == pk).values(**values))
+            chunks = list(
+                self.session.scalars(
+                    select(Chunk)
+                    .where(Chunk.document_id == document.id)
+                    .order_by(Chunk.chunk_index)
+                    .execution_options(populate_existing=True)
+                )
+            )
+            index_document_sections(self.session, document, chunks)
+            self.session.commit()
+            self.embedding_service.delete_vectors([chunk_id for _, chunk_id in log.inserted], collection_name)
+            restored = [c for c in chunks if c.id in log.originals and c.embedding_status == "completed"]
+            self.embedding_service.update_vector_metadata(restored, collection_name)
+            logger.warning(
+                "Undid failed ingestion of document %s: removed %s new chunks, restored %s changed and %s deleted",
+                document.id,
+                len(log.inserted),
+                len(log.originals),
+                len(log.deleted),
+            )
+        except Exception:
+            self.session.rollback()
+            logger.exception("Could not undo failed ingestion of document %s", document.id)
+
+    def _store(
+        self,
+        embedded: EmbeddedBatch[list[Chunk]],
+        collection_name: str,
+        result: IngestionResult,
+        started: float,
+    ) -> None:
+        embedding, stage = result.stages["embed"], result.stages["store"]
+        embedding.seconds += embedded.seconds
+        embedding.items += len(embedded.item)
+        stage.waited += embedded.waited
+
+        working = time.perf_counter()
+        outcome = self.embedding_service.store_embedded_batch(embedded, collection_name)
+        stage.seconds += time.perf_counter() - working
+        stage.items += len(embedded.item)
+        result.embeddings_generated += outcome["processed"]
+        result.embeddings_failed += outcome["failed"]
+        if outcome["processed"] and result.first_embedding_seconds is None:
+            result.first_embedding_seconds = time.perf_counter() - started
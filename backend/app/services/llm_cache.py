@@ -0,0 +1,220 @@
+"""Persistent, content-addressed cache of validated LLM chunk analyses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from ..config.settings import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached value format or key derivation changes
+CACHE_SCHEMA_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with LRU, TTL and size-based eviction.
+
+    Keys are SHA-256 digests of the complete request payload (model, system
+    prompt, rendered user prompt and request parameters), so any change to the
+    prompt template, retrieved context or model produces a new key. Values are
+    the normalized ``ChunkAnalysis`` dicts returned by the client.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_entries: int = 50_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed ON llm_responses (accessed_at)"
+        )
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "LLMResponseCache | None":
+        if not config.llm_cache_enabled:
+            return None
+        ttl_hours = config.llm_cache_ttl_hours
+        return cls(
+            Path(config.data_root) / "cache" / "llm_responses.sqlite3",
+            max_entries=config.llm_cache_max_entries,
+            max_bytes=int(config.llm_cache_max_mb * 1024 * 1024),
+            ttl_seconds=ttl_hours * 3600 if ttl_hours > 0 else None,
+        )
+
+    @staticmethod
+    def make_key(payload: dict[str, Any]) -> str:
+        """Hash a chat completion payload into a stable cache key."""
+        canonical = json.dumps(
+            {"v": CACHE_SCHEMA_VERSION, "payload": payload},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1], now):
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._stats.evictions += 1
+                row = None
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._stats.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, size_bytes, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, size, now, now),
+            )
+            self._stats.stores += 1
+            self._evict(now)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+            ).fetchone()
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stores=self._stats.stores,
+                evictions=self._stats.evictions,
+                entries=entries,
+                size_bytes=size,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then least-recently-used rows until within limits."""
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._stats.evictions += max(cursor.rowcount, 0)
+
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        excess_entries = max(0, entries - self.max_entries)
+        excess_bytes = max(0, size - self.max_bytes)
+        victims: list[str] = []
+        freed = 0
+        for key, row_size in self._conn.execute(
+            "SELECT key, size_bytes FROM llm_responses ORDER BY accessed_at ASC"
+        ):
+            if len(victims) >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append(key)
+            freed += row_size
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", [(k,) for k in victims])
+        self._stats.evictions += len(victims)
+        logger.debug("Evicted %s LLM cache entries (%s bytes)", len(victims), freed)
+
+
+# Global cache shared by all compliance LLM clients in the process
+_global_cache: LLMResponseCache | None = None
+_global_cache_loaded = False
+_global_lock = threading.Lock()
+
+
+def get_llm_response_cache(config: AppConfig | None = None) -> LLMResponseCache | None:
+    """Get the process-wide response cache, or None when caching is disabled."""
+    global _global_cache, _global_cache_loaded
+    with _global_lock:
+        if not _global_cache_loaded:
+            try:
+                _global_cache = LLMResponseCache.from_app_config(config or AppConfig())
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("LLM response cache unavailable: %s", exc)
+                _global_cache = None
+            _global_cache_loaded = True
+        return _global_cache
+
+
+def reset_llm_response_cache() -> None:
+    """Close and forget the global cache (useful for testing)."""
+    global _global_cache, _global_cache_loaded
+    with _global_lock:
+        if _global_cache is not None:
+            _global_cache.close()
+        _global_cache = None
+        _global_cache_loaded = False
@@ -20,6 +20,8 @@ class MetricsCollector:
     chunks_per_minute: float = 0.0
     retry_count: int = 0
     token_usage: int = 0
+    query_embedding_hits: int = 0
+    query_embedding_misses: int = 0
     start_time: float = field(default_factory=time.time)
     last_emission: float = field(default_factory=time.time)
     emission_interval: float = 60.0  # Emit metrics every 60 seconds
@@ -42,6 +44,16 @@ class MetricsCollector:
         """Record a retry attempt."""
         self.retry_count += 1
     
+    def record_query_embedding_lookup(self, hits: int, misses: int) -> None:
+        """Record query embedding cache hits and misses."""
+        self.query_embedding_hits += hits
+        self.query_embedding_misses += misses
+
+    @property
+    def query_embedding_hit_rate(self) -> float:
+        lookups = self.query_embedding_hits + self.query_embedding_misses
+        return self.query_embedding_hits / lookups if lookups else 0.0
+    
     def emit_metrics(self) -> None:
         """Emit current metrics to logs."""
         metrics = {
@@ -49,6 +61,7 @@ class MetricsCollector:
             "chunks_per_minute": round(self.chunks_per_minute, 2),
             "retry_count": self.retry_count,
             "token_usage": self.token_usage,
+            "query_embedding_hit_rate": round(self.query_embedding_hit_rate, 3),
             "elapsed_seconds": round(time.time() - self.start_time, 2),
         }
         logger.info("metrics", **metrics)
@@ -62,6 +75,7 @@ class MetricsCollector:
             "chunks_per_minute": round(self.chunks_per_minute, 2) if elapsed > 0 else 0.0,
             "retry_count": self.retry_count,
             "token_usage": self.token_usage,
+            "query_embedding_hit_rate": round(self.query_embedding_hit_rate, 3),
             "elapsed_seconds": round(elapsed, 2),
         }
 
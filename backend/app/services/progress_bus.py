@@ -0,0 +1,167 @@
+"""In-process feed of audit progress, published by the runner and read by streaming clients."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from ..db.models import Audit, AuditFlagSummary
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+def audit_status_payload(audit: Audit, flag_summary: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Progress of an audit as returned by the status endpoint and pushed to subscribers."""
+    # Calculate progress percentage
+    progress_percent = 0.0
+    if audit.chunk_total > 0:
+        progress_percent = (audit.chunk_completed / audit.chunk_total) * 100
+
+    # Determine current activity message
+    current_activity = None
+    if audit.status == "queued":
+        current_activity = "Waiting in queue..."
+    elif audit.status == "running":
+        if audit.chunk_total == 0:
+            current_activity = "Initializing audit process..."
+        elif audit.chunk_completed == 0:
+            current_activity = f"Starting analysis of {audit.chunk_total} chunks..."
+        elif audit.last_chunk_id:
+            # Show more detailed progress
+            progress_pct = (audit.chunk_completed / audit.chunk_total * 100) if audit.chunk_total > 0 else 0
+            current_activity = (
+                f"Analyzing chunk {audit.chunk_completed + 1} of {audit.chunk_total} "
+                f"({progress_pct:.1f}% complete)"
+            )
+        else:
+            current_activity = f"Analyzing chunk {audit.chunk_completed + 1} of {audit.chunk_total}"
+    elif audit.status == "completed":
+        current_activity = f"Audit completed successfully - {audit.chunk_completed} chunks analyzed"
+    elif audit.status == "failed":
+        # Truncate failure reason for display if too long
+        failure_msg = audit.failure_reason or "Unknown error"
+        if len(failure_msg) > 200:
+            failure_msg = failure_msg[:197] + "..."
+        current_activity = f"Audit failed: {failure_msg}"
+    else:
+        current_activity = f"Status: {audit.status}"
+
+    # Calculate ETA if running
+    eta_seconds = None
+    eta_formatted = None
+    if audit.status == "running" and audit.started_at and audit.chunk_completed > 0 and audit.chunk_total > 0:
+        # Handle both timezone-aware and naive datetimes
+        if audit.started_at.tzinfo is None:
+            # Naive datetime - assume UTC
+            started_at_aware = audit.started_at.replace(tzinfo=timezone.utc)
+        else:
+            started_at_aware = audit.started_at
+        elapsed = (datetime.now(timezone.utc) - started_at_aware).total_seconds()
+        if elapsed > 0 and audit.chunk_completed > 0:
+            rate = audit.chunk_completed / elapsed  # chunks per second
+            remaining_chunks = audit.chunk_total - audit.chunk_completed
+            if rate > 0:
+                eta_seconds = remaining_chunks / rate
+                # Format ETA
+                if eta_seconds < 60:
+                    eta_formatted = f"{int(eta_seconds)}s"
+                elif eta_seconds < 3600:
+                    eta_formatted = f"{int(eta_seconds / 60)}m {int(eta_seconds % 60)}s"
+                else:
+                    hours = int(eta_seconds / 3600)
+                    minutes = int((eta_seconds % 3600) / 60)
+                    eta_formatted = f"{hours}h {minutes}m"
+
+    return {
+        "audit_id": audit.external_id,
+        "status": audit.status,
+        "chunk_total": audit.chunk_total,
+        "chunk_completed": audit.chunk_completed,
+        "progress_percent": round(progress_percent, 1),
+        "current_activity": current_activity,
+        "last_chunk_id": audit.last_chunk_id,
+        "eta_seconds": eta_seconds,
+        "eta_formatted": eta_formatted,
+        "started_at": audit.started_at.isoformat() if audit.started_at else None,
+        "completed_at": audit.completed_at.isoformat() if audit.completed_at else None,
+        "failed_at": audit.failed_at.isoformat() if audit.failed_at else None,
+        "failure_reason": audit.failure_reason,
+        "is_draft": audit.is_draft,
+        "flag_summary": flag_summary,
+    }
+
+
+class ProgressBus:
+    """Keeps the latest progress of each audit and wakes every waiting subscriber on change.
+
+    Subscribers only ever need the newest state, so there are no per-subscriber queues: a
+    slow client skips intermediate updates instead of buffering them. Each published
+    payload gets a ``version`` that clients pass back to wait for the next one.
+    """
+
+    def __init__(self, max_audits: int = 1024):
+        self.max_audits = max_audits
+        self._condition = threading.Condition()
+        self._latest: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._version = 0
+
+    def publish(self, audit_id: str, payload: dict[str, Any]) -> int:
+        with self._condition:
+            self._version += 1
+            self._latest[audit_id] = {**payload, "version": self._version}
+            self._latest.move_to_end(audit_id)
+            while len(self._latest) > self.max_audits:
+                self._latest.popitem(last=False)
+            self._condition.notify_all()
+            return self._version
+
+    def latest(self, audit_id: str) -> dict[str, Any] | None:
+        with self._condition:
+            return self._latest.get(audit_id)
+
+    def wait(self, audit_id: str, *, after: int = 0, timeout: float = 15.0) -> dict[str, Any] | None:
+        """The audit's progress once its version is above ``after``, or ``None`` on timeout."""
+
+        def changed() -> bool:
+            payload = self._latest.get(audit_id)
+            return payload is not None and payload["version"] > after
+
+        with self._condition:
+            if self._condition.wait_for(changed, timeout=timeout):
+                return self._latest[audit_id]
+            return None
+
+
+def publish_audit_status(session: Session, audit: Audit) -> int:
+    """Publish an audit's committed status; call after every commit that changes it."""
+    from .compliance_score import summary_state
+
+    # Flag writes keep the summary row in the identity map, so this rarely queries
+    summary = session.get(AuditFlagSummary, audit.id)
+    flag_summary = summary_state(summary).summary() if summary is not None else None
+    return get_progress_bus().publish(audit.external_id, audit_status_payload(audit, flag_summary))
+
+
+# Global bus shared by every runner and request thread in the process
+_global_bus: ProgressBus | None = None
+_global_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get the process-wide progress bus, creating it on first use."""
+    global _global_bus
+    with _global_lock:
+        if _global_bus is None:
+            _global_bus = ProgressBus()
+        return _global_bus
+
+
+def reset_progress_bus() -> None:
+    """Reset the global progress bus (useful for testing)."""
+    global _global_bus
+    with _global_lock:
+        _global_bus = None
@@ -0,0 +1,200 @@
+"""Process-wide cache of query embeddings used by vector retrieval."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+
+from ..config.settings import AppConfig
+from .embedding_store import EmbeddingStore
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def query_cache_key(text: str) -> str:
+    """Same content key as ``EmbeddingService`` so ingested chunk vectors can be reused."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class QueryEmbeddingStats:
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return (self.memory_hits + self.store_hits) / lookups if lookups else 0.0
+
+
+class QueryEmbeddingCache:
+    """Bounded in-memory LRU of query embeddings backed by persistent embedding stores.
+
+    Lookups check the LRU first, then each backing store in order. Newly embedded
+    queries are written to ``store`` only; ``fallback_stores`` are read-only, which
+    lets retrieval reuse vectors the ingestion pipeline already computed for chunk
+    content (the default query for every chunk) without contending on its files.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        store: EmbeddingStore | None = None,
+        fallback_stores: Sequence[EmbeddingStore] = (),
+        dimensions: int | None = None,
+    ):
+        self.max_entries = max_entries
+        self.store = store
+        self.fallback_stores = list(fallback_stores)
+        self.dimensions = dimensions
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._stats = QueryEmbeddingStats()
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "QueryEmbeddingCache":
+        from .embeddings import get_expected_dimensions
+
+        root = Path(config.data_root) / "cache" / "embedding_store"
+        store: EmbeddingStore | None = None
+        fallbacks: list[EmbeddingStore] = []
+        try:
+            store = EmbeddingStore(root / "queries", config.embedding_model)
+            fallbacks.append(EmbeddingStore(root, config.embedding_model))
+        except Exception as exc:
+            logger.warning("Persistent query embedding cache unavailable: %s", exc)
+        return cls(
+            max_entries=config.query_embedding_cache_size,
+            store=store,
+            fallback_stores=fallbacks,
+            dimensions=get_expected_dimensions(config.embedding_model),
+        )
+
+    def embed(
+        self, texts: Sequence[str], embedder: Callable[[list[str]], Sequence[Sequence[float]]]
+    ) -> list[np.ndarray]:
+        """Return one vector per text, calling ``embedder`` only for texts never seen before."""
+        keys = [query_cache_key(text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        missing_texts = list(dict.fromkeys(text for key, text in zip(keys, texts) if key not in found))
+        if missing_texts:
+            vectors = embedder(missing_texts)
+            if len(vectors) != len(missing_texts):
+                raise ValueError(
+                    f"Embedder returned {len(vectors)} vectors for {len(missing_texts)} query texts"
+                )
+            new_items = [
+                (query_cache_key(text), np.asarray(vector, dtype=np.float32))
+                for text, vector in zip(missing_texts, vectors)
+            ]
+            self._remember(new_items)
+            self._persist(new_items)
+            found.update(new_items)
+        return [found[key] for key in keys]
+
+    def stats(self) -> QueryEmbeddingStats:
+        with self._lock:
+            return QueryEmbeddingStats(
+                memory_hits=self._stats.memory_hits,
+                store_hits=self._stats.store_hits,
+                misses=self._stats.misses,
+                entries=len(self._entries),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        self.clear()
+        for store in [self.store, *self.fallback_stores]:
+            if store is not None:
+                store.close()
+
+    def _lookup(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            memory_hits = len(found)
+            self._stats.memory_hits += memory_hits
+
+        pending = [key for key in keys if key not in found]
+        for store in [self.store, *self.fallback_stores]:
+            if store is None or not pending:
+                continue
+            try:
+                stored = store.get_many(pending, dimensions=self.dimensions)
+            except Exception as exc:
+                logger.warning("Query embedding store lookup failed: %s", exc)
+                continue
+            # Copy out of the memmap so the LRU does not pin mapped files
+            loaded = [(key, np.array(vector)) for key, vector in stored.items()]
+            self._remember(loaded)
+            found.update(loaded)
+            pending = [key for key in pending if key not in stored]
+
+        store_hits = len(found) - memory_hits
+        with self._lock:
+            self._stats.store_hits += store_hits
+            self._stats.misses += len(pending)
+        get_metrics().record_query_embedding_lookup(hits=len(found), misses=len(pending))
+        return found
+
+    def _remember(self, items: list[tuple[str, np.ndarray]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, vector in items:
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _persist(self, items: list[tuple[str, np.ndarray]]) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.put_many(items)
+        except Exception as exc:
+            logger.warning("Failed to persist query embeddings: %s", exc)
+
+
+# Caches shared by every ChromaVectorClient in the process, one per store location and model
+_global_caches: dict[tuple[str, str], QueryEmbeddingCache] = {}
+_global_lock = threading.Lock()
+
+
+def get_query_embedding_cache(config: AppConfig | None = None) -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache for ``config``'s data root and model."""
+    config = config or AppConfig()
+    key = (str(Path(config.data_root).resolve()), config.embedding_model)
+    with _global_lock:
+        cache = _global_caches.get(key)
+        if cache is None:
+            cache = QueryEmbeddingCache.from_app_config(config)
+            _global_caches[key] = cache
+        return cache
+
+
+def reset_query_embedding_cache() -> None:
+    """Close and forget all global caches (useful for testing)."""
+    with _global_lock:
+        for cache in _global_caches.values():
+            cache.close()
+        _global_caches.clear()
@@ -13,6 +13,7 @@ import httpx
 from ..config.settings import AppConfig
 from ..db.models import Audit, AuditorQuestion, Flag
 from ..db.session import get_session
+from .rate_limiter import estimate_chat_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,10 @@ class QuestionGenerator:
         }
 
         try:
+            rate_limiter = get_rate_limiter(self.config)
+            rate_limiter.acquire(tokens=estimate_chat_tokens(payload, self.config.rate_limit_completion_tokens))
             response = self._http_client.post(api_url, headers=headers, json=payload)
+            rate_limiter.observe_response(response)
             response.raise_for_status()
             data = response.json()
             choices = data.get("choices", [])
@@ -0,0 +1,248 @@
+"""Process-wide adaptive rate limiter for outbound LLM and embedding calls."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping
+
+import httpx
+
+from ..config.settings import AppConfig
+from ..logging_config import get_logger
+from .metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+def estimate_request_tokens(*texts: str) -> int:
+    """Cheap token estimate (~4 characters per token) used to charge the TPM budget."""
+    return max(1, sum(len(text) for text in texts if text) // 4)
+
+
+def estimate_chat_tokens(payload: Mapping[str, Any], default_completion_tokens: int) -> int:
+    """TPM charge for a chat completion: the prompt estimate plus the completion budget.
+
+    The budget is the request's ``max_tokens``, or ``default_completion_tokens`` when it
+    sets none, so every chat call site charges the shared budget the same way.
+    """
+    prompt = estimate_request_tokens(*(message.get("content") or "" for message in payload.get("messages", [])))
+    return prompt + int(payload.get("max_tokens") or default_completion_tokens)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the Retry-After delay in seconds, accepting delta-seconds or an HTTP date."""
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Continuously refilled bucket holding at most one minute of budget."""
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = now
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+        self.updated = now
+
+    def resize(self, per_minute: float, now: float) -> None:
+        self.refill(now)
+        self.capacity = per_minute
+        self.level = min(self.level, per_minute)
+
+    def wait_time(self, cost: float) -> float:
+        # Requests larger than the whole bucket are charged at capacity so they can still run.
+        cost = min(cost, self.capacity)
+        if self.level >= cost:
+            return 0.0
+        return (cost - self.level) / self.rate
+
+    def consume(self, cost: float) -> None:
+        self.level -= min(cost, self.capacity)
+
+
+@dataclass(frozen=True)
+class RateLimiterConfig:
+    """Budgets and adaptation parameters for :class:`AdaptiveRateLimiter`."""
+
+    requests_per_minute: float
+    tokens_per_minute: float
+    backoff_base: float = 10.0
+    max_wait: float = 120.0
+    decrease_factor: float = 0.5
+    min_scale: float = 0.1
+    recovery_step: float = 0.05
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "RateLimiterConfig":
+        return cls(
+            requests_per_minute=config.rate_limit_requests_per_minute,
+            tokens_per_minute=config.rate_limit_tokens_per_minute,
+            backoff_base=config.rate_limit_backoff_base,
+            max_wait=config.rate_limit_max_wait,
+        )
+
+
+class AdaptiveRateLimiter:
+    """Token-bucket limiter with request and token budgets that adapts to 429 responses.
+
+    Callers ``acquire`` before each outbound request and report the outcome via
+    ``observe_response`` (or ``record_success`` / ``record_throttle``). A throttle
+    pauses every caller until the provider's Retry-After has elapsed and cuts the
+    effective budget multiplicatively; each success restores it additively, so
+    throughput climbs back towards the configured ceiling once the provider recovers.
+    A budget of 0 disables that dimension.
+    """
+
+    def __init__(
+        self,
+        config: RateLimiterConfig,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.config = config
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._scale = 1.0
+        self._blocked_until = 0.0
+        self._consecutive_throttles = 0
+        self._requests = (
+            TokenBucket(config.requests_per_minute, now) if config.requests_per_minute > 0 else None
+        )
+        self._tokens = (
+            TokenBucket(config.tokens_per_minute, now) if config.tokens_per_minute > 0 else None
+        )
+        self.throttle_count = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def scale(self) -> float:
+        """Fraction of the configured budgets currently in effect."""
+        return self._scale
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request costing ``tokens`` fits both budgets; return seconds waited."""
+        waited = 0.0
+        while (delay := self._try_acquire(tokens, waited)) > 0:
+            self._sleep(delay)
+            waited += delay
+        return waited
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Awaitable variant of :meth:`acquire` that yields to the event loop while waiting."""
+        waited = 0.0
+        while (delay := self._try_acquire(tokens, waited)) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def _try_acquire(self, tokens: int, waited: float) -> float:
+        """Consume budget and return 0, or return how long to wait before retrying."""
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._blocked_until - now)
+            if delay > 0:
+                return delay
+            for bucket, cost in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None and cost > 0:
+                    bucket.refill(now)
+                    delay = max(delay, bucket.wait_time(cost))
+            if delay > 0:
+                return delay
+            if self._requests is not None:
+                self._requests.consume(1)
+            if self._tokens is not None and tokens > 0:
+                self._tokens.consume(tokens)
+            self.total_wait_seconds += waited
+            return 0.0
+
+    def record_success(self) -> None:
+        """Additively restore budget after a request the provider accepted."""
+        with self._lock:
+            self._consecutive_throttles = 0
+            if self._scale < 1.0:
+                self._set_scale(min(1.0, self._scale + self.config.recovery_step))
+
+    def record_throttle(self, retry_after: float | None = None) -> float:
+        """Register a 429: pause all callers and shrink the budget. Returns the pause length."""
+        with self._lock:
+            self._consecutive_throttles += 1
+            self.throttle_count += 1
+            if retry_after is None:
+                retry_after = self.config.backoff_base * (2 ** (self._consecutive_throttles - 1))
+            pause = min(retry_after, self.config.max_wait)
+            self._blocked_until = max(self._blocked_until, self._clock() + pause)
+            self._set_scale(max(self.config.min_scale, self._scale * self.config.decrease_factor))
+        get_metrics().record_retry()
+        logger.warning(
+            "Rate limit hit, pausing outbound calls",
+            pause_seconds=round(pause, 2),
+            budget_scale=round(self._scale, 3),
+        )
+        return pause
+
+    def observe_response(self, response: httpx.Response) -> None:
+        """Feed an HTTP response back into the limiter."""
+        if response.status_code == 429:
+            self.record_throttle(parse_retry_after(response.headers))
+        elif response.status_code < 400:
+            self.record_success()
+
+    def _set_scale(self, scale: float) -> None:
+        self._scale = scale
+        now = self._clock()
+        if self._requests is not None:
+            self._requests.resize(self.config.requests_per_minute * scale, now)
+        if self._tokens is not None:
+            self._tokens.resize(self.config.tokens_per_minute * scale, now)
+
+
+# Global limiter shared by every outbound LLM and embedding call in the process
+_global_rate_limiter: AdaptiveRateLimiter | None = None
+_global_lock = threading.Lock()
+
+
+def get_rate_limiter(config: AppConfig | None = None) -> AdaptiveRateLimiter:
+    """Get the process-wide rate limiter, creating it from ``config`` on first use."""
+    global _global_rate_limiter
+    with _global_lock:
+        if _global_rate_limiter is None:
+            _global_rate_limiter = AdaptiveRateLimiter(
+                RateLimiterConfig.from_app_config(config or AppConfig())
+            )
+        return _global_rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    """Reset the global rate limiter (useful for testing)."""
+    global _global_rate_limiter
+    with _global_lock:
+        _global_rate_limiter = None
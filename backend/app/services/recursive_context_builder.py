@@ -11,17 +11,22 @@ Implements recursive RAG that:
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
-from collections import deque
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any
+from functools import partial
+from typing import Any, Callable
 
 from sqlalchemy.orm import Session
 
 from ..config.settings import AppConfig
 from ..db.models import Chunk
-from .context_builder import ContextBuilder, ContextBundle, ContextSlice
+from .context_builder import ContextBuilder, ContextBundle, ContextSlice, is_usable_match, stored_token_count
+from .section_index import REGULATION_SOURCE_TYPES, SectionIndex, chunk_section_path
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +40,12 @@ class Reference:
 
 
 class ReferenceExtractor:
-    """Extracts section/subsection references from text."""
+    """Extracts section/subsection references from text.
+
+    ``extract_references`` scans each text once and memoizes the result by content hash
+    for the lifetime of the process, so a chunk revisited at another depth, or by the
+    next audit question, is never rescanned.
+    """
     
     # Patterns for common section reference formats
     SECTION_PATTERNS = [
@@ -61,53 +71,213 @@ class ReferenceExtractor:
         re.compile(r'^\d+\.\d+\.\d+\.\d+$'),  # IP addresses
     ]
     
+    # Words near a bare number that mark it as a section reference
+    SECTION_KEYWORDS = ('section', 'chapter', 'part', 'osa', 'kohdassa', 'kohta', 'appendix')
+    
+    # Memoized results, shared by every extractor in the process
+    CACHE_SIZE = 8192
+    
+    # Single-pass scanner tables. Every reference contains a digit, so the scanner visits
+    # each digit run once, checks which keyword (if any) ends just before it, and confirms
+    # the candidate with the matching SECTION_PATTERNS entry anchored at the keyword.
+    # Matching happens on lowercased text so the patterns run case-sensitively.
+    _LOWER_PATTERNS = [re.compile(p.pattern.replace('[A-Z]', '[a-z]')) for p in SECTION_PATTERNS]
+    _WHITESPACE_KEYWORDS = (
+        (0, ('section', 'sect.', 'sect')),
+        (1, ('chapter', 'ch.', 'ch')),
+        (3, ('osa',)),
+        (4, ('kohdassa',)),
+    )
+    _WHITESPACE_KEYWORD_ENDINGS = frozenset('nt.rha')
+    _PART, _GENERIC = 2, 5
+    _DIGIT_RUN = re.compile(r'\d+')
+    _EXCLUDE = re.compile('|'.join(p.pattern for p in EXCLUDE_PATTERNS))
+    _VERSION_LIKE = re.compile(r'\d{4}|\d+\.\d+\.\d+')
+    
+    _cache: OrderedDict[bytes, tuple[Reference, ...]] = OrderedDict()
+    _cache_lock = threading.Lock()
+    
     def extract_references(self, text: str) -> list[Reference]:
         """Extract all section/subsection references from text."""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cache = ReferenceExtractor._cache
+        with self._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                return list(cached)
+        
+        references = self._scan(text)
+        with self._cache_lock:
+            cache[key] = tuple(references)
+            while len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+        return references
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._cache_lock:
+            ReferenceExtractor._cache.clear()
+    
+    def _scan(self, text: str) -> list[Reference]:
+        """Single pass over the digit runs in ``text``; same results as ``_scan_patterns``."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets (rare non-ASCII text); use the per-pattern scan
+            return self._scan_patterns(text)
+        
+        patterns = self._LOWER_PATTERNS
+        found: list[list[re.Match[str]]] = [[] for _ in patterns]
+        resume_at = [0] * len(patterns)  # emulates finditer's non-overlapping matches per pattern
+        
+        def try_match(index: int, start: int) -> None:
+            if start >= resume_at[index]:
+                match = patterns[index].match(lowered, start)
+                if match:
+                    resume_at[index] = match.end()
+                    found[index].append(match)
+        
+        for run in self._DIGIT_RUN.finditer(lowered):
+            digits = run.start()
+            keyword_end = digits
+            while keyword_end > 0 and lowered[keyword_end - 1].isspace():
+                keyword_end -= 1
+            if keyword_end < digits and lowered[keyword_end - 1] in self._WHITESPACE_KEYWORD_ENDINGS:
+                for index, keywords in self._WHITESPACE_KEYWORDS:
+                    for keyword in keywords:
+                        if lowered.endswith(keyword, 0, keyword_end):
+                            try_match(index, keyword_end - len(keyword))
+                            break
+            if lowered.endswith('part', 0, digits):
+                try_match(self._PART, digits - 4)
+            elif digits >= 5 and (lowered[digits - 1] == '-' or lowered[digits - 1].isspace()) \
+                    and lowered.endswith('part', 0, digits - 1):
+                try_match(self._PART, digits - 5)
+            if digits == 0 or not (lowered[digits - 1].isalnum() or lowered[digits - 1] == '_'):
+                try_match(self._GENERIC, digits)
+        
+        return self._filter_matches(text, [(index, match) for index, matches in enumerate(found) for match in matches])
+    
+    def _scan_patterns(self, text: str) -> list[Reference]:
+        """Reference implementation: one ``finditer`` pass per pattern."""
+        matches = [
+            (index, match)
+            for index, pattern in enumerate(self.SECTION_PATTERNS)
+            for match in pattern.finditer(text)
+        ]
+        return self._filter_matches(text, matches)
+    
+    def _filter_matches(self, text: str, matches: list[tuple[int, re.Match[str]]]) -> list[Reference]:
         references: list[Reference] = []
         seen = set()
         
-        for pattern in self.SECTION_PATTERNS:
-            for match in pattern.finditer(text):
-                ref_text = match.group(0).strip()
-                section_num = match.group(1) if match.groups() else None
-                
-                # Skip if matches exclusion patterns
-                if any(exclude_pattern.search(ref_text) for exclude_pattern in self.EXCLUDE_PATTERNS):
-                    continue
-                
-                # Skip very short matches that are likely false positives
-                if len(ref_text) < 3:
+        for index, match in matches:
+            ref_text = text[match.start():match.end()].strip()
+            
+            # Skip if matches exclusion patterns, or very short matches that are likely false positives
+            if self._EXCLUDE.search(ref_text) or len(ref_text) < 3:
+                continue
+            
+            # A bare number that looks like a date or version needs section-related words nearby
+            if index == self._GENERIC and self._VERSION_LIKE.search(ref_text):
+                context_before = text[max(0, match.start() - 20):match.start()].lower()
+                context_after = text[match.end():match.end() + 20].lower()
+                if not any(keyword in context_before or keyword in context_after for keyword in self.SECTION_KEYWORDS):
                     continue
-                
-                # Skip if it's just a number without context (likely not a section reference)
-                if pattern == self.SECTION_PATTERNS[-1]:  # The generic \d+\.\d+ pattern
-                    # Check if it's preceded/followed by section-related words
-                    start_pos = match.start()
-                    end_pos = match.end()
-                    context_before = text[max(0, start_pos-20):start_pos].lower()
-                    context_after = text[end_pos:min(len(text), end_pos+20)].lower()
-                    
-                    # Skip if no section-related context
-                    section_keywords = ['section', 'chapter', 'part', 'osa', 'kohdassa', 'kohta', 'appendix']
-                    if not any(keyword in context_before or keyword in context_after for keyword in section_keywords):
-                        # Also skip if it looks like a date or version number
-                        if re.search(r'\d{4}', ref_text) or re.search(r'v?\d+\.\d+\.\d+', ref_text):
-                            continue
-                
-                # Avoid duplicates
-                if ref_text.lower() not in seen:
-                    seen.add(ref_text.lower())
-                    references.append(Reference(
-                        text=ref_text,
-                        section_number=section_num,
-                        section_path=None  # Will be resolved during RAG
-                    ))
+            
+            # Avoid duplicates
+            if ref_text.lower() not in seen:
+                seen.add(ref_text.lower())
+                references.append(Reference(
+                    text=ref_text,
+                    section_number=match.group(1),
+                    section_path=None  # Will be resolved during RAG
+                ))
         
         return references
 
 
+@dataclass
+class _PendingSearch:
+    """A vector search planned during expansion; ``result`` is filled once it has run."""
+    run: Callable[[], list[ContextSlice]]
+    result: list[ContextSlice] = field(default_factory=list)
+    done: bool = False
+
+    @classmethod
+    def resolved(cls, result: list[ContextSlice]) -> "_PendingSearch":
+        """A search answered during planning (e.g. by the section index) that never runs."""
+        return cls(run=lambda: result, result=result, done=True)
+
+
+@dataclass
+class _ChunkExpansion:
+    """Searches issued for one chunk, merged back in a fixed order."""
+    chunk_id: str
+    depth: int
+    concept: _PendingSearch | None = None
+    references: list[tuple[_PendingSearch, _PendingSearch | None]] = field(default_factory=list)
+    litigation: _PendingSearch | None = None
+
+    def searches(self) -> list[_PendingSearch]:
+        searches = [self.concept] if self.concept is not None else []
+        for manual_search, regulation_search in self.references:
+            searches.append(manual_search)
+            if regulation_search is not None:
+                searches.append(regulation_search)
+        if self.litigation is not None:
+            searches.append(self.litigation)
+        return searches
+
+
+class SliceRegistry:
+    """Per-category ordered sets of context slices keyed by ``chunk_id``.
+
+    Membership checks are constant time, and a category stops accepting slices
+    once it holds ``caps[category]`` entries so callers can skip searches whose
+    results could no longer make it into the bundle.
+    """
+
+    def __init__(self, caps: dict[str, int]):
+        self.caps = dict(caps)
+        self._slices: dict[str, list[ContextSlice]] = {category: [] for category in caps}
+        self._keys: dict[str, set[Any]] = {category: set() for category in caps}
+
+    def seed(self, category: str, slices: list[ContextSlice]) -> None:
+        """Register slices from the base bundle as-is, without deduplication."""
+        self._slices[category].extend(slices)
+        self._keys[category].update(slice_.metadata.get("chunk_id") for slice_ in slices)
+
+    def add(self, category: str, slice_: ContextSlice) -> bool:
+        """Append ``slice_`` unless its chunk is already present or the category is full."""
+        key = slice_.metadata.get("chunk_id")
+        if key in self._keys[category] or self.is_full(category):
+            return False
+        self._slices[category].append(slice_)
+        self._keys[category].add(key)
+        return True
+
+    def contains(self, category: str, chunk_id: Any) -> bool:
+        return chunk_id in self._keys[category]
+
+    def is_full(self, category: str) -> bool:
+        return len(self._slices[category]) >= self.caps[category]
+
+    def all_full(self, *categories: str) -> bool:
+        return all(self.is_full(category) for category in categories)
+
+    def slices(self, category: str) -> list[ContextSlice]:
+        return self._slices[category][: self.caps[category]]
+
+    def count(self, category: str) -> int:
+        return min(len(self._slices[category]), self.caps[category])
+
+
 class RecursiveContextBuilder:
     """Builds context using recursive RAG following references."""
+
+    # Upper bound on slices kept per category to avoid token overflow
+    DEFAULT_SLICE_CAPS = {"manual": 50, "regulation": 50, "guidance": 50, "litigation": 20}
     
     def __init__(
         self,
@@ -117,13 +287,23 @@ class RecursiveContextBuilder:
         base_context_builder: ContextBuilder | None = None,
         max_depth: int = 3,
         max_references_per_chunk: int = 10,
+        slice_caps: dict[str, int] | None = None,
+        expansion_workers: int | None = None,
+        section_index: SectionIndex | None = None,
     ):
         self.session = session
         self.app_config = app_config
         self.base_builder = base_context_builder or ContextBuilder(session, app_config)
         self.reference_extractor = ReferenceExtractor()
+        # Exact section-number lookups tried before falling back to vector search
+        self.section_index = section_index if section_index is not None or session is None else SectionIndex(session)
         self.max_depth = max_depth
         self.max_references_per_chunk = max_references_per_chunk
+        self.slice_caps = {**self.DEFAULT_SLICE_CAPS, **(slice_caps or {})}
+        # Concurrent vector searches per BFS level (1 = expand one chunk at a time)
+        self.expansion_workers = max(
+            1, expansion_workers if expansion_workers is not None else app_config.recursive_rag_workers
+        )
         
         # Track processed chunks to avoid infinite loops
         self._processed_chunk_ids: set[str] = set()
@@ -167,153 +347,250 @@ class RecursiveContextBuilder:
         # Track all chunks we need to process
         chunks_to_process: deque[tuple[str, int]] = deque([(chunk_id, 0)])  # (chunk_id, depth)
         self._queued_chunk_ids.add(chunk_id)  # Mark initial chunk as queued
-        all_manual_chunks: list[ContextSlice] = list(base_bundle.manual_neighbors)
-        all_regulation_chunks: list[ContextSlice] = list(base_bundle.regulation_slices)
-        all_guidance_chunks: list[ContextSlice] = list(base_bundle.guidance_slices)
-        all_litigation_chunks: list[ContextSlice] = []
-        
-        # Process chunks recursively
-        while chunks_to_process:
-            current_chunk_id, depth = chunks_to_process.popleft()
-            
-            # Remove from queued set when we start processing
-            self._queued_chunk_ids.discard(current_chunk_id)
-            
-            if depth >= self.max_depth:
-                logger.debug(f"Skipping chunk {current_chunk_id[:16]} - max depth reached")
-                continue
-            
-            if current_chunk_id in self._processed_chunk_ids:
-                logger.debug(f"Skipping chunk {current_chunk_id[:16]} - already processed")
-                continue
-            
-            self._processed_chunk_ids.add(current_chunk_id)
-            
-            # Load chunk
-            chunk = self.base_builder.load_chunk(current_chunk_id)
-            if not chunk:
-                continue
-            
-            logger.info(f"Processing chunk {current_chunk_id[:16]} at depth {depth}")
-            
-            # Extract references from this chunk
-            references = self.reference_extractor.extract_references(chunk.content)
-            
-            # If a context_query is provided (from refinement), also search for that
-            if context_query and depth == 0:  # Only on first pass
-                logger.info(f"Processing context_query: {context_query[:100]}...")
-                # Create a synthetic reference from the query to search for it
-                query_ref = Reference(text=context_query, section_path=None, section_number=None)
-                references.append(query_ref)
-                
-                # Also do a direct semantic search for the concept (not just as a reference)
-                concept_chunks = self._search_for_concept(context_query, chunk.document_id, current_chunk_id)
-                for concept_chunk in concept_chunks:
-                    if not any(c.metadata.get("chunk_id") == concept_chunk.metadata.get("chunk_id")
-                              for c in all_manual_chunks):
-                        all_manual_chunks.append(concept_chunk)
-                        # Add to queue for recursive processing
-                        concept_chunk_id = concept_chunk.metadata.get("chunk_id")
-                        # Skip self-reference and already processed/queued chunks
-                        if (concept_chunk_id and 
-                            concept_chunk_id != current_chunk_id and
-                            concept_chunk_id not in self._processed_chunk_ids and 
-                            concept_chunk_id not in self._queued_chunk_ids):
-                            chunks_to_process.append((concept_chunk_id, depth + 1))
-                            self._queued_chunk_ids.add(concept_chunk_id)
-            
-            logger.info(f"Found {len(references)} references in chunk {current_chunk_id[:16]}")
-            
-            # For each reference, try to find the referenced section via RAG
-            for ref in references[:self.max_references_per_chunk]:
-                if ref.text.lower() in self._processed_references:
-                    continue
-                
-                self._processed_references.add(ref.text.lower())
+        registry = SliceRegistry(self.slice_caps)
+        registry.seed("manual", base_bundle.manual_neighbors)
+        registry.seed("regulation", base_bundle.regulation_slices)
+        registry.seed("guidance", base_bundle.guidance_slices)
+        collecting = ("manual", "regulation", "litigation") if include_litigation else ("manual", "regulation")
+        
+        def enqueue(candidate_id: str | None, current_id: str, depth: int) -> None:
+            # Skip self-reference and already processed/queued chunks
+            if (candidate_id and
+                candidate_id != current_id and
+                candidate_id not in self._processed_chunk_ids and
+                candidate_id not in self._queued_chunk_ids):
+                chunks_to_process.append((candidate_id, depth + 1))
+                self._queued_chunk_ids.add(candidate_id)
+        
+        # Process chunks breadth-first. With expansion_workers > 1 every chunk at the
+        # current depth is planned first, all of their searches run concurrently, and
+        # results are merged in queue order, so bundles match the sequential traversal.
+        executor = ThreadPoolExecutor(max_workers=self.expansion_workers) if self.expansion_workers > 1 else None
+        try:
+            while chunks_to_process:
+                if registry.all_full(*collecting):
+                    logger.debug("All context categories are at capacity; stopping recursive expansion")
+                    break
                 
-                # Search for referenced section in manual chunks
-                ref_chunks = self._find_referenced_section(
-                    ref,
-                    document_id=chunk.document_id,
-                    current_chunk_id=current_chunk_id,
-                )
+                level_depth = chunks_to_process[0][1]
+                expansions: list[_ChunkExpansion] = []
+                while chunks_to_process and chunks_to_process[0][1] == level_depth:
+                    expansion = self._plan_expansion(
+                        *chunks_to_process.popleft(),
+                        registry=registry,
+                        include_litigation=include_litigation,
+                        context_query=context_query,
+                    )
+                    if expansion is not None:
+                        expansions.append(expansion)
+                    if executor is None and expansions:
+                        break  # Sequential mode expands one chunk at a time
                 
-                # Also search in regulations if it looks like a regulation reference or is a context_query
-                if any(keyword in ref.text.lower() for keyword in ['part', 'amc', 'gm', 'regulation']) or context_query:
-                    reg_chunks = self._find_in_regulations(ref, current_chunk_id)
-                    # Add regulation chunks to all_regulation_chunks
-                    for reg_chunk in reg_chunks:
-                        if not any(c.metadata.get("chunk_id") == reg_chunk.metadata.get("chunk_id")
-                                  for c in all_regulation_chunks):
-                            all_regulation_chunks.append(reg_chunk)
+                self._run_searches([search for expansion in expansions for search in expansion.searches()], executor)
                 
-                for ref_chunk in ref_chunks:
-                    ref_chunk_id = ref_chunk.metadata.get("chunk_id")
-                    
-                    # Skip if this is the same chunk we're currently processing (self-reference)
-                    if ref_chunk_id == current_chunk_id:
-                        logger.debug(f"Skipping self-reference: chunk {ref_chunk_id[:16]} references itself")
-                        continue
-                    
-                    # Add to manual chunks if not already present
-                    if not any(c.metadata.get("chunk_id") == ref_chunk_id 
-                              for c in all_manual_chunks):
-                        all_manual_chunks.append(ref_chunk)
-                    
-                    # Add to queue for recursive processing (only if not already processed or queued)
-                    if ref_chunk_id and ref_chunk_id not in self._processed_chunk_ids and ref_chunk_id not in self._queued_chunk_ids:
-                        chunks_to_process.append((ref_chunk_id, depth + 1))
-                        self._queued_chunk_ids.add(ref_chunk_id)
-            
-            # Find litigation related to this chunk
-            if include_litigation:
-                litigation_chunks = self._find_litigation(chunk)
-                for lit_chunk in litigation_chunks:
-                    if not any(c.metadata.get("chunk_id") == lit_chunk.metadata.get("chunk_id")
-                              for c in all_litigation_chunks):
-                        all_litigation_chunks.append(lit_chunk)
-                        # Recursively process litigation references
-                        lit_chunk_id = lit_chunk.metadata.get("chunk_id")
-                        # Skip self-reference and already processed/queued chunks
-                        if (lit_chunk_id and 
-                            lit_chunk_id != current_chunk_id and
-                            lit_chunk_id not in self._processed_chunk_ids and 
-                            lit_chunk_id not in self._queued_chunk_ids):
-                            chunks_to_process.append((lit_chunk_id, depth + 1))
-                            self._queued_chunk_ids.add(lit_chunk_id)
+                for expansion in expansions:
+                    if registry.all_full(*collecting):
+                        break
+                    self._merge_expansion(expansion, registry, enqueue)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
         
         # Build final bundle
         final_bundle = ContextBundle(focus=base_bundle.focus)
-        final_bundle.manual_neighbors = all_manual_chunks[:50]  # Limit to avoid token overflow
-        final_bundle.regulation_slices = all_regulation_chunks[:50]
-        final_bundle.guidance_slices = all_guidance_chunks[:50]
+        final_bundle.manual_neighbors = registry.slices("manual")
+        final_bundle.regulation_slices = registry.slices("regulation")
+        final_bundle.guidance_slices = registry.slices("guidance")
         final_bundle.evidence_slices = base_bundle.evidence_slices
         
         # Add litigation as a new category (or merge into evidence)
-        if all_litigation_chunks:
+        litigation_slices = registry.slices("litigation")
+        if litigation_slices:
             # For now, add to evidence slices
-            final_bundle.evidence_slices.extend(all_litigation_chunks[:20])
-        
-        # Recalculate tokens
-        token_estimator = self.base_builder.token_estimator
-        final_bundle.total_tokens = (
-            token_estimator.count(final_bundle.focus.content) +
-            sum(token_estimator.count(c.content) for c in final_bundle.manual_neighbors) +
-            sum(token_estimator.count(c.content) for c in final_bundle.regulation_slices) +
-            sum(token_estimator.count(c.content) for c in final_bundle.guidance_slices) +
-            sum(token_estimator.count(c.content) for c in final_bundle.evidence_slices)
+            final_bundle.evidence_slices.extend(litigation_slices)
+        
+        # Recalculate tokens, counting only slices that arrived without a token count
+        all_slices = [final_bundle.focus, *final_bundle.all_slices()]
+        uncounted = [slice_ for slice_ in all_slices if not slice_.token_count]
+        final_bundle.total_tokens = sum(slice_.token_count for slice_ in all_slices if slice_.token_count) + sum(
+            self.base_builder.token_estimator.count_many([slice_.content for slice_ in uncounted])
         )
         
         logger.info(
             f"Recursive context built: {len(final_bundle.manual_neighbors)} manual chunks, "
             f"{len(final_bundle.regulation_slices)} regulations, "
             f"{len(final_bundle.guidance_slices)} guidance, "
-            f"{len(all_litigation_chunks)} litigation chunks, "
+            f"{len(litigation_slices)} litigation chunks, "
             f"{final_bundle.total_tokens} total tokens"
         )
         
         return final_bundle
     
+    def _plan_expansion(
+        self,
+        current_chunk_id: str,
+        depth: int,
+        *,
+        registry: SliceRegistry,
+        include_litigation: bool,
+        context_query: str | None,
+    ) -> _ChunkExpansion | None:
+        """Decide which searches a chunk needs; runs on the caller's thread (uses the session)."""
+        # Remove from queued set when we start processing
+        self._queued_chunk_ids.discard(current_chunk_id)
+        
+        if depth >= self.max_depth:
+            logger.debug(f"Skipping chunk {current_chunk_id[:16]} - max depth reached")
+            return None
+        
+        if current_chunk_id in self._processed_chunk_ids:
+            logger.debug(f"Skipping chunk {current_chunk_id[:16]} - already processed")
+            return None
+        
+        self._processed_chunk_ids.add(current_chunk_id)
+        
+        # Load chunk
+        chunk = self.base_builder.load_chunk(current_chunk_id)
+        if not chunk:
+            return None
+        
+        logger.info(f"Processing chunk {current_chunk_id[:16]} at depth {depth}")
+        expansion = _ChunkExpansion(chunk_id=current_chunk_id, depth=depth)
+        
+        # Extract references from this chunk
+        references = self.reference_extractor.extract_references(chunk.content)
+        
+        # If a context_query is provided (from refinement), also search for that
+        if context_query and depth == 0:  # Only on first pass
+            logger.info(f"Processing context_query: {context_query[:100]}...")
+            # Create a synthetic reference from the query to search for it
+            references.append(Reference(text=context_query, section_path=None, section_number=None))
+            # Also do a direct semantic search for the concept (not just as a reference)
+            expansion.concept = _PendingSearch(
+                partial(self._search_for_concept, context_query, chunk.document_id, current_chunk_id)
+            )
+        
+        logger.info(f"Found {len(references)} references in chunk {current_chunk_id[:16]}")
+        
+        # For each reference, try to find the referenced section via RAG
+        for ref in references[:self.max_references_per_chunk]:
+            if ref.text.lower() in self._processed_references:
+                continue
+            self._processed_references.add(ref.text.lower())
+            
+            # Resolve the referenced section in manual chunks: exact index hit, else vector search
+            indexed = self._lookup_section_index(ref, document_id=chunk.document_id)
+            manual_search = _PendingSearch.resolved(indexed) if indexed else _PendingSearch(
+                partial(self._find_referenced_section, ref, document_id=chunk.document_id, current_chunk_id=current_chunk_id)
+            )
+            # Also search in regulations if it looks like a regulation reference or is a context_query
+            regulation_search = None
+            if not registry.is_full("regulation") and (
+                any(keyword in ref.text.lower() for keyword in ['part', 'amc', 'gm', 'regulation']) or context_query
+            ):
+                indexed = self._lookup_section_index(ref, source_types=REGULATION_SOURCE_TYPES)
+                regulation_search = _PendingSearch.resolved(indexed) if indexed else _PendingSearch(
+                    partial(self._find_in_regulations, ref, current_chunk_id)
+                )
+            expansion.references.append((manual_search, regulation_search))
+        
+        # Find litigation related to this chunk
+        if include_litigation and not registry.is_full("litigation"):
+            expansion.litigation = _PendingSearch(partial(self._find_litigation, chunk))
+        return expansion
+    
+    @staticmethod
+    def _run_searches(searches: list[_PendingSearch], executor: ThreadPoolExecutor | None) -> None:
+        searches = [search for search in searches if not search.done]
+        if executor is None or len(searches) <= 1:
+            for search in searches:
+                search.result = search.run()
+            return
+        for search, result in zip(searches, executor.map(lambda pending: pending.run(), searches)):
+            search.result = result
+    
+    @staticmethod
+    def _merge_expansion(
+        expansion: _ChunkExpansion,
+        registry: SliceRegistry,
+        enqueue: Callable[[str | None, str, int], None],
+    ) -> None:
+        """Fold a chunk's search results into the registry in the sequential order."""
+        current_chunk_id, depth = expansion.chunk_id, expansion.depth
+        if expansion.concept is not None:
+            for concept_chunk in expansion.concept.result:
+                if registry.add("manual", concept_chunk):
+                    # Add to queue for recursive processing
+                    enqueue(concept_chunk.metadata.get("chunk_id"), current_chunk_id, depth)
+        
+        for manual_search, regulation_search in expansion.references:
+            if regulation_search is not None:
+                for reg_chunk in regulation_search.result:
+                    registry.add("regulation", reg_chunk)
+            
+            for ref_chunk in manual_search.result:
+                ref_chunk_id = ref_chunk.metadata.get("chunk_id")
+                
+                # Skip if this is the same chunk we're currently processing (self-reference)
+                if ref_chunk_id == current_chunk_id:
+                    logger.debug(f"Skipping self-reference: chunk {ref_chunk_id[:16]} references itself")
+                    continue
+                
+                # Add to manual chunks if not already present
+                registry.add("manual", ref_chunk)
+                
+                # Add to queue for recursive processing (only if not already processed or queued)
+                enqueue(ref_chunk_id, current_chunk_id, depth)
+        
+        if expansion.litigation is not None:
+            for lit_chunk in expansion.litigation.result:
+                if registry.add("litigation", lit_chunk):
+                    # Recursively process litigation references
+                    enqueue(lit_chunk.metadata.get("chunk_id"), current_chunk_id, depth)
+    
+    def _lookup_section_index(
+        self,
+        reference: Reference,
+        *,
+        document_id: int | None = None,
+        source_types: tuple[str, ...] | None = None,
+    ) -> list[ContextSlice]:
+        """Exact section-number matches for a reference (empty when the index has none)."""
+        if self.section_index is None:
+            return []
+        chunks = self.section_index.lookup(reference.text, document_id=document_id, source_types=source_types)
+        regulation = document_id is None
+        slices: list[ContextSlice] = []
+        for idx, chunk in enumerate(chunks):
+            metadata = {
+                "chunk_id": chunk.chunk_id,
+                "chunk_index": chunk.chunk_index,
+                "section_path": chunk_section_path(chunk),
+                "heading": chunk.parent_heading,
+                "document_id": chunk.document_id,
+                **(chunk.chunk_metadata or {}),
+                "reference_source": reference.text,
+                "reference_type": "regulation_section_index" if regulation else "section_index",
+            }
+            label = "Regulation section" if regulation else "Referenced section"
+            slices.append(
+                ContextSlice(
+                    label=f"{label}: {reference.text} (exact match {idx + 1})",
+                    source="regulation" if regulation else "manual",
+                    content=chunk.content,
+                    token_count=(
+                        chunk.token_count
+                        or stored_token_count(chunk.chunk_metadata)
+                        or self.base_builder.token_estimator.count(chunk.content)
+                    ),
+                    metadata=metadata,
+                    score=1.0,
+                )
+            )
+        if slices:
+            logger.debug(f"Resolved reference '{reference.text}' from the section index ({len(slices)} chunks)")
+        return slices
+    
     def _find_referenced_section(
         self,
         reference: Reference,
@@ -337,25 +614,16 @@ class RecursiveContextBuilder:
             document_id=document_id,
         )
         
+        # Drop poor matches (typical good distances are < 1.0) and corrupted content
+        kept = [(idx, match) for idx, match in enumerate(matches) if is_usable_match(match)]
+        token_counts = self.base_builder.token_estimator.count_matches([match for _, match in kept])
         slices: list[ContextSlice] = []
-        for idx, match in enumerate(matches):
-            # Filter out low-quality matches (ChromaDB returns distances, lower is better)
-            # Typical good matches have distances < 1.0, very poor matches > 2.0
-            if match.score is not None and match.score > 1.5:  # Filter out poor matches
-                continue
-            
-            # Filter out corrupted content (looks like binary data or coordinates)
-            if match.content and (len(match.content.strip()) < 10 or 
-                                 re.match(r'^[\d\s\.\-]+$', match.content.strip()) or
-                                 '-1097280' in match.content or '-448310' in match.content):
-                continue
-            
+        for (idx, match), tokens in zip(kept, token_counts):
             label = f"Referenced section: {reference.text} (match {idx + 1})"
             metadata = dict(match.metadata or {})
             metadata["reference_source"] = reference.text
             metadata["reference_type"] = "section_reference"
             
-            tokens = self.base_builder.token_estimator.count(match.content)
             # Convert distance to similarity score for display (1 / (1 + distance))
             # This gives a score between 0 and 1, where 1 is perfect match
             display_score = 1.0 / (1.0 + match.score) if match.score is not None else None
@@ -388,24 +656,15 @@ class RecursiveContextBuilder:
             document_id=None,
         )
         
+        kept = [(idx, match) for idx, match in enumerate(matches) if is_usable_match(match)]
+        token_counts = self.base_builder.token_estimator.count_matches([match for _, match in kept])
         slices: list[ContextSlice] = []
-        for idx, match in enumerate(matches):
-            # Filter out low-quality matches
-            if match.score is not None and match.score > 1.5:
-                continue
-            
-            # Filter out corrupted content
-            if match.content and (len(match.content.strip()) < 10 or 
-                                 re.match(r'^[\d\s\.\-]+$', match.content.strip()) or
-                                 '-1097280' in match.content or '-448310' in match.content):
-                continue
-            
+        for (idx, match), tokens in zip(kept, token_counts):
             label = f"Regulation search: {reference.text} (match {idx + 1})"
             metadata = dict(match.metadata or {})
             metadata["reference_source"] = reference.text
             metadata["reference_type"] = "regulation_search"
             
-            tokens = self.base_builder.token_estimator.count(match.content)
             # Convert distance to similarity score for display
             display_score = 1.0 / (1.0 + match.score) if match.score is not None else None
             slices.append(
@@ -437,14 +696,14 @@ class RecursiveContextBuilder:
             document_id=document_id,
         )
         
+        token_counts = self.base_builder.token_estimator.count_matches(matches)
         slices: list[ContextSlice] = []
-        for idx, match in enumerate(matches):
+        for idx, (match, tokens) in enumerate(zip(matches, token_counts)):
             label = f"Concept search: {concept_query[:50]}... (match {idx + 1})"
             metadata = dict(match.metadata or {})
             metadata["concept_query"] = concept_query
             metadata["reference_type"] = "concept_search"
             
-            tokens = self.base_builder.token_estimator.count(match.content)
             slices.append(
                 ContextSlice(
                     label=label,
@@ -465,13 +724,13 @@ class RecursiveContextBuilder:
             document_id=None,
         )
         
-        for idx, match in enumerate(reg_matches):
+        token_counts = self.base_builder.token_estimator.count_matches(reg_matches)
+        for idx, (match, tokens) in enumerate(zip(reg_matches, token_counts)):
             label = f"Regulation concept: {concept_query[:50]}... (match {idx + 1})"
             metadata = dict(match.metadata or {})
             metadata["concept_query"] = concept_query
             metadata["reference_type"] = "regulation_concept_search"
             
-            tokens = self.base_builder.token_estimator.count(match.content)
             slices.append(
                 ContextSlice(
                     label=label,
@@ -497,14 +756,14 @@ class RecursiveContextBuilder:
             document_id=None,  # Litigation spans multiple documents
         )
         
+        token_counts = self.base_builder.token_estimator.count_matches(matches)
         slices: list[ContextSlice] = []
-        for idx, match in enumerate(matches):
+        for idx, (match, tokens) in enumerate(zip(matches, token_counts)):
             label = f"Litigation/Case Law (match {idx + 1})"
             metadata = dict(match.metadata or {})
             metadata["reference_type"] = "litigation"
             metadata["source_chunk_id"] = chunk.chunk_id
             
-            tokens = self.base_builder.token_estimator.count(match.content)
             slices.append(
                 ContextSlice(
                     label=label,
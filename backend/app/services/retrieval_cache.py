@@ -0,0 +1,231 @@
+"""Process-wide cache of vector search results, invalidated by collection writes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from ..config.settings import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-entry overhead used when estimating cache memory
+_ENTRY_OVERHEAD_BYTES = 256
+_METADATA_ITEM_BYTES = 64
+# Directory under the Chroma path holding one generation marker file per collection
+_GENERATIONS_DIR = ".retrieval-generations"
+
+
+def embedding_digest(vector: Sequence[float] | np.ndarray) -> str:
+    """Stable hash of a query embedding's float32 representation."""
+    data = np.ascontiguousarray(np.asarray(vector, dtype=np.float32)).tobytes()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Hash for text-only queries (used when no embedding client is configured)."""
+    return "text:" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _estimate_size(matches: Sequence[Any]) -> int:
+    size = _ENTRY_OVERHEAD_BYTES
+    for match in matches:
+        size += len(getattr(match, "content", "") or "") + _ENTRY_OVERHEAD_BYTES
+        size += len(getattr(match, "metadata", None) or {}) * _METADATA_ITEM_BYTES
+    return size
+
+
+@dataclass
+class RetrievalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class RetrievalCache:
+    """LRU of search results keyed by (collection, query embedding hash, top_k, where filter).
+
+    Every collection carries a version number that is part of the key. Writing to a
+    collection calls :meth:`invalidate`, which bumps its version and drops its
+    entries, so readers never see results from before the write. Entries are bounded
+    both by count and by an estimate of their in-memory size.
+
+    Collections are also written by other processes (the ingestion and embedding CLIs,
+    metadata backfills), so :meth:`invalidate` replaces a per-collection marker file
+    next to the Chroma data, and the marker's identity is part of every key: a write in
+    any process changes the keys everywhere for the cost of one ``stat`` per lookup.
+    Entries older than ``ttl_seconds`` expire as well, for writers that bypass this.
+    """
+
+    def __init__(
+        self, *, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 300.0
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[list[Any], int, float]] = OrderedDict()
+        self._versions: dict[tuple[str, str], int] = {}
+        self._size = 0
+        self._stats = RetrievalCacheStats()
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "RetrievalCache":
+        return cls(
+            max_entries=config.retrieval_cache_max_entries,
+            max_bytes=int(config.retrieval_cache_max_mb * 1024 * 1024),
+            ttl_seconds=config.retrieval_cache_ttl_seconds,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def _collection_key(chroma_path: Path | str, collection: str) -> tuple[str, str]:
+        return (str(Path(chroma_path).resolve()), collection)
+
+    @staticmethod
+    def _marker(collection_key: tuple[str, str]) -> Path:
+        return Path(collection_key[0]) / _GENERATIONS_DIR / collection_key[1]
+
+    def _generation(self, collection_key: tuple[str, str]) -> tuple[int, int]:
+        """Identity of the collection's marker file; replaced by every write in any process."""
+        try:
+            stat = os.stat(self._marker(collection_key))
+        except OSError:
+            return (0, 0)
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def make_key(
+        self,
+        chroma_path: Path | str,
+        collection: str,
+        query_digest: str,
+        top_k: int,
+        where: dict[str, Any] | None = None,
+    ) -> tuple:
+        collection_key = self._collection_key(chroma_path, collection)
+        generation = self._generation(collection_key)
+        with self._lock:
+            version = self._versions.get(collection_key, 0)
+        where_key = json.dumps(where, sort_keys=True, default=str) if where else ""
+        return (*collection_key, version, generation, query_digest, top_k, where_key)
+
+    def get(self, key: tuple) -> list[Any] | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry[2] > self.ttl_seconds:
+                self._size -= self._entries.pop(key)[1]
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return list(entry[0])
+
+    def put(self, key: tuple, matches: Sequence[Any]) -> None:
+        if not self.enabled:
+            return
+        size = _estimate_size(matches)
+        if size > self.max_bytes:
+            return
+        collection_key, version, generation = key[:2], key[2], key[3]
+        if self._generation(collection_key) != generation:
+            # Another process wrote the collection while this search was in flight
+            return
+        with self._lock:
+            if self._versions.get(collection_key, 0) != version:
+                # The collection was written while this search was in flight
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (list(matches), size, time.monotonic())
+            self._size += size
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._stats.evictions += 1
+
+    def invalidate(self, chroma_path: Path | str, collection: str) -> None:
+        """Bump the collection's version and drop every cached result for it, in every process."""
+        collection_key = self._collection_key(chroma_path, collection)
+        self._replace_marker(collection_key)
+        with self._lock:
+            self._versions[collection_key] = self._versions.get(collection_key, 0) + 1
+            stale = [key for key in self._entries if key[:2] == collection_key]
+            for key in stale:
+                self._size -= self._entries.pop(key)[1]
+            self._stats.invalidations += 1
+        if stale:
+            logger.debug("Invalidated %s cached searches for collection '%s'", len(stale), collection)
+
+    def _replace_marker(self, collection_key: tuple[str, str]) -> None:
+        marker = self._marker(collection_key)
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            tmp = marker.with_name(f"{marker.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(str(time.time_ns()), encoding="utf-8")
+            # A rename gives the marker a new inode, which readers compare
+            os.replace(tmp, marker)
+        except OSError as exc:
+            logger.warning("Could not record write to collection '%s' for other processes: %s", collection_key[1], exc)
+
+    def stats(self) -> RetrievalCacheStats:
+        with self._lock:
+            return RetrievalCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                invalidations=self._stats.invalidations,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# Global cache shared by every vector client and ingestion path in the process
+_global_cache: RetrievalCache | None = None
+_global_lock = threading.Lock()
+
+
+def get_retrieval_cache(config: AppConfig | None = None) -> RetrievalCache:
+    """Get the process-wide retrieval cache, creating it from ``config`` on first use."""
+    global _global_cache
+    with _global_lock:
+        if _global_cache is None:
+            _global_cache = RetrievalCache.from_app_config(config or AppConfig())
+        return _global_cache
+
+
+def reset_retrieval_cache() -> None:
+    """Reset the global retrieval cache (useful for testing)."""
+    global _global_cache
+    with _global_lock:
+        _global_cache = None
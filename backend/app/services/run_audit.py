@@ -27,6 +27,13 @@ def main(
         "--include-evidence/--skip-evidence",
         help="Override evidence retrieval (defaults to enabled for non-draft audits).",
     ),
+    concurrency: int | None = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Number of chunks analyzed in parallel (defaults to RUNNER_CONCURRENCY).",
+    ),
 ):
     """Run the compliance runner for a specific audit."""
 
@@ -34,7 +41,7 @@ def main(
     session = get_session()
     config = AppConfig()
 
-    runner = ComplianceRunner(session, config)
+    runner = ComplianceRunner(session, config, concurrency=concurrency)
     result = runner.run(
         audit_id,
         max_chunks=max_chunks,
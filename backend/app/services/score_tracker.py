@@ -3,14 +3,13 @@
 from __future__ import annotations
 
 import logging
-from collections import Counter
 from typing import Any
 
 from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
-from ..db.models import Audit, ComplianceScore, Flag
-from .compliance_score import calculate_compliance_score
+from ..db.models import Audit, AuditFlagSummary, ComplianceScore
+from .compliance_score import rebuild_flag_summary, summary_state
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +39,17 @@ class ScoreTracker:
             score_record = ComplianceScore(audit_id=audit_id)
             self.session.add(score_record)
 
-        # Fetch all flags for this audit
-        flags = self.session.execute(
-            select(Flag).where(Flag.audit_id == audit_id)
-        ).scalars().all()
-
-        # Calculate metrics
-        severity_counts = Counter(flag.flag_type for flag in flags)
-        overall_score = calculate_compliance_score(flags)
+        # Read the summary maintained as flags were written instead of re-scoring every flag
+        summary = self.session.get(AuditFlagSummary, audit_id) or rebuild_flag_summary(self.session, audit_id)
+        state = summary_state(summary)
+        overall_score = state.score
 
         # Update score record
         score_record.overall_score = overall_score
-        score_record.red_count = severity_counts.get("RED", 0)
-        score_record.yellow_count = severity_counts.get("YELLOW", 0)
-        score_record.green_count = severity_counts.get("GREEN", 0)
-        score_record.total_flags = len(flags)
+        score_record.red_count = state.red_count
+        score_record.yellow_count = state.yellow_count
+        score_record.green_count = state.green_count
+        score_record.total_flags = state.total_flags
 
         self.session.commit()
         logger.info(
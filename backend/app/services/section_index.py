@@ -0,0 +1,215 @@
+"""Exact section-number lookups for references such as "Section 4.2" or "Part-145.A.30"."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session
+
+from ..db.models import Chunk, Document, SectionIndexEntry
+
+logger = logging.getLogger(__name__)
+
+# Source types searched when resolving a reference against the regulation corpus
+REGULATION_SOURCE_TYPES = ("regulation", "amc", "gm")
+
+_PREFIX = re.compile(r"^(?:section|sect\.?|chapter|ch\.?|part|osa|kohdassa|kohta|§)[\s\-]*", re.IGNORECASE)
+# One component of a section number: digits with an optional letter suffix, or a lone letter (the "A" in 145.A.30)
+_COMPONENT = r"(?:\d+[a-z]?|[a-z](?![a-z]))"
+_LEADING_NUMBER = re.compile(rf"^{_COMPONENT}(?:[.\-]{_COMPONENT})*")
+_REFERENCE_NUMBER = re.compile(rf"{_COMPONENT}(?:[.\-\s]+{_COMPONENT})*\.?")
+_SEPARATORS = re.compile(r"[.\-\s]+")
+
+
+def normalize_section_number(text: str | None, *, leading: bool = False) -> str | None:
+    """Canonical key for a section number, e.g. ``"Part-145.A.30"`` → ``"145.a.30"``.
+
+    With ``leading=True`` only the number at the start of ``text`` is used, which is how
+    headings such as ``"4.2 Tools and equipment"`` are indexed. Otherwise the whole text
+    must be a (prefixed) section number, so free-text queries never hit the index.
+    """
+    if not text:
+        return None
+    value = _PREFIX.sub("", text.strip().lower(), count=1)
+    if leading:
+        match = _LEADING_NUMBER.match(value)
+        number = match.group(0) if match else ""
+    else:
+        number = value if _REFERENCE_NUMBER.fullmatch(value) else ""
+    key = ".".join(part for part in _SEPARATORS.split(number) if part)
+    if not key or not any(char.isdigit() for char in key):
+        return None
+    return key[:128]
+
+
+def chunk_section_path(chunk: Chunk) -> list[str]:
+    metadata = chunk.chunk_metadata or {}
+    path = metadata.get("section_path")
+    if isinstance(path, list):
+        return [str(part).strip() for part in path if str(part).strip()]
+    raw = path if isinstance(path, str) else chunk.section_path
+    return [part.strip() for part in (raw or "").split(">") if part.strip()]
+
+
+def section_keys(chunk: Chunk) -> dict[str, int]:
+    """Map each section number a chunk belongs to onto its level (0 = the chunk's own section)."""
+    keys: dict[str, int] = {}
+
+    def add(text: Any, level: int) -> None:
+        key = normalize_section_number(str(text), leading=True) if text is not None else None
+        if key is not None and level < keys.get(key, level + 1):
+            keys[key] = level
+
+    metadata = chunk.chunk_metadata or {}
+    section_metadata = metadata.get("section_metadata")
+    for source in (metadata, section_metadata if isinstance(section_metadata, dict) else {}):
+        add(source.get("section_number"), 0)
+    add(chunk.parent_heading, 0)
+    for level, component in enumerate(reversed(chunk_section_path(chunk))):
+        add(component, level)
+    return keys
+
+
+def delete_document_sections(session: Session, document: Document) -> None:
+    """Drop the document's index entries, ahead of re-indexing it in batches; the caller commits."""
+    session.execute(delete(SectionIndexEntry).where(SectionIndexEntry.document_id == document.id))
+
+
+def index_document_sections(
+    session: Session, document: Document, chunks: Iterable[Chunk], *, replace: bool = True
+) -> int:
+    """Replace the document's index entries with those of ``chunks``; the caller commits.
+
+    With ``replace=False`` the entries are added to the existing ones, for callers that
+    persist a document's chunks in batches.
+    """
+    if replace:
+        delete_document_sections(session, document)
+    entries = [
+        {
+            "document_id": document.id,
+            "chunk_id": chunk.chunk_id,
+            "section_key": key,
+            "source_type": document.source_type,
+            "level": level,
+            "chunk_index": chunk.chunk_index,
+        }
+        for chunk in chunks
+        for key, level in section_keys(chunk).items()
+    ]
+    if entries:
+        # The session does not autoflush; chunk rows must exist before entries reference them
+        session.flush()
+        session.execute(insert(SectionIndexEntry), entries)
+    logger.debug("Indexed %s section keys for document %s", len(entries), document.id)
+    return len(entries)
+
+
+def unindexed_documents(session: Session, source_types: Sequence[str] | None = None) -> list[Document]:
+    """Documents that have chunks but no section index entries, oldest first."""
+    stmt = (
+        select(Document)
+        .where(
+            exists().where(Chunk.document_id == Document.id),
+            ~exists().where(SectionIndexEntry.document_id == Document.id),
+        )
+        .order_by(Document.id)
+    )
+    if source_types:
+        stmt = stmt.where(Document.source_type.in_(list(source_types)))
+    return list(session.execute(stmt).scalars())
+
+
+def backfill_section_index(
+    session: Session, source_types: Sequence[str] | None = None
+) -> dict[int, int]:
+    """Index the stored chunks of every document chunked before the index existed.
+
+    Commits after each document, so an interrupted run keeps its progress, and returns
+    the number of entries written per document id. Documents whose chunks carry no
+    section numbers stay unindexed and are scanned again by the next run.
+    """
+    written: dict[int, int] = {}
+    for document in unindexed_documents(session, source_types):
+        chunks = session.execute(
+            select(Chunk).where(Chunk.document_id == document.id).order_by(Chunk.chunk_index)
+        ).scalars()
+        written[document.id] = index_document_sections(session, document, chunks, replace=False)
+        session.commit()
+    return written
+
+
+class SectionIndex:
+    """Resolves section references to chunks by exact key, before any vector search.
+
+    Lookups go to the ``section_index`` table. Documents chunked before the table
+    existed are indexed in memory from their chunk rows, so per-document lookups get
+    the same exact matches without a re-ingestion. Corpus lookups by source type only
+    see persisted entries; ``python -m pipelines.section_index`` writes them for
+    existing documents.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._indexed_documents: set[int] = set()
+        self._fallback: dict[int, dict[str, list[tuple[int, int, Chunk]]]] = {}
+
+    def lookup(
+        self,
+        reference_text: str,
+        *,
+        document_id: int | None = None,
+        source_types: Sequence[str] | None = None,
+        limit: int = 5,
+    ) -> list[Chunk]:
+        """Chunks whose section number equals the reference, closest section level first.
+
+        Pass ``document_id`` to search one document, or ``source_types`` to search a
+        corpus such as :data:`REGULATION_SOURCE_TYPES`.
+        """
+        key = normalize_section_number(reference_text)
+        if key is None:
+            return []
+        if document_id is not None and not self._is_indexed(document_id):
+            return self._fallback_lookup(document_id, key, limit)
+
+        stmt = (
+            select(Chunk)
+            .join(SectionIndexEntry, SectionIndexEntry.chunk_id == Chunk.chunk_id)
+            .where(SectionIndexEntry.section_key == key)
+            .order_by(SectionIndexEntry.level, SectionIndexEntry.document_id, SectionIndexEntry.chunk_index)
+            .limit(limit)
+        )
+        if document_id is not None:
+            stmt = stmt.where(SectionIndexEntry.document_id == document_id)
+        if source_types:
+            stmt = stmt.where(SectionIndexEntry.source_type.in_(list(source_types)))
+        return list(self.session.execute(stmt).scalars())
+
+    def _is_indexed(self, document_id: int) -> bool:
+        # Only a positive answer is cached: a backfill or re-chunk may index the document later
+        if document_id in self._indexed_documents:
+            return True
+        stmt = select(SectionIndexEntry.id).where(SectionIndexEntry.document_id == document_id).limit(1)
+        if self.session.execute(stmt).first() is None:
+            return False
+        self._indexed_documents.add(document_id)
+        self._fallback.pop(document_id, None)
+        return True
+
+    def _fallback_lookup(self, document_id: int, key: str, limit: int) -> list[Chunk]:
+        keys = self._fallback.get(document_id)
+        if keys is None:
+            keys = defaultdict(list)
+            chunks = self.session.execute(select(Chunk).where(Chunk.document_id == document_id)).scalars()
+            for chunk in chunks:
+                for section_key, level in section_keys(chunk).items():
+                    keys[section_key].append((level, chunk.chunk_index, chunk))
+            for matches in keys.values():
+                matches.sort(key=lambda item: item[:2])
+            self._fallback[document_id] = keys
+        return [chunk for _, _, chunk in keys.get(key, [])[:limit]]
@@ -0,0 +1,298 @@
+"""In-process NumPy vector index: exact or IVF search over float32 matrices."""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+from .context_builder import ChromaVectorClient, VectorClient, VectorMatch, VectorQuery
+from .vector_registry import VectorStoreRegistry, get_vector_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COLLECTIONS = ("manual_chunks", "regulation_chunks", "amc_chunks", "gm_chunks", "evidence_chunks")
+
+# Collections smaller than this are always searched exhaustively
+DEFAULT_IVF_MIN_SIZE = 50_000
+
+Embedder = Callable[[list[str]], Sequence[Sequence[float]]]
+
+
+def _squared_l2(queries: np.ndarray, query_norms: np.ndarray, matrix: np.ndarray, norms: np.ndarray) -> np.ndarray:
+    """Squared euclidean distances (Chroma's default ``l2`` space) via one matrix multiply."""
+    distances = query_norms[:, None] + norms[None, :] - 2.0 * (queries @ matrix.T)
+    np.maximum(distances, 0.0, out=distances)
+    return distances
+
+
+def _top_k(distances: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise indices and distances of the ``k`` smallest entries, nearest first."""
+    k = min(k, distances.shape[1])
+    if k < distances.shape[1]:
+        candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(distances.shape[1]), distances.shape).copy()
+    candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+    order = np.argsort(candidate_distances, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_distances, order, axis=1)
+
+
+def _kmeans(matrix: np.ndarray, n_lists: int, *, iterations: int, seed: int) -> np.ndarray:
+    """Lloyd's k-means on a sample of rows; returns float32 centroids."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(matrix.shape[0], n_lists * 256)
+    sample = matrix[rng.choice(matrix.shape[0], sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    sample_norms = np.einsum("ij,ij->i", sample, sample)
+    for _ in range(iterations):
+        centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+        assignment = np.argmin(_squared_l2(sample, sample_norms, centroids, centroid_norms), axis=1)
+        counts = np.bincount(assignment, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class NumpyCollection:
+    """One collection held as a contiguous float32 matrix with precomputed squared norms.
+
+    Rows are bucketed by ``metadata["document_id"]`` up front, so document-filtered
+    searches scan only that document's rows, exactly. Collections with at least
+    ``ivf_min_size`` rows also get an IVF coarse quantizer for unfiltered searches:
+    rows are assigned to ``n_lists`` k-means cells (and stored in cell order) and
+    each query scans only its ``n_probe`` nearest cells.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]] | np.ndarray,
+        documents: Sequence[str],
+        metadatas: Sequence[dict[str, Any] | None],
+        *,
+        ivf_min_size: int = DEFAULT_IVF_MIN_SIZE,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        seed: int = 0,
+    ):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [meta or {} for meta in metadatas]
+        self.matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if self.matrix.ndim != 2 or not (len(self.ids) == len(self.documents) == len(self.metadatas) == len(self.matrix)):
+            raise ValueError("ids, embeddings, documents and metadatas must have the same length")
+        self.norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+        self.ivf_min_size = ivf_min_size
+        self.n_probe = n_probe
+        self.centroids: np.ndarray | None = None
+        self._centroid_norms: np.ndarray | None = None
+        # Row ranges per IVF cell; rows are reordered so each cell is contiguous
+        self.list_bounds: np.ndarray | None = None
+        if len(self) >= ivf_min_size:
+            self._build_ivf(n_lists or max(1, int(math.sqrt(len(self)))), seed)
+
+        buckets: dict[Any, list[int]] = defaultdict(list)
+        for row, meta in enumerate(self.metadatas):
+            if meta.get("document_id") is not None:
+                buckets[meta["document_id"]].append(row)
+        self.document_rows = {doc_id: np.asarray(rows, dtype=np.int64) for doc_id, rows in buckets.items()}
+
+    @classmethod
+    def from_chroma(cls, collection: Any, **options: Any) -> "NumpyCollection":
+        """Load every stored vector, document and metadata row from a Chroma collection."""
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        embeddings = data.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        return cls(
+            data.get("ids") or [],
+            embeddings,
+            data.get("documents") or [],
+            data.get("metadatas") or [],
+            **options,
+        )
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1]
+
+    def _build_ivf(self, n_lists: int, seed: int) -> None:
+        n_lists = min(n_lists, len(self))
+        self.centroids = _kmeans(self.matrix, n_lists, iterations=10, seed=seed)
+        self._centroid_norms = centroid_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        assignment = np.empty(len(self), dtype=np.int64)
+        # Assign in blocks so the distance matrix stays small for large collections
+        for start in range(0, len(self), 8192):
+            block = slice(start, start + 8192)
+            distances = _squared_l2(self.matrix[block], self.norms[block], self.centroids, centroid_norms)
+            assignment[block] = np.argmin(distances, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        self.list_bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        # Store rows cell by cell so probing a cell reads one contiguous slice
+        self.matrix = np.ascontiguousarray(self.matrix[order])
+        self.norms = self.norms[order]
+        self.ids = [self.ids[row] for row in order]
+        self.documents = [self.documents[row] for row in order]
+        self.metadatas = [self.metadatas[row] for row in order]
+        logger.debug("Built IVF index with %d lists over %d vectors", n_lists, len(self))
+
+    def search(
+        self, queries: np.ndarray, k: int, *, document_id: Any | None = None
+    ) -> list[list[tuple[int, float]]]:
+        """Return ``(row, squared_l2_distance)`` pairs, nearest first, for each query row."""
+        queries = np.ascontiguousarray(np.asarray(queries, dtype=np.float32))
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        if k <= 0 or len(self) == 0:
+            return [[] for _ in range(len(queries))]
+        if queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query embedding has {queries.shape[1]} dimensions, collection has {self.dimension}"
+            )
+
+        rows: np.ndarray | None = None
+        if document_id is not None:
+            rows = self.document_rows.get(document_id)
+            if rows is None:
+                return [[] for _ in range(len(queries))]
+
+        query_norms = np.einsum("ij,ij->i", queries, queries)
+        if self.centroids is not None and rows is None:
+            return [
+                self._search_ivf(queries[i : i + 1], query_norms[i : i + 1], k)
+                for i in range(len(queries))
+            ]
+        return self._search_exact(queries, query_norms, k, rows)
+
+    def _search_exact(
+        self, queries: np.ndarray, query_norms: np.ndarray, k: int, rows: np.ndarray | None
+    ) -> list[list[tuple[int, float]]]:
+        matrix, norms = (self.matrix, self.norms) if rows is None else (self.matrix[rows], self.norms[rows])
+        indices, distances = _top_k(_squared_l2(queries, query_norms, matrix, norms), k)
+        if rows is not None:
+            indices = rows[indices]
+        return [
+            [(int(row), float(distance)) for row, distance in zip(index_row, distance_row)]
+            for index_row, distance_row in zip(indices, distances)
+        ]
+
+    def _search_ivf(self, query: np.ndarray, query_norm: np.ndarray, k: int) -> list[tuple[int, float]]:
+        assert self.centroids is not None and self._centroid_norms is not None and self.list_bounds is not None
+        cell_distances = _squared_l2(query, query_norm, self.centroids, self._centroid_norms)[0]
+        n_probe = min(self.n_probe, len(self.centroids))
+        probe = np.argpartition(cell_distances, n_probe - 1)[:n_probe]
+        ranges = [(self.list_bounds[cell], self.list_bounds[cell + 1]) for cell in probe]
+        # Score each probed cell in place; cells are contiguous so no rows are copied
+        candidates = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        distances = np.concatenate(
+            [_squared_l2(query, query_norm, self.matrix[start:stop], self.norms[start:stop]) for start, stop in ranges],
+            axis=1,
+        )
+        if len(candidates) < k:
+            # Probed cells are too sparse to fill top-k; fall back to an exact scan
+            return self._search_exact(query, query_norm, k, None)[0]
+        indices, top_distances = _top_k(distances, k)
+        return [(int(candidates[i]), float(d)) for i, d in zip(indices[0], top_distances[0])]
+
+    def matches(self, hits: Iterable[tuple[int, float]]) -> list[VectorMatch]:
+        return [
+            VectorMatch(content=self.documents[row], metadata=dict(self.metadatas[row]), score=distance)
+            for row, distance in hits
+        ]
+
+
+class NumpyVectorClient(VectorClient):
+    """``VectorClient`` that searches in-memory :class:`NumpyCollection` indexes.
+
+    Scores are squared L2 distances, matching Chroma's default space, so the context
+    builder's distance thresholds behave the same with either backend. Query texts
+    are embedded with ``embedder`` (one call per ``query_many`` batch).
+    """
+
+    def __init__(
+        self,
+        collections: dict[str, NumpyCollection] | None = None,
+        *,
+        embedder: Embedder | None = None,
+    ):
+        self.collections: dict[str, NumpyCollection] = dict(collections or {})
+        self._embedder = embedder
+
+    @classmethod
+    def from_chroma(
+        cls,
+        chroma_path: Path,
+        app_config=None,
+        *,
+        collections: Iterable[str] = DEFAULT_COLLECTIONS,
+        registry: VectorStoreRegistry | None = None,
+        **index_options: Any,
+    ) -> "NumpyVectorClient":
+        """Snapshot Chroma collections into memory; query embeddings reuse the Chroma client's model."""
+        registry = registry or get_vector_registry()
+        chroma_client = ChromaVectorClient(chroma_path, app_config=app_config, registry=registry)
+        loaded: dict[str, NumpyCollection] = {}
+        for name in collections:
+            collection = registry.get_collection(chroma_path, name)
+            if collection is None:
+                continue
+            loaded[name] = NumpyCollection.from_chroma(collection, **index_options)
+            logger.info("Loaded %d vectors from '%s' into the NumPy index", len(loaded[name]), name)
+        return cls(loaded, embedder=chroma_client.embed_queries)
+
+    def query(
+        self, collection: str, query_text: str, n_results: int, document_id: int | None = None
+    ) -> list[VectorMatch]:
+        return self.query_many([VectorQuery(collection, query_text, n_results, document_id)])[0]
+
+    def query_many(self, queries: Sequence[VectorQuery]) -> list[list[VectorMatch]]:
+        results: list[list[VectorMatch]] = [[] for _ in queries]
+        active = [
+            (idx, q)
+            for idx, q in enumerate(queries)
+            if q.query_text and q.n_results > 0 and len(self.collections.get(q.collection, ())) > 0
+        ]
+        if not active or self._embedder is None:
+            return results
+
+        texts = list(dict.fromkeys(q.query_text for _, q in active))
+        try:
+            vectors = self._embedder(texts)
+        except Exception as exc:  # pragma: no cover - embedding failure
+            logger.warning("Query embedding failed for %d texts: %s", len(texts), exc)
+            return results
+        if len(vectors) != len(texts):
+            return results
+        positions = {text: position for position, text in enumerate(texts)}
+        query_matrix = np.asarray(vectors, dtype=np.float32)
+
+        groups: dict[tuple[str, int | None], list[tuple[int, VectorQuery]]] = defaultdict(list)
+        for idx, q in active:
+            groups[(q.collection, q.document_id)].append((idx, q))
+        for (name, document_id), members in groups.items():
+            index = self.collections[name]
+            group_texts = list(dict.fromkeys(q.query_text for _, q in members))
+            try:
+                hits = index.search(
+                    query_matrix[[positions[text] for text in group_texts]],
+                    max(q.n_results for _, q in members),
+                    document_id=document_id,
+                )
+            except ValueError as exc:
+                logger.error("NumPy vector search failed for collection '%s': %s", name, exc)
+                continue
+            by_text = dict(zip(group_texts, hits))
+            for idx, q in members:
+                results[idx] = index.matches(by_text[q.query_text][: q.n_results])
+        return results
@@ -0,0 +1,121 @@
+"""Metadata stored with every vector, so retrieval never has to re-tokenize matches."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from ..db.models import Chunk
+from .context_builder import TokenEstimator, stored_token_count
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Hash of chunk text; the same key the embedding store uses for the vector."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def resolve_token_counts(chunks: Sequence[Chunk], estimator: Callable[[], TokenEstimator]) -> list[int]:
+    """Stored counts for each chunk, tokenizing (in one batch) only chunks that have none.
+
+    ``estimator`` is only called when a count is missing, since loading a tokenizer is slow.
+    """
+    counts = [chunk.token_count or stored_token_count(chunk.chunk_metadata) for chunk in chunks]
+    missing = [position for position, count in enumerate(counts) if not count]
+    if missing:
+        computed = estimator().count_many([chunks[position].content for position in missing])
+        for position, count in zip(missing, computed):
+            counts[position] = count
+    return counts  # type: ignore[return-value]
+
+
+def chunk_vector_metadata(chunk: Chunk, token_count: int) -> dict[str, Any]:
+    """Flatten a chunk into ChromaDB metadata (primitive values only)."""
+    metadata: dict[str, Any] = {
+        "chunk_pk": chunk.id,
+        "chunk_id": chunk.chunk_id,
+        "document_id": chunk.document_id,
+        "chunk_index": chunk.chunk_index,
+        "section_path": chunk.section_path or "",
+        "parent_heading": chunk.parent_heading or "",
+    }
+    # Flatten chunk_metadata, converting dicts to JSON strings
+    for key, value in (chunk.chunk_metadata or {}).items():
+        if isinstance(value, (dict, list)):
+            metadata[key] = json.dumps(value)
+        elif isinstance(value, (str, int, float, bool)) or value is None:
+            metadata[key] = value
+        else:
+            metadata[key] = str(value)
+    # Written last so stale values in chunk_metadata cannot override them
+    metadata["token_count"] = token_count
+    metadata["content_hash"] = content_hash(chunk.content)
+    return metadata
+
+
+@dataclass
+class BackfillReport:
+    collection: str
+    scanned: int = 0
+    updated: int = 0
+    tokenized: int = 0
+
+
+def backfill_collection(
+    collection: Any,
+    estimator: TokenEstimator,
+    *,
+    known_counts: Callable[[list[str]], dict[str, int]] | None = None,
+    batch_size: int = 500,
+    dry_run: bool = False,
+) -> BackfillReport:
+    """Add ``token_count`` and ``content_hash`` to vectors stored without them.
+
+    ``known_counts`` maps chunk ids to token counts already stored elsewhere (the
+    ``chunks`` table); only vectors it cannot answer are tokenized.
+    """
+    report = BackfillReport(collection=getattr(collection, "name", str(collection)))
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        ids = list(page.get("ids") or [])
+        if not ids:
+            break
+        offset += len(ids)
+        report.scanned += len(ids)
+
+        documents = page.get("documents") or [""] * len(ids)
+        metadatas = [dict(meta or {}) for meta in (page.get("metadatas") or [{}] * len(ids))]
+        stale = [
+            position
+            for position, (document, metadata) in enumerate(zip(documents, metadatas))
+            if stored_token_count(metadata) is None or metadata.get("content_hash") != content_hash(document or "")
+        ]
+        if not stale:
+            continue
+
+        counts = {position: stored_token_count(metadatas[position]) for position in stale}
+        lookup = [ids[position] for position, count in counts.items() if count is None]
+        known = known_counts(lookup) if known_counts and lookup else {}
+        for position in stale:
+            counts[position] = counts[position] or known.get(ids[position])
+        to_tokenize = [position for position in stale if not counts[position]]
+        for position, count in zip(to_tokenize, estimator.count_many([documents[p] or "" for p in to_tokenize])):
+            counts[position] = count
+        report.tokenized += len(to_tokenize)
+
+        for position in stale:
+            metadatas[position]["token_count"] = counts[position]
+            metadatas[position]["content_hash"] = content_hash(documents[position] or "")
+        report.updated += len(stale)
+        if not dry_run:
+            collection.update(ids=[ids[p] for p in stale], metadatas=[metadatas[p] for p in stale])
+
+    logger.info(
+        "Backfilled vector metadata for %s of %s entries in '%s'", report.updated, report.scanned, report.collection
+    )
+    return report
@@ -0,0 +1,124 @@
+"""Process-wide registry of open ChromaDB clients, collection handles and dimensions."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _default_client_factory(path: str) -> Any:
+    import chromadb  # type: ignore
+
+    return chromadb.PersistentClient(path=path)
+
+
+def _is_missing_collection_error(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return "does not exist" in message or "not found" in message
+
+
+class VectorStoreRegistry:
+    """Caches one ``PersistentClient`` per Chroma directory and its collection handles.
+
+    Opening a persistent client and peeking at a collection to learn its dimension
+    are the expensive parts of every ingestion batch and vector query; the registry
+    pays them once per process. Dimensions are memoized on first non-empty peek and
+    kept current by ``record_dimension`` after writes.
+    """
+
+    def __init__(self, client_factory: Callable[[str], Any] | None = None):
+        self._client_factory = client_factory or _default_client_factory
+        self._lock = threading.RLock()
+        self._clients: dict[str, Any] = {}
+        self._collections: dict[tuple[str, str], Any] = {}
+        self._dimensions: dict[tuple[str, str], int] = {}
+
+    @staticmethod
+    def _path_key(chroma_path: Path | str) -> str:
+        return str(Path(chroma_path).resolve())
+
+    def client(self, chroma_path: Path | str) -> Any:
+        """Return the shared client for ``chroma_path``; raises ImportError without chromadb."""
+        key = self._path_key(chroma_path)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                Path(key).mkdir(parents=True, exist_ok=True)
+                client = self._client_factory(key)
+                self._clients[key] = client
+                logger.debug("Opened ChromaDB client at %s", key)
+            return client
+
+    def get_collection(self, chroma_path: Path | str, name: str, *, create: bool = False) -> Any | None:
+        """Return a cached collection handle, or None if it does not exist and ``create`` is False."""
+        cache_key = (self._path_key(chroma_path), name)
+        with self._lock:
+            collection = self._collections.get(cache_key)
+            if collection is not None:
+                return collection
+            client = self.client(chroma_path)
+            if create:
+                collection = client.get_or_create_collection(name=name)
+            else:
+                try:
+                    collection = client.get_collection(name=name)
+                except Exception as exc:
+                    if _is_missing_collection_error(exc):
+                        return None
+                    raise
+            self._collections[cache_key] = collection
+            return collection
+
+    def collection_dimension(self, chroma_path: Path | str, name: str) -> int | None:
+        """Embedding dimension of a collection, or None if it is missing or empty."""
+        cache_key = (self._path_key(chroma_path), name)
+        with self._lock:
+            if cache_key in self._dimensions:
+                return self._dimensions[cache_key]
+            collection = self.get_collection(chroma_path, name)
+            if collection is None or collection.count() == 0:
+                return None
+            sample = collection.peek(limit=1).get("embeddings")
+            if sample is None or len(sample) == 0:
+                return None
+            dimension = len(sample[0])
+            self._dimensions[cache_key] = dimension
+            return dimension
+
+    def record_dimension(self, chroma_path: Path | str, name: str, dimension: int) -> None:
+        with self._lock:
+            self._dimensions[(self._path_key(chroma_path), name)] = dimension
+
+    def forget_collection(self, chroma_path: Path | str, name: str) -> None:
+        """Drop cached state for a collection that was deleted or recreated."""
+        cache_key = (self._path_key(chroma_path), name)
+        with self._lock:
+            self._collections.pop(cache_key, None)
+            self._dimensions.pop(cache_key, None)
+
+    def delete_collection(self, chroma_path: Path | str, name: str) -> None:
+        from .retrieval_cache import get_retrieval_cache
+
+        with self._lock:
+            self.client(chroma_path).delete_collection(name=name)
+            self.forget_collection(chroma_path, name)
+        get_retrieval_cache().invalidate(chroma_path, name)
+
+
+# Global registry shared by ingestion and retrieval
+_global_registry = VectorStoreRegistry()
+
+
+def get_vector_registry() -> VectorStoreRegistry:
+    """Get the global vector store registry."""
+    return _global_registry
+
+
+def reset_vector_registry() -> None:
+    """Reset the global registry (useful for testing)."""
+    global _global_registry
+    _global_registry = VectorStoreRegistry()
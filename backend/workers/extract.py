@@ -40,9 +40,15 @@ def main(
     ocr_lang: str = typer.Option(
         "eng", "--ocr-lang", help="Language hint passed to Tesseract when OCR is enabled."
     ),
+    workers: int = typer.Option(
+        0,
+        "--workers",
+        "-w",
+        help="Processes used to extract PDF pages in parallel (0 = one per CPU core).",
+    ),
 ) -> None:
     """CLI entrypoint for the text extraction worker."""
-    extractor = DocumentExtractor(use_ocr=ocr, ocr_lang=ocr_lang)
+    extractor = DocumentExtractor(use_ocr=ocr, ocr_lang=ocr_lang, pdf_workers=workers)
 
     try:
         result = extractor.extract(document_path)
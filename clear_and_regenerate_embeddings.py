@@ -15,6 +15,7 @@ load_dotenv()
 from backend.app.config.settings import AppConfig
 from backend.app.db.models import Base, Document, Chunk
 from backend.app.db.session import get_session, init_engine
+from backend.app.services.embedding_store import EmbeddingStore
 from backend.app.services.embeddings import EmbeddingService
 from sqlalchemy import select
 
@@ -74,6 +75,21 @@ def clear_embedding_cache(config: AppConfig) -> None:
     except Exception as e:
         print(f"  [ERROR] Failed to clear cache: {e}")
 
+def clear_embedding_store(config: AppConfig) -> None:
+    """Empty the memory-mapped embedding stores."""
+    # The web app and workers may have these stores open, so empty them through their
+    # index instead of deleting the directory out from under their connections and memmaps
+    store_dir = Path(config.data_root) / "cache" / "embedding_store"
+    for index_file in sorted(store_dir.rglob("index.sqlite3")) if store_dir.exists() else []:
+        store = EmbeddingStore(index_file.parent.parent, index_file.parent.name)
+        try:
+            removed = store.clear()
+            print(f"  [OK] Cleared {removed} entries from embedding store {store.path}")
+        except Exception as e:
+            print(f"  [ERROR] Failed to clear embedding store {store.path}: {e}")
+        finally:
+            store.close()
+
 def reset_chunk_embedding_status(session, source_type: str = "regulation") -> int:
     """Reset embedding status for chunks of a specific source type."""
     print(f"Resetting embedding status for {source_type} chunks...")
@@ -180,6 +196,7 @@ def main():
         # Step 2: Clear embedding cache
         print("\n[Step 2] Clearing embedding cache...")
         clear_embedding_cache(config)
+        clear_embedding_store(config)
         
         # Step 3: Reset chunk embedding status for regulations
         print("\n[Step 3] Resetting chunk embedding status...")
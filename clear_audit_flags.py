@@ -6,6 +6,7 @@ sys.path.insert(0, '.')
 from backend.app import create_app
 from backend.app.db.session import get_session
 from backend.app.db.models import Audit, Flag, AuditChunkResult
+from backend.app.services.compliance_score import rebuild_flag_summary
 from sqlalchemy import desc
 
 app = create_app()
@@ -39,6 +40,8 @@ with app.app_context():
     audit.failed_at = None
     audit.failure_reason = None
     
+    # The materialized flag counts and score would otherwise still include the deleted flags
+    rebuild_flag_summary(session, audit.id)
     session.commit()
     
     print(f"✅ Cleared {flag_count} flags and {result_count} chunk results")
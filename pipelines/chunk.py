@@ -50,9 +50,16 @@ def main(
     """Chunk an extracted document and persist rows to the SQLite database."""
 
     from backend.app.config.settings import AppConfig
-    from backend.app.db.models import Base, Chunk
+    from backend.app.db.models import Base
     from backend.app.db.session import get_session, init_engine
+    from backend.app.services.chunk_store import (
+        ChunkWriteReport,
+        chunk_values,
+        delete_document_chunks,
+        insert_chunks,
+    )
     from backend.app.services.chunking import SemanticChunker
+    from backend.app.services.section_index import index_document_sections
 
     config = AppConfig()
     engine = init_engine(config.database_url)
@@ -84,45 +91,32 @@ def main(
             _print_dry_run(payloads)
             return
 
+        writes = ChunkWriteReport()
         if replace:
-            deleted = (
-                session.query(Chunk)
-                .filter(Chunk.document_id == document.id)
-                .delete(synchronize_session=False)
-            )
+            deleted = delete_document_chunks(session, document, report=writes)
             if deleted:
                 console.print(f"[cyan]Removed {deleted} existing chunks for document.[/cyan]")
-            session.flush()
-
-        for idx, payload in enumerate(payloads):
-            metadata = {
-                **payload.metadata,
-                "chunk_id": payload.chunk_id,
-                "section_path": payload.section_path,
-                "parent_heading": payload.parent_heading,
-            }
-            section_path = " > ".join(payload.section_path).strip() or None
-            chunk_row = Chunk(
-                document_id=document.id,
-                chunk_id=payload.chunk_id,
-                chunk_index=idx,
-                section_path=section_path,
-                parent_heading=payload.parent_heading,
-                content=payload.text,
-                token_count=payload.token_count,
-                chunk_metadata=metadata,
-            )
-            session.add(chunk_row)
 
-            if verbose:
+        chunk_rows = insert_chunks(
+            session,
+            [
+                chunk_values(document.id, payload, idx, with_path_metadata=True)
+                for idx, payload in enumerate(payloads)
+            ],
+            report=writes,
+        )
+        if verbose:
+            for idx, payload in enumerate(payloads):
                 console.print(
                     f"[green]chunk {idx:04d}[/green] {payload.chunk_id} "
                     f"[tokens={payload.token_count}] path={' > '.join(payload.section_path)}"
                 )
 
+        index_document_sections(session, document, chunk_rows)
         session.commit()
         console.print(
-            f"[green]Persisted {len(payloads)} chunks for document {document.external_id}.[/green]"
+            f"[green]Persisted {len(payloads)} chunks for document {document.external_id}[/green] "
+            f"({writes.rows_per_second:.0f} rows/s)."
         )
     finally:
         session.close()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+
+load_dotenv()
+
+console = Console()
+app = typer.Typer(add_completion=False, help="Embedding cache maintenance")
+
+
+def _store_root(data_root: str) -> Path:
+    return Path(data_root) / "cache" / "embedding_store"
+
+
+@app.command()
+def migrate(
+    source: Path = typer.Option(
+        None,
+        "--source",
+        "-s",
+        help="Legacy .npy cache directory (defaults to DATA_ROOT/cache/embeddings).",
+    ),
+    model: str = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Embedding model the cached vectors belong to (defaults to EMBEDDING_MODEL).",
+    ),
+    remove: bool = typer.Option(
+        False,
+        "--remove",
+        help="Delete legacy .npy files after they have been imported.",
+    ),
+) -> None:
+    """Import a legacy per-text .npy embedding cache into the memory-mapped store."""
+
+    from backend.app.config.settings import AppConfig
+    from backend.app.services.embedding_store import EmbeddingStore
+
+    config = AppConfig()
+    source_dir = source or Path(config.data_root) / "cache" / "embeddings"
+    if not source_dir.exists():
+        console.print(f"[yellow]No legacy cache found at {source_dir}.[/yellow]")
+        raise typer.Exit(code=0)
+
+    store = EmbeddingStore(_store_root(config.data_root), model or config.embedding_model)
+    try:
+        report = store.import_npy_directory(source_dir, remove=remove)
+        stats = store.stats()
+    finally:
+        store.close()
+
+    console.print(
+        f"[green]Migration complete![/green]\n"
+        f"  Imported: {report.migrated}\n"
+        f"  Already present: {report.skipped}\n"
+        f"  Unreadable: {report.failed}\n"
+        f"  Legacy files removed: {report.removed}\n"
+        f"  Store entries: {stats['entries']}"
+    )
+
+
+@app.command()
+def compact(
+    model: str = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Embedding model namespace to compact (defaults to EMBEDDING_MODEL).",
+    ),
+) -> None:
+    """Rewrite the vector files without rows that are no longer indexed."""
+
+    from backend.app.config.settings import AppConfig
+    from backend.app.services.embedding_store import EmbeddingStore
+
+    config = AppConfig()
+    store = EmbeddingStore(_store_root(config.data_root), model or config.embedding_model)
+    try:
+        reclaimed = store.compact()
+        stats = store.stats()
+    finally:
+        store.close()
+
+    console.print(
+        f"[green]Compaction complete![/green] Reclaimed {reclaimed} bytes, "
+        f"{stats['entries']} entries remain."
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+
+load_dotenv()
+
+console = Console()
+app = typer.Typer(add_completion=False, help="Section number index backfill")
+
+
+@app.command()
+def main(
+    source_types: list[str] = typer.Option(
+        None,
+        "--source-type",
+        "-s",
+        help="Source type to backfill; repeat for several (defaults to every document).",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="List the documents that have no section index entries without writing any.",
+    ),
+) -> None:
+    """Write section index entries for documents chunked before the index existed."""
+
+    from backend.app.config.settings import AppConfig
+    from backend.app.db.models import Base
+    from backend.app.db.session import get_session, init_engine
+    from backend.app.services.section_index import backfill_section_index, unindexed_documents
+
+    config = AppConfig()
+    engine = init_engine(config.database_url)
+    Base.metadata.create_all(engine)
+    session = get_session()
+
+    try:
+        if dry_run:
+            documents = unindexed_documents(session, source_types)
+            for document in documents:
+                console.print(f"{document.external_id} ({document.source_type})")
+            console.print(f"[green]Would index {len(documents)} documents[/green]")
+            return
+        written = backfill_section_index(session, source_types)
+    finally:
+        session.close()
+
+    indexed = sum(1 for count in written.values() if count)
+    console.print(
+        f"[green]Indexed {indexed} of {len(written)} documents[/green] "
+        f"({sum(written.values())} entries; {len(written) - indexed} had no section numbers)"
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+
+load_dotenv()
+
+console = Console()
+app = typer.Typer(add_completion=False, help="Vector metadata backfill")
+
+
+@app.command()
+def main(
+    collections: list[str] = typer.Option(
+        None,
+        "--collection",
+        "-c",
+        help="Collection to backfill; repeat for several (defaults to every standard collection).",
+    ),
+    batch_size: int = typer.Option(
+        500,
+        "--batch-size",
+        "-b",
+        help="Vectors read and updated per request.",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Report how many vectors need metadata without writing it.",
+    ),
+) -> None:
+    """Write token_count and content_hash into vectors stored before ingestion recorded them."""
+
+    from sqlalchemy import select
+
+    from backend.app.config.settings import AppConfig
+    from backend.app.db.models import Base, Chunk
+    from backend.app.db.session import get_session, init_engine
+    from backend.app.services.context_builder import TokenEstimator
+    from backend.app.services.retrieval_cache import get_retrieval_cache
+    from backend.app.services.vector_index import DEFAULT_COLLECTIONS
+    from backend.app.services.vector_metadata import backfill_collection
+    from backend.app.services.vector_registry import get_vector_registry
+
+    config = AppConfig()
+    engine = init_engine(config.database_url)
+    Base.metadata.create_all(engine)
+    chroma_path = Path(config.data_root) / "chroma"
+    registry = get_vector_registry()
+    try:
+        registry.client(chroma_path)
+    except ImportError:
+        console.print("[red]chromadb not installed. Install with: pip install chromadb[/red]")
+        raise typer.Exit(code=1)
+
+    session = get_session()
+    estimator = TokenEstimator(config.context_builder.tokenizer)
+
+    def known_counts(chunk_ids: list[str]) -> dict[str, int]:
+        stmt = select(Chunk.chunk_id, Chunk.token_count).where(
+            Chunk.chunk_id.in_(chunk_ids), Chunk.token_count > 0
+        )
+        return {chunk_id: count for chunk_id, count in session.execute(stmt)}
+
+    try:
+        for name in collections or DEFAULT_COLLECTIONS:
+            collection = registry.get_collection(chroma_path, name)
+            if collection is None:
+                console.print(f"[yellow]Collection '{name}' does not exist; skipping.[/yellow]")
+                continue
+            report = backfill_collection(
+                collection, estimator, known_counts=known_counts, batch_size=batch_size, dry_run=dry_run
+            )
+            if report.updated and not dry_run:
+                # Servers cache search results, including metadata; tell them the collection changed
+                get_retrieval_cache(config).invalidate(chroma_path, name)
+            verb = "Would update" if dry_run else "Updated"
+            console.print(
+                f"[green]{name}[/green]: {verb} {report.updated} of {report.scanned} vectors "
+                f"({report.tokenized} tokenized, {report.updated - report.tokenized} from stored counts)"
+            )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Micro-benchmark the recursive RAG reference extractor on stored chunk text."""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable
+
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+
+from backend.app.services.recursive_context_builder import Reference, ReferenceExtractor
+
+load_dotenv()
+
+console = Console()
+app = typer.Typer(add_completion=False, help="Reference extractor micro-benchmark")
+
+_WORDS = (
+    "the maintenance organisation shall ensure that tools equipment and certifying staff comply with "
+    "the approved procedures of the quality system and the accountable manager"
+).split()
+
+
+def _synthetic_chunks(count: int, seed: int) -> list[str]:
+    """MOE-like paragraphs with section references, dates and version numbers mixed in."""
+    rng = random.Random(seed)
+    makers: list[Callable[[], str]] = [
+        lambda: f"Section {rng.randint(1, 9)}.{rng.randint(1, 12)}",
+        lambda: f"Part-145.A.{rng.choice([30, 35, 42, 47, 65, 70])}",
+        lambda: f"chapter {rng.randint(1, 9)}",
+        lambda: f"{rng.randint(1, 28)}.{rng.randint(1, 12)}.{rng.randint(2019, 2025)}",
+        lambda: f"rev {rng.randint(1, 9)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+    ]
+    chunks = []
+    for _ in range(count):
+        words = [rng.choice(makers)() if rng.random() < 0.04 else rng.choice(_WORDS) for _ in range(rng.randint(150, 450))]
+        chunks.append(" ".join(words))
+    return chunks
+
+
+def _stored_chunks(source_type: str, limit: int) -> list[str]:
+    from sqlalchemy import select
+
+    from backend.app.config.settings import AppConfig
+    from backend.app.db.models import Chunk, Document
+    from backend.app.db.session import get_session, init_engine
+
+    init_engine(AppConfig().database_url)
+    session = get_session()
+    try:
+        stmt = (
+            select(Chunk.content)
+            .join(Document, Document.id == Chunk.document_id)
+            .where(Document.source_type == source_type)
+            .order_by(Chunk.id)
+            .limit(limit)
+        )
+        return list(session.execute(stmt).scalars())
+    finally:
+        session.close()
+
+
+def _time(run: Callable[[str], list[Reference]], texts: list[str], repeat: int) -> tuple[float, list[list[Reference]]]:
+    results = [run(text) for text in texts]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            run(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(texts)) * 1e6, results
+
+
+@app.command()
+def main(
+    source_type: str = typer.Option("manual", "--source-type", "-s", help="Benchmark chunks of this document type."),
+    limit: int = typer.Option(2000, "--limit", "-n", help="Maximum number of chunks to load."),
+    synthetic: int = typer.Option(0, "--synthetic", help="Use N synthetic MOE-like chunks instead of the database."),
+    repeat: int = typer.Option(5, "--repeat", "-r", help="Timed passes over the corpus."),
+    seed: int = typer.Option(0, "--seed", help="Random seed for synthetic text."),
+) -> None:
+    """Compare the per-pattern scan, the single-pass scan and memoized extraction."""
+
+    texts = _synthetic_chunks(synthetic, seed) if synthetic else _stored_chunks(source_type, limit)
+    if not texts:
+        console.print(f"[yellow]No '{source_type}' chunks found; run with --synthetic N instead.[/yellow]")
+        raise typer.Exit(code=1)
+
+    extractor = ReferenceExtractor()
+    ReferenceExtractor.clear_cache()
+    for text in texts:
+        extractor.extract_references(text)
+
+    timings = {
+        "Per-pattern scan (6 passes)": _time(extractor._scan_patterns, texts, repeat),
+        "Single-pass scan": _time(extractor._scan, texts, repeat),
+        "Memoized extract_references": _time(extractor.extract_references, texts, repeat),
+    }
+    baseline_us, expected = timings["Per-pattern scan (6 passes)"]
+
+    chars = sum(len(text) for text in texts)
+    table = Table(title=f"{len(texts)} chunks, {chars / len(texts):.0f} chars/chunk, {repeat} passes")
+    table.add_column("Extractor")
+    table.add_column("µs/chunk", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Same output", justify="right")
+    for name, (per_chunk_us, results) in timings.items():
+        table.add_row(name, f"{per_chunk_us:.1f}", f"{baseline_us / per_chunk_us:.1f}x", "yes" if results == expected else "NO")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
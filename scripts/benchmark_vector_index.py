@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""Benchmark the in-process NumPy vector index against ChromaDB retrieval."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import typer
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+
+from backend.app.services.vector_index import NumpyCollection
+
+load_dotenv()
+
+console = Console()
+app = typer.Typer(add_completion=False, help="NumPy vector index vs ChromaDB benchmark")
+
+
+def _synthetic_corpus(size: int, dim: int, documents: int, seed: int) -> dict[str, Any]:
+    """Clustered vectors so IVF behaves as it would on real embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, size // 200), dim)).astype(np.float32) * 3
+    embeddings = centers[rng.integers(0, len(centers), size)] + rng.standard_normal((size, dim)).astype(np.float32)
+    return {
+        "ids": [f"chunk-{i}" for i in range(size)],
+        "embeddings": embeddings.astype(np.float32),
+        "documents": [f"synthetic chunk {i}" for i in range(size)],
+        "metadatas": [{"document_id": i % documents, "chunk_index": i} for i in range(size)],
+    }
+
+
+def _load_chroma_collection(chroma_path: Path, name: str) -> tuple[Any, dict[str, Any]]:
+    import chromadb
+
+    collection = chromadb.PersistentClient(path=str(chroma_path)).get_collection(name=name)
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+    data["embeddings"] = np.asarray(data["embeddings"], dtype=np.float32)
+    return collection, data
+
+
+def _chroma_from_corpus(corpus: dict[str, Any], workdir: Path) -> Any | None:
+    try:
+        import chromadb
+    except ImportError:
+        return None
+    collection = chromadb.PersistentClient(path=str(workdir)).get_or_create_collection(name="benchmark")
+    for start in range(0, len(corpus["ids"]), 5000):
+        stop = start + 5000
+        collection.add(
+            ids=corpus["ids"][start:stop],
+            embeddings=corpus["embeddings"][start:stop].tolist(),
+            documents=corpus["documents"][start:stop],
+            metadatas=corpus["metadatas"][start:stop],
+        )
+    return collection
+
+
+Runner = Callable[[np.ndarray, Any], list[str]]
+
+
+def _time_per_query(run: Runner, queries: np.ndarray, document_ids: list[Any]) -> tuple[list[float], list[list[str]]]:
+    latencies: list[float] = []
+    results: list[list[str]] = []
+    for query, document_id in zip(queries, document_ids):
+        start = time.perf_counter()
+        results.append(run(query, document_id))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, results
+
+
+def _recall(results: list[list[str]], truth: list[list[str]]) -> float:
+    scores = [len(set(found) & set(expected)) / max(1, len(expected)) for found, expected in zip(results, truth)]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+@app.command()
+def main(
+    collection: str = typer.Option("manual_chunks", "--collection", "-c", help="ChromaDB collection to load."),
+    synthetic: int = typer.Option(0, "--synthetic", help="Benchmark N synthetic vectors instead of DATA_ROOT/chroma."),
+    dim: int = typer.Option(1024, "--dim", help="Dimension of synthetic vectors."),
+    queries: int = typer.Option(200, "--queries", "-n", help="Number of query vectors."),
+    top_k: int = typer.Option(10, "--top-k", "-k", help="Results per query."),
+    n_probe: int = typer.Option(8, "--n-probe", help="IVF cells scanned per query."),
+    filtered: bool = typer.Option(False, "--filtered", help="Filter every query by its source document_id."),
+    seed: int = typer.Option(0, "--seed", help="Random seed for sampling."),
+) -> None:
+    """Compare per-query latency and recall of exact NumPy, IVF NumPy and ChromaDB search."""
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if synthetic:
+            corpus = _synthetic_corpus(synthetic, dim, documents=max(1, synthetic // 500), seed=seed)
+            chroma_collection = _chroma_from_corpus(corpus, Path(workdir))
+        else:
+            chroma_path = Path(os.getenv("DATA_ROOT", "./data")) / "chroma"
+            try:
+                chroma_collection, corpus = _load_chroma_collection(chroma_path, collection)
+            except ImportError:
+                console.print("[red]chromadb not installed; use --synthetic N instead.[/red]")
+                raise typer.Exit(code=1)
+        if len(corpus["ids"]) == 0:
+            console.print(f"[yellow]Collection '{collection}' is empty.[/yellow]")
+            raise typer.Exit(code=1)
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(len(corpus["ids"]), min(queries, len(corpus["ids"])), replace=False)
+        embeddings = corpus["embeddings"]
+        noise = rng.standard_normal((len(sample), embeddings.shape[1])).astype(np.float32)
+        query_vectors = embeddings[sample] + 0.05 * np.std(embeddings) * noise
+        document_ids = [corpus["metadatas"][i].get("document_id") for i in sample]
+
+        timings: dict[str, float] = {}
+        start = time.perf_counter()
+        exact = NumpyCollection(corpus["ids"], embeddings, corpus["documents"], corpus["metadatas"], ivf_min_size=len(corpus["ids"]) + 1)
+        timings["NumPy exact"] = time.perf_counter() - start
+        start = time.perf_counter()
+        ivf = NumpyCollection(corpus["ids"], embeddings, corpus["documents"], corpus["metadatas"], ivf_min_size=0, n_probe=n_probe)
+        timings["NumPy IVF"] = time.perf_counter() - start
+
+        def numpy_runner(index: NumpyCollection) -> Runner:
+            def run(query: np.ndarray, document_id: Any) -> list[str]:
+                hits = index.search(query, top_k, document_id=document_id)[0]
+                return [index.ids[row] for row, _ in hits]
+
+            return run
+
+        runners: dict[str, Runner] = {"NumPy exact": numpy_runner(exact), "NumPy IVF": numpy_runner(ivf)}
+        if chroma_collection is not None:
+
+            def chroma_run(query: np.ndarray, document_id: Any) -> list[str]:
+                kwargs: dict[str, Any] = {"query_embeddings": [query.tolist()], "n_results": top_k}
+                if document_id is not None:
+                    kwargs["where"] = {"document_id": document_id}
+                return chroma_collection.query(**kwargs)["ids"][0]
+
+            runners["ChromaDB"] = chroma_run
+
+        filters = document_ids if filtered else [None] * len(sample)
+        measured = {name: _time_per_query(run, query_vectors, filters) for name, run in runners.items()}
+        truth = measured["NumPy exact"][1]
+
+        table = Table(
+            title=f"{len(corpus['ids'])} vectors x {embeddings.shape[1]} dims, {len(sample)} queries, top-{top_k}"
+            + (" (document-filtered)" if filtered else "")
+        )
+        table.add_column("Backend")
+        table.add_column("Build (s)", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        table.add_column("Recall@k", justify="right")
+        for name, (latencies, results) in measured.items():
+            table.add_row(
+                name,
+                f"{timings[name]:.2f}" if name in timings else "-",
+                f"{np.mean(latencies):.2f}",
+                f"{np.percentile(latencies, 95):.2f}",
+                f"{_recall(results, truth):.3f}",
+            )
+        console.print(table)
+        if chroma_collection is None:
+            console.print("[yellow]chromadb not installed; ChromaDB row skipped.[/yellow]")
+
+
+if __name__ == "__main__":
+    app()
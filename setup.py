@@ -96,7 +96,7 @@ def setup_directories() -> bool:
         "data/processed",
         "data/logs",
         "data/chroma",
-        "data/cache/embeddings",
+        "data/cache/embedding_store",
     ]
     
     for dir_path in dirs:
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import json
+import threading
+
 from backend.app.db.models import Audit, Document
 from backend.app.db.session import get_session
+from backend.app.services.progress_bus import get_progress_bus
 
 
 def _seed_document(session) -> Document:
@@ -59,6 +63,49 @@ def test_create_audit_draft_mode(client, app):
     assert data["audit"]["is_draft"] is True
 
 
+def test_create_delta_audit_picks_latest_completed_baseline(client, app):
+    """A delta audit is linked to the document's latest completed full audit."""
+    session = get_session()
+    doc = _seed_document(session)
+    baseline = Audit(document_id=doc.id, status="completed")
+    session.add_all([baseline, Audit(document_id=doc.id, status="completed", is_draft=True)])
+    session.commit()
+
+    response = client.post("/api/audits", json={"document_id": doc.id, "delta": True})
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["audit"]["baseline_audit_id"] == baseline.external_id
+    assert session.get(Audit, data["audit"]["id"]).baseline_audit_id == baseline.id
+
+
+def test_create_audit_rejects_ineligible_explicit_baseline(client, app):
+    """An explicit baseline must be a completed full audit of the document or its organization."""
+    session = get_session()
+    doc = _seed_document(session)
+    doc.organization = "Acme Air"
+    other = _seed_document(session)
+    other.organization = "Other Air"
+    sibling = _seed_document(session)
+    sibling.organization = "Acme Air"
+    running = Audit(document_id=doc.id, status="running")
+    draft = Audit(document_id=doc.id, status="completed", is_draft=True)
+    foreign = Audit(document_id=other.id, status="completed")
+    same_org = Audit(document_id=sibling.id, status="completed")
+    session.add_all([running, draft, foreign, same_org])
+    session.commit()
+
+    for baseline in (running, draft, foreign):
+        response = client.post("/api/audits", json={"document_id": doc.id, "baseline_audit_id": baseline.external_id})
+        assert response.status_code == 400
+        assert baseline.external_id in response.get_json()["error"]
+
+    response = client.post("/api/audits", json={"document_id": doc.id, "baseline_audit_id": same_org.external_id})
+    assert response.status_code == 201
+    assert response.get_json()["audit"]["baseline_audit_id"] == same_org.external_id
+    assert session.query(Audit).filter_by(document_id=doc.id).count() == 3
+
+
 def test_create_audit_missing_document_id(client, app):
     """Test that missing document_id returns 400."""
     response = client.post("/audits", json={}, content_type="application/json")
@@ -113,3 +160,96 @@ def test_get_audit_not_found(client, app):
     response = client.get("/audits/99999")
     assert response.status_code == 404
 
+
+
+def test_list_audits_reads_flag_summaries_and_pages_by_cursor(client, app):
+    """The list reads materialized flag summaries, falls back for older audits, and pages by cursor."""
+    from backend.app.db.models import ComplianceScore
+    from backend.app.services.flagging import FlagSynthesizer
+
+    session = get_session()
+    doc = _seed_document(session)
+    audits = [Audit(document_id=doc.id, status="completed") for _ in range(3)]
+    session.add_all(audits)
+    session.commit()
+    synthesizer = FlagSynthesizer(session)
+    for flag_type, chunk in (("RED", "a"), ("YELLOW", "b"), ("YELLOW", "c")):
+        synthesizer.upsert_flag(audits[2].id, chunk, {"flag": flag_type, "severity_score": 50, "findings": "x"})
+    # Scored before flag summaries existed
+    session.add(ComplianceScore(audit_id=audits[1].id, overall_score=71.5, red_count=1, yellow_count=2, total_flags=3))
+    session.commit()
+
+    first = client.get("/api/audits?limit=2").get_json()
+    assert [a["id"] for a in first["audits"]] == [audits[2].id, audits[1].id]
+    summary = first["audits"][0]["flag_summary"]
+    assert (summary["red_count"], summary["yellow_count"], summary["total_flags"]) == (1, 2, 3)
+    assert summary["compliance_score"] == 61.0
+    assert first["audits"][0]["document"]["id"] == doc.id
+    assert first["audits"][1]["flag_summary"]["compliance_score"] == 71.5
+
+    second = client.get(f"/api/audits?limit=2&cursor={first['next_cursor']}").get_json()
+    assert [a["id"] for a in second["audits"]] == [audits[0].id]
+    # Neither summary stored: scored from the audit's (empty) flag set
+    assert second["audits"][0]["flag_summary"]["compliance_score"] == 100.0
+    assert second["next_cursor"] is None
+
+
+def test_audit_events_stream_published_progress_until_completion(client, app):
+    session = get_session()
+    doc = _seed_document(session)
+    audit = Audit(document_id=doc.id, status="completed", chunk_total=2, chunk_completed=2)
+    session.add(audit)
+    session.commit()
+
+    # Nothing published yet: the stream starts from the stored status and ends on a terminal one
+    response = client.get(f"/api/audits/{audit.external_id}/events")
+    assert response.mimetype == "text/event-stream"
+    body = response.get_data(as_text=True)
+    assert body.startswith("id: 0\ndata: ")
+    assert '"status": "completed"' in body
+
+    audit.status, audit.chunk_completed = "running", 1
+    session.commit()
+    bus = get_progress_bus()
+    version = bus.publish(audit.external_id, {"status": "running", "chunk_completed": 1, "chunk_total": 2})
+    publisher = threading.Timer(
+        0.2, bus.publish, (audit.external_id, {"status": "completed", "chunk_completed": 2, "chunk_total": 2})
+    )
+    publisher.start()
+    body = client.get(f"/api/audits/{audit.external_id}/events?heartbeat=5").get_data(as_text=True)
+    publisher.join()
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert [(event["status"], event["chunk_completed"], event["version"]) for event in events] == [
+        ("running", 1, version),
+        ("completed", 2, version + 1),
+    ]
+
+    progress = client.get(f"/api/audits/{audit.external_id}/progress?after={version}&timeout=0").get_json()
+    assert progress["version"] == version + 1
+    assert client.get("/api/audits/missing/events").status_code == 404
+
+
+def test_audit_events_stream_rereads_unpublished_status_changes(client, app):
+    session = get_session()
+    doc = _seed_document(session)
+    audit = Audit(document_id=doc.id, status="running", chunk_total=2, chunk_completed=1)
+    session.add(audit)
+    session.commit()
+    get_progress_bus().publish(audit.external_id, {"status": "running", "chunk_completed": 1, "chunk_total": 2})
+
+    def fail_elsewhere() -> None:
+        # As another process would: a committed change that never reaches this bus
+        with app.app_context():
+            other = get_session()
+            stored = other.get(Audit, audit.id)
+            stored.status, stored.failure_reason = "failed", "Resume failed: worker crashed"
+            other.commit()
+
+    writer = threading.Timer(0.2, fail_elsewhere)
+    writer.start()
+    body = client.get(f"/api/audits/{audit.external_id}/events?heartbeat=1").get_data(as_text=True)
+    writer.join()
+
+    assert ": keep-alive" not in body.split("data: ")[-1]
+    assert json.loads(body.rsplit("data: ", 1)[1])["status"] == "failed"
+    assert client.get(f"/api/audits/{audit.external_id}/status").get_json()["status"] == "failed"
@@ -7,6 +7,48 @@ import pytest
 
 from backend.app import create_app
 from backend.app.db.session import get_session
+from backend.app.services.llm_cache import reset_llm_response_cache
+from backend.app.services.progress_bus import reset_progress_bus
+from backend.app.services.query_embedding_cache import reset_query_embedding_cache
+from backend.app.services.rate_limiter import reset_rate_limiter
+from backend.app.services.retrieval_cache import reset_retrieval_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_rate_limiter() -> Iterator[None]:
+    reset_rate_limiter()
+    yield
+    reset_rate_limiter()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # Tests opt in to the persistent response cache explicitly
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    reset_llm_response_cache()
+    yield
+    reset_llm_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_query_embedding_cache() -> Iterator[None]:
+    reset_query_embedding_cache()
+    yield
+    reset_query_embedding_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_retrieval_cache() -> Iterator[None]:
+    reset_retrieval_cache()
+    yield
+    reset_retrieval_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_progress_bus() -> Iterator[None]:
+    reset_progress_bus()
+    yield
+    reset_progress_bus()
 
 
 @pytest.fixture()
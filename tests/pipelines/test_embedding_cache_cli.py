@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import numpy as np
+from typer.testing import CliRunner
+
+
+def test_embedding_cache_cli_migrates_legacy_directory(tmp_path: Path, monkeypatch):
+    data_root = tmp_path / "data"
+    legacy = data_root / "cache" / "embeddings"
+    legacy.mkdir(parents=True)
+    for idx in range(3):
+        np.save(legacy / f"{idx:016x}.npy", np.arange(4, dtype=np.float64) + idx)
+
+    monkeypatch.setenv("DATA_ROOT", str(data_root))
+    monkeypatch.setenv("EMBEDDING_MODEL", "text-embedding-3-small")
+
+    module = importlib.reload(importlib.import_module("pipelines.embedding_cache"))
+    result = CliRunner().invoke(module.app, ["migrate"])
+
+    assert result.exit_code == 0, result.output
+    assert "Imported: 3" in result.output
+
+    from backend.app.services.embedding_store import EmbeddingStore
+
+    store = EmbeddingStore(data_root / "cache" / "embedding_store", "text-embedding-3-small")
+    assert store.get_many([f"{2:016x}"])[f"{2:016x}"].tolist() == [2.0, 3.0, 4.0, 5.0]
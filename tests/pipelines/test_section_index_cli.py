@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+
+def test_section_index_cli_backfills_documents_without_entries(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path / "data"))
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+
+    from backend.app import create_app
+    from backend.app.db.models import Chunk, Document, SectionIndexEntry
+    from backend.app.db.session import get_session
+
+    create_app()
+    session = get_session()
+    document = Document(
+        external_id="part145",
+        original_filename="part145.md",
+        stored_filename="part145.md",
+        storage_path="uploads/part145.md",
+        content_type="text/markdown",
+        size_bytes=10,
+        sha256="d" * 64,
+        source_type="regulation",
+    )
+    session.add(document)
+    session.flush()
+    session.add(
+        Chunk(
+            document_id=document.id,
+            chunk_id="part145_0",
+            chunk_index=0,
+            section_path="Part-145 > 145.A.30 Personnel requirements",
+            parent_heading="145.A.30 Personnel requirements",
+            content="Personnel requirements",
+            token_count=2,
+        )
+    )
+    session.commit()
+
+    module = importlib.reload(importlib.import_module("pipelines.section_index"))
+    runner = CliRunner()
+
+    dry = runner.invoke(module.app, ["--dry-run"])
+    assert dry.exit_code == 0, dry.output
+    assert "part145 (regulation)" in dry.output
+    assert session.query(SectionIndexEntry).count() == 0
+
+    result = runner.invoke(module.app, ["--source-type", "regulation"])
+    assert result.exit_code == 0, result.output
+    assert "Indexed 1 of 1 documents" in result.output
+    keys = {entry.section_key for entry in session.query(SectionIndexEntry).filter_by(chunk_id="part145_0")}
+    assert keys == {"145", "145.a.30"}
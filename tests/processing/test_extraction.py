@@ -56,3 +56,74 @@ def test_cli_emits_json(tmp_path: Path):
     assert payload["sections"][0]["title"] == "General"
 
 
+
+
+def _write_pdf(path: Path, pages: list[str]) -> Path:
+    """Minimal uncompressed PDF with one line of Helvetica text per page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (" ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text else ""
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(body)
+    return path
+
+
+def test_pdf_pages_extracted_in_parallel_match_sequential_order(tmp_path: Path, monkeypatch):
+    pages = [f"Page body {index}" if index % 7 else "" for index in range(40)]
+    pdf_path = _write_pdf(tmp_path / "manual.pdf", pages)
+    monkeypatch.setattr(DocumentExtractor, "PDF_PARALLEL_MIN_PAGES", 10)
+    monkeypatch.setattr(DocumentExtractor, "PDF_PAGES_PER_TASK", 3)
+
+    sequential = DocumentExtractor(pdf_workers=1).extract(pdf_path)
+    parallel = DocumentExtractor(pdf_workers=2).extract(pdf_path)
+
+    expected = [(index, f"Page body {index}") for index, text in enumerate(pages) if text]
+    assert [(s.index, s.content) for s in sequential.sections] == expected
+    assert [s.to_dict() for s in parallel.sections] == [s.to_dict() for s in sequential.sections]
+    assert parallel.sections[0].metadata == {"source": "pdf", "page_number": 2}
+
+
+def test_pdf_worker_pool_spawns_instead_of_forking(tmp_path: Path, monkeypatch):
+    from backend.app.processing import extraction
+
+    pdf_path = _write_pdf(tmp_path / "manual.pdf", [f"Page {index}" for index in range(12)])
+    monkeypatch.setattr(DocumentExtractor, "PDF_PARALLEL_MIN_PAGES", 10)
+    contexts = []
+    real_pool = extraction.ProcessPoolExecutor
+
+    def recording_pool(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(extraction, "ProcessPoolExecutor", recording_pool)
+    DocumentExtractor(pdf_workers=2).extract(pdf_path)
+
+    assert [context.get_start_method() for context in contexts] == ["spawn"]
+
+
+def test_iter_sections_streams_pdf_pages(tmp_path: Path):
+    pdf_path = _write_pdf(tmp_path / "short.pdf", ["First page", "Second page"])
+    sections = DocumentExtractor().iter_sections(pdf_path)
+
+    first = next(sections)
+    assert (first.title, first.content) == ("Page 1", "First page")
+    assert [s.content for s in sections] == ["Second page"]
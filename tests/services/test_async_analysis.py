@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from backend.app.config.settings import AppConfig
+from backend.app.services.analysis import AsyncComplianceLLMClient, LLMConfig, OpenRouterError
+from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.rate_limiter import AdaptiveRateLimiter, RateLimiterConfig
+
+ANALYSIS_JSON = json.dumps(
+    {
+        "flag": "YELLOW",
+        "severity_score": 40,
+        "findings": "Stub finding",
+        "citations": {"manual_section": "1.1", "regulation_sections": ["145.A.30"]},
+    }
+)
+
+
+class StubCompletionsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        super().__init__(("127.0.0.1", 0), _CompletionsHandler)
+        self.delay = delay
+        self.status = status
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+class _CompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubCompletionsServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests.append({"path": self.path, "body": body})
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            time.sleep(self.server.delay)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+        if self.server.status == 200:
+            payload = {"choices": [{"message": {"role": "assistant", "content": ANALYSIS_JSON}}]}
+        else:
+            payload = {"error": {"message": "stub failure"}}
+        data = json.dumps(payload).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - silence test output
+        pass
+
+
+def _serve(server: StubCompletionsServer) -> Iterator[StubCompletionsServer]:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def completions_server() -> Iterator[StubCompletionsServer]:
+    yield from _serve(StubCompletionsServer(delay=0.2))
+
+
+def _client(base_url: str) -> AsyncComplianceLLMClient:
+    return AsyncComplianceLLMClient(
+        AppConfig(),
+        llm_config=LLMConfig(api_key="test-key", model="stub-model", api_base_url=base_url, max_retries=1),
+        rate_limiter=AdaptiveRateLimiter(RateLimiterConfig(requests_per_minute=0, tokens_per_minute=0)),
+    )
+
+
+def _bundle(label: str = "Focus") -> ContextBundle:
+    return ContextBundle(
+        focus=ContextSlice(label=label, source="manual", content="Manual text", token_count=3)
+    )
+
+
+def test_async_client_returns_normalized_analysis(completions_server):
+    client = _client(completions_server.base_url)
+
+    async def run() -> dict:
+        try:
+            return await client.analyze(None, _bundle())
+        finally:
+            await client.aclose()
+
+    result = asyncio.run(run())
+
+    assert result["flag"] == "YELLOW"
+    assert result["regulation_references"] == []
+    assert completions_server.requests[0]["path"] == "/v1/chat/completions"
+    assert completions_server.requests[0]["body"]["model"] == "stub-model"
+
+
+def test_async_client_overlaps_requests_on_one_loop(completions_server):
+    client = _client(completions_server.base_url)
+
+    async def run() -> list[dict]:
+        try:
+            return await asyncio.gather(*(client.analyze(None, _bundle(f"c{i}")) for i in range(8)))
+        finally:
+            await client.aclose()
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 8
+    assert completions_server.max_in_flight > 1
+    assert elapsed < 8 * completions_server.delay
+
+
+def test_async_client_raises_after_http_errors():
+    for server in _serve(StubCompletionsServer(status=500)):
+        client = _client(server.base_url)
+
+        async def run() -> dict:
+            try:
+                return await client.analyze(None, _bundle())
+            finally:
+                await client.aclose()
+
+        with pytest.raises(OpenRouterError):
+            asyncio.run(run())
+
+
+def test_async_client_closes_its_pool_before_each_loop_ends(completions_server):
+    client = _client(completions_server.base_url)
+    pools = []
+
+    async def run() -> None:
+        try:
+            await client.analyze(None, _bundle())
+            pools.append(client._client)
+        finally:
+            await client.close_loop_client()
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    assert len(pools) == 2 and pools[0] is not pools[1]
+    assert all(pool.is_closed for pool in pools)
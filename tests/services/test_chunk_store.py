@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from backend.app.db.models import Chunk, Document, SectionIndexEntry
+from backend.app.db.session import get_session
+from backend.app.services.chunk_store import (
+    ChunkWriteReport,
+    chunk_values,
+    delete_document_chunks,
+    insert_chunks,
+)
+from backend.app.services.chunking import ChunkPayload
+from backend.app.services.section_index import index_document_sections
+
+
+def _payload(index: int) -> ChunkPayload:
+    return ChunkPayload(
+        chunk_id=f"reg_{index}_0",
+        doc_id="reg",
+        text=f"145.A.{index} requirement text",
+        token_count=5,
+        section_path=["Part-145", f"145.A.{index} Requirement"],
+        parent_heading=f"145.A.{index} Requirement",
+        metadata={"section_index": index},
+    )
+
+
+def test_insert_chunks_returns_persistent_rows_in_order(app):
+    session = get_session()
+    document = Document(
+        original_filename="part145.pdf",
+        stored_filename="part145.pdf",
+        storage_path="uploads/part145.pdf",
+        content_type="application/pdf",
+        size_bytes=10,
+        sha256="e" * 64,
+        source_type="regulation",
+    )
+    session.add(document)
+    session.commit()
+    report = ChunkWriteReport()
+
+    values = [chunk_values(document.id, _payload(i), i, with_path_metadata=True) for i in range(30, 0, -1)]
+    rows = insert_chunks(session, values, report=report)
+    index_document_sections(session, document, rows)
+    session.commit()
+
+    assert [row.chunk_id for row in rows] == [f"reg_{i}_0" for i in range(30, 0, -1)]
+    assert all(row.id is not None and row.embedding_status == "pending" for row in rows)
+    assert rows[0].section_path == "Part-145 > 145.A.30 Requirement"
+    assert rows[0].chunk_metadata["parent_heading"] == "145.A.30 Requirement"
+    assert session.get(Chunk, rows[0].id) is rows[0]
+    assert report.inserted == 30
+
+    deleted = delete_document_chunks(session, document, report=report)
+    session.commit()
+
+    assert deleted == 30 and report.deleted == 30
+    assert report.rows_per_second > 0
+    assert session.query(Chunk).filter_by(document_id=document.id).count() == 0
+    assert session.query(SectionIndexEntry).filter_by(document_id=document.id).count() == 0
@@ -3,10 +3,10 @@ from __future__ import annotations
 from typing import Any
 
 from backend.app.config.settings import AppConfig
-from backend.app.db.models import Audit, AuditChunkResult, Chunk, Document, Flag
+from backend.app.db.models import Audit, AuditChunkResult, AuditFlagSummary, Chunk, Document, Flag
 from backend.app.db.session import get_session
 from backend.app.services.compliance_runner import ComplianceRunner, RunnerResult
-from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.context_builder import ContextBuilder, ContextBundle, ContextSlice
 
 
 def _create_document(session, external_id: str = "audit-doc") -> Document:
@@ -233,3 +233,215 @@ def test_runner_refines_when_additional_context_needed(app):
     assert flags[0].flag_type == "GREEN"
     assert audit.status == "completed"
 
+
+
+class SlowStubAnalysisClient(StubAnalysisClient):
+    """Finishes later chunks first so the pool completes out of order."""
+
+    def __init__(self, delays: dict[str, float], failing: set[str] | None = None):
+        super().__init__()
+        self.delays = delays
+        self.failing = failing or set()
+
+    def analyze(self, chunk: Chunk, context: ContextBundle) -> dict[str, Any]:
+        import time
+
+        time.sleep(self.delays.get(chunk.chunk_id, 0.0))
+        if chunk.chunk_id in self.failing:
+            raise RuntimeError(f"analysis failed for {chunk.chunk_id}")
+        response = super().analyze(chunk, context)
+        response["findings"] = f"Findings for {chunk.chunk_id}"
+        return response
+
+
+def test_runner_concurrent_mode_commits_in_chunk_order(app, monkeypatch):
+    monkeypatch.setenv("CHUNK_PROCESSING_DELAY", "0")
+    session = get_session()
+    doc = _create_document(session, external_id="runner-doc-pool")
+    chunks = [_create_chunk(session, doc, idx) for idx in range(5)]
+    audit = _create_audit(session, doc, status="queued")
+
+    delays = {chunk.chunk_id: 0.05 * (len(chunks) - idx) for idx, chunk in enumerate(chunks)}
+    runner = ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=StubContextBuilder(),
+        analysis_client=SlowStubAnalysisClient(delays),
+        use_recursive_rag=False,
+        concurrency=4,
+    )
+
+    result = runner.run(audit.external_id)
+
+    session.refresh(audit)
+    assert result.processed == 5
+    assert result.remaining == 0
+    assert audit.status == "completed"
+    assert audit.chunk_completed == 5
+    assert audit.last_chunk_id == chunks[-1].chunk_id
+
+    rows = (
+        session.query(AuditChunkResult)
+        .filter(AuditChunkResult.audit_id == audit.id)
+        .order_by(AuditChunkResult.id.asc())
+        .all()
+    )
+    assert [row.chunk_index for row in rows] == [0, 1, 2, 3, 4]
+    flags = session.query(Flag).filter(Flag.audit_id == audit.id).order_by(Flag.id.asc()).all()
+    assert [flag.chunk_id for flag in flags] == [chunk.chunk_id for chunk in chunks]
+    assert flags[2].findings == f"Findings for {chunks[2].chunk_id}"
+
+
+def test_rerunning_a_cleared_audit_does_not_double_count_flags(app, monkeypatch):
+    monkeypatch.setenv("CHUNK_PROCESSING_DELAY", "0")
+    session = get_session()
+    doc = _create_document(session, external_id="runner-doc-rerun")
+    for idx in range(3):
+        _create_chunk(session, doc, idx)
+    audit = _create_audit(session, doc, status="queued")
+
+    def run() -> None:
+        ComplianceRunner(
+            session,
+            AppConfig(),
+            context_builder=StubContextBuilder(),
+            analysis_client=StubAnalysisClient([{"flag": "RED"}, {"flag": "YELLOW"}]),
+            use_recursive_rag=False,
+            concurrency=2,
+        ).run(audit.external_id)
+
+    run()
+    first = session.get(AuditFlagSummary, audit.id)
+    expected = (first.total_flags, first.red_count, first.red_penalty, first.consecutive_yellow)
+    assert first.total_flags == 3
+
+    # What clear_audit_flags.py does: drop flags and results, re-queue, leave the summary row
+    session.query(Flag).filter(Flag.audit_id == audit.id).delete()
+    session.query(AuditChunkResult).filter(AuditChunkResult.audit_id == audit.id).delete()
+    audit.status = "queued"
+    audit.chunk_completed = 0
+    session.commit()
+    # Bulk deletes leave the flags' citations in the identity map
+    session.expunge_all()
+
+    run()
+    session.expire_all()
+    summary = session.get(AuditFlagSummary, audit.id)
+    assert (summary.total_flags, summary.red_count, summary.red_penalty, summary.consecutive_yellow) == expected
+
+
+def test_runner_concurrent_mode_failure_keeps_resumable_prefix(app, monkeypatch):
+    monkeypatch.setenv("CHUNK_PROCESSING_DELAY", "0")
+    session = get_session()
+    doc = _create_document(session, external_id="runner-doc-pool-fail")
+    chunks = [_create_chunk(session, doc, idx) for idx in range(5)]
+    audit = _create_audit(session, doc, status="queued")
+
+    runner = ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=StubContextBuilder(),
+        analysis_client=SlowStubAnalysisClient({}, failing={chunks[2].chunk_id}),
+        use_recursive_rag=False,
+        concurrency=3,
+    )
+
+    result = runner.run(audit.id)
+
+    session.refresh(audit)
+    assert result.status == "failed"
+    assert result.processed == 2
+    assert result.remaining == 3
+    committed = {
+        row.chunk_id
+        for row in session.query(AuditChunkResult).filter(AuditChunkResult.audit_id == audit.id)
+    }
+    assert committed == {chunks[0].chunk_id, chunks[1].chunk_id}
+
+
+def test_runner_concurrent_workers_do_not_share_an_injected_session_bound_builder(app, monkeypatch):
+    monkeypatch.setenv("CHUNK_PROCESSING_DELAY", "0")
+    session = get_session()
+    doc = _create_document(session, external_id="runner-doc-pool-builder")
+    chunks = [_create_chunk(session, doc, idx) for idx in range(4)]
+    audit = _create_audit(session, doc, status="queued")
+    vector_client = object()
+    used: list[tuple[Any, Any]] = []
+
+    def build_context(self, chunk_id: str, **kwargs: Any) -> ContextBundle:
+        used.append((self.session, self.vector))
+        return StubContextBuilder().build_context(chunk_id)
+
+    monkeypatch.setattr(ContextBuilder, "build_context", build_context)
+    runner = ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=ContextBuilder(session, AppConfig(), vector_client=vector_client),
+        analysis_client=SlowStubAnalysisClient({chunk.chunk_id: 0.01 for chunk in chunks}),
+        use_recursive_rag=False,
+        concurrency=2,
+    )
+
+    result = runner.run(audit.external_id)
+
+    assert result.processed == 4
+    assert len(used) == 4
+    assert all(worker_session is not session for worker_session, _ in used)
+    assert {id(vector) for _, vector in used} == {id(vector_client)}
+
+
+class AsyncStubAnalysisClient:
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.loop_closes = 0
+
+    async def close_loop_client(self) -> None:
+        self.loop_closes += 1
+
+    async def analyze(self, chunk: Chunk, context: ContextBundle) -> dict[str, Any]:
+        import asyncio
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(chunk.chunk_id, 0.0))
+        finally:
+            self.in_flight -= 1
+        response = StubAnalysisClient().analyze(chunk, context)
+        response["findings"] = f"Findings for {chunk.chunk_id}"
+        return response
+
+
+def test_runner_async_client_keeps_analyses_in_flight(app):
+    session = get_session()
+    doc = _create_document(session, external_id="runner-doc-async")
+    chunks = [_create_chunk(session, doc, idx) for idx in range(6)]
+    audit = _create_audit(session, doc, status="queued")
+
+    delays = {chunk.chunk_id: 0.02 * (len(chunks) - idx) for idx, chunk in enumerate(chunks)}
+    client = AsyncStubAnalysisClient(delays)
+    runner = ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=StubContextBuilder(),
+        analysis_client=client,
+        use_recursive_rag=False,
+        concurrency=6,
+    )
+
+    result = runner.run(audit.external_id)
+
+    session.refresh(audit)
+    assert result.processed == 6
+    assert audit.status == "completed"
+    assert client.max_in_flight > 1
+    assert client.loop_closes == 1
+    rows = (
+        session.query(AuditChunkResult)
+        .filter(AuditChunkResult.audit_id == audit.id)
+        .order_by(AuditChunkResult.id.asc())
+        .all()
+    )
+    assert [row.chunk_index for row in rows] == list(range(6))
@@ -8,8 +8,10 @@ from backend.app.db.models import Chunk, Document
 from backend.app.db.session import get_session
 from backend.app.services.context_builder import (
     ContextBuilder,
+    TokenEstimator,
     VectorClient,
     VectorMatch,
+    VectorQuery,
 )
 
 
@@ -21,6 +23,21 @@ class FakeVectorClient(VectorClient):
         return list(self.responses.get(collection, []))[:n_results]
 
 
+@dataclass
+class BatchingVectorClient(VectorClient):
+    responses: Dict[str, List[VectorMatch]]
+
+    def __post_init__(self) -> None:
+        self.batches: list[list[VectorQuery]] = []
+
+    def query(self, collection: str, query_text: str, n_results: int, document_id=None) -> list[VectorMatch]:
+        raise AssertionError("build_context should only issue batched queries")
+
+    def query_many(self, queries):
+        self.batches.append(list(queries))
+        return [list(self.responses.get(q.collection, []))[: q.n_results] for q in queries]
+
+
 def _make_document(session, source_type: str, external_id: str) -> Document:
     doc = Document(
         external_id=external_id,
@@ -214,3 +231,88 @@ def test_context_builder_respects_token_budgets(app, monkeypatch):
     assert bundle.total_tokens <= 12
     assert bundle.truncated is True
 
+
+
+def test_context_builder_batches_vector_queries(app, monkeypatch):
+    monkeypatch.setenv("CONTEXT_EVIDENCE_TOP_K", "2")
+
+    session = get_session()
+    manual_doc = _make_document(session, "manual", "manual-batch")
+    focus = _make_chunk(
+        session,
+        manual_doc,
+        chunk_index=0,
+        chunk_id="manual-batch_0",
+        text="Focus chunk describing tool calibration.",
+        token_count=8,
+    )
+    vector_client = BatchingVectorClient(
+        responses={
+            "regulation_chunks": [
+                VectorMatch(
+                    content="Part-145.A.40 covers equipment and tools.",
+                    metadata={"chunk_id": "reg-tools", "token_count": 10},
+                    score=0.2,
+                )
+            ]
+        }
+    )
+
+    builder = ContextBuilder(session, AppConfig(), vector_client=vector_client)
+    bundle = builder.build_context(focus.chunk_id, include_evidence=True)
+
+    assert len(vector_client.batches) == 1
+    batch = vector_client.batches[0]
+    assert [q.collection for q in batch] == [
+        "manual_chunks",
+        "regulation_chunks",
+        "amc_chunks",
+        "gm_chunks",
+        "evidence_chunks",
+    ]
+    assert {q.query_text for q in batch} == {focus.content}
+    assert batch[0].document_id == manual_doc.id
+    assert bundle.regulation_slices[0].metadata["chunk_id"] == "reg-tools"
+
+    # A refinement query with new text is fetched again rather than served stale
+    builder.build_context(focus.chunk_id, context_query="tool calibration records")
+    assert len(vector_client.batches) == 2
+    assert {q.query_text for q in vector_client.batches[1]} == {"tool calibration records"}
+
+
+class CountingEncoding:
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def encode(self, text: str) -> list[int]:
+        self.encoded.append(text)
+        return list(range(len(text.split())))
+
+    def encode_batch(self, texts: list[str], num_threads: int = 8) -> list[list[int]]:
+        self.batches.append(list(texts))
+        return [list(range(len(text.split()))) for text in texts]
+
+
+def test_token_estimator_memoizes_counts_and_batches_misses(monkeypatch):
+    TokenEstimator.clear_cache()
+    encoding = CountingEncoding()
+    monkeypatch.setattr(TokenEstimator, "_load_encoding", staticmethod(lambda name: encoding))
+    estimator = TokenEstimator("counting")
+
+    assert estimator.count_many(["one two", "three", "one two", ""]) == [2, 1, 2, 0]
+    assert encoding.batches == [["one two", "three"]]
+
+    # A second estimator shares the process-wide cache
+    assert TokenEstimator("counting").count_many(["three", "four five six"]) == [1, 3]
+    assert encoding.encoded == ["four five six"]
+
+    matches = [
+        VectorMatch(content="seven eight", metadata={"token_count": 40}),
+        VectorMatch(content="nine ten eleven", metadata={}),
+    ]
+    assert estimator.count_matches(matches) == [40, 3]
+    assert len(encoding.batches) == 1
+    TokenEstimator.clear_cache()
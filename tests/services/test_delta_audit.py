@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any
+
+from backend.app.config.settings import AppConfig
+from backend.app.db.models import Audit, AuditChunkResult, Chunk, Document, Flag
+from backend.app.db.session import get_session
+from backend.app.services.compliance_runner import ComplianceRunner
+from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.delta_audit import find_baseline_audit
+
+
+def _document(session, external_id: str, contents: list[str]) -> Document:
+    document = Document(
+        external_id=external_id,
+        original_filename=f"{external_id}.md",
+        stored_filename=f"{external_id}.md",
+        storage_path=f"uploads/{external_id}.md",
+        content_type="text/markdown",
+        size_bytes=1024,
+        sha256="e" * 64,
+        source_type="manual",
+        organization="Acme MRO",
+    )
+    session.add(document)
+    session.commit()
+    for idx, content in enumerate(contents):
+        session.add(
+            Chunk(
+                document_id=document.id,
+                chunk_id=f"{external_id}_{idx}",
+                chunk_index=idx,
+                content=content,
+                token_count=10,
+                section_path=f"Manual > Section {idx}",
+                chunk_metadata={},
+            )
+        )
+    session.commit()
+    return document
+
+
+class RegulationContextBuilder:
+    """Returns one regulation slice per chunk; ``regulations`` maps chunk index to its text."""
+
+    def __init__(self, regulations: dict[int, str]):
+        self.regulations = regulations
+        self.calls: list[str] = []
+
+    def build_context(self, chunk_id: str, **kwargs: Any) -> ContextBundle:
+        self.calls.append(chunk_id)
+        index = int(chunk_id.rsplit("_", 1)[1])
+        return ContextBundle(
+            focus=ContextSlice(label="Focus", source="manual", content=chunk_id, token_count=1),
+            regulation_slices=[
+                ContextSlice(
+                    label=f"145.A.{index}",
+                    source="regulation",
+                    content=self.regulations[index],
+                    token_count=5,
+                    metadata={"chunk_id": f"reg_{index}"},
+                )
+            ],
+        )
+
+
+class RecordingAnalysisClient:
+    def __init__(self, flag: str):
+        self.flag = flag
+        self.analyzed: list[str] = []
+
+    def analyze(self, chunk: Chunk, context: ContextBundle) -> dict[str, Any]:
+        self.analyzed.append(chunk.chunk_id)
+        return {
+            "chunk_id": chunk.chunk_id,
+            "flag": self.flag,
+            "severity_score": 60 if self.flag == "YELLOW" else 5,
+            "findings": f"Findings for {chunk.chunk_id}",
+            "gaps": [],
+            "citations": {"manual_section": "1.0", "regulation_sections": ["145.A.30"]},
+            "recommendations": [],
+            "needs_additional_context": False,
+        }
+
+
+def _run(session, audit: Audit, builder: RegulationContextBuilder, client: RecordingAnalysisClient):
+    runner = ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=builder,
+        analysis_client=client,
+        use_recursive_rag=False,
+    )
+    return runner.run(audit.external_id)
+
+
+def test_delta_audit_reanalyzes_only_changed_chunks(app):
+    session = get_session()
+    contents = ["Tool control procedure.", "Training records are kept.", "Stores are segregated."]
+    regulations = {0: "145.A.40 tools", 1: "145.A.30 staff", 2: "145.A.42 components"}
+    first = _document(session, "moe-v1", contents)
+    baseline = Audit(document_id=first.id, status="queued")
+    session.add(baseline)
+    session.commit()
+    _run(session, baseline, RegulationContextBuilder(regulations), RecordingAnalysisClient("YELLOW"))
+
+    revised = _document(session, "moe-v2", [contents[0], "Training records are kept for 3 years.", contents[2]])
+    assert find_baseline_audit(session, revised).id == baseline.id
+    audit = Audit(document_id=revised.id, status="queued", baseline_audit_id=baseline.id)
+    session.add(audit)
+    session.commit()
+    client = RecordingAnalysisClient("GREEN")
+    # The regulation retrieved for the third chunk has been amended since the baseline
+    result = _run(
+        session, audit, RegulationContextBuilder({**regulations, 2: "145.A.42 components (amended)"}), client
+    )
+
+    session.refresh(audit)
+    assert audit.status == "completed"
+    assert audit.chunk_completed == 3
+    assert result.processed == 2
+    assert client.analyzed == ["moe-v2_1", "moe-v2_2"]
+
+    rows = {
+        row.chunk_id: row
+        for row in session.query(AuditChunkResult).filter(AuditChunkResult.audit_id == audit.id)
+    }
+    assert rows["moe-v2_0"].carried_from_audit_id == baseline.id
+    assert rows["moe-v2_1"].carried_from_audit_id is None
+    assert rows["moe-v2_2"].carried_from_audit_id is None
+
+    flags = {flag.chunk_id: flag for flag in session.query(Flag).filter(Flag.audit_id == audit.id)}
+    assert flags["moe-v2_0"].flag_type == "YELLOW"
+    assert flags["moe-v2_0"].analysis_metadata["carried_over_from"] == baseline.external_id
+    assert [c.reference for c in flags["moe-v2_0"].citations] == ["1.0", "145.A.30"]
+    assert "carried_over_from" not in (flags["moe-v2_1"].analysis_metadata or {})
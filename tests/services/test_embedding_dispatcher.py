@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+
+from backend.app.config.settings import AppConfig
+from backend.app.db.models import Chunk, Document
+from backend.app.db.session import get_session
+from backend.app.services.embedding_dispatcher import EmbeddingDispatcher
+from backend.app.services.embeddings import EmbeddingService
+
+
+def test_dispatch_runs_batches_concurrently_and_yields_in_order():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def embed(texts: list[str]) -> list[list[float]]:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # Later batches finish first
+        time.sleep(0.02 * (10 - int(texts[0])))
+        with lock:
+            active -= 1
+        return [[float(text)] for text in texts]
+
+    dispatcher = EmbeddingDispatcher(embed, concurrency=4)
+    batches = [[str(i)] for i in range(8)]
+    results = list(dispatcher.dispatch(batches, lambda batch: batch))
+
+    assert [r.item for r in results] == batches
+    assert [r.embeddings for r in results] == [[[float(i)]] for i in range(8)]
+    assert peak == 4
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.test/embeddings")
+    return httpx.HTTPStatusError(f"{status} error", request=request, response=httpx.Response(status, request=request))
+
+
+def test_failed_batches_are_retried_independently():
+    calls: dict[str, int] = {}
+
+    def embed(texts: list[str]) -> list[list[float]]:
+        key = texts[0]
+        calls[key] = calls.get(key, 0) + 1
+        if key == "flaky" and calls[key] < 2:
+            raise _status_error(502)
+        if key == "timeout" and calls[key] < 3:
+            raise httpx.ReadTimeout("read timed out")
+        if key == "down":
+            raise _status_error(503)
+        return [[1.0] for _ in texts]
+
+    dispatcher = EmbeddingDispatcher(embed, concurrency=2, max_retries=3, retry_delay=0)
+    results = list(dispatcher.dispatch([["ok"], ["flaky"], ["timeout"], ["down"]], lambda batch: batch))
+
+    assert [(r.error is None, r.attempts) for r in results] == [(True, 1), (True, 2), (True, 3), (False, 3)]
+    assert calls == {"ok": 1, "flaky": 2, "timeout": 3, "down": 3}
+
+
+def test_permanent_errors_fail_the_batch_without_retrying():
+    calls: dict[str, int] = {}
+
+    def embed(texts: list[str]) -> list[list[float]]:
+        key = texts[0]
+        calls[key] = calls.get(key, 0) + 1
+        if key in ("unauthorized", "forbidden", "invalid"):
+            raise _status_error({"unauthorized": 401, "forbidden": 403, "invalid": 400}[key])
+        return []
+
+    dispatcher = EmbeddingDispatcher(embed, concurrency=2, max_retries=3, retry_delay=60)
+    batches = [["unauthorized"], ["forbidden"], ["invalid"], ["short"]]
+    started = time.perf_counter()
+    results = list(dispatcher.dispatch(batches, lambda batch: batch))
+
+    assert time.perf_counter() - started < 5
+    assert [(r.error is None, r.attempts) for r in results] == [(False, 1)] * 4
+    assert "0 embeddings for 1 texts" in str(results[3].error)
+    assert calls == {"unauthorized": 1, "forbidden": 1, "invalid": 1, "short": 1}
+
+
+def test_dispatch_pulls_input_lazily():
+    pulled: list[int] = []
+
+    def batches():
+        for index in range(10):
+            pulled.append(index)
+            yield [str(index)]
+
+    dispatcher = EmbeddingDispatcher(lambda texts: [[0.0]] * len(texts), concurrency=2, max_pending=3)
+    stream = dispatcher.dispatch(batches(), lambda batch: batch)
+    next(stream)
+    assert len(pulled) == 3
+    stream.close()
+
+
+def test_process_chunks_fails_only_the_failing_batch(app, monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    monkeypatch.setenv("EMBEDDING_MAX_RETRIES", "1")
+    session = get_session()
+    document = Document(
+        original_filename="moe.pdf",
+        stored_filename="moe.pdf",
+        storage_path="uploads/moe.pdf",
+        content_type="application/pdf",
+        size_bytes=10,
+        sha256="f" * 64,
+        source_type="manual",
+    )
+    session.add(document)
+    session.commit()
+    chunks = [
+        Chunk(document_id=document.id, chunk_id=f"moe_{i}", chunk_index=i, content=f"chunk {i}", token_count=2)
+        for i in range(5)
+    ]
+    session.add_all(chunks)
+    session.commit()
+
+    def embed(self, texts):
+        if "chunk 2" in texts:
+            raise RuntimeError("timeout")
+        return [[0.1, 0.2] for _ in texts]
+
+    with patch.object(EmbeddingService, "_store_in_chroma") as mock_store, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts", embed
+    ):
+        service = EmbeddingService(session, AppConfig())
+        service.embedding_config.batch_size = 2
+        result = service.process_chunks(chunks, collection_name="manual_chunks")
+
+    assert (result["processed"], result["failed"]) == (3, 2)
+    assert "timeout" in result["error"]
+    assert [c.embedding_status for c in chunks] == ["completed", "completed", "failed", "failed", "completed"]
+    assert [len(call.args[0]) for call in mock_store.call_args_list] == [2, 1]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import numpy as np
+
+from backend.app.services.embedding_store import EmbeddingStore, model_namespace
+
+
+def _vec(seed: float, dim: int = 4) -> list[float]:
+    return [seed + i for i in range(dim)]
+
+
+def test_store_round_trips_vectors_as_memmap_views(tmp_path):
+    store = EmbeddingStore(tmp_path, "text-embedding-3-small")
+
+    assert store.put_many([("a", _vec(1)), ("b", _vec(2))]) == 2
+    found = store.get_many(["a", "b", "missing"])
+
+    assert set(found) == {"a", "b"}
+    assert found["b"].dtype == np.float32
+    assert found["b"].tolist() == _vec(2)
+    assert isinstance(found["a"].base, np.memmap) or isinstance(found["a"], np.memmap)
+    assert not found["a"].flags.writeable
+
+
+def test_store_skips_existing_keys_and_sees_appends(tmp_path):
+    store = EmbeddingStore(tmp_path, "model")
+    store.put_many([("a", _vec(1))])
+    store.get_many(["a"])  # map the file before appending more rows
+
+    assert store.put_many([("a", _vec(9)), ("c", _vec(3))]) == 1
+    found = store.get_many(["a", "c"])
+
+    assert found["a"].tolist() == _vec(1)
+    assert found["c"].tolist() == _vec(3)
+    assert store.stats() == {"entries": 2, "file_rows": 2, "dead_rows": 0}
+
+
+def test_store_namespaces_by_model_and_dimension(tmp_path):
+    small = EmbeddingStore(tmp_path, "openai/text-embedding-3-small")
+    other = EmbeddingStore(tmp_path, "other-model")
+    small.put_many([("k", _vec(1, dim=4)), ("k", _vec(1, dim=8))])
+
+    assert other.get_many(["k"]) == {}
+    assert small.get_many(["k"], dimensions=8)["k"].shape == (8,)
+    assert small.get_many(["k"], dimensions=4)["k"].shape == (4,)
+    assert (tmp_path / model_namespace("openai/text-embedding-3-small")).is_dir()
+
+
+def test_store_persists_and_compacts(tmp_path):
+    store = EmbeddingStore(tmp_path, "model")
+    store.put_many([(f"k{i}", _vec(i)) for i in range(5)])
+    store.delete_many(["k1", "k3"])
+
+    reclaimed = store.compact()
+    store.close()
+    reopened = EmbeddingStore(tmp_path, "model")
+
+    assert reclaimed == 2 * 4 * 4
+    assert reopened.stats() == {"entries": 3, "file_rows": 3, "dead_rows": 0}
+    found = reopened.get_many(["k0", "k1", "k2", "k4"])
+    assert sorted(found) == ["k0", "k2", "k4"]
+    assert found["k4"].tolist() == _vec(4)
+
+
+def test_compact_keeps_rows_appended_after_a_read(tmp_path):
+    store = EmbeddingStore(tmp_path, "model")
+    store.put_many([("a", _vec(1))])
+    store.get_many(["a"])
+    store.put_many([("b", _vec(2))])
+    store.delete_many(["a"])
+
+    store.compact()
+
+    assert store.get_many(["b"])["b"].tolist() == _vec(2)
+    assert store.stats() == {"entries": 1, "file_rows": 1, "dead_rows": 0}
+
+
+def test_stores_sharing_a_directory_do_not_overwrite_each_others_rows(tmp_path):
+    # Separate instances have separate locks and connections, like separate processes
+    stores = [EmbeddingStore(tmp_path, "model") for _ in range(2)]
+
+    def write(worker: int) -> None:
+        for batch in range(50):
+            stores[worker].put_many([(f"w{worker}-{batch}-{i}", _vec(worker * 1000 + batch)) for i in range(3)])
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reader = EmbeddingStore(tmp_path, "model")
+    found = reader.get_many([f"w{w}-{b}-{i}" for w in range(2) for b in range(50) for i in range(3)])
+    assert len(found) == 300
+    assert all(vector.tolist() == _vec(int(key[1]) * 1000 + int(key.split("-")[1])) for key, vector in found.items())
+    assert reader.stats()["dead_rows"] == 0
+
+
+def test_reads_during_another_stores_compaction_never_return_renumbered_rows(tmp_path, monkeypatch):
+    reader = EmbeddingStore(tmp_path, "model")
+    compactor = EmbeddingStore(tmp_path, "model")
+    compactor.put_many([(key, _vec(idx)) for idx, key in enumerate("abcd")])
+    assert reader.get_many(["b"])["b"].tolist() == _vec(1)
+    compactor.delete_many(["a"])
+
+    seen = []
+    real_replace = os.replace
+
+    def replace_then_read(src, dst):
+        real_replace(src, dst)
+        # The new file is in place but the renumbered index is not committed yet
+        seen.append({key: vector.tolist() for key, vector in reader.get_many(["b", "d"]).items()})
+
+    monkeypatch.setattr(os, "replace", replace_then_read)
+    compactor.compact()
+    monkeypatch.setattr(os, "replace", real_replace)
+
+    assert seen == [{}]
+    found = reader.get_many(["b", "d"])
+    assert (found["b"].tolist(), found["d"].tolist()) == (_vec(1), _vec(3))
+
+
+def test_clear_empties_a_store_another_instance_has_open(tmp_path):
+    reader = EmbeddingStore(tmp_path, "model")
+    reader.put_many([("a", _vec(1)), ("b", _vec(2))])
+    assert reader.get_many(["a"])["a"].tolist() == _vec(1)
+
+    assert EmbeddingStore(tmp_path, "model").clear() == 2
+
+    assert reader.get_many(["a", "b"]) == {}
+    assert not list(reader.path.glob("vectors-*.f32"))
+    reader.put_many([("c", _vec(3))])
+    assert reader.get_many(["c"])["c"].tolist() == _vec(3)
+
+
+def test_store_imports_legacy_npy_directory(tmp_path):
+    legacy = tmp_path / "embeddings"
+    legacy.mkdir()
+    np.save(legacy / "aaaaaaaaaaaaaaaa.npy", np.array(_vec(1)))
+    np.save(legacy / "bbbbbbbbbbbbbbbb.npy", np.array(_vec(2)))
+    (legacy / "cccccccccccccccc.npy").write_bytes(b"not a numpy file")
+
+    store = EmbeddingStore(tmp_path / "store", "model")
+    report = store.import_npy_directory(legacy, remove=True)
+
+    assert (report.migrated, report.failed, report.removed) == (2, 1, 2)
+    assert store.get_many(["bbbbbbbbbbbbbbbb"])["bbbbbbbbbbbbbbbb"].tolist() == _vec(2)
+    assert sorted(p.name for p in legacy.glob("*.npy")) == ["cccccccccccccccc.npy"]
@@ -84,3 +84,29 @@ def test_flag_synthesizer_updates_existing_flag(app):
     assert flag.severity_score == 70
     assert len(flag.citations) == 1
 
+
+
+def test_flag_synthesizer_maintains_audit_flag_summary(app):
+    from backend.app.db.models import AuditFlagSummary, Flag
+    from backend.app.services.compliance_score import audit_flag_summary, get_flag_summary
+
+    session = get_session()
+    doc = _make_document(session)
+    audit = _make_audit(session, doc)
+    synth = FlagSynthesizer(session)
+
+    for chunk_id, flag_type in [("c1", "RED"), ("c2", "RED"), ("c3", "YELLOW"), ("c4", "GREEN"), ("c5", "YELLOW")]:
+        synth.upsert_flag(audit.id, chunk_id, {"flag": flag_type, "severity_score": 40, "findings": "x"})
+        session.commit()
+    flags = session.query(Flag).filter(Flag.audit_id == audit.id).all()
+    assert audit_flag_summary(session, audit.id) == get_flag_summary(flags)
+
+    # Re-scoring an earlier flag rebuilds the running state
+    synth.upsert_flag(audit.id, "c2", {"flag": "GREEN", "severity_score": 10, "findings": "Resolved."})
+    session.commit()
+    session.expire_all()
+    flags = session.query(Flag).filter(Flag.audit_id == audit.id).all()
+    summary = session.get(AuditFlagSummary, audit.id)
+    assert (summary.red_count, summary.green_count, summary.consecutive_yellow) == (1, 2, 1)
+    assert audit_flag_summary(session, audit.id) == get_flag_summary(flags)
+    assert summary.last_flag_at is not None
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from backend.app.config.settings import AppConfig
+from backend.app.db.models import Chunk, Document, SectionIndexEntry
+from backend.app.db.session import get_session
+from backend.app.processing import DocumentExtractor, ExtractionError
+from backend.app.services.chunking import SemanticChunker
+from backend.app.services.document_processor import DocumentProcessor
+from backend.app.services.embeddings import EmbeddingService
+from backend.app.services.ingestion_pipeline import STAGES, StreamingIngestionPipeline
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+
+
+def _document(session, data_root: Path, body: str, name: str = "moe.md") -> Document:
+    path = data_root / "uploads" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding="utf-8")
+    document = Document(
+        original_filename=name,
+        stored_filename=name,
+        storage_path=f"uploads/{name}",
+        content_type="text/markdown",
+        size_bytes=len(body),
+        sha256="d" * 64,
+        source_type="manual",
+    )
+    session.add(document)
+    session.commit()
+    return document
+
+
+def _manual(sections: int) -> str:
+    return "\n\n".join(
+        f"## {index}.1 Procedure {index}\n\nThe organisation shall maintain procedure {index} and record it."
+        for index in range(1, sections + 1)
+    )
+
+
+def test_process_document_streams_chunks_into_embedding_batches(app, monkeypatch):
+    monkeypatch.setenv("INGEST_BATCH_SIZE", "2")
+    monkeypatch.setenv("INGEST_QUEUE_SIZE", "1")
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(5))
+    embedded_batches: list[list[str]] = []
+
+    def fake_embed(self, texts):
+        embedded_batches.append(list(texts))
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    with patch.object(EmbeddingService, "_store_in_chroma") as mock_store, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts", fake_embed
+    ):
+        result = DocumentProcessor(data_root, session, config).process_document(document)
+
+    assert result["status"] == "completed"
+    assert result["chunks_created"] == result["embeddings_generated"] == 5
+    assert [len(batch) for batch in embedded_batches] == [2, 2, 1]
+    assert mock_store.call_count == 3
+    assert set(result["timings"]["stages"]) == set(STAGES)
+    assert result["timings"]["stages"]["persist"]["items"] == 5
+
+    chunks = session.query(Chunk).filter_by(document_id=document.id).order_by(Chunk.chunk_index).all()
+    assert [chunk.chunk_index for chunk in chunks] == [0, 1, 2, 3, 4]
+    assert {chunk.embedding_status for chunk in chunks} == {"completed"}
+    assert chunks[0].chunk_metadata["next_chunk_id"] == chunks[1].chunk_id
+    assert chunks[4].chunk_metadata["prev_chunk_id"] == chunks[3].chunk_id
+    assert "next_chunk_id" not in chunks[4].chunk_metadata
+    assert session.query(SectionIndexEntry).filter_by(document_id=document.id, section_key="3.1").count() == 1
+
+    extracted = json.loads((data_root / "processed" / document.external_id / "extracted.json").read_text())
+    expected = DocumentExtractor().extract(data_root / document.storage_path).to_dict()
+    assert extracted["section_count"] == expected["section_count"] == 5
+    assert extracted["sections"] == expected["sections"]
+
+
+def test_pipeline_matches_batch_chunking_and_replaces_stored_chunks(app):
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(3))
+    chunker = SemanticChunker(config.chunking)
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts",
+        side_effect=lambda texts: [[0.5] * 3 for _ in texts],
+    ):
+        pipeline = StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=chunker,
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        )
+        pipeline.run(document, data_root / document.storage_path, collection_name="manual_chunks")
+        result = pipeline.run(
+            document, data_root / document.storage_path, collection_name="manual_chunks", incremental=False
+        )
+
+    from backend.app.services.chunking import SectionText
+
+    sections = [
+        SectionText(index=s.index, title=s.title, content=s.content, metadata=s.metadata)
+        for s in DocumentExtractor().extract(data_root / document.storage_path).sections
+    ]
+    expected = chunker.chunk_sections(document.external_id, sections, section_aware=True)
+    chunks = session.query(Chunk).filter_by(document_id=document.id).order_by(Chunk.chunk_index).all()
+    assert result.chunks_created == 3
+    assert [(c.chunk_id, c.content, c.chunk_metadata) for c in chunks] == [
+        (p.chunk_id, p.text, p.metadata) for p in expected
+    ]
+
+
+def test_incremental_run_embeds_only_changed_chunks(app):
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(3))
+    path = data_root / document.storage_path
+    embedded: list[str] = []
+
+    def fake_embed(self, texts):
+        embedded.extend(texts)
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch.object(
+        EmbeddingService, "update_vector_metadata"
+    ) as mock_update, patch.object(EmbeddingService, "delete_vectors") as mock_delete, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts", fake_embed
+    ):
+        pipeline = StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        )
+        pipeline.run(document, path, collection_name="manual_chunks")
+        before = {c.content: (c.id, c.chunk_id) for c in session.query(Chunk).filter_by(document_id=document.id)}
+        removed = next(chunk_id for content, (_, chunk_id) in before.items() if "procedure 3" in content)
+
+        embedded.clear()
+        path.write_text(_manual(3).replace("procedure 3", "procedure 3 annually"), encoding="utf-8")
+        result = pipeline.run(document, path, collection_name="manual_chunks")
+
+    assert (result.chunks_created, result.chunks_reused, result.chunks_removed) == (1, 2, 1)
+    assert len(embedded) == 1 and "annually" in embedded[0]
+    chunks = session.query(Chunk).filter_by(document_id=document.id).order_by(Chunk.chunk_index).all()
+    assert [(c.id, c.chunk_id) for c in chunks[:2]] == [before[c.content] for c in chunks[:2]]
+    assert chunks[2].chunk_id != removed
+    assert chunks[1].chunk_metadata["next_chunk_id"] == chunks[2].chunk_id
+    assert {c.embedding_status for c in chunks} == {"completed"}
+    assert sum(len(call.args[0]) for call in mock_update.call_args_list) == 2
+    mock_delete.assert_called_once_with([removed], "manual_chunks")
+    assert session.query(SectionIndexEntry).filter_by(document_id=document.id, section_key="3.1").count() == 1
+
+
+def test_pipeline_marks_batch_failed_when_embedding_fails(app, monkeypatch):
+    monkeypatch.setenv("INGEST_BATCH_SIZE", "2")
+    monkeypatch.setenv("EMBEDDING_MAX_RETRIES", "1")
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(3))
+    calls = iter([RuntimeError("rate limited"), None])
+
+    def flaky_embed(self, texts):
+        error = next(calls)
+        if error is not None:
+            raise error
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts", flaky_embed
+    ):
+        pipeline = StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        )
+        result = pipeline.run(document, data_root / document.storage_path, collection_name="manual_chunks")
+
+    assert (result.embeddings_generated, result.embeddings_failed) == (1, 2)
+    statuses = [c.embedding_status for c in session.query(Chunk).order_by(Chunk.chunk_index)]
+    assert statuses == ["failed", "failed", "completed"]
+
+
+def test_pipeline_reraises_errors_raised_on_stage_threads(app, tmp_path):
+    session = get_session()
+    config = AppConfig()
+    document = _document(session, Path(config.data_root), _manual(1))
+    pipeline = StreamingIngestionPipeline(
+        session,
+        extractor=DocumentExtractor(),
+        chunker=SemanticChunker(config.chunking),
+        embedding_service=EmbeddingService(session, config),
+        config=config.ingestion,
+    )
+    unsupported = tmp_path / "manual.rtf"
+    unsupported.write_text("{\\rtf1 Procedure}", encoding="utf-8")
+
+    with pytest.raises(ExtractionError):
+        pipeline.run(document, unsupported, collection_name="manual_chunks", extracted_json_path=tmp_path / "out.json")
+
+
+class _FailingExtractor(DocumentExtractor):
+    """Yields the first ``sections`` sections, then fails as a corrupt page would."""
+
+    def __init__(self, sections: int):
+        super().__init__()
+        self.sections = sections
+
+    def iter_sections(self, path):
+        for count, section in enumerate(super().iter_sections(path)):
+            if count == self.sections:
+                raise ExtractionError("Corrupt page")
+            yield section
+
+
+def test_failed_incremental_run_leaves_stored_chunks_as_they_were(app, monkeypatch):
+    monkeypatch.setenv("INGEST_BATCH_SIZE", "2")
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(6))
+    path = data_root / document.storage_path
+
+    def snapshot():
+        chunks = session.query(Chunk).filter_by(document_id=document.id).order_by(Chunk.chunk_index).all()
+        entries = session.query(SectionIndexEntry).filter_by(document_id=document.id).count()
+        return [(c.chunk_id, c.chunk_index, c.content, c.chunk_metadata) for c in chunks], entries
+
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch.object(
+        EmbeddingService, "update_vector_metadata"
+    ), patch.object(EmbeddingService, "delete_vectors") as mock_delete, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts",
+        side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts],
+    ):
+        StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        ).run(document, path, collection_name="manual_chunks")
+        before = snapshot()
+
+        # The first two sections change; extraction then fails at the fifth
+        revised = _manual(6).replace("procedure 1 ", "procedure 1 daily ").replace("procedure 2 ", "procedure 2 weekly ")
+        path.write_text(revised, encoding="utf-8")
+        with pytest.raises(ExtractionError):
+            StreamingIngestionPipeline(
+                session,
+                extractor=_FailingExtractor(4),
+                chunker=SemanticChunker(config.chunking),
+                embedding_service=EmbeddingService(session, config),
+                config=config.ingestion,
+            ).run(document, path, collection_name="manual_chunks")
+
+    session.expire_all()
+    assert snapshot() == before
+    assert before[1] == 6
+    inserted = mock_delete.call_args.args[0]
+    assert len(inserted) == 2 and not set(inserted) & {chunk_id for chunk_id, *_ in before[0]}
+
+
+def test_failed_full_rebuild_keeps_stored_chunks(app):
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(6))
+    path = data_root / document.storage_path
+
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch.object(
+        EmbeddingService, "delete_vectors"
+    ) as mock_delete, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts",
+        side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts],
+    ):
+        StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        ).run(document, path, collection_name="manual_chunks")
+        before = [c.chunk_id for c in session.query(Chunk).filter_by(document_id=document.id)]
+
+        with pytest.raises(ExtractionError):
+            StreamingIngestionPipeline(
+                session,
+                extractor=_FailingExtractor(5),
+                chunker=SemanticChunker(config.chunking),
+                embedding_service=EmbeddingService(session, config),
+                config=config.ingestion,
+            ).run(document, path, collection_name="manual_chunks", incremental=False)
+
+    session.expire_all()
+    assert [c.chunk_id for c in session.query(Chunk).filter_by(document_id=document.id)] == before
+    assert session.query(SectionIndexEntry).filter_by(document_id=document.id).count() == 6
+    assert not any(call.args[0] for call in mock_delete.call_args_list)
+
+
+@pytest.mark.parametrize("failure", ["persist", "delete_vectors"])
+def test_full_rebuild_failing_after_the_delete_restores_stored_chunks(app, failure):
+    session = get_session()
+    config = AppConfig()
+    data_root = Path(config.data_root)
+    document = _document(session, data_root, _manual(6))
+    path = data_root / document.storage_path
+
+    def snapshot():
+        chunks = session.query(Chunk).filter_by(document_id=document.id).order_by(Chunk.chunk_index).all()
+        return [(c.id, c.chunk_id, c.content, c.chunk_metadata) for c in chunks], [c.embedding_status for c in chunks]
+
+    with patch.object(EmbeddingService, "_store_in_chroma"), patch.object(
+        EmbeddingService, "delete_vectors"
+    ) as mock_delete, patch(
+        "backend.app.services.embeddings.EmbeddingClient.embed_texts",
+        side_effect=lambda texts: [[0.1, 0.2, 0.3] for _ in texts],
+    ):
+        StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        ).run(document, path, collection_name="manual_chunks")
+        before, statuses = snapshot()
+        assert statuses == ["completed"] * 6
+
+        # The rebuilt document drops its last two sections, whose vectors are deleted last
+        path.write_text(_manual(4), encoding="utf-8")
+        stale = [chunk_id for _, chunk_id, *_ in before[4:]]
+
+        def delete_vectors(chunk_ids, collection_name):
+            if chunk_ids == stale:
+                raise RuntimeError("Chroma unavailable")
+
+        mock_delete.side_effect = delete_vectors
+        pipeline = StreamingIngestionPipeline(
+            session,
+            extractor=DocumentExtractor(),
+            chunker=SemanticChunker(config.chunking),
+            embedding_service=EmbeddingService(session, config),
+            config=config.ingestion,
+        )
+        with patch.object(
+            StreamingIngestionPipeline,
+            "_persist",
+            side_effect=RuntimeError("database is locked") if failure == "persist" else pipeline._persist,
+        ), pytest.raises(RuntimeError):
+            pipeline.run(document, path, collection_name="manual_chunks", incremental=False)
+
+    session.expire_all()
+    after, statuses = snapshot()
+    assert after == before
+    assert session.query(SectionIndexEntry).filter_by(document_id=document.id).count() == 6
+    if failure == "persist":
+        # Nothing was re-embedded or deleted, so the stored vectors still match
+        assert statuses == ["completed"] * 6
+    else:
+        # Vectors were overwritten by the rebuild or partly deleted; embed the old chunks again
+        assert statuses == ["pending"] * 6
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import httpx
+
+from backend.app.config.settings import AppConfig
+from backend.app.services.analysis import ComplianceLLMClient, LLMConfig
+from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.llm_cache import LLMResponseCache
+
+ANALYSIS = {"flag": "GREEN", "findings": "Cached finding"}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_round_trip_counts_hits_and_misses(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    key = cache.make_key({"model": "m", "messages": [{"role": "user", "content": "a"}]})
+
+    assert cache.get(key) is None
+    cache.put(key, ANALYSIS)
+    assert cache.get(key) == ANALYSIS
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_cache_key_depends_on_full_payload(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    base = {"model": "m", "messages": [{"role": "user", "content": "a"}]}
+
+    assert cache.make_key(base) == cache.make_key(dict(reversed(list(base.items()))))
+    assert cache.make_key(base) != cache.make_key({**base, "model": "other"})
+    assert cache.make_key(base) != cache.make_key(
+        {**base, "messages": [{"role": "user", "content": "b"}]}
+    )
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "llm.sqlite3"
+    first = LLMResponseCache(path)
+    first.put("k", ANALYSIS)
+    first.close()
+
+    assert LLMResponseCache(path).get("k") == ANALYSIS
+
+
+def test_cache_expires_entries_after_ttl(tmp_path):
+    clock = FakeClock()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=60, clock=clock)
+    cache.put("k", ANALYSIS)
+
+    clock.now += 61
+
+    assert cache.get("k") is None
+    assert cache.stats().evictions == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    clock = FakeClock()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_entries=2, clock=clock)
+    cache.put("a", ANALYSIS)
+    clock.now += 1
+    cache.put("b", ANALYSIS)
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+
+    cache.put("c", ANALYSIS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ANALYSIS
+    assert cache.get("c") == ANALYSIS
+
+
+def test_cache_enforces_byte_limit(tmp_path):
+    clock = FakeClock()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_bytes=200, clock=clock)
+    for idx in range(5):
+        cache.put(f"k{idx}", {"findings": "x" * 60})
+        clock.now += 1
+
+    stats = cache.stats()
+    assert stats.size_bytes <= 200
+    assert cache.get("k4") is not None
+    assert cache.get("k0") is None
+
+
+def test_llm_client_serves_identical_requests_from_cache(tmp_path):
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        content = '{"flag": "RED", "findings": "Live", "citations": {"regulation_sections": []}}'
+        return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+    client = ComplianceLLMClient(
+        AppConfig(),
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        llm_config=LLMConfig(api_key="test", model="test-model", api_base_url="http://llm.test"),
+        response_cache=LLMResponseCache(tmp_path / "llm.sqlite3"),
+    )
+
+    def bundle(text: str) -> ContextBundle:
+        return ContextBundle(focus=ContextSlice(label="Focus", source="manual", content=text, token_count=1))
+
+    first = client.analyze(None, bundle("Manual text"))
+    second = client.analyze(None, bundle("Manual text"))
+    client.analyze(None, bundle("Changed manual text"))
+
+    assert first == second
+    assert first["flag"] == "RED"
+    assert len(calls) == 2
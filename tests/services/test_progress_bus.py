@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+
+from backend.app.config.settings import AppConfig
+from backend.app.db.models import Audit, Chunk, Document
+from backend.app.db.session import get_session
+from backend.app.services.compliance_runner import ComplianceRunner
+from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.progress_bus import ProgressBus, get_progress_bus
+
+
+def test_wait_returns_next_version_or_none_on_timeout():
+    bus = ProgressBus()
+    assert bus.wait("audit-1", timeout=0) is None
+
+    version = bus.publish("audit-1", {"status": "running"})
+    assert bus.wait("audit-1", after=0, timeout=0) == {"status": "running", "version": version}
+    assert bus.wait("audit-1", after=version, timeout=0) is None
+
+    received: list[dict] = []
+    waiter = threading.Thread(target=lambda: received.append(bus.wait("audit-1", after=version, timeout=5)))
+    waiter.start()
+    bus.publish("audit-1", {"status": "completed"})
+    waiter.join(timeout=5)
+    assert received[0]["status"] == "completed"
+
+
+def test_bus_keeps_only_the_most_recent_audits():
+    bus = ProgressBus(max_audits=2)
+    for audit_id in ("a", "b", "c"):
+        bus.publish(audit_id, {"status": "running"})
+    assert bus.latest("a") is None
+    assert bus.latest("c")["version"] == 3
+
+
+class StubContextBuilder:
+    def build_context(self, chunk_id: str, **kwargs) -> ContextBundle:
+        return ContextBundle(focus=ContextSlice(label="Focus", source="manual", content=chunk_id, token_count=1))
+
+
+class StubAnalysisClient:
+    def analyze(self, chunk: Chunk, context: ContextBundle) -> dict:
+        return {
+            "chunk_id": chunk.chunk_id,
+            "flag": "RED",
+            "severity_score": 90,
+            "findings": "Missing procedure",
+            "gaps": [],
+            "citations": {"manual_section": "1.0", "regulation_sections": []},
+            "recommendations": [],
+            "needs_additional_context": False,
+        }
+
+
+def _audit_with_chunks(session, chunks: int = 2, **audit_fields) -> Audit:
+    document = Document(
+        original_filename="moe.md",
+        stored_filename="moe.md",
+        storage_path="uploads/moe.md",
+        content_type="text/markdown",
+        size_bytes=100,
+        sha256="f" * 64,
+        source_type="manual",
+    )
+    session.add(document)
+    session.commit()
+    for idx in range(chunks):
+        session.add(
+            Chunk(document_id=document.id, chunk_id=f"{document.external_id}_{idx}", chunk_index=idx, content="Text", token_count=1)
+        )
+    audit = Audit(document_id=document.id, status="queued", **audit_fields)
+    session.add(audit)
+    session.commit()
+    return audit
+
+
+def _runner(session) -> ComplianceRunner:
+    return ComplianceRunner(
+        session,
+        AppConfig(),
+        context_builder=StubContextBuilder(),
+        analysis_client=StubAnalysisClient(),
+        use_recursive_rag=False,
+    )
+
+
+def test_runner_publishes_progress_after_each_chunk(app):
+    session = get_session()
+    audit = _audit_with_chunks(session)
+
+    bus = get_progress_bus()
+    published: list[dict] = []
+    publish = bus.publish
+    bus.publish = lambda audit_id, payload: published.append(payload) or publish(audit_id, payload)
+    _runner(session).run(audit.external_id)
+
+    assert [(p["status"], p["chunk_completed"]) for p in published] == [
+        ("running", 0),
+        ("running", 1),
+        ("running", 2),
+        ("completed", 2),
+    ]
+    assert published[-1]["flag_summary"]["red_count"] == 2
+    assert bus.latest(audit.external_id)["status"] == "completed"
+
+
+def test_runner_publishes_failure_of_carry_forward(app, monkeypatch):
+    session = get_session()
+    baseline = _audit_with_chunks(session)
+    audit = _audit_with_chunks(session, baseline_audit_id=baseline.id)
+
+    def fail(self, audit, *, include_evidence):
+        raise RuntimeError("Regulation index unavailable")
+
+    monkeypatch.setattr(ComplianceRunner, "_carry_forward", fail)
+    result = _runner(session).run(audit.external_id)
+
+    assert result.status == "failed"
+    published = get_progress_bus().latest(audit.external_id)
+    assert (published["status"], published["failure_reason"]) == ("failed", "Regulation index unavailable")
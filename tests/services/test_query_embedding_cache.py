@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.app.services.embedding_store import EmbeddingStore
+from backend.app.services.metrics import get_metrics, reset_metrics
+from backend.app.services.query_embedding_cache import QueryEmbeddingCache, query_cache_key
+
+
+class CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_repeated_queries_are_embedded_once():
+    reset_metrics()
+    cache = QueryEmbeddingCache(max_entries=8)
+    embedder = CountingEmbedder()
+
+    first = cache.embed(["Part-145.A.30", "tooling", "Part-145.A.30"], embedder)
+    second = cache.embed(["Part-145.A.30"], embedder)
+
+    assert embedder.calls == [["Part-145.A.30", "tooling"]]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(second[0], first[0])
+    stats = cache.stats()
+    assert (stats.memory_hits, stats.misses) == (1, 2)
+    assert stats.hit_rate == 1 / 3
+    assert get_metrics().get_metrics()["query_embedding_hit_rate"] == round(1 / 3, 3)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = QueryEmbeddingCache(max_entries=2)
+    embedder = CountingEmbedder()
+
+    cache.embed(["a", "b"], embedder)
+    cache.embed(["a"], embedder)  # refresh "a" so "b" is the eviction victim
+    cache.embed(["c"], embedder)
+    cache.embed(["a", "b"], embedder)
+
+    assert embedder.calls == [["a", "b"], ["c"], ["b"]]
+    assert cache.stats().entries == 2
+
+
+def test_persistent_store_survives_new_cache_and_reads_ingested_vectors(tmp_path):
+    store = EmbeddingStore(tmp_path / "queries", "test-model")
+    ingested = EmbeddingStore(tmp_path, "test-model")
+    ingested.put_many([(query_cache_key("chunk content"), [0.5, 0.5])])
+
+    embedder = CountingEmbedder()
+    QueryEmbeddingCache(store=store, fallback_stores=[ingested]).embed(["Part-145.A.30"], embedder)
+
+    fresh = QueryEmbeddingCache(store=store, fallback_stores=[ingested])
+    vectors = fresh.embed(["Part-145.A.30", "chunk content"], embedder)
+
+    assert embedder.calls == [["Part-145.A.30"]]
+    assert vectors[1].tolist() == [0.5, 0.5]
+    assert fresh.stats().store_hits == 2
+    # Vectors found only in the read-only ingestion store are not copied into the query store
+    assert query_cache_key("chunk content") not in store
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from backend.app.config.settings import AppConfig
+from backend.app.services.analysis import ComplianceLLMClient, LLMConfig
+from backend.app.services.context_builder import ContextBundle, ContextSlice
+from backend.app.services.rate_limiter import (
+    AdaptiveRateLimiter,
+    RateLimiterConfig,
+    estimate_chat_tokens,
+    get_rate_limiter,
+    parse_retry_after,
+    reset_rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, **overrides) -> AdaptiveRateLimiter:
+    params = {"requests_per_minute": 60, "tokens_per_minute": 0}
+    params.update(overrides)
+    return AdaptiveRateLimiter(RateLimiterConfig(**params), clock=clock, sleep=clock.sleep)
+
+
+def test_request_budget_paces_after_burst():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_minute=2)
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    waited = limiter.acquire()
+
+    assert waited == pytest.approx(30.0)
+
+
+def test_token_budget_limits_large_requests():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_minute=0, tokens_per_minute=600)
+
+    limiter.acquire(tokens=600)
+    waited = limiter.acquire(tokens=300)
+
+    assert waited == pytest.approx(30.0)
+
+
+def test_throttle_honours_retry_after_and_shrinks_budget():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    pause = limiter.record_throttle(retry_after=7)
+    waited = limiter.acquire()
+
+    assert pause == 7
+    assert waited == pytest.approx(7.0)
+    assert limiter.scale == pytest.approx(0.5)
+    assert limiter.throttle_count == 1
+
+
+def test_throttle_without_retry_after_backs_off_exponentially():
+    clock = FakeClock()
+    limiter = _limiter(clock, backoff_base=2.0, max_wait=5.0)
+
+    assert limiter.record_throttle() == 2.0
+    assert limiter.record_throttle() == 4.0
+    assert limiter.record_throttle() == 5.0
+
+
+def test_successes_recover_budget_towards_ceiling():
+    clock = FakeClock()
+    limiter = _limiter(clock, recovery_step=0.25)
+    limiter.record_throttle(retry_after=0)
+    assert limiter.scale == pytest.approx(0.5)
+
+    limiter.record_success()
+    limiter.record_success()
+    limiter.record_success()
+
+    assert limiter.scale == 1.0
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after({"Retry-After": "12"}) == 12.0
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+
+def test_chat_requests_are_charged_their_completion_budget():
+    messages = [{"role": "system", "content": "s" * 400}, {"role": "user", "content": "u" * 800}]
+
+    assert estimate_chat_tokens({"messages": messages}, 1000) == 300 + 1000
+    assert estimate_chat_tokens({"messages": messages, "max_tokens": 4000}, 1000) == 300 + 4000
+
+
+def test_llm_client_charges_prompt_and_completion_tokens(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_COMPLETION_TOKENS", "700")
+    charged = []
+
+    class RecordingLimiter(AdaptiveRateLimiter):
+        def acquire(self, tokens: int = 0) -> float:
+            charged.append(tokens)
+            return 0.0
+
+    content = '{"flag": "GREEN", "findings": "ok", "citations": {"manual_section": null, "regulation_sections": []}}'
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+    )
+    client = ComplianceLLMClient(
+        AppConfig(),
+        http_client=httpx.Client(transport=transport),
+        llm_config=LLMConfig(api_key="test", model="test-model", api_base_url="http://llm.test"),
+        rate_limiter=RecordingLimiter(RateLimiterConfig(requests_per_minute=0, tokens_per_minute=0)),
+    )
+    bundle = ContextBundle(
+        focus=ContextSlice(label="Focus", source="manual", content="Focus text", token_count=2)
+    )
+    payload, _, tokens = client._build_request(bundle)
+
+    client.analyze(None, bundle)
+
+    assert charged == [tokens] and tokens == estimate_chat_tokens(payload, 0) + 700
+
+
+def test_global_limiter_is_shared_until_reset():
+    first = get_rate_limiter(AppConfig())
+    assert get_rate_limiter() is first
+
+    reset_rate_limiter()
+
+    assert get_rate_limiter() is not first
+
+
+def test_llm_client_feeds_429_into_shared_limiter():
+    responses = iter(
+        [
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(
+                200,
+                json={
+                    "choices": [
+                        {
+                            "message": {
+                                "content": (
+                                    '{"flag": "GREEN", "findings": "ok", '
+                                    '"citations": {"manual_section": null, "regulation_sections": []}}'
+                                )
+                            }
+                        }
+                    ]
+                },
+            ),
+        ]
+    )
+    transport = httpx.MockTransport(lambda request: next(responses))
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    client = ComplianceLLMClient(
+        AppConfig(),
+        http_client=httpx.Client(transport=transport),
+        llm_config=LLMConfig(api_key="test", model="test-model", api_base_url="http://llm.test"),
+        rate_limiter=limiter,
+    )
+    bundle = ContextBundle(
+        focus=ContextSlice(label="Focus", source="manual", content="Focus text", token_count=2)
+    )
+
+    result = client.analyze(None, bundle)
+
+    assert result["flag"] == "GREEN"
+    assert clock.sleeps == [pytest.approx(3.0)]
+    assert limiter.throttle_count == 1
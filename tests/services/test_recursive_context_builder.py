@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.app.config.settings import AppConfig
+from backend.app.services.context_builder import ContextBundle, ContextSlice, TokenEstimator, VectorMatch
+from backend.app.services.recursive_context_builder import ReferenceExtractor, RecursiveContextBuilder, SliceRegistry
+from backend.app.services.section_index import normalize_section_number
+
+
+def _slice(chunk_id: str | None, source: str = "manual") -> ContextSlice:
+    return ContextSlice(label=str(chunk_id), source=source, content="text", token_count=1, metadata={"chunk_id": chunk_id})
+
+
+def test_single_pass_scan_matches_per_pattern_scan():
+    extractor = ReferenceExtractor()
+    text = (
+        "See Section 4.2 and sect. 4.2.1, Chapter 3 of the MOE, Part-145.A.30 and part 145 A 65. "
+        "Revised 3.11.2025 by FI.145.9999 (v1.2.3). OSA 5.2, kohdassa 3.4, appendix 2.1, approach 7."
+    )
+    assert [r.text for r in extractor._scan(text)] == [
+        "Section 4.2", "sect. 4.2.1", "Chapter 3", "ch 7", "Part-145.A.30", "part 145 A 65",
+        "OSA 5.2", "kohdassa 3.4", "4.2", "4.2.1", "145.9999", "2.3", "5.2", "3.4", "2.1",
+    ]
+
+    rng = random.Random(7)
+    tokens = "Section sect. CH. chapter Part PART- osa Kohdassa approach 12 4.5 145.A.30 3.11.2025 v1.2.3 1.2.3.4.5 - .".split()
+    for _ in range(2000):
+        text = "".join(rng.choice(tokens) + rng.choice(["", " ", "  ", "-", ".", "\n"]) for _ in range(rng.randint(1, 12)))
+        assert extractor._scan(text) == extractor._scan_patterns(text), text
+
+
+def test_extract_references_scans_each_text_once(monkeypatch):
+    ReferenceExtractor.clear_cache()
+    extractor = ReferenceExtractor()
+    scans: list[str] = []
+    original = ReferenceExtractor._scan
+    monkeypatch.setattr(ReferenceExtractor, "_scan", lambda self, text: scans.append(text) or original(self, text))
+
+    first = extractor.extract_references("Refer to Section 2.3.")
+    first.append("caller-owned")
+    second = ReferenceExtractor().extract_references("Refer to Section 2.3.")
+
+    assert scans == ["Refer to Section 2.3."]
+    assert [r.text for r in second] == ["Section 2.3", "2.3"]
+
+
+class WordCountEstimator(TokenEstimator):
+    def __init__(self) -> None:
+        self.tokenizer_name = "words"
+        self._encoding = None
+
+    def count_many(self, texts):
+        return [len(text.split()) for text in texts]
+
+
+class FanOutBaseBuilder:
+    """Every chunk references two new sections; every search returns fresh chunks."""
+
+    def __init__(self) -> None:
+        self.token_estimator = WordCountEstimator()
+        self.queries: list[tuple[str, str]] = []
+        self.loaded: list[str] = []
+        self._next_id = 0
+
+    def build_context(self, chunk_id: str, **_: object) -> ContextBundle:
+        return ContextBundle(
+            focus=_slice(chunk_id),
+            manual_neighbors=[_slice("neighbor-1")],
+            regulation_slices=[_slice("reg-base", "regulation")],
+        )
+
+    def load_chunk(self, chunk_id: str) -> SimpleNamespace:
+        self.loaded.append(chunk_id)
+        number = len(self.loaded)
+        return SimpleNamespace(
+            chunk_id=chunk_id,
+            document_id=1,
+            content=f"See section {number}.1 and Part-145.A.{number} for details.",
+        )
+
+    def vector_query(self, collection: str, query_text: str, cache_key: str, top_k: int, document_id=None):
+        self.queries.append((collection, query_text))
+        matches = []
+        for _ in range(top_k):
+            self._next_id += 1
+            prefix = {"manual_chunks": "m", "regulation_chunks": "r", "evidence_chunks": "lit"}[collection]
+            matches.append(VectorMatch(content=f"match body {self._next_id}", metadata={"chunk_id": f"{prefix}-{self._next_id}"}, score=0.2))
+        # Repeat the first hit so duplicates must be filtered
+        return matches + matches[:1]
+
+
+def test_slice_registry_deduplicates_and_caps():
+    registry = SliceRegistry({"manual": 3})
+    registry.seed("manual", [_slice("a")])
+
+    assert registry.add("manual", _slice("b"))
+    assert not registry.add("manual", _slice("a"))
+    assert not registry.add("manual", _slice("b"))
+    assert registry.add("manual", _slice("c"))
+    assert registry.is_full("manual")
+    assert not registry.add("manual", _slice("d"))
+    assert [s.metadata["chunk_id"] for s in registry.slices("manual")] == ["a", "b", "c"]
+    assert registry.contains("manual", "c") and not registry.contains("manual", "d")
+
+
+def test_recursive_build_stops_expanding_once_categories_are_full():
+    uncapped_base = FanOutBaseBuilder()
+    uncapped = RecursiveContextBuilder(
+        None, AppConfig(), base_context_builder=uncapped_base, max_depth=3,
+        slice_caps={"manual": 10_000, "regulation": 10_000, "litigation": 10_000},
+    ).build_recursive_context("focus")
+
+    capped_base = FanOutBaseBuilder()
+    capped = RecursiveContextBuilder(
+        None, AppConfig(), base_context_builder=capped_base, max_depth=3,
+        slice_caps={"manual": 8, "regulation": 6, "litigation": 3},
+    ).build_recursive_context("focus")
+
+    manual_ids = [s.metadata["chunk_id"] for s in capped.manual_neighbors]
+    assert manual_ids[0] == "neighbor-1"
+    assert len(manual_ids) == 8 == len(set(manual_ids))
+    assert len(capped.regulation_slices) == 6
+    assert capped.regulation_slices[0].metadata["chunk_id"] == "reg-base"
+    assert len([s for s in capped.evidence_slices if s.metadata.get("chunk_id", "").startswith("lit-")]) == 3
+
+    uncapped_manual = [s.metadata["chunk_id"] for s in uncapped.manual_neighbors]
+    assert len(uncapped_manual) == len(set(uncapped_manual)) > 8
+    assert len(capped_base.queries) < len(uncapped_base.queries)
+
+
+class KeyedBaseBuilder(FanOutBaseBuilder):
+    """Results depend only on the query, and searches are slow enough to overlap."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.max_in_flight = 0
+
+    def load_chunk(self, chunk_id: str) -> SimpleNamespace:
+        number = int(hashlib.sha1(chunk_id.encode()).hexdigest()[:4], 16)
+        return SimpleNamespace(
+            chunk_id=chunk_id,
+            document_id=1,
+            content=f"See section {number}.1 and Part-145.A.{number} for details.",
+        )
+
+    def vector_query(self, collection: str, query_text: str, cache_key: str, top_k: int, document_id=None):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(0.002)
+        with self._lock:
+            self._in_flight -= 1
+            self.queries.append((collection, query_text))
+        digest = hashlib.sha1(f"{collection}:{query_text}".encode()).hexdigest()[:6]
+        prefix = {"manual_chunks": "m", "regulation_chunks": "r", "evidence_chunks": "lit"}[collection]
+        return [
+            VectorMatch(content=f"match body {digest} {i}", metadata={"chunk_id": f"{prefix}-{digest}-{i}"}, score=0.2)
+            for i in range(2)
+        ]
+
+
+def test_parallel_expansion_matches_sequential_traversal():
+    def build(workers: int) -> tuple[ContextBundle, KeyedBaseBuilder]:
+        base = KeyedBaseBuilder()
+        bundle = RecursiveContextBuilder(
+            None, AppConfig(), base_context_builder=base, max_depth=3, expansion_workers=workers,
+            slice_caps={"manual": 40, "regulation": 30, "litigation": 15},
+        ).build_recursive_context("focus", context_query="tool calibration")
+        return bundle, base
+
+    sequential, sequential_base = build(1)
+    parallel, parallel_base = build(4)
+
+    def ids(slices: list[ContextSlice]) -> list[str]:
+        return [s.metadata["chunk_id"] for s in slices]
+
+    assert ids(parallel.manual_neighbors) == ids(sequential.manual_neighbors)
+    assert ids(parallel.regulation_slices) == ids(sequential.regulation_slices)
+    assert ids(parallel.evidence_slices) == ids(sequential.evidence_slices)
+    assert sequential_base.max_in_flight == 1
+    assert parallel_base.max_in_flight > 1
+
+
+class StubSectionIndex:
+    def __init__(self, hits: dict[str, list[SimpleNamespace]]):
+        self.hits = hits
+
+    def lookup(self, reference_text, *, document_id=None, source_types=None, limit=5):
+        return self.hits.get(("reg" if source_types else "doc", normalize_section_number(reference_text)), [])
+
+
+def test_recursive_builder_uses_exact_hits_before_vector_search():
+    def chunk(chunk_id: str) -> SimpleNamespace:
+        return SimpleNamespace(
+            chunk_id=chunk_id, chunk_index=0, section_path=None, parent_heading=None,
+            document_id=1, content=f"{chunk_id} body", token_count=2, chunk_metadata=None,
+        )
+
+    base = FanOutBaseBuilder()
+    index = StubSectionIndex({
+        ("doc", "1.1"): [chunk("moe-1.1")],
+        ("doc", "145.a.1"): [chunk("moe-145.a.1")],
+        ("reg", "145.a.1"): [chunk("reg-145.a.1")],
+    })
+    bundle = RecursiveContextBuilder(
+        None, AppConfig(), base_context_builder=base, max_depth=1, section_index=index,
+    ).build_recursive_context("focus", include_litigation=False)
+
+    assert base.queries == []
+    assert [s.metadata["chunk_id"] for s in bundle.manual_neighbors] == ["neighbor-1", "moe-1.1", "moe-145.a.1"]
+    assert bundle.manual_neighbors[1].metadata["reference_type"] == "section_index"
+    assert [s.metadata["chunk_id"] for s in bundle.regulation_slices] == ["reg-base", "reg-145.a.1"]
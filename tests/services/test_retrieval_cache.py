@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from backend.app.services.context_builder import VectorMatch
+from backend.app.services.retrieval_cache import RetrievalCache, embedding_digest
+
+
+def _matches(*contents: str) -> list[VectorMatch]:
+    return [VectorMatch(content=content, metadata={"chunk_id": content}, score=0.1) for content in contents]
+
+
+def test_results_are_shared_across_callers_until_collection_is_written(tmp_path):
+    cache = RetrievalCache(max_entries=10)
+    digest = embedding_digest([0.1, 0.2])
+    key = cache.make_key(tmp_path, "regulation_chunks", digest, 5, {"document_id": 3})
+    cache.put(key, _matches("Part-145.A.30"))
+
+    same_query = cache.make_key(tmp_path, "regulation_chunks", embedding_digest([0.1, 0.2]), 5, {"document_id": 3})
+    assert [m.content for m in cache.get(same_query)] == ["Part-145.A.30"]
+    assert cache.get(cache.make_key(tmp_path, "regulation_chunks", digest, 10, {"document_id": 3})) is None
+    assert cache.get(cache.make_key(tmp_path, "regulation_chunks", digest, 5, None)) is None
+
+    other = cache.make_key(tmp_path, "amc_chunks", digest, 5, None)
+    cache.put(other, _matches("AMC"))
+    cache.invalidate(tmp_path, "regulation_chunks")
+
+    assert cache.get(same_query) is None
+    assert cache.get(cache.make_key(tmp_path, "regulation_chunks", digest, 5, {"document_id": 3})) is None
+    assert cache.get(other) is not None
+    stats = cache.stats()
+    assert (stats.entries, stats.invalidations) == (1, 1)
+
+
+def test_put_after_concurrent_write_is_discarded(tmp_path):
+    cache = RetrievalCache()
+    key = cache.make_key(tmp_path, "manual_chunks", "digest", 5)
+    cache.invalidate(tmp_path, "manual_chunks")  # write lands while the search is in flight
+    cache.put(key, _matches("stale"))
+
+    assert cache.stats().entries == 0
+
+
+def test_lru_respects_entry_and_memory_limits(tmp_path):
+    cache = RetrievalCache(max_entries=2)
+    keys = [cache.make_key(tmp_path, "gm_chunks", f"q{i}", 5) for i in range(3)]
+    cache.put(keys[0], _matches("a"))
+    cache.put(keys[1], _matches("b"))
+    cache.get(keys[0])
+    cache.put(keys[2], _matches("c"))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.stats().evictions == 1
+
+    small = RetrievalCache(max_entries=100, max_bytes=2000)
+    for i in range(10):
+        small.put(small.make_key(tmp_path, "gm_chunks", f"q{i}", 5), _matches("x" * 200))
+    stats = small.stats()
+    assert stats.size_bytes <= 2000
+    assert 0 < stats.entries < 10
+
+
+def test_writes_from_another_process_invalidate_cached_results(tmp_path):
+    # Separate instances share nothing in memory, like caches in separate processes
+    server, ingestion = RetrievalCache(), RetrievalCache()
+    key = server.make_key(tmp_path, "regulation_chunks", "digest", 5)
+    server.put(key, _matches("old"))
+    assert server.get(server.make_key(tmp_path, "regulation_chunks", "digest", 5)) is not None
+
+    ingestion.invalidate(tmp_path, "regulation_chunks")
+
+    assert server.get(server.make_key(tmp_path, "regulation_chunks", "digest", 5)) is None
+    # A search that started before the write is not cached under the new generation either
+    server.put(key, _matches("in flight during the write"))
+    assert server.get(server.make_key(tmp_path, "regulation_chunks", "digest", 5)) is None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    import backend.app.services.retrieval_cache as retrieval_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(retrieval_cache.time, "monotonic", lambda: now[0])
+    cache = RetrievalCache(ttl_seconds=60)
+    key = cache.make_key(tmp_path, "gm_chunks", "digest", 5)
+    cache.put(key, _matches("a"))
+
+    now[0] += 59
+    assert cache.get(key) is not None
+    now[0] += 2
+    assert cache.get(key) is None
+    assert cache.stats().entries == 0
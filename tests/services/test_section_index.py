@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from backend.app.db.models import Chunk, Document, SectionIndexEntry
+from backend.app.db.session import get_session
+from backend.app.services.section_index import (
+    REGULATION_SOURCE_TYPES,
+    SectionIndex,
+    backfill_section_index,
+    index_document_sections,
+    normalize_section_number,
+)
+
+
+def _document(session, external_id: str, source_type: str) -> Document:
+    document = Document(
+        external_id=external_id,
+        original_filename=f"{external_id}.md",
+        stored_filename=f"{external_id}.md",
+        storage_path=f"uploads/{external_id}.md",
+        content_type="text/markdown",
+        size_bytes=10,
+        sha256="c" * 64,
+        source_type=source_type,
+    )
+    session.add(document)
+    session.flush()
+    return document
+
+
+def _chunks(document: Document, paths: list[list[str]]) -> list[Chunk]:
+    return [
+        Chunk(
+            document_id=document.id,
+            chunk_id=f"{document.external_id}_{idx}",
+            chunk_index=idx,
+            section_path=" > ".join(path),
+            parent_heading=path[-1],
+            content=f"Body of {path[-1]}",
+            token_count=4,
+            chunk_metadata={"section_path": path},
+        )
+        for idx, path in enumerate(paths)
+    ]
+
+
+def test_normalize_section_number_handles_reference_and_heading_forms():
+    assert normalize_section_number("Part-145.A.30") == "145.a.30"
+    assert normalize_section_number("part 145.A.30") == "145.a.30"
+    assert normalize_section_number("Section 4.2") == "4.2"
+    assert normalize_section_number("kohdassa 3.4") == "3.4"
+    assert normalize_section_number("tool calibration procedures") is None
+    assert normalize_section_number("4.2 Tools and equipment", leading=True) == "4.2"
+    assert normalize_section_number("145.A.30 Personnel requirements", leading=True) == "145.a.30"
+    assert normalize_section_number("1.Introduction", leading=True) == "1"
+    assert normalize_section_number("A. General", leading=True) is None
+
+
+def test_lookup_prefers_the_sections_own_chunk_and_scopes_to_document(app):
+    session = get_session()
+    manual = _document(session, "moe", "manual")
+    other = _document(session, "other", "manual")
+    regulation = _document(session, "part145", "regulation")
+    manual_chunks = _chunks(manual, [["4 Maintenance", "4.1 Scope"], ["4 Maintenance", "4.2 Tools"], ["4 Maintenance"]])
+    other_chunks = _chunks(other, [["4.2 Tools"]])
+    regulation_chunks = _chunks(regulation, [["Part-145", "145.A.30 Personnel requirements"]])
+    session.add_all(manual_chunks + other_chunks + regulation_chunks)
+    index_document_sections(session, manual, manual_chunks)
+    index_document_sections(session, other, other_chunks)
+    index_document_sections(session, regulation, regulation_chunks)
+    session.commit()
+
+    index = SectionIndex(session)
+    assert [c.chunk_id for c in index.lookup("Section 4.2", document_id=manual.id)] == ["moe_1"]
+    assert [c.chunk_id for c in index.lookup("Chapter 4", document_id=manual.id)] == ["moe_2", "moe_0", "moe_1"]
+    assert index.lookup("Section 9.9", document_id=manual.id) == []
+    assert [
+        c.chunk_id for c in index.lookup("Part-145.A.30", source_types=REGULATION_SOURCE_TYPES)
+    ] == ["part145_0"]
+    assert index.lookup("Section 4.2", source_types=REGULATION_SOURCE_TYPES) == []
+
+    # Re-indexing replaces the document's entries instead of duplicating them
+    index_document_sections(session, manual, manual_chunks)
+    session.commit()
+    assert session.query(SectionIndexEntry).filter_by(document_id=manual.id, section_key="4.2").count() == 1
+
+
+def test_unindexed_documents_are_indexed_in_memory(app):
+    session = get_session()
+    legacy = _document(session, "legacy", "manual")
+    session.add_all(_chunks(legacy, [["2 Organisation", "2.3 Quality system"]]))
+    session.commit()
+
+    index = SectionIndex(session)
+    assert [c.chunk_id for c in index.lookup("section 2.3", document_id=legacy.id)] == ["legacy_0"]
+    assert session.query(SectionIndexEntry).count() == 0
+
+
+def test_backfill_indexes_legacy_corpora_for_an_open_index(app):
+    session = get_session()
+    regulation = _document(session, "legacy-reg", "regulation")
+    manual = _document(session, "legacy-moe", "manual")
+    indexed = _document(session, "indexed", "manual")
+    session.add_all(_chunks(regulation, [["Part-145", "145.A.30 Personnel requirements"]]))
+    session.add_all(_chunks(manual, [["2 Organisation", "2.3 Quality system"]]))
+    indexed_chunks = _chunks(indexed, [["1 Scope"]])
+    session.add_all(indexed_chunks)
+    index_document_sections(session, indexed, indexed_chunks)
+    session.commit()
+
+    index = SectionIndex(session)
+    assert index.lookup("Part-145.A.30", source_types=REGULATION_SOURCE_TYPES) == []
+    assert [c.chunk_id for c in index.lookup("section 2.3", document_id=manual.id)] == ["legacy-moe_0"]
+
+    assert backfill_section_index(session, REGULATION_SOURCE_TYPES) == {regulation.id: 2}
+    assert backfill_section_index(session) == {manual.id: 2}
+    assert backfill_section_index(session) == {}
+
+    # The same index instance sees the new entries instead of a cached "not indexed"
+    assert [
+        c.chunk_id for c in index.lookup("Part-145.A.30", source_types=REGULATION_SOURCE_TYPES)
+    ] == ["legacy-reg_0"]
+    assert index._is_indexed(manual.id)
+    assert [c.chunk_id for c in index.lookup("section 2.3", document_id=manual.id)] == ["legacy-moe_0"]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.app.config.settings import AppConfig
+from backend.app.db.models import Chunk, Document
+from backend.app.db.session import get_session
+from backend.app.services.context_builder import ContextBuilder, VectorQuery
+from backend.app.services.vector_index import NumpyCollection, NumpyVectorClient
+
+
+def _clustered(size: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((20, dim)) * 4
+    return (centers[rng.integers(0, 20, size)] + rng.standard_normal((size, dim))).astype(np.float32)
+
+
+def _collection(embeddings: np.ndarray, **options) -> NumpyCollection:
+    size = len(embeddings)
+    return NumpyCollection(
+        [f"c{i}" for i in range(size)],
+        embeddings,
+        [f"chunk {i}" for i in range(size)],
+        [{"chunk_id": f"c{i}", "document_id": i % 3} for i in range(size)],
+        **options,
+    )
+
+
+def test_exact_search_matches_brute_force_and_filters_by_document():
+    embeddings = _clustered(300)
+    index = _collection(embeddings)
+    queries = embeddings[:4] + 0.01
+
+    hits = index.search(queries, 5)
+    expected = np.argsort(((embeddings[None, :, :] - queries[:, None, :]) ** 2).sum(-1), axis=1)[:, :5]
+    assert [[row for row, _ in query_hits] for query_hits in hits] == expected.tolist()
+    assert all(a <= b for query_hits in hits for (_, a), (_, b) in zip(query_hits, query_hits[1:]))
+
+    filtered = index.search(queries[:1], 5, document_id=2)[0]
+    assert len(filtered) == 5
+    assert all(index.metadatas[row]["document_id"] == 2 for row, _ in filtered)
+    assert index.search(queries[:1], 5, document_id=99) == [[]]
+
+
+def test_ivf_search_recalls_exact_neighbours_on_clustered_data():
+    embeddings = _clustered(3000)
+    exact = _collection(embeddings)
+    ivf = _collection(embeddings, ivf_min_size=1000, n_lists=30, n_probe=6)
+    queries = embeddings[::150] + 0.05
+
+    assert ivf.centroids is not None and exact.centroids is None
+    exact_ids = [{exact.ids[row] for row, _ in hits} for hits in exact.search(queries, 10)]
+    ivf_ids = [{ivf.ids[row] for row, _ in hits} for hits in ivf.search(queries, 10)]
+    recall = np.mean([len(a & b) / 10 for a, b in zip(exact_ids, ivf_ids)])
+    assert recall >= 0.9
+
+
+def test_numpy_client_plugs_into_context_builder(app):
+    session = get_session()
+    document = Document(
+        external_id="np-doc",
+        original_filename="np-doc.md",
+        stored_filename="np-doc.md",
+        storage_path="uploads/np-doc.md",
+        content_type="text/markdown",
+        size_bytes=64,
+        sha256="n" * 64,
+        status="uploaded",
+        source_type="manual",
+    )
+    session.add(document)
+    session.commit()
+    chunk = Chunk(
+        document_id=document.id,
+        chunk_id="np-doc_0",
+        chunk_index=0,
+        content="Calibration of torque tools.",
+        token_count=6,
+    )
+    session.add(chunk)
+    session.commit()
+
+    regulation = NumpyCollection(
+        ["reg-tools", "reg-staff"],
+        [[1.0, 0.0], [0.0, 1.0]],
+        ["Part-145.A.40 equipment and tools.", "Part-145.A.30 personnel requirements."],
+        [{"chunk_id": "reg-tools"}, {"chunk_id": "reg-staff"}],
+    )
+    manual = NumpyCollection(
+        ["np-doc_5", "other_1"],
+        [[0.9, 0.1], [1.0, 0.0]],
+        ["Tool store procedure for this manual.", "A different manual's tooling section."],
+        [{"chunk_id": "np-doc_5", "document_id": document.id}, {"chunk_id": "other_1", "document_id": -1}],
+    )
+    embedded: list[list[str]] = []
+
+    def embedder(texts: list[str]) -> list[list[float]]:
+        embedded.append(list(texts))
+        return [[1.0, 0.0] for _ in texts]
+
+    client = NumpyVectorClient({"regulation_chunks": regulation, "manual_chunks": manual}, embedder=embedder)
+    assert client.query_many([VectorQuery("missing_chunks", "x", 3)]) == [[]]
+
+    bundle = ContextBuilder(session, AppConfig(), vector_client=client).build_context(chunk.chunk_id)
+
+    assert embedded == [[chunk.content]]
+    assert bundle.regulation_slices[0].metadata["chunk_id"] == "reg-tools"
+    rag_neighbours = [s.metadata["chunk_id"] for s in bundle.manual_neighbors if s.label.startswith("Manual (similar)")]
+    assert rag_neighbours == ["np-doc_5"]
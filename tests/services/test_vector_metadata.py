@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any
+
+from backend.app.db.models import Chunk
+from backend.app.services.context_builder import TokenEstimator
+from backend.app.services.vector_metadata import (
+    backfill_collection,
+    chunk_vector_metadata,
+    content_hash,
+    resolve_token_counts,
+)
+
+
+class WordCountEstimator(TokenEstimator):
+    def __init__(self) -> None:
+        self.tokenizer_name = "words"
+        self._encoding = None
+        self.counted: list[str] = []
+
+    def count_many(self, texts):
+        self.counted.extend(texts)
+        return [len(text.split()) for text in texts]
+
+
+class PagedCollection:
+    name = "manual_chunks"
+
+    def __init__(self, rows: list[tuple[str, str, dict[str, Any]]]) -> None:
+        self.rows = {row_id: (document, metadata) for row_id, document, metadata in rows}
+        self.updates: list[list[str]] = []
+
+    def get(self, include, limit, offset) -> dict[str, Any]:
+        ids = list(self.rows)[offset:offset + limit]
+        return {
+            "ids": ids,
+            "documents": [self.rows[i][0] for i in ids],
+            "metadatas": [dict(self.rows[i][1]) for i in ids],
+        }
+
+    def update(self, ids, metadatas) -> None:
+        self.updates.append(list(ids))
+        for row_id, metadata in zip(ids, metadatas):
+            self.rows[row_id] = (self.rows[row_id][0], metadata)
+
+
+def test_chunk_metadata_always_carries_token_count_and_hash():
+    chunk = Chunk(
+        id=7, document_id=1, chunk_id="c7", chunk_index=0, content="alpha beta gamma",
+        chunk_metadata={"token_count": 0, "section_path": ["1 Scope"], "section_index": 3},
+    )
+    estimator = WordCountEstimator()
+
+    [tokens] = resolve_token_counts([chunk], lambda: estimator)
+    metadata = chunk_vector_metadata(chunk, tokens)
+
+    assert metadata["token_count"] == 3
+    assert metadata["content_hash"] == content_hash("alpha beta gamma")
+    assert metadata["section_path"] == '["1 Scope"]'
+    assert metadata["section_index"] == 3
+
+    stored = Chunk(chunk_id="c8", content="delta", token_count=11)
+    assert resolve_token_counts([stored], lambda: (_ for _ in ()).throw(AssertionError("tokenizer loaded"))) == [11]
+
+
+def test_backfill_fills_missing_metadata_and_is_idempotent():
+    collection = PagedCollection([
+        ("a", "one two", {"chunk_id": "a", "token_count": 0}),
+        ("b", "three four five", {"chunk_id": "b"}),
+        ("c", "six", {"chunk_id": "c", "token_count": 1, "content_hash": content_hash("six")}),
+        ("d", "seven eight", {"chunk_id": "d", "token_count": 2}),
+    ])
+    estimator = WordCountEstimator()
+
+    dry = backfill_collection(collection, estimator, batch_size=2, dry_run=True)
+    assert (dry.scanned, dry.updated) == (4, 3)
+    assert collection.updates == []
+
+    report = backfill_collection(
+        collection, estimator, known_counts=lambda ids: {"a": 9} if "a" in ids else {}, batch_size=2
+    )
+    assert (report.scanned, report.updated, report.tokenized) == (4, 3, 1)
+    assert collection.rows["a"][1]["token_count"] == 9
+    assert collection.rows["b"][1]["token_count"] == 3
+    assert collection.rows["d"][1] == {"chunk_id": "d", "token_count": 2, "content_hash": content_hash("seven eight")}
+
+    assert backfill_collection(collection, estimator, batch_size=2).updated == 0
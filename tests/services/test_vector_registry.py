@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backend.app.services import vector_registry
+from backend.app.services.vector_registry import VectorStoreRegistry
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.embeddings: list[list[float]] = []
+        self.metadatas: list[dict[str, Any]] = []
+        self.documents: list[str] = []
+        self.peeks = 0
+        self.queries: list[dict[str, Any]] = []
+
+    def count(self) -> int:
+        return len(self.embeddings)
+
+    def peek(self, limit: int = 10) -> dict[str, Any]:
+        self.peeks += 1
+        return {"embeddings": self.embeddings[:limit]}
+
+    def add(self, ids, embeddings, documents, metadatas) -> None:
+        self.embeddings.extend(embeddings)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        self.add(ids, embeddings, documents, metadatas)
+
+    def query(self, query_embeddings, n_results, where=None) -> dict[str, Any]:
+        self.queries.append({"query_embeddings": query_embeddings, "n_results": n_results, "where": where})
+        rows = len(query_embeddings)
+        return {
+            "ids": [[str(i) for i in range(len(self.documents))][:n_results]] * rows,
+            "documents": [self.documents[:n_results]] * rows,
+            "metadatas": [self.metadatas[:n_results]] * rows,
+            "distances": [[0.1] * min(n_results, len(self.documents))] * rows,
+        }
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.collections: dict[str, FakeCollection] = {}
+
+    def get_collection(self, name: str) -> FakeCollection:
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist.")
+        return self.collections[name]
+
+    def get_or_create_collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection())
+
+    def delete_collection(self, name: str) -> None:
+        self.collections.pop(name)
+
+
+@pytest.fixture()
+def fake_registry(monkeypatch):
+    opened: list[str] = []
+
+    def factory(path: str) -> FakeClient:
+        opened.append(path)
+        return FakeClient()
+
+    registry = VectorStoreRegistry(client_factory=factory)
+    registry.opened = opened  # type: ignore[attr-defined]
+    monkeypatch.setattr(vector_registry, "_global_registry", registry)
+    return registry
+
+
+def test_registry_reuses_clients_and_collections(tmp_path, fake_registry):
+    first = fake_registry.get_collection(tmp_path / "chroma", "manual_chunks", create=True)
+    second = fake_registry.get_collection(str(tmp_path / "chroma"), "manual_chunks")
+
+    assert first is second
+    assert len(fake_registry.opened) == 1
+    assert fake_registry.get_collection(tmp_path / "chroma", "missing") is None
+
+
+def test_registry_memoizes_collection_dimension(tmp_path, fake_registry):
+    path = tmp_path / "chroma"
+    collection = fake_registry.get_collection(path, "regulation_chunks", create=True)
+    assert fake_registry.collection_dimension(path, "regulation_chunks") is None
+
+    collection.add(ids=["a"], embeddings=[[0.0] * 3], documents=["a"], metadatas=[{}])
+
+    assert fake_registry.collection_dimension(path, "regulation_chunks") == 3
+    assert fake_registry.collection_dimension(path, "regulation_chunks") == 3
+    assert collection.peeks == 1
+
+    fake_registry.delete_collection(path, "regulation_chunks")
+    assert fake_registry.collection_dimension(path, "regulation_chunks") is None
+
+
+def test_store_in_chroma_opens_client_once(app, monkeypatch, fake_registry):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("EMBEDDING_MODEL", "test-embedding")
+    from backend.app.config.settings import AppConfig
+    from backend.app.db.models import Chunk
+    from backend.app.db.session import get_session
+    from backend.app.services.embeddings import EmbeddingService
+
+    service = EmbeddingService(get_session(), AppConfig())
+    chunks = [
+        Chunk(id=i, document_id=1, chunk_id=f"c{i}", chunk_index=i, content=f"text {i}", token_count=2)
+        for i in range(4)
+    ]
+
+    service._store_in_chroma(chunks[:2], [[0.1, 0.2], [0.3, 0.4]], "manual_chunks")
+    service._store_in_chroma(chunks[2:], [[0.5, 0.6], [0.7, 0.8]], "manual_chunks")
+
+    collection = fake_registry.get_collection(service.config.data_root + "/chroma", "manual_chunks")
+    assert len(fake_registry.opened) == 1
+    assert collection.count() == 4
+    assert collection.peeks == 0
+    assert collection.metadatas[0]["token_count"] == 2
+    assert collection.metadatas[0]["content_hash"] == service._compute_cache_key("text 0")
+
+    with pytest.raises(ValueError, match="Dimension mismatch"):
+        service._store_in_chroma(chunks[:1], [[0.1, 0.2, 0.3]], "manual_chunks")
+
+
+def test_chroma_vector_clients_share_registry(tmp_path, monkeypatch, fake_registry):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path / "data"))
+    from backend.app.config.settings import AppConfig
+    from backend.app.services.context_builder import ChromaVectorClient
+
+    path = tmp_path / "chroma"
+    collection = fake_registry.get_collection(path, "regulation_chunks", create=True)
+    collection.add(ids=["a"], embeddings=[[0.0, 1.0]], documents=["Part-145"], metadatas=[{"k": "v"}])
+
+    clients = [ChromaVectorClient(path, app_config=AppConfig()) for _ in range(3)]
+    for client in clients:
+        monkeypatch.setattr(client._embedding_client, "embed_texts", lambda texts: [[1.0, 0.0]])
+        matches = client.query("regulation_chunks", "maintenance", n_results=1)
+        assert [match.content for match in matches] == ["Part-145"]
+
+    assert len(fake_registry.opened) == 1
+    assert collection.peeks == 1
+
+
+def test_query_many_embeds_once_and_queries_each_collection_once(tmp_path, monkeypatch, fake_registry):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("DATA_ROOT", str(tmp_path / "data"))
+    from backend.app.config.settings import AppConfig
+    from backend.app.services.context_builder import ChromaVectorClient, VectorQuery
+
+    path = tmp_path / "chroma"
+    for name in ("manual_chunks", "regulation_chunks"):
+        collection = fake_registry.get_collection(path, name, create=True)
+        collection.add(
+            ids=["a", "b", "c"],
+            embeddings=[[0.0, 1.0]] * 3,
+            documents=[f"{name} {i}" for i in range(3)],
+            metadatas=[{"i": i} for i in range(3)],
+        )
+
+    client = ChromaVectorClient(path, app_config=AppConfig())
+    embed_calls: list[list[str]] = []
+
+    def fake_embed(texts):
+        embed_calls.append(list(texts))
+        return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(client._embedding_client, "embed_texts", fake_embed)
+    results = client.query_many(
+        [
+            VectorQuery("manual_chunks", "engine", 1, document_id=7),
+            VectorQuery("regulation_chunks", "engine", 3),
+            VectorQuery("regulation_chunks", "tooling", 2),
+            VectorQuery("missing_chunks", "engine", 5),
+        ]
+    )
+
+    assert embed_calls == [["engine", "tooling"]]
+    assert [len(matches) for matches in results] == [1, 3, 2, 0]
+    manual = fake_registry.get_collection(path, "manual_chunks")
+    regulation = fake_registry.get_collection(path, "regulation_chunks")
+    assert manual.queries == [
+        {"query_embeddings": [[1.0, 0.0]], "n_results": 1, "where": {"document_id": 7}}
+    ]
+    assert len(regulation.queries) == 1
+    assert regulation.queries[0]["n_results"] == 3
+    assert len(regulation.queries[0]["query_embeddings"]) == 2
+
+
+def test_identical_searches_are_served_from_retrieval_cache_until_write(app, tmp_path, monkeypatch, fake_registry):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("EMBEDDING_MODEL", "test-embedding")
+    from backend.app.config.settings import AppConfig
+    from backend.app.db.models import Chunk
+    from backend.app.db.session import get_session
+    from backend.app.services.context_builder import ChromaVectorClient
+    from backend.app.services.embeddings import EmbeddingService
+
+    config = AppConfig()
+    path = Path(config.data_root) / "chroma"
+    collection = fake_registry.get_collection(path, "regulation_chunks", create=True)
+    collection.add(ids=["a"], embeddings=[[0.0, 1.0]], documents=["Part-145"], metadatas=[{"k": "v"}])
+
+    for _ in range(2):
+        client = ChromaVectorClient(path, app_config=config)
+        monkeypatch.setattr(client._embedding_client, "embed_texts", lambda texts: [[1.0, 0.0]] * len(texts))
+        assert [m.content for m in client.query("regulation_chunks", "Part-145.A.30", 1)] == ["Part-145"]
+    assert len(collection.queries) == 1
+
+    service = EmbeddingService(get_session(), config)
+    chunk = Chunk(id=1, document_id=1, chunk_id="new", chunk_index=0, content="new text", token_count=2)
+    service._store_in_chroma([chunk], [[0.5, 0.5]], "regulation_chunks")
+
+    client.query("regulation_chunks", "Part-145.A.30", 1)
+    assert len(collection.queries) == 2